@@ -0,0 +1,137 @@
+"""
+AsyncEntityManager benchmark.
+
+Simulates concurrent requests against a SQLite database from async handlers:
+each request runs a filtered query (a table scan) then awaits some other I/O.
+"sync" calls EntityManager directly from the handler, as async controllers do
+today, which blocks the event loop for the whole query. "async" goes through
+AsyncEntityManager (aiosqlite), so other requests progress in the meantime.
+The max loop lag column shows how long the event loop was stalled.
+
+Usage:
+    python benchmarks/async_entity_manager_benchmark.py [concurrency] [rows]
+"""
+
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlmodel import (  # noqa: E402
+    Field,
+    Session,
+    SQLModel,
+    col,
+    create_engine,
+    func,
+    select,
+)
+
+from framefox.core.orm.async_entity_manager import AsyncEntityManager  # noqa: E402
+from framefox.core.orm.entity_manager import EntityManager  # noqa: E402
+from framefox.core.orm.entity_manager_registry import (  # noqa: E402
+    EntityManagerRegistry,
+)
+
+OTHER_IO_SECONDS = 0.005
+
+
+class BenchArticle(SQLModel, table=True):
+    __tablename__ = "bench_article"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    title: str
+    body: str
+
+
+def query():
+    return select(func.count()).select_from(BenchArticle).where(col(BenchArticle.body).like("%needle 7%"))
+
+
+def populate(engine, rows: int) -> None:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(BenchArticle(title=f"Article {i}", body=f"lorem ipsum needle {i} dolor" * 4) for i in range(rows))
+        session.commit()
+
+
+async def sync_request(latencies: list) -> None:
+    started = time.perf_counter()
+    entity_manager = EntityManager()
+    try:
+        entity_manager.exec_statement(query())
+    finally:
+        entity_manager.close_session()
+    await asyncio.sleep(OTHER_IO_SECONDS)
+    latencies.append(time.perf_counter() - started)
+
+
+async def async_request(latencies: list) -> None:
+    started = time.perf_counter()
+    entity_manager = AsyncEntityManager()
+    try:
+        await entity_manager.exec_statement(query())
+    finally:
+        await entity_manager.close_session()
+    await asyncio.sleep(OTHER_IO_SECONDS)
+    latencies.append(time.perf_counter() - started)
+
+
+async def watch_loop_lag(lags: list, stop: asyncio.Event) -> None:
+    """Measures how late a 1 ms timer fires, i.e. how long the event loop is blocked"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - started - 0.001)
+
+
+async def run(handler, concurrency: int) -> tuple:
+    latencies, lags = [], []
+    stop = asyncio.Event()
+    watcher = asyncio.create_task(watch_loop_lag(lags, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(handler(latencies) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await watcher
+    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+    return concurrency / elapsed, statistics.median(latencies), p95, max(lags, default=0.0)
+
+
+async def main(concurrency: int, rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Path(tmp) / "bench.db"
+        engine = create_engine(f"sqlite:///{database}")
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{database}")
+        populate(engine, rows)
+
+        registry = Mock()
+        registry.get_engine.return_value = engine
+        registry.get_async_engine.return_value = async_engine
+
+        with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+            await run(async_request, 4)
+            print(f"{concurrency} concurrent requests, {rows} rows")
+            print(f"{'manager':<8} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'max loop lag ms':>16}")
+            for label, handler in (("sync", sync_request), ("async", async_request)):
+                throughput, p50, p95, lag = await run(handler, concurrency)
+                print(f"{label:<8} {throughput:>10.1f} {p50 * 1e3:>10.1f} {p95 * 1e3:>10.1f} {lag * 1e3:>16.1f}")
+
+        await async_engine.dispose()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 20000,
+        )
+    )
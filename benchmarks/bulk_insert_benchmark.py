@@ -0,0 +1,111 @@
+"""
+Bulk insert benchmark.
+
+Loads rows into a SQLite database the way mocks and imports did until now,
+one add and flush per entity ("persist"), then with a single unit of work
+("add_all"), then with EntityManager.bulk_insert from entities and from dicts,
+and finally re-applies every row with EntityManager.upsert.
+
+Usage:
+    python benchmarks/bulk_insert_benchmark.py [rows] [chunk_size]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlmodel import Field, SQLModel, create_engine, func, select  # noqa: E402
+
+from framefox.core.orm.entity_manager import EntityManager  # noqa: E402
+from framefox.core.orm.entity_manager_registry import (  # noqa: E402
+    EntityManagerRegistry,
+)
+
+
+class BenchCustomer(SQLModel, table=True):
+    __tablename__ = "bench_customer"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    email: str
+    name: str
+    balance: int = 0
+
+
+def entities(rows: int):
+    return (BenchCustomer(email=f"customer{i}@example.com", name=f"Customer {i}", balance=i) for i in range(rows))
+
+
+def dicts(rows: int):
+    return ({"email": f"customer{i}@example.com", "name": f"Customer {i}", "balance": i} for i in range(rows))
+
+
+def per_entity_flush(entity_manager, rows, chunk_size):
+    for customer in entities(rows):
+        entity_manager.session.add(customer)
+        entity_manager.session.flush()
+    entity_manager.commit()
+
+
+def add_all(entity_manager, rows, chunk_size):
+    entity_manager.session.add_all(entities(rows))
+    entity_manager.commit()
+
+
+def bulk_insert_entities(entity_manager, rows, chunk_size):
+    entity_manager.bulk_insert(BenchCustomer, entities(rows), chunk_size=chunk_size)
+
+
+def bulk_insert_dicts(entity_manager, rows, chunk_size):
+    entity_manager.bulk_insert(BenchCustomer, dicts(rows), chunk_size=chunk_size)
+
+
+def upsert_existing(entity_manager, rows, chunk_size):
+    updated = ({"id": i + 1, "email": f"customer{i}@example.com", "name": f"Customer {i}", "balance": -i} for i in range(rows))
+    entity_manager.upsert(BenchCustomer, updated, chunk_size=chunk_size)
+
+
+def run(label: str, loader, rows: int, chunk_size: int, fresh: bool = True) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        SQLModel.metadata.create_all(engine)
+        registry = Mock()
+        registry.get_engine.return_value = engine
+
+        with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+            if not fresh:
+                setup = EntityManager()
+                bulk_insert_dicts(setup, rows, chunk_size)
+                setup.close_session()
+
+            entity_manager = EntityManager()
+            started = time.perf_counter()
+            loader(entity_manager, rows, chunk_size)
+            elapsed = time.perf_counter() - started
+            count = entity_manager.exec_statement(select(func.count()).select_from(BenchCustomer))[0]
+            entity_manager.close_session()
+
+        engine.dispose()
+        assert count == rows, f"{label}: expected {rows} rows, found {count}"
+        print(f"{label:<24} {elapsed:>10.2f} {rows / elapsed:>14.0f}")
+
+
+def main(rows: int, chunk_size: int) -> None:
+    print(f"{rows} rows, chunk size {chunk_size} (SQLite)")
+    print(f"{'method':<24} {'seconds':>10} {'rows/s':>14}")
+    run("persist + flush", per_entity_flush, rows, chunk_size)
+    run("add_all + commit", add_all, rows, chunk_size)
+    run("bulk_insert (entities)", bulk_insert_entities, rows, chunk_size)
+    run("bulk_insert (dicts)", bulk_insert_dicts, rows, chunk_size)
+    run("upsert (all existing)", upsert_existing, rows, chunk_size, fresh=False)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1000,
+    )
@@ -0,0 +1,140 @@
+"""
+find_by benchmark.
+
+Runs login-style lookups (find_one_by on email and active) against a SQLite
+database. "rebuilt" builds a new select().filter_by(**criteria) per call, as
+find_by did until now, with criteria dicts coming in either key order. "find_by"
+goes through AbstractRepository.find_by, whose statements are built once per
+criteria shape with bound parameters. The table reports the time per lookup,
+the time spent building a statement and its cache key (what SQLAlchemy pays
+before it can even look the compiled SQL up), and how many lookups missed the
+engine compiled-SQL cache.
+
+Usage:
+    python benchmarks/find_by_benchmark.py [lookups] [rows]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.engine.interfaces import CacheStats  # noqa: E402
+from sqlmodel import Field, Session, SQLModel, create_engine, select  # noqa: E402
+
+from framefox.core.orm.abstract_repository import AbstractRepository  # noqa: E402
+from framefox.core.orm.entity_manager import EntityManager  # noqa: E402
+from framefox.core.orm.entity_manager_registry import (  # noqa: E402
+    EntityManagerRegistry,
+)
+
+
+class BenchAccount(SQLModel, table=True):
+    __tablename__ = "bench_account"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    email: str = Field(index=True)
+    active: bool = True
+
+    @classmethod
+    def get_primary_keys(cls):
+        return ["id"]
+
+
+class BenchAccountRepository(AbstractRepository):
+    def __init__(self, entity_manager):
+        self.model = BenchAccount
+        self._entity_manager = entity_manager
+
+    @property
+    def entity_manager(self):
+        return self._entity_manager
+
+
+def populate(engine, rows: int) -> None:
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(BenchAccount(email=f"user{i}@example.com") for i in range(rows))
+        session.commit()
+
+
+def criteria(i: int, rows: int) -> dict:
+    email = f"user{i % rows}@example.com"
+    return {"email": email, "active": True} if i % 2 else {"active": True, "email": email}
+
+
+def rebuilt(entity_manager, lookup: dict):
+    statement = select(BenchAccount).filter_by(**lookup).limit(1)
+    results = entity_manager.exec_statement(statement)
+    return results[0] if results else None
+
+
+def run(engine, entity_manager, lookup, lookups: int, rows: int) -> tuple:
+    misses = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        misses.append(context.cache_hit != CacheStats.CACHE_HIT)
+
+    event.listen(engine, "after_cursor_execute", record)
+    started = time.perf_counter()
+    for i in range(lookups):
+        lookup(entity_manager, criteria(i, rows))
+        entity_manager.session.expunge_all()
+    elapsed = time.perf_counter() - started
+    event.remove(engine, "after_cursor_execute", record)
+    return elapsed / lookups, sum(misses)
+
+
+def profile_statement_time(lookup, lookups: int, rows: int) -> float:
+    """Time spent building the statement and its cache key, without executing it"""
+    started = time.perf_counter()
+    for i in range(lookups):
+        statement, _ = lookup(criteria(i, rows))
+        statement._generate_cache_key()
+    return (time.perf_counter() - started) / lookups
+
+
+def main(lookups: int, rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        populate(engine, rows)
+
+        registry = Mock()
+        registry.get_engine.return_value = engine
+        with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+            entity_manager = EntityManager()
+        repository = BenchAccountRepository(entity_manager)
+
+        def repository_lookup(entity_manager, lookup):
+            return repository.find_one_by(lookup)
+
+        def rebuilt_statement(lookup):
+            return select(BenchAccount).filter_by(**lookup).limit(1), lookup
+
+        def repository_statement(lookup):
+            return repository._build_find_by_statement(lookup, limit=1)
+
+        print(f"{lookups} lookups, {rows} rows")
+        print(f"{'statements':<10} {'us/lookup':>10} {'us/build+key':>13} {'cache misses':>13}")
+        for label, lookup, build in (
+            ("rebuilt", rebuilt, rebuilt_statement),
+            ("find_by", repository_lookup, repository_statement),
+        ):
+            per_lookup, misses = run(engine, entity_manager, lookup, lookups, rows)
+            per_build = profile_statement_time(build, lookups, rows)
+            print(f"{label:<10} {per_lookup * 1e6:>10.1f} {per_build * 1e6:>13.1f} {misses:>13}")
+
+        entity_manager.close_session()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1000,
+    )
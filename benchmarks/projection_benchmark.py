@@ -0,0 +1,106 @@
+"""
+Projection benchmark.
+
+Loads an admin-table sized result (id, name, email of every customer) from a
+SQLite database, once as full entities with find_by (every column fetched,
+each row validated and registered in the identity map) and once with
+find_by(fields=[...]), which returns rows holding only the selected columns.
+The table reports the time and the peak memory allocated while loading.
+
+Usage:
+    python benchmarks/projection_benchmark.py [rows]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Optional
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlmodel import Field, SQLModel, create_engine  # noqa: E402
+
+from framefox.core.orm.abstract_repository import AbstractRepository  # noqa: E402
+from framefox.core.orm.entity_manager import EntityManager  # noqa: E402
+from framefox.core.orm.entity_manager_registry import (  # noqa: E402
+    EntityManagerRegistry,
+)
+
+
+class BenchCustomer(SQLModel, table=True):
+    __tablename__ = "bench_projected_customer"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    email: str
+    address: str
+    notes: str
+
+    @classmethod
+    def get_primary_keys(cls):
+        return ["id"]
+
+
+class BenchCustomerRepository(AbstractRepository):
+    def __init__(self, entity_manager):
+        self.model = BenchCustomer
+        self._entity_manager = entity_manager
+
+    @property
+    def entity_manager(self):
+        return self._entity_manager
+
+
+def populate(engine, rows: int) -> None:
+    SQLModel.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            BenchCustomer.__table__.insert(),
+            [
+                {
+                    "name": f"Customer {i}",
+                    "email": f"customer{i}@example.com",
+                    "address": f"{i} Main Street" * 4,
+                    "notes": "lorem ipsum " * 40,
+                }
+                for i in range(rows)
+            ],
+        )
+
+
+def measure(load) -> tuple:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(result), elapsed, peak
+
+
+def main(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        populate(engine, rows)
+
+        registry = Mock()
+        registry.get_engine.return_value = engine
+        print(f"{rows} rows")
+        print(f"{'load':<10} {'ms':>10} {'peak MB':>10}")
+        for label, fields in (("entities", None), ("fields", ["id", "name", "email"])):
+            with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+                entity_manager = EntityManager()
+            repository = BenchCustomerRepository(entity_manager)
+            count, elapsed, peak = measure(lambda repository=repository, fields=fields: repository.find_by({}, fields=fields))
+            assert count == rows
+            print(f"{label:<10} {elapsed * 1e3:>10.1f} {peak / 1024 / 1024:>10.1f}")
+            entity_manager.close_session()
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
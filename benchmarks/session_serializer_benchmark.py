@@ -0,0 +1,89 @@
+"""
+Session serializer benchmark.
+
+Measures encode/decode time and payload size of every available session
+serializer, then a full SQLite SessionManager write/read round trip, for a
+typical session and a large (~50 KB) one.
+
+Usage:
+    python benchmarks/session_serializer_benchmark.py [iterations]
+"""
+
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from framefox.core.config.settings import Settings  # noqa: E402
+from framefox.core.request.session.serializer.session_payload_codec import (  # noqa: E402
+    SessionPayloadCodec,
+)
+from framefox.core.request.session.serializer.session_serializer_factory import (  # noqa: E402
+    SessionSerializerFactory,
+)
+from framefox.core.request.session.session_manager import SessionManager  # noqa: E402
+
+
+def typical_session() -> dict:
+    return {
+        "_current_user_id": 42,
+        "csrf_token": "9f2c1d0b7e6a4c3f8d5e2a1b0c9d8e7f",
+        "_flash_initialized": True,
+        "_flash_messages": {"success": ["Your profile has been updated."]},
+        "cart": [{"sku": f"SKU-{i}", "qty": i % 3 + 1, "price": 19.99} for i in range(5)],
+    }
+
+
+def large_session() -> dict:
+    data = typical_session()
+    data["history"] = [{"path": f"/catalog/item/{i}", "ts": 1700000000 + i, "ref": "search"} for i in range(850)]
+    return data
+
+
+def available_serializers() -> list:
+    names = []
+    for name in SessionSerializerFactory.SUPPORTED:
+        if SessionSerializerFactory.create(name).name == name:
+            names.append(name)
+    return names
+
+
+def bench_codec(name: str, data: dict, iterations: int) -> tuple:
+    codec = SessionPayloadCodec(SessionSerializerFactory.create(name))
+    payload = codec.encode(data)
+    encode = timeit.timeit(lambda: codec.encode(data), number=iterations) / iterations
+    decode = timeit.timeit(lambda: codec.decode(payload), number=iterations) / iterations
+    return len(payload), encode, decode
+
+
+def bench_storage(name: str, data: dict, iterations: int) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = Mock(spec=Settings)
+        settings.session_file_path = str(Path(tmp) / "sessions.db")
+        settings.session_redis_enabled = False
+        settings.session_serializer = name
+        manager = SessionManager(settings)
+        manager.create_session("bench", data, 3600)
+
+        def round_trip():
+            manager.update_session("bench", data, 3600)
+            manager.get_session("bench")
+
+        return timeit.timeit(round_trip, number=iterations) / iterations
+
+
+def main(iterations: int) -> None:
+    for label, data in (("typical", typical_session()), ("large", large_session())):
+        print(f"\n{label} session")
+        print(f"{'serializer':<10} {'bytes':>8} {'encode µs':>11} {'decode µs':>11} {'sqlite rt µs':>13}")
+        for name in available_serializers():
+            size, encode, decode = bench_codec(name, data, iterations)
+            storage = bench_storage(name, data, max(1, iterations // 20))
+            print(f"{name:<10} {size:>8} {encode * 1e6:>11.1f} {decode * 1e6:>11.1f} {storage * 1e6:>13.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
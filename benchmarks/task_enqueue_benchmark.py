@@ -0,0 +1,71 @@
+"""
+Task enqueue benchmark.
+
+Queues tasks on a DatabaseBroker over a SQLite file, one enqueue() (one
+INSERT and one commit) per task as TaskManager.queue_task does outside of a
+batch, then with enqueue_many() as TaskManager.batch() and queue_many() do.
+
+Usage:
+    python benchmarks/task_enqueue_benchmark.py [tasks]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlmodel import create_engine  # noqa: E402
+
+from framefox.core.orm.entity_manager import EntityManager  # noqa: E402
+from framefox.core.orm.entity_manager_interface import (  # noqa: E402
+    EntityManagerInterface,
+)
+from framefox.core.orm.entity_manager_registry import (  # noqa: E402
+    EntityManagerRegistry,
+)
+from framefox.core.task.broker.database_broker import DatabaseBroker  # noqa: E402
+from framefox.core.task.entity.task import Task  # noqa: E402
+
+
+def build_broker(directory: str, label: str) -> DatabaseBroker:
+    engine = create_engine(f"sqlite:///{directory}/{label}.db")
+    Task.__table__.create(engine)
+    registry = Mock()
+    registry.get_engine.return_value = engine
+    with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+        return DatabaseBroker(EntityManagerInterface(entity_manager=EntityManager()))
+
+
+def one_by_one(broker: DatabaseBroker, tasks: int) -> None:
+    for index in range(tasks):
+        broker.enqueue("bench.send_mail", {"kwargs": {"user_id": index}})
+
+
+def bulk(broker: DatabaseBroker, tasks: int) -> None:
+    batch = []
+    for index in range(tasks):
+        task = Task(name="bench.send_mail")
+        task.set_payload({"kwargs": {"user_id": index}})
+        batch.append(task)
+    broker.enqueue_many(batch)
+
+
+def main(tasks: int) -> None:
+    print(f"{tasks} tasks")
+    print(f"{'enqueue':<12} {'seconds':>10} {'tasks/s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        # persist() looks the repositories of the relations up in the service container
+        with patch.object(EntityManager, "get_repository", return_value=None):
+            for label, run in (("one by one", one_by_one), ("bulk", bulk)):
+                broker = build_broker(directory, label.replace(" ", "_"))
+                started = time.perf_counter()
+                run(broker, tasks)
+                elapsed = time.perf_counter() - started
+                print(f"{label:<12} {elapsed:>10.2f} {tasks / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
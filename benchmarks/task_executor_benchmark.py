@@ -0,0 +1,76 @@
+"""
+Task executor benchmark.
+
+Runs small synchronous task handlers through WorkerManager._execute_task, in
+batches of the worker concurrency as the worker loop does, with a broker that
+keeps nothing. "per task" creates a new ThreadPoolExecutor for every task, as
+the worker did until now (its thread only goes away once the executor is
+garbage collected), "shared" uses the thread pool of the worker. The table
+reports the throughput and the number of threads started to run the handlers.
+
+Usage:
+    python benchmarks/task_executor_benchmark.py [tasks] [concurrency]
+"""
+
+import asyncio
+import concurrent.futures
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from framefox.core.task.entity.task import Task  # noqa: E402
+from framefox.core.task.worker_manager import WorkerManager  # noqa: E402
+
+handler_threads = set()
+
+
+def small_task(value):
+    handler_threads.add(threading.current_thread().name)
+    return value * 2
+
+
+class PerTaskExecutor:
+    """Stands in for the shared executor with a new ThreadPoolExecutor per task"""
+
+    def get_executor(self, kind="thread"):
+        return concurrent.futures.ThreadPoolExecutor()
+
+
+async def run(worker_manager, tasks: int, concurrency: int) -> float:
+    started = time.perf_counter()
+    for offset in range(0, tasks, concurrency):
+        batch = []
+        for value in range(offset, min(tasks, offset + concurrency)):
+            task = Task(name="bench.small_task")
+            task.set_payload({"args": [value]})
+            batch.append(worker_manager._execute_task(task))
+        await asyncio.gather(*batch)
+    return time.perf_counter() - started
+
+
+def main(tasks: int, concurrency: int) -> None:
+    WorkerManager.register_task_handler("bench.small_task", small_task)
+    print(f"{tasks} tasks, concurrency {concurrency}")
+    print(f"{'executor':<10} {'tasks/s':>10} {'threads':>10}")
+    for label in ("per task", "shared"):
+        handler_threads.clear()
+        worker_manager = WorkerManager(Mock())
+        worker_manager.set_concurrent_tasks(concurrency)
+        if label == "per task":
+            with patch.object(worker_manager, "get_executor", PerTaskExecutor().get_executor):
+                elapsed = asyncio.run(run(worker_manager, tasks, concurrency))
+        else:
+            elapsed = asyncio.run(run(worker_manager, tasks, concurrency))
+        worker_manager.shutdown_executors()
+        print(f"{label:<10} {tasks / elapsed:>10.0f} {len(handler_threads):>10}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5,
+    )
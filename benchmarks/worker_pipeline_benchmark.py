@@ -0,0 +1,106 @@
+"""
+Worker pipeline benchmark.
+
+Runs tasks of mixed durations (90% take 10ms, 10% take 500ms) through a
+WorkerManager on an in-memory broker. "batch" claims as many tasks as there
+are slots and waits for the whole batch before claiming again, as the worker
+loop did until now, "pipeline" is the current loop starting a task as soon
+as a slot frees up. The table reports the wall time and the share of the
+slot time spent running tasks.
+
+Usage:
+    python benchmarks/worker_pipeline_benchmark.py [tasks] [concurrency]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from framefox.core.task.entity.task import Task  # noqa: E402
+from framefox.core.task.worker_manager import WorkerManager  # noqa: E402
+
+busy_time = 0.0
+
+
+async def mixed_task(seconds):
+    global busy_time
+    await asyncio.sleep(seconds)
+    busy_time += seconds
+
+
+class MemoryBroker:
+    def __init__(self, durations):
+        self.pending = deque()
+        for seconds in durations:
+            task = Task(name="bench.mixed_task")
+            task.set_payload({"args": [seconds]})
+            self.pending.append(task)
+        self.done = 0
+
+    def subscribe(self, queues):
+        return None
+
+    def dequeue(self, queue="default", batch_size=1):
+        return [self.pending.popleft() for _ in range(min(batch_size, len(self.pending)))]
+
+    def complete_task(self, task):
+        self.done += 1
+
+    def fail_task(self, task, error):
+        self.done += 1
+
+    def release(self, task):
+        self.pending.appendleft(task)
+
+
+async def run_batch(worker_manager, broker, total):
+    started = time.perf_counter()
+    while broker.done < total:
+        tasks = await worker_manager._call_broker(broker.dequeue, "default", worker_manager.concurrent_tasks)
+        await asyncio.gather(*[worker_manager._execute_task(task) for task in tasks])
+    return time.perf_counter() - started
+
+
+async def run_pipeline(worker_manager, broker, total):
+    started = time.perf_counter()
+    worker_manager.running = True
+    loop_task = asyncio.create_task(worker_manager._process_loop())
+    while broker.done < total:
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - started
+    worker_manager.running = False
+    await loop_task
+    return elapsed
+
+
+def main(tasks: int, concurrency: int) -> None:
+    global busy_time
+    WorkerManager.register_task_handler("bench.mixed_task", mixed_task)
+    rng = random.Random(42)
+    durations = [0.5 if rng.random() < 0.1 else 0.01 for _ in range(tasks)]
+    print(f"{tasks} tasks, concurrency {concurrency}, {sum(durations):.1f}s of work")
+    print(f"{'loop':<10} {'seconds':>10} {'utilization':>12}")
+    for label, run in (("batch", run_batch), ("pipeline", run_pipeline)):
+        busy_time = 0.0
+        broker = MemoryBroker(durations)
+        worker_manager = WorkerManager(broker)
+        worker_manager.set_concurrent_tasks(concurrency)
+        worker_manager.set_min_polling_interval(0.001)
+        worker_manager.last_cleanup_time = time.time()
+        with patch("framefox.core.task.worker_manager.ServiceContainer"):
+            elapsed = asyncio.run(run(worker_manager, broker, tasks))
+        worker_manager.shutdown_executors()
+        print(f"{label:<10} {elapsed:>10.2f} {busy_time / (elapsed * concurrency):>11.0%}")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10,
+    )
@@ -0,0 +1,41 @@
+import logging
+from typing import Dict
+
+from framefox.core.cache.cache_interface import CacheInterface
+from framefox.core.cache.memory_cache import MemoryCache
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class CacheFactory:
+    """Creates a cache backend from a configuration section (backend, max_entries, redis)"""
+
+    SUPPORTED = ("memory", "redis")
+
+    @staticmethod
+    def create(config: Dict) -> CacheInterface:
+        logger = logging.getLogger("CACHE_FACTORY")
+        backend = config.get("backend", "memory")
+
+        if backend == "redis":
+            redis_config = config.get("redis", {})
+            try:
+                from framefox.core.cache.redis_cache import RedisCache
+
+                return RedisCache(
+                    url=redis_config.get("url", "redis://localhost:6379"),
+                    prefix=redis_config.get("prefix", "framefox:cache:"),
+                    db=int(redis_config.get("db", 0)),
+                )
+            except ImportError:
+                logger.error("Falling back to the in-memory cache")
+        elif backend != "memory":
+            logger.error(f"Unknown cache backend '{backend}', expected one of: {', '.join(CacheFactory.SUPPORTED)}. Using memory cache")
+
+        return MemoryCache(max_entries=int(config.get("max_entries", 10000)))
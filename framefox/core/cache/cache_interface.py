@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class CacheInterface(ABC):
+    """
+    Interface for key/value cache backends.
+
+    Values are plain Python data (dicts, lists, tuples, scalars). A backend
+    failure must never break the caller: reads then behave as misses.
+    """
+
+    name: str = None
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under key, or None when missing or expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store value under key, expiring after ttl seconds (never when None)"""
+        pass
+
+    @abstractmethod
+    def delete(self, *keys: str) -> None:
+        """Remove the given keys"""
+        pass
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove every key starting with prefix"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every key of this cache"""
+        pass
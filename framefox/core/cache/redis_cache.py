@@ -0,0 +1,79 @@
+import logging
+import pickle
+from typing import Any, Optional
+
+from framefox.core.cache.cache_interface import CacheInterface
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class RedisCache(CacheInterface):
+    """
+    Redis cache shared by every worker and server.
+
+    Values are pickled, so the Redis instance must only be writable by the
+    application. Connection errors are logged and reads behave as misses.
+    Requires redis (pip install redis).
+    """
+
+    name = "redis"
+
+    SCAN_BATCH_SIZE = 500
+
+    def __init__(self, url: str = "redis://localhost:6379", prefix: str = "framefox:cache:", db: int = 0, client=None):
+        self.prefix = prefix
+        self.logger = logging.getLogger("REDIS_CACHE")
+        self.client = client or self._create_client(url, db)
+
+    def _create_client(self, url: str, db: int):
+        try:
+            import redis
+        except ImportError as e:
+            self.logger.error(f"Redis package not installed: {e}. To enable the Redis cache, install with: pip install redis")
+            raise
+
+        return redis.Redis.from_url(url, db=db, socket_connect_timeout=2, socket_timeout=2)
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            payload = self.client.get(self.prefix + key)
+        except Exception as e:
+            self.logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+        return pickle.loads(payload) if payload is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        try:
+            self.client.set(self.prefix + key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ex=ttl or None)
+        except Exception as e:
+            self.logger.warning(f"Cache write failed for {key}: {e}")
+
+    def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            self.client.delete(*(self.prefix + key for key in keys))
+        except Exception as e:
+            self.logger.warning(f"Cache delete failed: {e}")
+
+    def delete_prefix(self, prefix: str) -> None:
+        try:
+            batch = []
+            for key in self.client.scan_iter(match=f"{self.prefix}{prefix}*", count=self.SCAN_BATCH_SIZE):
+                batch.append(key)
+                if len(batch) >= self.SCAN_BATCH_SIZE:
+                    self.client.delete(*batch)
+                    batch = []
+            if batch:
+                self.client.delete(*batch)
+        except Exception as e:
+            self.logger.warning(f"Cache delete failed for prefix {prefix}: {e}")
+
+    def clear(self) -> None:
+        self.delete_prefix("")
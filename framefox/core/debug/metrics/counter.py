@@ -0,0 +1,50 @@
+import threading
+from typing import Dict, Tuple
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class Counter:
+    """
+    Monotonic counter, optionally split by label values.
+
+    Labels are passed as keyword arguments and must match the label names
+    declared when the counter was registered.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, description: str = "", labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, label_values: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(label_values.get(label, "")) for label in self.labels)
+
+    def inc(self, amount: float = 1, **label_values) -> None:
+        """Increment the counter for the given label values"""
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **label_values) -> float:
+        """Return the current value for the given label values"""
+        return self._values.get(self._key(label_values), 0)
+
+    def samples(self) -> Dict[Tuple[str, ...], float]:
+        """Return a copy of all values keyed by label values"""
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
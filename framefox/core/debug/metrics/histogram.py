@@ -0,0 +1,102 @@
+import bisect
+import threading
+from typing import Dict, List, Tuple
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class Histogram:
+    """
+    Bucketed histogram, optionally split by label values.
+
+    Each label combination keeps cumulative bucket counts, the number of
+    observations, their sum and the largest value observed.
+    """
+
+    type = "histogram"
+
+    DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], Dict] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, label_values: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(label_values.get(label, "")) for label in self.labels)
+
+    def observe(self, value: float, **label_values) -> None:
+        """Record one observation for the given label values"""
+        key = self._key(label_values)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"counts": [0] * len(self.buckets), "count": 0, "sum": 0.0, "max": 0.0}
+                self._series[key] = series
+
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series["counts"][index] += 1
+            series["count"] += 1
+            series["sum"] += value
+            series["max"] = max(series["max"], value)
+
+    def cumulative_buckets(self, series: Dict) -> List[Tuple[float, int]]:
+        """Return (upper bound, cumulative count) pairs, ending with +Inf"""
+        pairs = []
+        running = 0
+        for bound, count in zip(self.buckets, series["counts"]):
+            running += count
+            pairs.append((bound, running))
+        pairs.append((float("inf"), series["count"]))
+        return pairs
+
+    def summary(self, **label_values) -> Dict:
+        """Return count, sum, average and max for the given label values"""
+        series = self._series.get(self._key(label_values))
+        if not series:
+            return {"count": 0, "sum": 0.0, "avg": 0.0, "max": 0.0}
+        return {
+            "count": series["count"],
+            "sum": series["sum"],
+            "avg": series["sum"] / series["count"],
+            "max": series["max"],
+        }
+
+    def quantile(self, q: float, **label_values) -> float:
+        """
+        Estimate the q quantile (0 < q <= 1) as the upper bound of the bucket holding it.
+        Observations above the last bucket are reported as the largest value observed.
+        """
+        series = self._series.get(self._key(label_values))
+        if not series or not series["count"]:
+            return 0.0
+        rank = q * series["count"]
+        for bound, cumulative in self.cumulative_buckets(series):
+            if cumulative >= rank:
+                return min(bound, series["max"])
+        return series["max"]
+
+    def samples(self) -> Dict[Tuple[str, ...], Dict]:
+        """Return a copy of every series keyed by label values"""
+        with self._lock:
+            return {key: {**series, "counts": list(series["counts"])} for key, series in self._series.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
@@ -0,0 +1,24 @@
+from fastapi.responses import PlainTextResponse
+
+from framefox.core.controller.abstract_controller import AbstractController
+from framefox.core.debug.metrics.metrics_registry import MetricsRegistry
+from framefox.core.routing.decorator.route import Route
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class MetricsController(AbstractController):
+    """
+    Exposes the process-wide MetricsRegistry in the Prometheus text format.
+    Registered when debug.metrics.enabled is true (the default in dev).
+    """
+
+    @Route("/metrics", "metrics.index", methods=["GET"])
+    async def metrics(self):
+        return PlainTextResponse(MetricsRegistry().render_text(), media_type="text/plain; version=0.0.4")
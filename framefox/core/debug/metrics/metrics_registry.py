@@ -0,0 +1,107 @@
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+from framefox.core.debug.metrics.counter import Counter
+from framefox.core.debug.metrics.gauge import Gauge
+from framefox.core.debug.metrics.histogram import Histogram
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+Metric = Union[Counter, Gauge, Histogram]
+
+
+class MetricsRegistry:
+    """
+    Process-wide registry of application metrics.
+
+    Components register their counters, gauges and histograms once (registration is
+    idempotent) and update them on their hot paths. The registry can render
+    every metric in the Prometheus text exposition format.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MetricsRegistry, cls).__new__(cls)
+            cls._instance._metrics = {}
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+
+    def _register(self, metric_class, name: str, **kwargs) -> Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.type}")
+            return metric
+
+    def counter(self, name: str, description: str = "", labels: Tuple[str, ...] = ()) -> Counter:
+        """Get or register a counter"""
+        return self._register(Counter, name, description=description, labels=labels)
+
+    def gauge(self, name: str, description: str = "", labels: Tuple[str, ...] = ()) -> Gauge:
+        """Get or register a gauge"""
+        return self._register(Gauge, name, description=description, labels=labels)
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        labels: Tuple[str, ...] = (),
+        buckets: Optional[Tuple[float, ...]] = None,
+    ) -> Histogram:
+        """Get or register a histogram"""
+        kwargs = {"description": description, "labels": labels}
+        if buckets:
+            kwargs["buckets"] = buckets
+        return self._register(Histogram, name, **kwargs)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def all(self) -> Dict[str, Metric]:
+        with self._lock:
+            return dict(self._metrics)
+
+    def reset(self) -> None:
+        """Reset every registered metric to zero (mostly useful in tests)"""
+        for metric in self.all().values():
+            metric.reset()
+
+    def render_text(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for name, metric in sorted(self.all().items()):
+            if metric.description:
+                lines.append(f"# HELP {name} {metric.description}")
+            lines.append(f"# TYPE {name} {metric.type}")
+
+            if isinstance(metric, Histogram):
+                for key, series in sorted(metric.samples().items()):
+                    for bound, count in metric.cumulative_buckets(series):
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{name}_bucket{self._format_labels(metric.labels, key, le=le)} {count}")
+                    lines.append(f"{name}_sum{self._format_labels(metric.labels, key)} {series['sum']}")
+                    lines.append(f"{name}_count{self._format_labels(metric.labels, key)} {series['count']}")
+            else:
+                for key, value in sorted(metric.samples().items()):
+                    lines.append(f"{name}{self._format_labels(metric.labels, key)} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], **extra) -> str:
+        pairs = list(zip(names, values)) + list(extra.items())
+        if not pairs:
+            return ""
+        escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+        return "{" + ",".join(f'{label}="{value}"' for (label, _), value in zip(pairs, escaped)) + "}"
@@ -0,0 +1,56 @@
+from fastapi import Request, Response
+
+from framefox.core.debug.profiler.collector.data_collector import DataCollector
+from framefox.core.request.session.lazy_session_data import LazySessionData
+from framefox.core.request.session.session_metrics import SessionMetrics
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class SessionDataCollector(DataCollector):
+    """
+    Session profiling data collector.
+
+    Reports the session store operations performed while handling the request
+    (latency, payload size, hit or miss) along with the process-wide session
+    metrics, so slow stores and oversized payloads show up in the profiler.
+    """
+
+    name = "session"
+
+    def __init__(self):
+        super().__init__("session", "fa-id-card")
+
+    def start_request(self) -> None:
+        SessionMetrics.start_request()
+
+    def collect(self, request: Request, response: Response) -> None:
+        operations = SessionMetrics.get_request_operations()
+        session_data = getattr(request.state, "session_data", None)
+        loaded = session_data is not None and (not isinstance(session_data, LazySessionData) or session_data.loaded)
+
+        self.data = {
+            "loaded": loaded,
+            "session_keys": sorted(session_data.keys()) if loaded else [],
+            "operations": operations,
+            "total_time": round(sum(op["duration"] for op in operations), 3),
+            "bytes_read": sum(op["size"] or 0 for op in operations if op["operation"] == "get"),
+            "bytes_written": sum(op["size"] or 0 for op in operations if op["operation"] != "get"),
+            "totals": self._collect_totals(),
+        }
+
+    def _collect_totals(self):
+        from framefox.core.di.service_container import ServiceContainer
+
+        session_manager = ServiceContainer().get_by_name("SessionManager")
+        metrics = getattr(session_manager, "metrics", None)
+        return metrics.snapshot() if metrics else {}
+
+    def reset(self):
+        self.data = {}
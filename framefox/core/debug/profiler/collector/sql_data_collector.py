@@ -5,6 +5,7 @@ from fastapi import Request, Response
 
 from framefox.core.config.settings import Settings
 from framefox.core.debug.profiler.collector.data_collector import DataCollector
+from framefox.core.orm.pool_metrics import PoolMetrics
 
 """
 Framefox Framework developed by SOMA
@@ -23,6 +24,13 @@ class SQLDataCollector(DataCollector):
     providing detailed information about database operations including query text,
     parameters, execution time, and database configuration.
 
+    Repeated SELECT statements executed with different parameters are
+    reported as N+1 query suspects (typically a relationship lazy-loaded
+    or an entity fetched by id inside a loop).
+
+    Connection pool checkouts of the request (wait time, connections in use)
+    are reported along with the process-wide state of each pool.
+
     Attributes:
         name (str): Identifier for this collector type
         request_active (bool): Flag indicating if request collection is active
@@ -30,6 +38,7 @@ class SQLDataCollector(DataCollector):
     """
 
     name = "database"
+    N_PLUS_ONE_THRESHOLD = 3
 
     def __init__(self):
         super().__init__("database", "fa-database")
@@ -51,6 +60,10 @@ class SQLDataCollector(DataCollector):
 
             def emit(self, record):
                 if self.collector.request_active:
+                    if record.msg == "[%s] %r" and record.args:
+                        self.collector.attach_parameters(record.args[-1])
+                        return
+
                     message = record.getMessage()
                     timestamp = record.created
 
@@ -122,6 +135,7 @@ class SQLDataCollector(DataCollector):
     def start_request(self):
         self.request_active = True
         self.queries = []
+        PoolMetrics.start_request()
 
     def add_query(
         self,
@@ -142,6 +156,41 @@ class SQLDataCollector(DataCollector):
         }
         self.queries.append(query_data)
 
+    def attach_parameters(self, parameters: Any):
+        """SQLAlchemy logs the parameters of a statement in a separate record, following the statement"""
+        if self.request_active and self.queries and self.queries[-1]["parameters"] is None:
+            self.queries[-1]["parameters"] = parameters
+
+    @classmethod
+    def detect_n_plus_one(cls, queries: list) -> list:
+        """
+        Groups identical SELECT statements and returns those executed at least
+        N_PLUS_ONE_THRESHOLD times with differing parameters, most repeated first.
+        """
+        groups = {}
+        for index, query in enumerate(queries):
+            sql = query["query"]
+            if not sql.upper().startswith("SELECT"):
+                continue
+            group = groups.setdefault(sql, {"query": sql, "count": 0, "parameters": set(), "total_duration": 0.0, "first_index": index + 1})
+            group["count"] += 1
+            group["parameters"].add(repr(query.get("parameters")))
+            group["total_duration"] += query.get("duration") or 0.0
+
+        suspects = []
+        for group in groups.values():
+            if group["count"] >= cls.N_PLUS_ONE_THRESHOLD and len(group["parameters"]) > 1:
+                suspects.append(
+                    {
+                        "query": group["query"],
+                        "count": group["count"],
+                        "distinct_parameters": len(group["parameters"]),
+                        "total_duration": round(group["total_duration"], 2),
+                        "first_index": group["first_index"],
+                    }
+                )
+        return sorted(suspects, key=lambda suspect: suspect["count"], reverse=True)
+
     def _clean_query(self, query: str) -> str:
         if query.startswith("SQL "):
             query = query[4:]
@@ -160,6 +209,19 @@ class SQLDataCollector(DataCollector):
             "total_duration": round(total_duration, 2),
             "database_info": db_config,
             "average_duration": (round(total_duration / len(self.queries), 2) if self.queries else 0),
+            "n_plus_one": self.detect_n_plus_one(self.queries),
+            "pool": self._collect_pool(),
+        }
+
+    def _collect_pool(self) -> Dict[str, Any]:
+        checkouts = PoolMetrics.get_request_checkouts()
+        return {
+            "checkouts": checkouts,
+            "checkout_count": len(checkouts),
+            "total_wait": round(sum(checkout["wait"] for checkout in checkouts), 3),
+            "max_wait": max((checkout["wait"] for checkout in checkouts), default=0.0),
+            "timeouts": sum(1 for checkout in checkouts if checkout["timed_out"]),
+            "pools": [metrics.snapshot() for metrics in PoolMetrics.get_pools().values()],
         }
 
     def _get_database_info(self) -> Dict[str, Any]:
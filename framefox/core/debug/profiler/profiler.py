@@ -28,6 +28,9 @@ from framefox.core.debug.profiler.collector.route_data_collector import (
 from framefox.core.debug.profiler.collector.sentry_data_collector import (
     SentryDataCollector,
 )
+from framefox.core.debug.profiler.collector.session_data_collector import (
+    SessionDataCollector,
+)
 from framefox.core.debug.profiler.collector.sql_data_collector import SQLDataCollector
 from framefox.core.debug.profiler.collector.time_data_collector import TimeDataCollector
 from framefox.core.debug.profiler.collector.user_data_collector import UserDataCollector
@@ -102,6 +105,7 @@ class Profiler:
         self.register_collector(ExceptionDataCollector())
         self.register_collector(LogDataCollector())
         self.register_collector(UserDataCollector())
+        self.register_collector(SessionDataCollector())
         self.register_collector(SentryDataCollector())
 
         self._setup_storage_directory()
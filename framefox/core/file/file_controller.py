@@ -0,0 +1,119 @@
+import asyncio
+from email.utils import formatdate
+from typing import Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from framefox.core.config.settings import Settings
+from framefox.core.controller.abstract_controller import AbstractController
+from framefox.core.file.file_manager import FileManager
+from framefox.core.routing.decorator.route import Route
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class FileController(AbstractController):
+    """
+    Serves stored files from the configured storage backend.
+
+    Supports ETag/If-None-Match revalidation and single Range requests. Local
+    files are sent with FileResponse (sendfile when the server supports it),
+    remote objects are streamed chunk by chunk, so large media are never read
+    fully into memory. Only keys under storage.download.prefixes are served.
+    """
+
+    def __init__(self):
+        self.storage = FileManager().storage
+        self.allowed_prefixes = [prefix.strip("/") + "/" for prefix in Settings().storage_download_prefixes]
+
+    @Route("/_files/{key:path}", "file.download", methods=["GET", "HEAD"])
+    async def download(self, key: str, request: Request):
+        if not self._is_allowed(key):
+            return Response(status_code=404)
+
+        # A round trip to the bucket for remote storages
+        stat = await asyncio.to_thread(self.storage.stat, key)
+        if not stat:
+            return Response(status_code=404)
+
+        headers = {
+            "etag": stat.etag,
+            "last-modified": formatdate(stat.mtime, usegmt=True),
+            "accept-ranges": "bytes",
+        }
+
+        if self._etag_matches(request.headers.get("if-none-match"), stat.etag):
+            return Response(status_code=304, headers=headers)
+
+        local_path = self.storage.local_path(key)
+        if local_path:
+            return FileResponse(local_path, headers=headers, media_type=stat.content_type)
+
+        media_type = stat.content_type or "application/octet-stream"
+        byte_range = None
+        if_range = request.headers.get("if-range")
+        if "range" in request.headers and (not if_range or if_range in (stat.etag, headers["last-modified"])):
+            try:
+                byte_range = self.parse_range(request.headers["range"], stat.size)
+            except ValueError:
+                return Response(status_code=416, headers={**headers, "content-range": f"bytes */{stat.size}"})
+
+        if byte_range is None:
+            headers["content-length"] = str(stat.size)
+            body = self.storage.iter_range(key) if request.method != "HEAD" else iter(())
+            return StreamingResponse(body, media_type=media_type, headers=headers)
+
+        start, end = byte_range
+        headers["content-range"] = f"bytes {start}-{end}/{stat.size}"
+        headers["content-length"] = str(end - start + 1)
+        body = self.storage.iter_range(key, start, end) if request.method != "HEAD" else iter(())
+        return StreamingResponse(body, status_code=206, media_type=media_type, headers=headers)
+
+    def _is_allowed(self, key: str) -> bool:
+        try:
+            key = self.storage.normalize_key(key)
+        except ValueError:
+            return False
+        return any(key.startswith(prefix) for prefix in self.allowed_prefixes)
+
+    @staticmethod
+    def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+        if not if_none_match:
+            return False
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag.removeprefix("W/") in candidates
+
+    @staticmethod
+    def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+        """
+        Parse a single "bytes=" range against a file size.
+        Returns None when the header should be ignored (other unit, multiple ranges)
+        and raises ValueError when the range cannot be satisfied.
+        """
+        unit, _, ranges = header.partition("=")
+        if unit.strip().lower() != "bytes" or "," in ranges:
+            return None
+
+        start_text, _, end_text = ranges.strip().partition("-")
+        try:
+            if not start_text:
+                suffix = int(end_text)
+                if suffix <= 0:
+                    raise ValueError("Empty suffix range")
+                return max(size - suffix, 0), size - 1
+
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+        except ValueError:
+            raise ValueError(f"Invalid range: {header}")
+
+        if start >= size or start > end:
+            raise ValueError(f"Unsatisfiable range: {header}")
+        return start, min(end, size - 1)
@@ -2,10 +2,17 @@ import logging
 import os
 import uuid
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from fastapi import UploadFile
 
+from framefox.core.config.settings import Settings
+from framefox.core.debug.exception.settings_exception import SettingsException
+from framefox.core.file.storage.local_storage import LocalStorage
+from framefox.core.file.storage.storage_factory import StorageFactory
+from framefox.core.file.storage.storage_interface import StorageInterface
+from framefox.core.file.stored_file import StoredFile
+
 """
 Framefox Framework developed by SOMA
 Github: https://github.com/soma-smart/framefox
@@ -16,18 +23,24 @@ Github: https://github.com/RayenBou
 
 
 class FileManager:
-    """Service for managing uploaded files."""
+    """Service for managing uploaded files through the configured storage backend."""
 
-    def __init__(self):
+    def __init__(self, storage: Optional[StorageInterface] = None):
         """
-        Initializes the file manager with a base directory.
+        Initializes the file manager with the configured storage backend
+        (local disk rooted in the project directory by default).
         """
         project_root = os.getcwd()
         self.base_upload_path = Path(project_root)
 
-        os.makedirs(self.base_upload_path, exist_ok=True)
-
         self.logger = logging.getLogger("FILE_MANAGER")
+        self.storage = storage or self._create_storage()
+
+    def _create_storage(self) -> StorageInterface:
+        try:
+            return StorageFactory.create(Settings())
+        except SettingsException:
+            return LocalStorage(str(self.base_upload_path))
 
     async def save(
         self,
@@ -35,10 +48,32 @@ class FileManager:
         subdirectory: str = None,
         rename: bool = True,
         allowed_extensions: List[str] = None,
+        max_size: Optional[int] = None,
     ) -> str:
         """
         Saves an uploaded file and returns its relative path.
         """
+        stored = await self.store(
+            file,
+            subdirectory=subdirectory,
+            rename=rename,
+            allowed_extensions=allowed_extensions,
+            max_size=max_size,
+        )
+        return stored.path if stored else None
+
+    async def store(
+        self,
+        file: UploadFile,
+        subdirectory: str = None,
+        rename: bool = True,
+        allowed_extensions: List[str] = None,
+        max_size: Optional[int] = None,
+    ) -> Optional[StoredFile]:
+        """
+        Streams an uploaded file to the storage backend and returns its path, size and sha256.
+        The upload is never held in memory as a whole.
+        """
         if not file:
             self.logger.warning("Attempt to upload with a None file")
             return None
@@ -49,40 +84,33 @@ class FileManager:
         if allowed_extensions and extension not in allowed_extensions:
             raise ValueError(f"Unauthorized file type. Allowed extensions: {', '.join(allowed_extensions)}")
 
-        dest_dir = self.base_upload_path
-        if subdirectory:
-            subdirectory = subdirectory.strip("/")
-            dest_dir = dest_dir / subdirectory
-
-        os.makedirs(dest_dir, exist_ok=True)
+        known_size = getattr(file, "size", None)
+        if max_size is not None and known_size is not None and known_size > max_size:
+            raise ValueError(StorageInterface.too_large_message(max_size))
 
         if rename:
             filename = f"{uuid.uuid4()}{extension}"
         else:
-            filename = original_filename
+            filename = os.path.basename(original_filename)
 
-        file_path = dest_dir / filename
+        key = f"{subdirectory.strip('/')}/{filename}" if subdirectory else filename
 
         try:
-            content = await file.read()
-            with open(file_path, "wb") as f:
-                f.write(content)
-
-            try:
-                rel_path = str(file_path.relative_to(os.getcwd()))
-            except ValueError:
-
-                if os.path.isabs(file_path):
-                    base_path = Path(os.getcwd())
-                    rel_path = str(file_path).replace(str(base_path) + "/", "")
-                else:
-                    rel_path = str(file_path)
-            return rel_path
-
+            size, checksum = await self.storage.write(file, key, max_size)
+        except ValueError:
+            raise
         except Exception as e:
             self.logger.error(f"Error saving file: {str(e)}", exc_info=True)
             raise e
 
+        return StoredFile(
+            path=StorageInterface.normalize_key(key),
+            filename=filename,
+            size=size,
+            sha256=checksum,
+            content_type=getattr(file, "content_type", None),
+        )
+
     def delete(self, file_path: str) -> bool:
         """
         Deletes a file.
@@ -96,13 +124,13 @@ class FileManager:
         if not file_path:
             return False
 
-        path = Path(file_path)
-        if not path.is_absolute():
-            path = Path(os.getcwd()) / path
-        if path.exists() and str(path).startswith(str(Path(os.getcwd()) / self.base_upload_path)):
-            os.remove(path)
-            return True
-        return False
+        if isinstance(self.storage, LocalStorage) and os.path.isabs(file_path):
+            try:
+                file_path = str(Path(file_path).resolve().relative_to(self.storage.root))
+            except ValueError:
+                return False
+
+        return self.storage.delete(file_path)
 
     def get_file_url(self, file_path: str) -> str:
         """
@@ -116,7 +144,4 @@ class FileManager:
         """
         if not file_path:
             return None
-        path = Path(file_path)
-        if "public/" in file_path:
-            return "/" + str(path).split("public/", 1)[1]
-        return "/" + str(path)
+        return self.storage.url(file_path)
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from typing import Optional
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+@dataclass
+class FileStat:
+    """Metadata of a stored file, used for conditional and range requests."""
+
+    key: str
+    size: int
+    mtime: float
+    etag: str
+    content_type: Optional[str] = None
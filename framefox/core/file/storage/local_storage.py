@@ -0,0 +1,214 @@
+import asyncio
+import hashlib
+import io
+import logging
+import mimetypes
+import os
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import UploadFile
+
+from framefox.core.file.storage.file_stat import FileStat
+from framefox.core.file.storage.storage_interface import StorageInterface
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class LocalStorage(StorageInterface):
+    """
+    Local disk storage rooted in a directory (the project directory by default).
+
+    Uploads are copied chunk by chunk (CHUNK_SIZE at most in memory) from a
+    worker thread, or with copy_file_range/sendfile when the upload is already
+    spooled to disk. Files are written under a temporary name and only moved in
+    place once complete, so a rejected or failed upload leaves nothing behind.
+    """
+
+    name = "local"
+
+    ZERO_COPY_CHUNK_SIZE = 64 * 1024 * 1024
+
+    if hasattr(os, "copy_file_range"):
+        _zero_copy_method = "copy_file_range"
+    elif hasattr(os, "sendfile"):
+        _zero_copy_method = "sendfile"
+    else:
+        _zero_copy_method = "read"
+
+    def __init__(self, root: str = None):
+        self.root = Path(root or os.getcwd()).resolve()
+        self.logger = logging.getLogger("LOCAL_STORAGE")
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / self.normalize_key(key)).resolve()
+        if path != self.root and self.root not in path.parents:
+            raise ValueError(f"Invalid storage key: {key!r}")
+        return path
+
+    async def write(self, file: UploadFile, key: str, max_size: Optional[int] = None) -> Tuple[int, str]:
+        file_path = self._path(key)
+        os.makedirs(file_path.parent, exist_ok=True)
+        temp_path = file_path.parent / f".{file_path.name}.{uuid.uuid4().hex}.part"
+
+        try:
+            source_fd = self._spooled_fileno(getattr(file, "file", None))
+            if source_fd is not None:
+                file.file.flush()
+                offset = file.file.tell()
+                size, checksum = await asyncio.to_thread(self._copy_from_fd, source_fd, offset, temp_path, max_size)
+            else:
+                size, checksum = await self._stream_chunks(file, temp_path, max_size)
+
+            os.replace(temp_path, file_path)
+        except Exception:
+            if temp_path.exists():
+                os.remove(temp_path)
+            raise
+
+        return size, checksum
+
+    async def _stream_chunks(self, file: UploadFile, temp_path: Path, max_size: Optional[int]) -> Tuple[int, str]:
+        """Copy the upload chunk by chunk, hashing and writing each chunk off the event loop"""
+        hasher = hashlib.sha256()
+        size = 0
+        handle = await asyncio.to_thread(open, temp_path, "wb")
+        try:
+            while True:
+                chunk = await file.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise ValueError(self.too_large_message(max_size))
+                await asyncio.to_thread(self._write_chunk, handle, hasher, chunk)
+        finally:
+            await asyncio.to_thread(handle.close)
+        return size, hasher.hexdigest()
+
+    @staticmethod
+    def _write_chunk(handle, hasher, chunk: bytes) -> None:
+        hasher.update(chunk)
+        handle.write(chunk)
+
+    def _copy_from_fd(self, source_fd: int, offset: int, temp_path: Path, max_size: Optional[int]) -> Tuple[int, str]:
+        """Copy an upload spooled to disk with in-kernel copies, then hash it from the page cache"""
+        size = os.fstat(source_fd).st_size - offset
+        if max_size is not None and size > max_size:
+            raise ValueError(self.too_large_message(max_size))
+
+        with open(temp_path, "wb") as destination:
+            copied = 0
+            while copied < size:
+                count = min(size - copied, self.ZERO_COPY_CHUNK_SIZE)
+                written = self._copy_range(source_fd, destination.fileno(), offset + copied, count)
+                if written == 0:
+                    # Some filesystems stop the in-kernel copies early: copy the rest by hand
+                    written = self._read_write(source_fd, destination.fileno(), offset + copied, count)
+                if written == 0:
+                    raise OSError(f"Upload truncated: {copied} of {size} bytes copied")
+                copied += written
+
+        hasher = hashlib.sha256()
+        position = offset
+        while position < offset + size:
+            chunk = os.pread(source_fd, min(self.CHUNK_SIZE, offset + size - position), position)
+            if not chunk:
+                raise OSError(f"Upload truncated: {position - offset} of {size} bytes hashed")
+            hasher.update(chunk)
+            position += len(chunk)
+
+        return copied, hasher.hexdigest()
+
+    def _copy_range(self, source_fd: int, destination_fd: int, offset: int, count: int) -> int:
+        """Copy count bytes at offset using copy_file_range, sendfile or pread/write"""
+        if self._zero_copy_method == "copy_file_range":
+            try:
+                return os.copy_file_range(source_fd, destination_fd, count, offset)
+            except OSError:
+                LocalStorage._zero_copy_method = "sendfile" if hasattr(os, "sendfile") else "read"
+
+        if self._zero_copy_method == "sendfile":
+            try:
+                return os.sendfile(destination_fd, source_fd, offset, count)
+            except OSError:
+                LocalStorage._zero_copy_method = "read"
+
+        return self._read_write(source_fd, destination_fd, offset, count)
+
+    def _read_write(self, source_fd: int, destination_fd: int, offset: int, count: int) -> int:
+        """Copy up to count bytes at offset through a buffer, 0 once the source ends"""
+        chunk = os.pread(source_fd, min(count, self.CHUNK_SIZE), offset)
+        return os.write(destination_fd, chunk) if chunk else 0
+
+    @staticmethod
+    def _spooled_fileno(source) -> Optional[int]:
+        """Return the descriptor of an upload already spooled to disk, None if it is still in memory"""
+        if source is None or getattr(source, "_rolled", True) is False:
+            return None
+        try:
+            return source.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            return None
+
+    def stat(self, key: str) -> Optional[FileStat]:
+        try:
+            path = self._path(key)
+            stat_result = os.stat(path)
+        except (ValueError, OSError):
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        return FileStat(
+            key=self.normalize_key(key),
+            size=stat_result.st_size,
+            mtime=stat_result.st_mtime,
+            etag=f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+            content_type=mimetypes.guess_type(path.name)[0],
+        )
+
+    def delete(self, key: str) -> bool:
+        try:
+            path = self._path(key)
+        except ValueError:
+            return False
+        if path.is_file():
+            os.remove(path)
+            return True
+        return False
+
+    def url(self, key: str) -> str:
+        key = self.normalize_key(key)
+        if key.startswith("public/"):
+            return "/" + key[len("public/") :]
+        if "/public/" in key:
+            return "/" + key.split("/public/", 1)[1]
+        return "/" + key
+
+    def local_path(self, key: str) -> Optional[str]:
+        return str(self._path(key))
+
+    async def iter_range(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        path = self._path(key)
+        handle = await asyncio.to_thread(open, path, "rb")
+        try:
+            await asyncio.to_thread(handle.seek, start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                size = self.CHUNK_SIZE if remaining is None else min(self.CHUNK_SIZE, remaining)
+                chunk = await asyncio.to_thread(handle.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(handle.close)
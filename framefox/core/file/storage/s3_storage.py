@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import logging
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import UploadFile
+
+from framefox.core.file.storage.file_stat import FileStat
+from framefox.core.file.storage.storage_interface import StorageInterface
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class _HashingReader:
+    """File-like wrapper hashing and counting what the S3 client reads, enforcing a max size"""
+
+    def __init__(self, source, max_size: Optional[int]):
+        self.source = source
+        self.max_size = max_size
+        self.hasher = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.source.read(size)
+        self.size += len(chunk)
+        if self.max_size is not None and self.size > self.max_size:
+            raise ValueError(S3Storage.too_large_message(self.max_size))
+        self.hasher.update(chunk)
+        return chunk
+
+
+class S3Storage(StorageInterface):
+    """
+    S3-compatible object storage (AWS S3, MinIO, Ceph, ...).
+
+    Uploads are sent with multipart uploads straight from the spooled upload
+    file and downloads are streamed with ranged GetObject calls, so objects are
+    never held entirely in memory. Requires boto3 (pip install boto3).
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        public_url: Optional[str] = None,
+        client=None,
+    ):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.public_url = public_url.rstrip("/") if public_url else None
+        self.logger = logging.getLogger("S3_STORAGE")
+        self.client = client or self._create_client(endpoint_url, region, access_key, secret_key)
+
+    def _create_client(self, endpoint_url, region, access_key, secret_key):
+        try:
+            import boto3
+        except ImportError as e:
+            self.logger.error(f"boto3 package not installed: {e}. To enable S3 storage, install with: pip install boto3")
+            raise
+
+        return boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            aws_access_key_id=access_key,
+            aws_secret_access_key=secret_key,
+        )
+
+    def _object_key(self, key: str) -> str:
+        key = self.normalize_key(key)
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    async def write(self, file: UploadFile, key: str, max_size: Optional[int] = None) -> Tuple[int, str]:
+        reader = _HashingReader(file.file, max_size)
+        extra_args = {"ContentType": file.content_type} if getattr(file, "content_type", None) else None
+        await asyncio.to_thread(
+            self.client.upload_fileobj,
+            reader,
+            self.bucket,
+            self._object_key(key),
+            ExtraArgs=extra_args,
+        )
+        return reader.size, reader.hasher.hexdigest()
+
+    def stat(self, key: str) -> Optional[FileStat]:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except Exception:
+            return None
+
+        last_modified = head.get("LastModified")
+        return FileStat(
+            key=self.normalize_key(key),
+            size=int(head.get("ContentLength", 0)),
+            mtime=last_modified.timestamp() if last_modified else 0.0,
+            etag=head.get("ETag", ""),
+            content_type=head.get("ContentType"),
+        )
+
+    def delete(self, key: str) -> bool:
+        if not self.exists(key):
+            return False
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+        return True
+
+    def url(self, key: str) -> str:
+        if self.public_url:
+            return f"{self.public_url}/{self._object_key(key)}"
+        return f"/_files/{self.normalize_key(key)}"
+
+    async def iter_range(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        response = await asyncio.to_thread(
+            self.client.get_object,
+            Bucket=self.bucket,
+            Key=self._object_key(key),
+            Range=byte_range,
+        )
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
@@ -0,0 +1,48 @@
+import logging
+import os
+
+from framefox.core.file.storage.local_storage import LocalStorage
+from framefox.core.file.storage.storage_interface import StorageInterface
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class StorageFactory:
+    """Creates the file storage backend configured in the storage section"""
+
+    SUPPORTED = ("local", "s3")
+
+    @staticmethod
+    def create(settings) -> StorageInterface:
+        logger = logging.getLogger("STORAGE_FACTORY")
+        storage_type = settings.storage_type
+        config = settings.storage_config
+
+        if storage_type == "s3":
+            s3_config = config.get("s3", {})
+            try:
+                from framefox.core.file.storage.s3_storage import S3Storage
+
+                return S3Storage(
+                    bucket=s3_config.get("bucket"),
+                    prefix=s3_config.get("prefix", ""),
+                    endpoint_url=s3_config.get("endpoint_url"),
+                    region=s3_config.get("region"),
+                    access_key=s3_config.get("access_key"),
+                    secret_key=s3_config.get("secret_key"),
+                    public_url=s3_config.get("public_url"),
+                )
+            except ImportError:
+                logger.error("Falling back to local file storage")
+        elif storage_type != "local":
+            logger.error(
+                f"Unknown storage type '{storage_type}', expected one of: {', '.join(StorageFactory.SUPPORTED)}. Using local storage"
+            )
+
+        return LocalStorage(config.get("local", {}).get("root") or os.getcwd())
@@ -0,0 +1,72 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import UploadFile
+
+from framefox.core.file.storage.file_stat import FileStat
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class StorageInterface(ABC):
+    """
+    Interface for file storage backends.
+
+    Keys are relative, slash-separated paths (e.g. "public/uploads/a.png").
+    Implementations must stream content: neither writing nor reading a file
+    may require holding it entirely in memory.
+    """
+
+    name: str = None
+
+    CHUNK_SIZE = 1024 * 1024
+
+    @abstractmethod
+    async def write(self, file: UploadFile, key: str, max_size: Optional[int] = None) -> Tuple[int, str]:
+        """Stream an upload to key and return its size and sha256 hex digest"""
+        pass
+
+    @abstractmethod
+    def stat(self, key: str) -> Optional[FileStat]:
+        """Return the metadata of key, or None if it does not exist"""
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete key, returning True if something was deleted"""
+        pass
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """Return a URL under which key can be downloaded"""
+        pass
+
+    @abstractmethod
+    def iter_range(self, key: str, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Yield the bytes of key from start to end (inclusive) in chunks"""
+        pass
+
+    def exists(self, key: str) -> bool:
+        return self.stat(key) is not None
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Return a filesystem path for key when the backend is disk based, so it can be sent with sendfile"""
+        return None
+
+    @staticmethod
+    def too_large_message(max_size: int) -> str:
+        return f"The file is too large. Maximum: {max_size / 1024 / 1024}MB"
+
+    @staticmethod
+    def normalize_key(key: str) -> str:
+        """Normalize a key and reject absolute paths and parent directory segments"""
+        parts = [part for part in str(key).replace("\\", "/").split("/") if part not in ("", ".")]
+        if not parts or ".." in parts:
+            raise ValueError(f"Invalid storage key: {key!r}")
+        return "/".join(parts)
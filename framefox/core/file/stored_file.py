@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+@dataclass
+class StoredFile:
+    """Result of persisting an uploaded file."""
+
+    path: str
+    filename: str
+    size: int
+    sha256: str
+    content_type: str = None
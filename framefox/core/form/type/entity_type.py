@@ -1,5 +1,7 @@
 from typing import Any, Dict
 
+from sqlalchemy import inspect
+
 from framefox.core.form.type.abstract_form_type import AbstractFormType
 
 """
@@ -46,9 +48,9 @@ class EntityType(AbstractFormType):
         choices = {}
 
         if repository:
-            items = repository.find_all()
             choice_label = self.options.get("choice_label")
             show_id = self.options.get("show_id", True)
+            items = self._load_choice_items(repository, choice_label)
 
             for item in items:
 
@@ -69,6 +71,20 @@ class EntityType(AbstractFormType):
 
         return choices
 
+    def _load_choice_items(self, repository, choice_label: str) -> list:
+        """
+        Only selects the id and label columns when the label is a column of the entity,
+        a choice_label computed by a property needs the full entities.
+        """
+        model = getattr(repository, "model", None)
+        columns = inspect(model).column_attrs.keys() if model is not None else []
+        if "id" not in columns or (choice_label not in columns and hasattr(model, choice_label)):
+            return repository.find_all()
+
+        label = next((field for field in (choice_label, "name", "title") if field in columns), None)
+        fields = ["id"] if label in (None, "id") else ["id", label]
+        return repository.find_by({}, fields=fields)
+
     def transform_to_model(self, value: Any) -> Any:
         if not value:
             return [] if self.options.get("multiple") else None
@@ -92,12 +108,14 @@ class EntityType(AbstractFormType):
 
         if self.options.get("multiple"):
             if isinstance(value, list):
+                ids = [int(id) for id in value if id]
+                if hasattr(repository, "find_many"):
+                    return repository.find_many(ids)
                 entities = []
-                for id in value:
-                    if id:
-                        entity = get_entity_from_id(id)
-                        if entity:
-                            entities.append(entity)
+                for id in ids:
+                    entity = get_entity_from_id(id)
+                    if entity:
+                        entities.append(entity)
                 return entities
             entity = get_entity_from_id(value) if value else None
             return [entity] if entity else []
@@ -35,17 +35,14 @@ class FileType(AbstractFormType):
             self.options["attr"]["class"] += " form-control"
 
     async def handle_upload(self, upload_file: UploadFile) -> str:
-        """Handles an uploaded file and returns the storage path."""
+        """
+        Handles an uploaded file and returns the storage path.
+        The upload is streamed to disk; max_file_size is enforced while copying.
+        """
         if not upload_file:
             return None
 
         await upload_file.seek(0)
-        content = await upload_file.read()
-        file_size = len(content)
-        await upload_file.seek(0)
-
-        if file_size > self.options.get("max_file_size"):
-            raise ValueError(f"The file is too large. Maximum: {self.options.get('max_file_size') / 1024 / 1024}MB")
 
         original_filename = upload_file.filename
         extension = os.path.splitext(original_filename)[1].lower()
@@ -66,6 +63,7 @@ class FileType(AbstractFormType):
                 subdirectory=storage_path,
                 rename=self.options.get("rename", True),
                 allowed_extensions=allowed_extensions,
+                max_size=self.options.get("max_file_size"),
             )
 
             return file_path
@@ -1,6 +1,4 @@
-from fastapi import Request
-
-from framefox.core.orm.entity_manager import EntityManager
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
 
 """
 Framefox Framework developed by SOMA
@@ -12,7 +10,13 @@ Github: https://github.com/RayenBou
 
 
 class EntityManagerMiddleware:
-    """Middleware that manages the lifecycle of sessions for each request"""
+    """
+    Middleware that manages the lifecycle of sessions for each request.
+    It only opens an entity manager scope: the EntityManager and AsyncEntityManager
+    are created on first use, and only the ones that opened a session are
+    committed, rolled back and closed. Requests that never touch the database
+    cost no session and no commit round trip.
+    """
 
     def __init__(self, app):
         self.app = app
@@ -21,10 +25,8 @@ class EntityManagerMiddleware:
         if scope["type"] != "http":
             return await self.app(scope, receive, send)
 
-        entity_manager = EntityManager()
-
-        request = Request(scope)
-        request.state.entity_manager = entity_manager
+        token = EntityManagerRegistry.begin_request_scope()
+        managers = EntityManagerRegistry.get_request_scope()
 
         try:
             response = None
@@ -38,10 +40,29 @@ class EntityManagerMiddleware:
             await self.app(scope, receive, wrapped_send)
 
             if response and 200 <= response.get("status", 500) < 300:
-                entity_manager.commit()
+                entity_manager = self._used(managers, "entity_manager")
+                if entity_manager:
+                    entity_manager.commit()
+                async_entity_manager = self._used(managers, "async_entity_manager")
+                if async_entity_manager:
+                    await async_entity_manager.commit()
         except Exception:
-
-            entity_manager.rollback()
+            entity_manager = self._used(managers, "entity_manager")
+            if entity_manager:
+                entity_manager.rollback()
+            async_entity_manager = self._used(managers, "async_entity_manager")
+            if async_entity_manager:
+                await async_entity_manager.rollback()
             raise
         finally:
-            entity_manager.close_session()
+            EntityManagerRegistry.end_request_scope(token)
+            if managers.get("entity_manager") is not None:
+                managers["entity_manager"].close_session()
+            if managers.get("async_entity_manager") is not None:
+                await managers["async_entity_manager"].close_session()
+
+    @staticmethod
+    def _used(managers: dict, name: str):
+        """Returns the entity manager created during the request if it opened a session"""
+        entity_manager = managers.get(name)
+        return entity_manager if entity_manager is not None and entity_manager.has_session else None
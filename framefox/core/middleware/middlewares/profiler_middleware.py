@@ -72,6 +72,10 @@ class ProfilerMiddleware(BaseHTTPMiddleware):
         if sql_collector:
             sql_collector.start_request()
 
+        session_collector = self.profiler.get_collector("session")
+        if session_collector:
+            session_collector.start_request()
+
         response = await call_next(request)
 
         try:
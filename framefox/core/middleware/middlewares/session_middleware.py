@@ -1,6 +1,8 @@
 import logging
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
+from typing import Dict
 
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -8,6 +10,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from framefox.core.config.settings import Settings
 from framefox.core.di.service_container import ServiceContainer
 from framefox.core.request.request_stack import RequestStack
+from framefox.core.request.session.lazy_session_data import LazySessionData
 from framefox.core.request.session.session import Session
 from framefox.core.request.session.session_interface import SessionInterface
 
@@ -21,6 +24,8 @@ Github: https://github.com/RayenBou
 
 
 class SessionMiddleware(BaseHTTPMiddleware):
+    CLEANUP_INTERVAL = 300
+
     def __init__(self, app):
         super().__init__(app)
         self.logger = logging.getLogger("SESSION")
@@ -30,26 +35,40 @@ class SessionMiddleware(BaseHTTPMiddleware):
         self.cookie_manager = self.container.get_by_tag("core.request.cookie_manager")
         self.session_manager = self.container.get_by_tag("core.request.session.session_manager")
         self.session_service = self.container.get_by_tag("core.request.session.session_service")
+        self._last_cleanup = 0.0
 
     async def dispatch(self, request: Request, call_next):
         """
         Processes the session for the current request
         Uses an inactivity-based expiration system rather than a fixed duration
+
+        The session is loaded lazily: the cookie signature is only verified and the
+        storage only read when the session data is first accessed, so requests that
+        never use the session perform no session I/O.
         """
         signed_session_id = request.cookies.get(self.cookie_name)
-        session_id = None
-        session = None
+        stored_session_id = None
 
-        if signed_session_id:
+        def load_session() -> Dict:
+            nonlocal stored_session_id
+            if not signed_session_id:
+                return {}
 
             session_id = self.session_manager.verify_and_extract_session_id(signed_session_id)
-            if session_id:
-                session = self.session_manager.get_session(session_id)
-                if not session:
-                    session_id = None
+            if not session_id:
+                return {}
 
-        request.state.session_id = session_id
-        request.state.session_data = session["data"] if session else {}
+            session = self.session_manager.get_session(session_id)
+            if not session:
+                return {}
+
+            stored_session_id = session_id
+            if not request.state.session_id:
+                request.state.session_id = session_id
+            return session["data"]
+
+        request.state.session_id = None
+        request.state.session_data = LazySessionData(load_session)
 
         RequestStack.set_request(request)
         if not self.session_service:
@@ -66,15 +85,17 @@ class SessionMiddleware(BaseHTTPMiddleware):
 
         response = await call_next(request)
 
-        if request.state.session_data:
-            if not session_id:
+        session_data = request.state.session_data
+        is_loaded = not isinstance(session_data, LazySessionData) or session_data.loaded
 
-                session_id = str(uuid.uuid4())
-                request.state.session_id = session_id
-                self.session_manager.create_session(session_id, request.state.session_data, self.settings.cookie_max_age)
+        if is_loaded and session_data:
+            session_id = request.state.session_id
+            if session_id and session_id == stored_session_id:
+                self.session_manager.update_session(session_id, dict(session_data), self.settings.cookie_max_age)
             else:
-
-                self.session_manager.update_session(session_id, request.state.session_data, self.settings.cookie_max_age)
+                session_id = session_id or str(uuid.uuid4())
+                request.state.session_id = session_id
+                self.session_manager.create_session(session_id, dict(session_data), self.settings.cookie_max_age)
 
             expiration = datetime.now(timezone.utc) + timedelta(seconds=self.settings.cookie_max_age)
 
@@ -88,7 +109,15 @@ class SessionMiddleware(BaseHTTPMiddleware):
                 expires=expiration.strftime("%a, %d-%b-%Y %H:%M:%S GMT"),
             )
 
-        self.session_manager.cleanup_expired_sessions()
+        self._cleanup_expired_sessions()
         RequestStack.set_request(None)
 
         return response
+
+    def _cleanup_expired_sessions(self) -> None:
+        """Purge expired sessions at most once every CLEANUP_INTERVAL seconds"""
+        now = time.monotonic()
+        if now - self._last_cleanup < self.CLEANUP_INTERVAL:
+            return
+        self._last_cleanup = now
+        self.session_manager.cleanup_expired_sessions()
@@ -1,4 +1,4 @@
-from typing import List, Optional, Type
+from typing import Callable, Dict, List, Optional, Type
 
 from pydantic import BaseModel, create_model
 from sqlmodel import SQLModel, inspect
@@ -15,55 +15,75 @@ Github: https://github.com/Vasulvius
 class AbstractEntity(SQLModel):
     __abstract__ = True
 
+    @classmethod
+    def _class_cache(cls, key: str, factory: Callable):
+        """
+        Return the value computed by factory once per entity class. The cache is
+        read from the class __dict__ so a subclass never reuses its parent's models.
+        """
+        cache: Optional[Dict] = cls.__dict__.get("_framefox_class_cache")
+        if cache is None:
+            cache = {}
+            cls._framefox_class_cache = cache
+        if key not in cache:
+            cache[key] = factory()
+        return cache[key]
+
     @classmethod
     def generate_create_model(cls) -> Type[BaseModel]:
         """
-        Generate the create model class.
+        Generate the create model class, built once per entity class.
 
         Returns:
             The create model class.
         """
-        fields = {name: (field.annotation, ...) for name, field in cls.__fields__.items() if name != "id"}
-        create_model_name = f"{cls.__name__}Create"
-        create_model_class = create_model(create_model_name, **fields)
-        return create_model_class
+
+        def build():
+            fields = {name: (field.annotation, ...) for name, field in cls.__fields__.items() if name != "id"}
+            return create_model(f"{cls.__name__}Create", **fields)
+
+        return cls._class_cache("create_model", build)
 
     @classmethod
     def get_primary_keys(cls: Type[SQLModel]) -> List[str]:
         """
         Return the list of primary key column names for the entity.
+        The mapper is only inspected on the first call.
 
         Returns:
             List[str]: The list of primary key column names.
         """
-        mapper = inspect(cls)
-        primary_keys = [key.name for key in mapper.primary_key]
-        return primary_keys
+        primary_keys = cls._class_cache("primary_keys", lambda: tuple(key.name for key in inspect(cls).primary_key))
+        return list(primary_keys)
 
     @classmethod
     def generate_find_model(cls) -> Type[BaseModel]:
         """
-        Generate the create model class.
+        Generate the find model class (primary key fields), built once per entity class.
 
         Returns:
-            The create model class.
+            The find model class.
         """
-        mapper = inspect(cls)
-        primary_keys = [key.name for key in mapper.primary_key]
-        fields = {name: (field.annotation, ...) for name, field in cls.__fields__.items() if name in primary_keys}
-        create_model_name = f"{cls.__name__}Find"
-        create_model_class = create_model(create_model_name, **fields)
-        return create_model_class
+
+        def build():
+            primary_keys = cls.get_primary_keys()
+            fields = {name: (field.annotation, ...) for name, field in cls.__fields__.items() if name in primary_keys}
+            return create_model(f"{cls.__name__}Find", **fields)
+
+        return cls._class_cache("find_model", build)
 
     @classmethod
     def generate_patch_model(cls) -> Type[BaseModel]:
         """
-        Generate the patch model class with all fields optional.
+        Generate the patch model class with all fields optional, built once per entity class.
 
         Returns:
             The patch model class.
         """
-        fields = {name: (Optional[field.annotation], None) for name, field in cls.__fields__.items() if name not in cls.get_primary_keys()}
-        patch_model_name = f"{cls.__name__}Patch"
-        patch_model_class = create_model(patch_model_name, **fields)
-        return patch_model_class
+
+        def build():
+            primary_keys = cls.get_primary_keys()
+            fields = {name: (Optional[field.annotation], None) for name, field in cls.__fields__.items() if name not in primary_keys}
+            return create_model(f"{cls.__name__}Patch", **fields)
+
+        return cls._class_cache("patch_model", build)
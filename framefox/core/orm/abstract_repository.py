@@ -1,9 +1,13 @@
 from abc import ABC
-from typing import List, Optional, Type, TypeVar
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple, Type, TypeVar
 
+from sqlalchemy import Integer, bindparam, inspect
+from sqlalchemy import select as sql_select
 from sqlmodel import SQLModel, asc, desc, select
 
 from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+from framefox.core.orm.page import Keyset, Page
 from framefox.core.orm.query_builder import QueryBuilder
 
 """
@@ -22,8 +26,12 @@ class AbstractRepository(ABC):
     AbstractRepository provides the following methods:
 
     - find(id): Retrieve an entity by its ID.
+    - find_many(ids): Retrieve several entities by ID with a single query.
     - find_all(): Retrieve all entities.
     - find_by(criteria): Retrieve entities based on specific criteria.
+    - find_by(criteria, fields=[...]): Retrieve only some columns, as lightweight rows.
+    - paginate(cursor, size, order_by): Retrieve a page of entities with keyset pagination.
+    - iterate(batch_size): Stream entities without loading the whole table.
     """
 
     def __init__(
@@ -51,6 +59,18 @@ class AbstractRepository(ABC):
         """
         return self.entity_manager.find(self.model, id)
 
+    def find_many(self, ids) -> List[T]:
+        """
+        Retrieve several entities by their IDs with a single IN query.
+
+        Args:
+            ids: The primary keys of the entities.
+
+        Returns:
+            List[T]: The entities found, in the order of ids.
+        """
+        return self.entity_manager.find_many(self.model, ids)
+
     def find_all(self) -> List[T]:
         """
         Retrieve all entities.
@@ -61,7 +81,7 @@ class AbstractRepository(ABC):
         statement = select(self.model)
         return self.entity_manager.exec_statement(statement)
 
-    def find_by(self, criteria, order_by=None, limit=None, offset=None) -> List[T]:
+    def find_by(self, criteria, order_by=None, limit=None, offset=None, eager_load=None, cache=None, fields=None) -> List[T]:
         """
         Retrieve entities based on specific criteria.
 
@@ -70,39 +90,82 @@ class AbstractRepository(ABC):
             order_by: The field(s) to order the entities by.
             limit: The maximum number of entities to retrieve.
             offset: The number of entities to skip.
+            eager_load: Relationships to load with the entities, as a list of names
+                or a {name: "selectin" | "joined" | "subquery"} dict.
+            cache: Serve the result from the query cache, as a ttl in seconds,
+                True for the default ttl or a {"ttl", "key", "tags"} dict.
+            fields: Field names to select. Rows (named tuples: row.email, row[0])
+                are returned instead of entities, without validation nor identity
+                map registration. Cannot be combined with eager_load.
 
         Returns:
             List[T]: A list of entities that match the criteria.
         """
-        statement = select(self.model).filter_by(**criteria)
-        if order_by:
-            for field, direction in order_by.items():
-                if direction.lower() == "asc":
-                    statement = statement.order_by(asc(getattr(self.model, field)))
-                elif direction.lower() == "desc":
-                    statement = statement.order_by(desc(getattr(self.model, field)))
-
-        if limit is not None:
-            statement = statement.limit(limit)
+        statement, params = self._build_find_by_statement(criteria, order_by, limit, offset, eager_load, fields)
+        unique = QueryBuilder.uses_joined_load(eager_load)
+        return self.entity_manager.exec_statement(statement, unique=unique, cache=cache, params=params)
 
-        if offset is not None:
-            statement = statement.offset(offset)
-        return self.entity_manager.exec_statement(statement)
-
-    def find_one_by(self, criteria) -> Optional[T]:
+    def find_one_by(self, criteria, eager_load=None, cache=None, fields=None) -> Optional[T]:
         """
         Retrieve a single entity based on specific criteria.
 
         Args:
             criteria: The criteria to filter the entity.
+            eager_load: Relationships to load with the entity (see find_by).
+            cache: Serve the result from the query cache (see find_by).
+            fields: Field names to select, a row is returned (see find_by).
 
         Returns:
             Optional[T]: The first entity that matches the criteria, or None if not found.
         """
-        statement = select(self.model).filter_by(**criteria).limit(1)
-        results = self.entity_manager.exec_statement(statement)
+        results = self.find_by(criteria, limit=1, eager_load=eager_load, cache=cache, fields=fields)
         return results[0] if results else None
 
+    def paginate(
+        self,
+        cursor: Optional[str] = None,
+        size: int = 20,
+        order_by: Optional[Dict[str, str]] = None,
+        criteria: Optional[dict] = None,
+    ) -> Page[T]:
+        """
+        Retrieve a page of entities with keyset pagination: pages are found by
+        seeking past the last row of the previous one instead of using OFFSET,
+        so deep pages are as fast as the first one.
+
+        Args:
+            cursor: Page.next_cursor or Page.previous_cursor of a page, None for the first page.
+            size: The number of entities per page.
+            order_by: The field(s) to order the entities by, as for find_by; the primary
+                key is always added to make the order total. Fields must not be nullable.
+            criteria: The criteria to filter the entities.
+
+        Returns:
+            Page[T]: The entities of the page and the cursors of its neighbours.
+
+        Raises:
+            ValueError: If the cursor is invalid or was built for another ordering.
+        """
+        keyset, statement, direction = self._build_page_statement(cursor, size, order_by, criteria)
+        return keyset.build_page(list(self.entity_manager.exec_statement(statement)), size, direction)
+
+    def iterate(self, batch_size: int = 1000, criteria: Optional[dict] = None, order_by=None, fields=None) -> Iterator[T]:
+        """
+        Stream the entities matching criteria, fetching batch_size rows at a time
+        with a server-side cursor where the driver supports one.
+
+        Args:
+            batch_size: The number of rows fetched per round trip.
+            criteria: The criteria to filter the entities.
+            order_by: The field(s) to order the entities by, as for find_by.
+            fields: Field names to select, rows are yielded (see find_by).
+
+        Yields:
+            T: The entities, one at a time.
+        """
+        statement, params = self._build_find_by_statement(criteria or {}, order_by, fields=fields)
+        yield from self.entity_manager.session.exec(statement.execution_options(yield_per=batch_size), params=params)
+
     def get_query_builder(self) -> QueryBuilder:
         """
         Retrieve an instance of QueryBuilder for the specific entity of the repository.
@@ -111,3 +174,90 @@ class AbstractRepository(ABC):
             QueryBuilder: An instance configured for the repository's entity.
         """
         return QueryBuilder(entity_manager=self.entity_manager, model=self.model)
+
+    def _build_find_by_statement(self, criteria, order_by=None, limit=None, offset=None, eager_load=None, fields=None) -> Tuple:
+        """
+        Return the SELECT statement used by find_by and its parameters.
+
+        Criteria values, limit and offset are bound parameters, so the statement
+        only depends on the shape of the call (criteria names, ordering, eager
+        loads, selected fields). It is built once per shape and SQLAlchemy finds its compiled
+        form in the engine cache, whatever the order of the criteria keys.
+        Relationship criteria compare with an entity, which a bound parameter
+        cannot hold: they are added to the built statement as they are.
+        """
+        relationships = self._relationship_names(self.model)
+        related = {name: value for name, value in criteria.items() if name in relationships}
+        criteria = {name: value for name, value in criteria.items() if name not in relationships}
+        criteria_shape = tuple(sorted((name, value is None) for name, value in criteria.items()))
+        statement = self._find_by_statement(
+            self.model,
+            criteria_shape,
+            tuple(order_by.items()) if order_by else (),
+            limit is not None,
+            offset is not None,
+            self._eager_load_key(eager_load),
+            tuple(fields) if fields else (),
+        )
+        if related:
+            statement = statement.filter_by(**related)
+        params = {f"criterion_{name}": value for name, value in criteria.items() if value is not None}
+        if limit is not None:
+            params["find_by_limit"] = limit
+        if offset is not None:
+            params["find_by_offset"] = offset
+        return statement, params
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _relationship_names(model) -> frozenset:
+        """Names of the relationship attributes of model"""
+        return frozenset(inspect(model).relationships.keys())
+
+    @staticmethod
+    def _eager_load_key(eager_load) -> Tuple:
+        """eager_load as hashable (relationship, strategy) pairs"""
+        if not eager_load:
+            return ()
+        if isinstance(eager_load, str):
+            eager_load = [eager_load]
+        if not isinstance(eager_load, dict):
+            eager_load = {relation: "selectin" for relation in eager_load}
+        return tuple(eager_load.items())
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _find_by_statement(model, criteria_shape, order_by, limited, offset, eager_load, fields):
+        """Build the find_by statement of a call shape, None criteria compare with IS NULL"""
+        if fields and eager_load:
+            raise ValueError("eager_load cannot be combined with fields, only the selected columns are loaded")
+        # sqlalchemy's select returns rows even for a single column, sqlmodel's would return scalars
+        statement = sql_select(*QueryBuilder.columns(model, fields)) if fields else select(model)
+        statement = statement.filter_by(**{name: None if is_none else bindparam(f"criterion_{name}") for name, is_none in criteria_shape})
+        if eager_load:
+            statement = statement.options(*QueryBuilder.loader_options(model, dict(eager_load)))
+        for field, direction in order_by:
+            if direction.lower() == "asc":
+                statement = statement.order_by(asc(getattr(model, field)))
+            elif direction.lower() == "desc":
+                statement = statement.order_by(desc(getattr(model, field)))
+
+        if limited:
+            statement = statement.limit(bindparam("find_by_limit", type_=Integer))
+
+        if offset:
+            statement = statement.offset(bindparam("find_by_offset", type_=Integer))
+        return statement
+
+    def _build_page_statement(self, cursor, size, order_by=None, criteria=None):
+        """Build the keyset SELECT statement of a page, fetching one extra row to know if another page follows"""
+        if size < 1:
+            raise ValueError("Page size must be at least 1")
+        keyset = Keyset(self.model, order_by)
+        direction = None
+        statement = select(self.model).filter_by(**(criteria or {}))
+        if cursor:
+            values, direction = keyset.decode(cursor)
+            statement = statement.where(keyset.seek_condition(values, backwards=direction == Keyset.PREVIOUS))
+        statement = statement.order_by(*keyset.order_clauses(backwards=direction == Keyset.PREVIOUS)).limit(size + 1)
+        return keyset, statement, direction
@@ -0,0 +1,102 @@
+from typing import AsyncIterator, Dict, List, Optional, TypeVar
+
+from sqlmodel import SQLModel, select
+
+from framefox.core.orm.abstract_repository import AbstractRepository
+from framefox.core.orm.async_query_builder import AsyncQueryBuilder
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+from framefox.core.orm.page import Page
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+T = TypeVar("T", bound=SQLModel)
+
+
+class AsyncAbstractRepository(AbstractRepository):
+    """
+    Asynchronous counterpart of AbstractRepository, backed by the AsyncEntityManager
+    of the current request. Every query method must be awaited:
+
+        user = await self.user_repository.find(1)
+        users = await self.user_repository.find_by({"active": True}, limit=20)
+    """
+
+    @property
+    def entity_manager(self):
+        return EntityManagerRegistry.get_async_entity_manager_for_request()
+
+    async def find(self, id) -> Optional[T]:
+        """
+        Retrieve an entity by its ID.
+        """
+        return await self.entity_manager.find(self.model, id)
+
+    async def find_many(self, ids) -> List[T]:
+        """
+        Retrieve several entities by their IDs with a single IN query.
+        """
+        return await self.entity_manager.find_many(self.model, ids)
+
+    async def find_all(self) -> List[T]:
+        """
+        Retrieve all entities.
+        """
+        return await self.entity_manager.exec_statement(select(self.model))
+
+    async def find_by(self, criteria, order_by=None, limit=None, offset=None, eager_load=None, cache=None, fields=None) -> List[T]:
+        """
+        Retrieve entities based on specific criteria.
+        Relationships used afterwards must be listed in eager_load, lazy loads are not possible with AsyncSession.
+        """
+        statement, params = self._build_find_by_statement(criteria, order_by, limit, offset, eager_load, fields)
+        unique = AsyncQueryBuilder.uses_joined_load(eager_load)
+        return await self.entity_manager.exec_statement(statement, unique=unique, cache=cache, params=params)
+
+    async def find_one_by(self, criteria, eager_load=None, cache=None, fields=None) -> Optional[T]:
+        """
+        Retrieve a single entity based on specific criteria.
+        """
+        results = await self.find_by(criteria, limit=1, eager_load=eager_load, cache=cache, fields=fields)
+        return results[0] if results else None
+
+    async def paginate(
+        self,
+        cursor: Optional[str] = None,
+        size: int = 20,
+        order_by: Optional[Dict[str, str]] = None,
+        criteria: Optional[dict] = None,
+    ) -> Page[T]:
+        """
+        Retrieve a page of entities with keyset pagination (see AbstractRepository.paginate).
+        """
+        keyset, statement, direction = self._build_page_statement(cursor, size, order_by, criteria)
+        return keyset.build_page(list(await self.entity_manager.exec_statement(statement)), size, direction)
+
+    async def iterate(self, batch_size: int = 1000, criteria: Optional[dict] = None, order_by=None, fields=None) -> AsyncIterator[T]:
+        """
+        Stream the entities matching criteria, batch_size rows at a time:
+
+            async for user in self.user_repository.iterate(batch_size=500):
+                ...
+        """
+        statement, params = self._build_find_by_statement(criteria or {}, order_by, fields=fields)
+        statement = statement.execution_options(yield_per=batch_size)
+        session = self.entity_manager.session
+        result = await (session.stream(statement, params) if fields else session.stream_scalars(statement, params))
+        try:
+            async for entity in result:
+                yield entity
+        finally:
+            await result.close()
+
+    def get_query_builder(self) -> AsyncQueryBuilder:
+        """
+        Retrieve an AsyncQueryBuilder for the entity of the repository.
+        """
+        return AsyncQueryBuilder(entity_manager=self.entity_manager, model=self.model)
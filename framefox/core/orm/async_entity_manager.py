@@ -0,0 +1,301 @@
+import contextlib
+import logging
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from sqlalchemy import insert as sql_insert
+from sqlalchemy import inspect
+from sqlalchemy import update as sql_update
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from framefox.core.di.service_container import ServiceContainer
+from framefox.core.orm.cache.entity_cache import EntityCache
+from framefox.core.orm.cache.query_cache import QueryCache
+from framefox.core.orm.entity_manager import EntityManager
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+from framefox.core.orm.replica_router import RoutingSession
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class AsyncEntityManager:
+    """
+    Asynchronous entity manager scoped to the current request.
+
+    Mirrors EntityManager on top of an AsyncEngine/AsyncSession so database
+    calls made from async controllers do not block the event loop. Uses the
+    async driver of the configured database (aiosqlite, asyncpg or aiomysql).
+    """
+
+    def __init__(self, connection_name: str = "default"):
+        self.registry = EntityManagerRegistry.get_instance()
+        self.logger = logging.getLogger(__name__)
+        self.engine = self.registry.get_async_engine(connection_name)
+        self.replica_router = EntityManagerRegistry.get_replica_router(self.engine)
+        self.entity_cache = EntityCache.get_instance()
+        self.query_cache = QueryCache.get_instance()
+        self._session = None
+        self._transaction_depth = 0
+        self._identity_map = {}
+
+    @property
+    def session(self) -> AsyncSession:
+        """Returns the active session or creates a new one"""
+        if self._session is None:
+            if self.replica_router is not None:
+                self._session = AsyncSession(
+                    self.engine, expire_on_commit=False, sync_session_class=RoutingSession, router=self.replica_router
+                )
+            else:
+                self._session = AsyncSession(self.engine, expire_on_commit=False)
+        return self._session
+
+    @property
+    def has_session(self) -> bool:
+        """Whether a session was opened (i.e. the database was used)"""
+        return self._session is not None
+
+    async def close_session(self):
+        """Closes the active session if it exists"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> AsyncGenerator[AsyncSession, None]:
+        """Async context manager for transactions, every statement of which runs on the primary"""
+        session = self.session
+        self._transaction_depth += 1
+        try:
+            with self.use_primary():
+                yield session
+            if self._transaction_depth == 1:
+                await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            self._transaction_depth -= 1
+
+    def use_primary(self):
+        """Context manager sending the reads of the block to the primary instead of a replica"""
+        sync_session = self.session.sync_session
+        return sync_session.use_primary() if isinstance(sync_session, RoutingSession) else contextlib.nullcontext(sync_session)
+
+    async def commit(self) -> None:
+        """Commit if we are not in a nested transaction"""
+        if self._transaction_depth <= 1:
+            await self.session.commit()
+
+    async def rollback(self) -> None:
+        """Rolls back the current transaction"""
+        await self.session.rollback()
+
+    async def persist(self, entity):
+        """
+        Adds an entity to the session and identity map.
+        Entities loaded by another session are merged into this one.
+        """
+        for name, prop_type in getattr(entity.__class__, "__annotations__", {}).items():
+            value = getattr(entity, name, None)
+            if value is None:
+                continue
+            if get_origin(prop_type) is list:
+                target_class = get_args(prop_type)[0]
+                if isinstance(value, list) and value and isinstance(value[0], (int, str)) and self._is_entity(target_class):
+                    setattr(entity, name, await self.find_many(target_class, value))
+            elif isinstance(value, (int, str)) and self._is_entity(prop_type):
+                setattr(entity, name, await self.find(prop_type, value))
+
+        if entity not in self.session:
+            if self._has_identity(entity):
+                entity = await self.session.merge(entity)
+            else:
+                self.session.add(entity)
+
+        primary_keys = entity.get_primary_keys()
+        if primary_keys:
+            pk_value = getattr(entity, primary_keys[0])
+            if pk_value:
+                self._identity_map[(type(entity), pk_value)] = entity
+
+        return entity
+
+    @staticmethod
+    def _is_entity(candidate) -> bool:
+        return isinstance(candidate, type) and issubclass(candidate, SQLModel) and hasattr(candidate, "__table__")
+
+    @staticmethod
+    def _has_identity(entity) -> bool:
+        state = inspect(entity, raiseerr=False)
+        return bool(state is not None and state.has_identity)
+
+    async def delete(self, entity) -> None:
+        """
+        Deletes the specified entity from the database session.
+        """
+        await self.session.delete(entity)
+
+    async def refresh(self, entity) -> None:
+        """
+        Refresh the state of the given entity from the database, overwriting any local changes.
+        """
+        await self.session.refresh(entity)
+
+    async def exec_statement(self, statement, unique: bool = False, cache=None, params: Optional[dict] = None) -> list:
+        """
+        Executes the given SQL statement and returns the result as a list.
+        unique must be set when the statement joined-eager-loads a collection.
+        cache (a ttl, True or a {ttl, key, tags} dict) serves a SELECT from the query cache.
+        params gives the values of the bindparam() placeholders of the statement.
+        """
+        if cache is not None and cache is not False:
+            if params:
+                statement = statement.params(params)
+            return await self._exec_cached(statement, unique, QueryCache.normalize_options(cache))
+        result = await self.session.exec(statement, params=params)
+        return result.unique().all() if unique else result.all()
+
+    async def _exec_cached(self, statement, unique: bool, options: dict) -> list:
+        namespace = self.engine.url.render_as_string(hide_password=True)
+        entry_key, versions, results = self.query_cache.lookup(statement, self.engine.dialect, namespace, options)
+        if results is not None:
+            return [await self._attach(item) if QueryCache.is_detached_entity(item) else item for item in results]
+
+        result = await self.session.exec(statement)
+        results = result.unique().all() if unique else result.all()
+        self.query_cache.store(entry_key, versions, statement, results, ttl=options["ttl"])
+        return results
+
+    async def _attach(self, entity):
+        """Attach a detached entity rebuilt from a cache, preferring the instance the session already holds"""
+        in_session = self.session.identity_map.get(inspect(entity).key)
+        return in_session if in_session is not None else await self.session.merge(entity, load=False)
+
+    async def find(self, entity_class, primary_key):
+        """
+        Retrieve an entity from the identity map, the second-level cache or the database.
+        """
+        map_key = (entity_class, primary_key)
+        if map_key in self._identity_map:
+            return self._identity_map[map_key]
+        entity = await self._find_cached(entity_class, primary_key)
+        if entity is None:
+            entity = await self.session.get(entity_class, primary_key)
+            if entity is not None:
+                self.entity_cache.put(entity)
+        if entity:
+            self._identity_map[map_key] = entity
+        return entity
+
+    async def _find_cached(self, entity_class, primary_key):
+        """Attach the entity from the second-level cache, unless the session already holds it"""
+        if EntityCache.options(entity_class) is None:
+            return None
+        identity = EntityCache.identity(entity_class, primary_key)
+        in_session = self.session.identity_map.get(inspect(entity_class).identity_key_from_primary_key(identity))
+        if in_session is not None:
+            return in_session
+        cached = self.entity_cache.get(entity_class, primary_key)
+        return await self._attach(cached) if cached is not None else None
+
+    async def find_many(self, entity_class, primary_keys) -> list:
+        """
+        Retrieve several entities by primary key with a single IN query,
+        in the order of primary_keys, skipping unknown keys.
+        """
+        pk_name, keys = EntityManager._typed_primary_keys(entity_class, primary_keys)
+        missing = [key for key in keys if (entity_class, key) not in self._identity_map]
+        if missing:
+            statement = select(entity_class).where(getattr(entity_class, pk_name).in_(missing))
+            for entity in await self.exec_statement(statement):
+                self._identity_map[(entity_class, getattr(entity, pk_name))] = entity
+        return [self._identity_map[(entity_class, key)] for key in keys if (entity_class, key) in self._identity_map]
+
+    async def bulk_insert(self, entity_class, rows: Iterable[Union[SQLModel, Dict[str, Any]]], chunk_size: int = 1000) -> int:
+        """
+        Inserts many rows with one multi-row INSERT per chunk, inside a single transaction
+        (see EntityManager.bulk_insert).
+        """
+        count = 0
+        async with self.transaction() as session:
+            for chunk in EntityManager._bulk_chunks(entity_class, rows, chunk_size):
+                await session.execute(sql_insert(entity_class), chunk)
+                count += len(chunk)
+        return count
+
+    async def bulk_update(self, entity_class, rows: Iterable[Union[SQLModel, Dict[str, Any]]], chunk_size: int = 1000) -> int:
+        """
+        Updates many rows by primary key inside a single transaction (see EntityManager.bulk_update).
+        """
+        count = 0
+        async with self.transaction() as session:
+            for chunk in EntityManager._bulk_chunks(entity_class, rows, chunk_size):
+                EntityManager._check_primary_keys(entity_class, chunk)
+                await session.execute(sql_update(entity_class), chunk)
+                count += len(chunk)
+        return count
+
+    async def upsert(
+        self,
+        entity_class,
+        rows: Iterable[Union[SQLModel, Dict[str, Any]]],
+        index_elements: Optional[Sequence[str]] = None,
+        update_fields: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """
+        Inserts rows or updates the conflicting ones (see EntityManager.upsert).
+        """
+        index_elements = list(index_elements or [column.name for column in inspect(entity_class).primary_key])
+        dialect_name = self.engine.dialect.name
+        count = 0
+        async with self.transaction() as session:
+            for chunk in EntityManager._bulk_chunks(entity_class, rows, chunk_size):
+                for group in EntityManager._group_by_columns(chunk):
+                    statement = EntityManager.upsert_statement(dialect_name, entity_class, list(group[0]), index_elements, update_fields)
+                    await session.execute(statement, group)
+                count += len(chunk)
+        return count
+
+    async def create_all_tables(self) -> None:
+        """
+        Create all tables defined in the SQLModel metadata.
+        """
+        async with self.engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+
+    async def drop_all_tables(self) -> None:
+        """
+        Drops all tables in the database.
+        """
+        async with self.engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.drop_all)
+
+    def get_repository(self, entity_class: Type) -> Any:
+        """
+        Retrieve the repository instance associated with the given entity class.
+        """
+        repositories = ServiceContainer().get_by_tag_prefix("repository.")
+
+        for repo in repositories:
+            if getattr(repo, "model", None) == entity_class:
+                return repo
+        return None
@@ -0,0 +1,98 @@
+import contextlib
+from typing import Any, AsyncGenerator, Optional, Type
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class AsyncEntityManagerInterface:
+    """
+    Interface that delegates calls to the AsyncEntityManager of the execution context.
+    Inject it in async controllers and services instead of AsyncEntityManager itself.
+    """
+
+    def __init__(self, entity_manager=None):
+        """
+        Initializes the interface with an optional fixed async entity manager.
+
+        Args:
+            entity_manager: If provided, it will always be used instead of the request context
+        """
+        self.entity_manager = entity_manager
+
+    def _get_current_entity_manager(self):
+        """
+        Retrieves the fixed AsyncEntityManager, or the one of the current request
+        (created on first use and committed/closed by EntityManagerMiddleware)
+        """
+        if self.entity_manager:
+            return self.entity_manager
+        return EntityManagerRegistry.get_async_entity_manager_for_request()
+
+    @property
+    def session(self) -> AsyncSession:
+        return self._get_current_entity_manager().session
+
+    async def close_session(self):
+        return await self._get_current_entity_manager().close_session()
+
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> AsyncGenerator[AsyncSession, None]:
+        async with self._get_current_entity_manager().transaction() as session:
+            yield session
+
+    def use_primary(self):
+        return self._get_current_entity_manager().use_primary()
+
+    async def commit(self) -> None:
+        return await self._get_current_entity_manager().commit()
+
+    async def rollback(self) -> None:
+        return await self._get_current_entity_manager().rollback()
+
+    async def persist(self, entity) -> Any:
+        return await self._get_current_entity_manager().persist(entity)
+
+    async def delete(self, entity) -> None:
+        return await self._get_current_entity_manager().delete(entity)
+
+    async def refresh(self, entity) -> None:
+        return await self._get_current_entity_manager().refresh(entity)
+
+    async def exec_statement(self, statement, unique: bool = False, cache=None, params: Optional[dict] = None) -> list:
+        return await self._get_current_entity_manager().exec_statement(statement, unique=unique, cache=cache, params=params)
+
+    async def find(self, entity_class, primary_keys) -> Any:
+        return await self._get_current_entity_manager().find(entity_class, primary_keys)
+
+    async def find_many(self, entity_class, primary_keys) -> list:
+        return await self._get_current_entity_manager().find_many(entity_class, primary_keys)
+
+    async def bulk_insert(self, entity_class, rows, chunk_size: int = 1000) -> int:
+        return await self._get_current_entity_manager().bulk_insert(entity_class, rows, chunk_size=chunk_size)
+
+    async def bulk_update(self, entity_class, rows, chunk_size: int = 1000) -> int:
+        return await self._get_current_entity_manager().bulk_update(entity_class, rows, chunk_size=chunk_size)
+
+    async def upsert(self, entity_class, rows, index_elements=None, update_fields=None, chunk_size: int = 1000) -> int:
+        return await self._get_current_entity_manager().upsert(
+            entity_class, rows, index_elements=index_elements, update_fields=update_fields, chunk_size=chunk_size
+        )
+
+    async def create_all_tables(self) -> None:
+        return await self._get_current_entity_manager().create_all_tables()
+
+    async def drop_all_tables(self) -> None:
+        return await self._get_current_entity_manager().drop_all_tables()
+
+    def get_repository(self, entity_class: Type) -> Any:
+        return self._get_current_entity_manager().get_repository(entity_class)
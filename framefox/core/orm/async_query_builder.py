@@ -0,0 +1,70 @@
+from typing import Any, List, Optional
+
+from sqlalchemy.sql.expression import Delete, Update
+
+from framefox.core.orm.query_builder import QueryBuilder
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class AsyncQueryBuilder(QueryBuilder):
+    """
+    QueryBuilder executing its queries through an AsyncEntityManager.
+    Building methods are shared with QueryBuilder, only execution is awaited.
+    """
+
+    async def execute(self) -> List[Any]:
+        query = self.get_query()
+        if self._cache is not None and not isinstance(query, (Delete, Update)):
+            return await self.entity_manager.exec_statement(query, unique=self._unique, cache=self._cache)
+
+        session = self.entity_manager.session
+
+        if isinstance(query, (Delete, Update)):
+            result = await session.exec(query)
+            await self.entity_manager.commit()
+            return result
+        result = await session.exec(query)
+        return result.unique().all() if self._unique else result.all()
+
+    async def first(self) -> Optional[Any]:
+        query = self.get_query()
+        if isinstance(query, (Delete, Update)):
+            raise ValueError("The 'first' method is not applicable for delete or update queries.")
+        if self._cache is not None:
+            results = await self.entity_manager.exec_statement(query.limit(1), unique=self._unique, cache=self._cache_options("first"))
+            return results[0] if results else None
+        result = await self.entity_manager.session.exec(query)
+        return result.unique().first() if self._unique else result.first()
+
+    async def last(self) -> Optional[Any]:
+        """
+        Returns the last element of the query by reversing the current sort order.
+        """
+        query = self.get_query()
+        if isinstance(query, (Delete, Update)):
+            raise ValueError("The 'last' method is not applicable for delete or update queries.")
+        if not self._order_by:
+            raise ValueError("A sort order must be defined to use the 'last' method.")
+
+        reversed_order = []
+        for condition in self._order_by:
+            if hasattr(condition, "desc"):
+                reversed_order.append(condition.asc())
+            elif hasattr(condition, "asc"):
+                reversed_order.append(condition.desc())
+            else:
+                raise ValueError(f"Unsupported order condition: {condition}")
+
+        query = query.order_by(None).order_by(*reversed_order).limit(1)
+        if self._cache is not None:
+            results = await self.entity_manager.exec_statement(query, unique=self._unique, cache=self._cache_options("last"))
+            return results[0] if results else None
+        result = await self.entity_manager.session.exec(query)
+        return result.unique().first() if self._unique else result.first()
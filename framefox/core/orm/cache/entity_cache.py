@@ -0,0 +1,218 @@
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from framefox.core.cache.cache_factory import CacheFactory
+from framefox.core.cache.cache_interface import CacheInterface
+from framefox.core.debug.metrics.metrics_registry import MetricsRegistry
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class EntityCache:
+    """
+    Second-level entity cache, shared between requests.
+
+    Opt-in per entity class with __cache__ = {"ttl": 60} (or True to use
+    database.cache.default_ttl). The column values of entities loaded by
+    EntityManager.find() are stored under (table, primary key); a hit is
+    attached to the session with merge(load=False), without any query.
+
+    Entries are invalidated when an entity is updated or deleted
+    (after_flush, then again after_commit), and bulk UPDATE/DELETE
+    statements drop every entry of their entity.
+    """
+
+    _instance = None
+    _listeners_registered = False
+
+    KEY_PREFIX = "entity:"
+    PENDING_KEYS = "framefox_entity_cache_keys"
+    PENDING_PREFIXES = "framefox_entity_cache_prefixes"
+
+    def __init__(self, cache: Optional[CacheInterface] = None, default_ttl: Optional[int] = None):
+        self.logger = logging.getLogger("ENTITY_CACHE")
+        self._cache = cache
+        self._default_ttl = default_ttl
+        self.lookups = MetricsRegistry().counter(
+            "framefox_entity_cache_lookups_total",
+            "Second-level entity cache lookups",
+            labels=("entity", "result"),
+        )
+
+    @classmethod
+    def get_instance(cls) -> "EntityCache":
+        if cls._instance is None:
+            cls._instance = cls()
+        cls.register_listeners()
+        return cls._instance
+
+    @property
+    def cache(self) -> CacheInterface:
+        if self._cache is None:
+            self._cache = CacheFactory.create(self.load_config())
+        return self._cache
+
+    @property
+    def default_ttl(self) -> int:
+        if self._default_ttl is None:
+            self._default_ttl = int(self.load_config().get("default_ttl", 300))
+        return self._default_ttl
+
+    @staticmethod
+    def load_config() -> Dict:
+        """Returns database.cache from orm.yaml, empty when the settings cannot be loaded"""
+        from framefox.core.config.settings import Settings
+        from framefox.core.debug.exception.settings_exception import (
+            SettingsException,
+        )
+
+        try:
+            return Settings().orm_cache_config
+        except SettingsException:
+            return {}
+
+    @staticmethod
+    def options(entity_class) -> Optional[Dict[str, Any]]:
+        """Returns the __cache__ options of a cacheable entity class, None otherwise"""
+        options = getattr(entity_class, "__cache__", None)
+        if not options:
+            return None
+        return options if isinstance(options, dict) else {}
+
+    @staticmethod
+    def identity(entity_class, primary_key) -> Tuple:
+        """Normalizes a primary key given to find() (value, tuple or dict) to an identity tuple"""
+        if isinstance(primary_key, dict):
+            return tuple(primary_key[column.key] for column in inspect(entity_class).primary_key)
+        if isinstance(primary_key, (tuple, list)):
+            return tuple(primary_key)
+        return (primary_key,)
+
+    def key(self, entity_class, identity: Tuple) -> str:
+        return f"{self.namespace(entity_class)}{':'.join(str(value) for value in identity)}"
+
+    def namespace(self, entity_class) -> str:
+        return f"{self.KEY_PREFIX}{entity_class.__tablename__}:"
+
+    def get(self, entity_class, primary_key) -> Optional[Any]:
+        """Returns a detached instance built from the cache, or None on a miss or for non-cacheable classes"""
+        if self.options(entity_class) is None:
+            return None
+
+        data = self.cache.get(self.key(entity_class, self.identity(entity_class, primary_key)))
+        self.lookups.inc(entity=entity_class.__name__, result="hit" if data is not None else "miss")
+        if data is None:
+            return None
+
+        return self.build_entity(entity_class, data)
+
+    def put(self, entity) -> None:
+        """Stores the column values of a persistent, fully loaded entity"""
+        entity_class = type(entity)
+        options = self.options(entity_class)
+        if options is None:
+            return
+
+        data = self.dump_entity(entity)
+        if data is not None:
+            identity = inspect(entity).identity
+            self.cache.set(self.key(entity_class, identity), data, ttl=options.get("ttl", self.default_ttl))
+
+    @staticmethod
+    def dump_entity(entity) -> Optional[Dict[str, Any]]:
+        """Returns the column values of a persistent, unmodified and fully loaded entity, None otherwise"""
+        state = inspect(entity)
+        if state.identity is None or state.modified:
+            return None
+        column_keys = [attribute.key for attribute in state.mapper.column_attrs]
+        if any(key not in state.dict for key in column_keys):
+            return None
+        return {key: state.dict[key] for key in column_keys}
+
+    @staticmethod
+    def build_entity(entity_class, data: Dict[str, Any]):
+        """Rebuilds a detached entity from dump_entity() values, ready for merge(load=False)"""
+        instance = entity_class(**data)
+        make_transient_to_detached(instance)
+        return instance
+
+    def invalidate(self, entity) -> None:
+        state = inspect(entity)
+        if self.options(type(entity)) is not None and state.identity is not None:
+            self.cache.delete(self.key(type(entity), state.identity))
+
+    def invalidate_class(self, entity_class) -> None:
+        if self.options(entity_class) is not None:
+            self.cache.delete_prefix(self.namespace(entity_class))
+
+    @classmethod
+    def register_listeners(cls) -> None:
+        """Listens to every Session (sync sessions and the ones behind AsyncSession)"""
+        if cls._listeners_registered:
+            return
+        event.listen(Session, "after_flush", cls._after_flush)
+        event.listen(Session, "after_commit", cls._after_commit)
+        event.listen(Session, "after_rollback", cls._after_rollback)
+        event.listen(Session, "do_orm_execute", cls._on_orm_execute)
+        cls._listeners_registered = True
+
+    @classmethod
+    def _after_flush(cls, session, flush_context) -> None:
+        entity_cache = cls._instance
+        if entity_cache is None:
+            return
+
+        keys = set()
+        for entity in list(session.dirty) + list(session.deleted):
+            identity = inspect(entity).identity
+            if identity is not None and cls.options(type(entity)) is not None:
+                keys.add(entity_cache.key(type(entity), identity))
+
+        if keys:
+            session.info.setdefault(cls.PENDING_KEYS, set()).update(keys)
+            entity_cache.cache.delete(*keys)
+
+    @classmethod
+    def _after_commit(cls, session) -> None:
+        entity_cache = cls._instance
+        keys = session.info.pop(cls.PENDING_KEYS, None)
+        prefixes = session.info.pop(cls.PENDING_PREFIXES, None)
+        if entity_cache is None:
+            return
+        if keys:
+            entity_cache.cache.delete(*keys)
+        for prefix in prefixes or ():
+            entity_cache.cache.delete_prefix(prefix)
+
+    @classmethod
+    def _after_rollback(cls, session) -> None:
+        session.info.pop(cls.PENDING_KEYS, None)
+        session.info.pop(cls.PENDING_PREFIXES, None)
+
+    @staticmethod
+    def _is_upsert(orm_execute_state) -> bool:
+        """INSERT ... ON CONFLICT DO UPDATE / ON DUPLICATE KEY UPDATE rewrites existing rows"""
+        return orm_execute_state.is_insert and getattr(orm_execute_state.statement, "_post_values_clause", None) is not None
+
+    @classmethod
+    def _on_orm_execute(cls, orm_execute_state) -> None:
+        entity_cache = cls._instance
+        if entity_cache is None or not (orm_execute_state.is_update or orm_execute_state.is_delete or cls._is_upsert(orm_execute_state)):
+            return
+
+        mapper = orm_execute_state.bind_mapper
+        if mapper is None or cls.options(mapper.class_) is None:
+            return
+
+        prefix = entity_cache.namespace(mapper.class_)
+        orm_execute_state.session.info.setdefault(cls.PENDING_PREFIXES, set()).add(prefix)
+        entity_cache.cache.delete_prefix(prefix)
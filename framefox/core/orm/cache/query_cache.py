@@ -0,0 +1,250 @@
+import hashlib
+import logging
+import uuid
+from collections import namedtuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+
+from framefox.core.cache.cache_factory import CacheFactory
+from framefox.core.cache.cache_interface import CacheInterface
+from framefox.core.debug.metrics.metrics_registry import MetricsRegistry
+from framefox.core.orm.cache.entity_cache import EntityCache
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class QueryCache:
+    """
+    Result cache for SELECT statements, used through
+    exec_statement(statement, cache=...), QueryBuilder.cache() and find_by(cache=...).
+
+    Entries are keyed by the compiled SQL and its bound parameters (or an
+    explicit key) and tagged with every table the statement reads plus the
+    given tags. Each tag has a version token stored in the cache; writing an
+    entity through a session replaces the token of its tables, which makes
+    every entry depending on them stale. invalidate_tags() does the same for
+    custom tags.
+
+    Entities are cached as column values and re-attached to the session
+    without a query; relationships are loaded lazily as usual.
+    """
+
+    _instance = None
+    _listeners_registered = False
+
+    KEY_PREFIX = "query:"
+    TAG_PREFIX = "tag:"
+    PENDING_TAGS = "framefox_query_cache_tags"
+
+    def __init__(self, cache: Optional[CacheInterface] = None, default_ttl: Optional[int] = None):
+        self.logger = logging.getLogger("QUERY_CACHE")
+        self._cache = cache
+        self._default_ttl = default_ttl
+        self._used = cache is not None
+        self._configured = None
+        self.lookups = MetricsRegistry().counter(
+            "framefox_query_cache_lookups_total",
+            "Query result cache lookups",
+            labels=("result",),
+        )
+
+    @classmethod
+    def get_instance(cls) -> "QueryCache":
+        if cls._instance is None:
+            cls._instance = cls()
+        cls.register_listeners()
+        return cls._instance
+
+    @property
+    def cache(self) -> CacheInterface:
+        if self._cache is None:
+            self._cache = CacheFactory.create(EntityCache.load_config())
+        return self._cache
+
+    @property
+    def default_ttl(self) -> int:
+        if self._default_ttl is None:
+            self._default_ttl = int(EntityCache.load_config().get("default_ttl", 300))
+        return self._default_ttl
+
+    @property
+    def active(self) -> bool:
+        """Writes only invalidate tags once the cache is configured or was used by this process"""
+        if self._configured is None:
+            self._configured = bool(EntityCache.load_config())
+        return self._used or self._configured
+
+    @staticmethod
+    def normalize_options(cache) -> Dict[str, Any]:
+        """Accepts a ttl, True (default ttl) or a {ttl, key, tags} dict"""
+        if isinstance(cache, dict):
+            return {"ttl": cache.get("ttl"), "key": cache.get("key"), "tags": list(cache.get("tags") or [])}
+        if cache is True:
+            return {"ttl": None, "key": None, "tags": []}
+        return {"ttl": int(cache), "key": None, "tags": []}
+
+    def key(self, statement, dialect, namespace: str = "", key: Optional[str] = None) -> str:
+        if key:
+            return f"{self.KEY_PREFIX}{key}"
+        compiled = statement.compile(dialect=dialect)
+        params = sorted((name, repr(value)) for name, value in compiled.params.items())
+        digest = hashlib.sha256(f"{namespace}|{compiled}|{params}".encode()).hexdigest()
+        return f"{self.KEY_PREFIX}{digest}"
+
+    @staticmethod
+    def tags(statement, extra_tags: List[str] = ()) -> List[str]:
+        """Tables read by the statement plus custom tags"""
+        tables = {table.name for table in find_tables(statement) if getattr(table, "name", None)}
+        return sorted(tables | set(extra_tags))
+
+    def tag_version(self, tag: str) -> str:
+        """Returns the current token of a tag, creating one if it is missing (or was evicted)"""
+        version = self.cache.get(self.TAG_PREFIX + tag)
+        if version is None:
+            version = uuid.uuid4().hex
+            self.cache.set(self.TAG_PREFIX + tag, version)
+        return version
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """Makes every entry tagged with one of tags stale"""
+        for tag in tags:
+            self.cache.set(self.TAG_PREFIX + tag, uuid.uuid4().hex)
+
+    def lookup(self, statement, dialect, namespace: str, options: Dict[str, Any]) -> Tuple[str, Dict[str, str], Optional[List[Any]]]:
+        """
+        Returns the entry key, the tag versions read before executing the statement
+        and the restored results on a hit (None on a miss)
+        """
+        self._used = True
+        entry_key = self.key(statement, dialect, namespace, options.get("key"))
+        versions = {tag: self.tag_version(tag) for tag in self.tags(statement, options.get("tags", []))}
+
+        entry = self.cache.get(entry_key)
+        if entry is None or entry.get("tags") != versions:
+            self.lookups.inc(result="miss")
+            return entry_key, versions, None
+
+        self.lookups.inc(result="hit")
+        return entry_key, versions, self._restore(entry, statement)
+
+    def store(self, entry_key: str, versions: Dict[str, str], statement, results: List[Any], ttl: Optional[int] = None) -> None:
+        """Stores results under entry_key unless they cannot be cached (modified or mixed entities)"""
+        entry = self._dump(statement, results)
+        if entry is None:
+            return
+        entry["tags"] = versions
+        self.cache.set(entry_key, entry, ttl=ttl or self.default_ttl)
+
+    @staticmethod
+    def _entity_class(statement):
+        descriptions = getattr(statement, "column_descriptions", None) or []
+        if (
+            len(descriptions) == 1
+            and descriptions[0].get("entity") is not None
+            and descriptions[0].get("expr") is descriptions[0].get("entity")
+        ):
+            return descriptions[0]["entity"]
+        return None
+
+    @staticmethod
+    def _is_entity(value) -> bool:
+        return hasattr(type(value), "__mapper__")
+
+    @classmethod
+    def is_detached_entity(cls, value) -> bool:
+        """Restored entities must be attached to the session before being returned"""
+        return cls._is_entity(value) and inspect(value).detached
+
+    def _dump(self, statement, results: List[Any]) -> Optional[Dict[str, Any]]:
+        entity_class = self._entity_class(statement)
+        if entity_class is not None:
+            items = []
+            for entity in results:
+                data = EntityCache.dump_entity(entity) if isinstance(entity, entity_class) else None
+                if data is None:
+                    return None
+                items.append(data)
+            return {"kind": "entities", "items": items}
+
+        if any(isinstance(item, Row) for item in results):
+            if not all(isinstance(item, Row) for item in results):
+                return None
+            if any(self._is_entity(value) for row in results for value in row):
+                return None
+            fields = tuple(results[0]._fields)
+            return {"kind": "rows", "fields": fields, "items": [tuple(row) for row in results]}
+
+        if any(self._is_entity(value) for value in results):
+            return None
+        return {"kind": "scalars", "items": list(results)}
+
+    def _restore(self, entry: Dict[str, Any], statement) -> List[Any]:
+        if entry["kind"] == "entities":
+            entity_class = self._entity_class(statement)
+            return [EntityCache.build_entity(entity_class, data) for data in entry["items"]]
+        if entry["kind"] == "rows":
+            row_class = namedtuple("Row", entry["fields"], rename=True)
+            return [row_class(*values) for values in entry["items"]]
+        return list(entry["items"])
+
+    @classmethod
+    def register_listeners(cls) -> None:
+        """Listens to every Session (sync sessions and the ones behind AsyncSession)"""
+        if cls._listeners_registered:
+            return
+        event.listen(Session, "after_flush", cls._after_flush)
+        event.listen(Session, "after_commit", cls._after_commit)
+        event.listen(Session, "after_rollback", cls._after_rollback)
+        event.listen(Session, "do_orm_execute", cls._on_orm_execute)
+        cls._listeners_registered = True
+
+    @staticmethod
+    def _tables_of(mapper) -> set:
+        return {table.name for table in mapper.tables}
+
+    @classmethod
+    def _after_flush(cls, session, flush_context) -> None:
+        query_cache = cls._instance
+        if query_cache is None or not query_cache.active:
+            return
+
+        tags = set()
+        for entity in list(session.new) + list(session.dirty) + list(session.deleted):
+            tags |= cls._tables_of(inspect(entity).mapper)
+
+        if tags:
+            session.info.setdefault(cls.PENDING_TAGS, set()).update(tags)
+            query_cache.invalidate_tags(*tags)
+
+    @classmethod
+    def _after_commit(cls, session) -> None:
+        tags = session.info.pop(cls.PENDING_TAGS, None)
+        if tags and cls._instance is not None:
+            cls._instance.invalidate_tags(*tags)
+
+    @classmethod
+    def _after_rollback(cls, session) -> None:
+        session.info.pop(cls.PENDING_TAGS, None)
+
+    @classmethod
+    def _on_orm_execute(cls, orm_execute_state) -> None:
+        query_cache = cls._instance
+        if query_cache is None or orm_execute_state.is_select or not query_cache.active:
+            return
+
+        mapper = orm_execute_state.bind_mapper
+        if mapper is None:
+            return
+        tags = cls._tables_of(mapper)
+        orm_execute_state.session.info.setdefault(cls.PENDING_TAGS, set()).update(tags)
+        query_cache.invalidate_tags(*tags)
@@ -1,12 +1,35 @@
 import contextlib
+import itertools
 import logging
-from typing import Any, Generator, Type, get_args, get_origin
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin,
+)
 
+from sqlalchemy import Column
+from sqlalchemy import insert as sql_insert
+from sqlalchemy import inspect
+from sqlalchemy import update as sql_update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.orm.session import object_session
-from sqlmodel import Session, SQLModel
+from sqlmodel import Session, SQLModel, select
 
 from framefox.core.di.service_container import ServiceContainer
+from framefox.core.orm.cache.entity_cache import EntityCache
+from framefox.core.orm.cache.query_cache import QueryCache
 from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+from framefox.core.orm.replica_router import RoutingSession
 
 """
 Framefox Framework developed by SOMA
@@ -26,6 +49,9 @@ class EntityManager:
         self.registry = EntityManagerRegistry.get_instance()
         self.logger = logging.getLogger(__name__)
         self.engine = self.registry.get_engine(connection_name)
+        self.replica_router = EntityManagerRegistry.get_replica_router(self.engine)
+        self.entity_cache = EntityCache.get_instance()
+        self.query_cache = QueryCache.get_instance()
         self._session = None
         self._transaction_depth = 0
         self._identity_map = {}
@@ -34,9 +60,17 @@ class EntityManager:
     def session(self) -> Session:
         """Returns the active session or creates a new one"""
         if self._session is None:
-            self._session = Session(self.engine)
+            if self.replica_router is not None:
+                self._session = RoutingSession(self.engine, router=self.replica_router)
+            else:
+                self._session = Session(self.engine)
         return self._session
 
+    @property
+    def has_session(self) -> bool:
+        """Whether a session was opened (i.e. the database was used)"""
+        return self._session is not None
+
     def close_session(self):
         """Closes the active session if it exists"""
         if self._session is not None:
@@ -45,11 +79,12 @@ class EntityManager:
 
     @contextlib.contextmanager
     def transaction(self) -> Generator[Session, None, None]:
-        """Context manager for transactions"""
+        """Context manager for transactions, every statement of which runs on the primary"""
         session = self.session
         self._transaction_depth += 1
         try:
-            yield session
+            with self.use_primary():
+                yield session
             if self._transaction_depth == 1:
                 session.commit()
         except Exception as e:
@@ -58,6 +93,11 @@ class EntityManager:
         finally:
             self._transaction_depth -= 1
 
+    def use_primary(self):
+        """Context manager sending the reads of the block to the primary instead of a replica"""
+        session = self.session
+        return session.use_primary() if isinstance(session, RoutingSession) else contextlib.nullcontext(session)
+
     def commit(self) -> None:
         """Commit if we are not in a nested transaction"""
         if self._transaction_depth <= 1:
@@ -81,7 +121,7 @@ class EntityManager:
                 target_class = get_args(prop_type)[0]
                 repo = self.get_repository(target_class)
                 if repo and isinstance(value, list) and value and isinstance(value[0], (int, str)):
-                    hydrated = [repo.find(v) for v in value if v is not None]
+                    hydrated = repo.find_many(value)
                     setattr(entity, name, hydrated)
             elif isinstance(value, (int, str)):
                 repo = self.get_repository(prop_type)
@@ -135,11 +175,35 @@ class EntityManager:
         """
         self.session.refresh(entity)
 
-    def exec_statement(self, statement) -> list:
+    def exec_statement(self, statement, unique: bool = False, cache=None, params: Optional[dict] = None) -> list:
         """
         Executes the given SQL statement and returns the result as a list.
+        unique must be set when the statement joined-eager-loads a collection.
+        cache (a ttl, True or a {ttl, key, tags} dict) serves a SELECT from the query cache.
+        params gives the values of the bindparam() placeholders of the statement.
         """
-        return self.session.exec(statement).all()
+        if cache is not None and cache is not False:
+            if params:
+                statement = statement.params(params)
+            return self._exec_cached(statement, unique, QueryCache.normalize_options(cache))
+        result = self.session.exec(statement, params=params)
+        return result.unique().all() if unique else result.all()
+
+    def _exec_cached(self, statement, unique: bool, options: dict) -> list:
+        namespace = self.engine.url.render_as_string(hide_password=True)
+        entry_key, versions, results = self.query_cache.lookup(statement, self.engine.dialect, namespace, options)
+        if results is not None:
+            return [self._attach(item) if QueryCache.is_detached_entity(item) else item for item in results]
+
+        result = self.session.exec(statement)
+        results = result.unique().all() if unique else result.all()
+        self.query_cache.store(entry_key, versions, statement, results, ttl=options["ttl"])
+        return results
+
+    def _attach(self, entity):
+        """Attach a detached entity rebuilt from a cache, preferring the instance the session already holds"""
+        in_session = self.session.identity_map.get(inspect(entity).key)
+        return in_session if in_session is not None else self.session.merge(entity, load=False)
 
     def find(self, entity_class, primary_key):
         """
@@ -149,15 +213,205 @@ class EntityManager:
         is present in the identity map. If found, it returns the cached entity. If not found,
         it queries the database session for the entity. If the entity is found in the database,
         it is added to the identity map and then returned.
+
+        Entity classes declaring __cache__ are looked up in the second-level cache
+        before querying the database.
         """
         map_key = (entity_class, primary_key)
         if map_key in self._identity_map:
             return self._identity_map[map_key]
-        entity = self.session.get(entity_class, primary_key)
+        entity = self._find_cached(entity_class, primary_key)
+        if entity is None:
+            entity = self.session.get(entity_class, primary_key)
+            if entity is not None:
+                self.entity_cache.put(entity)
         if entity:
             self._identity_map[map_key] = entity
         return entity
 
+    def _find_cached(self, entity_class, primary_key):
+        """Attach the entity from the second-level cache, unless the session already holds it"""
+        if EntityCache.options(entity_class) is None:
+            return None
+        identity = EntityCache.identity(entity_class, primary_key)
+        in_session = self.session.identity_map.get(inspect(entity_class).identity_key_from_primary_key(identity))
+        if in_session is not None:
+            return in_session
+        cached = self.entity_cache.get(entity_class, primary_key)
+        return self._attach(cached) if cached is not None else None
+
+    def find_many(self, entity_class, primary_keys) -> list:
+        """
+        Retrieve several entities by primary key with a single IN query.
+
+        Entities already in the identity map are not queried again. The result
+        follows the order of primary_keys; unknown keys are skipped.
+        """
+        pk_name, keys = self._typed_primary_keys(entity_class, primary_keys)
+        missing = [key for key in keys if (entity_class, key) not in self._identity_map]
+        if missing:
+            statement = select(entity_class).where(getattr(entity_class, pk_name).in_(missing))
+            for entity in self.session.exec(statement).all():
+                self._identity_map[(entity_class, getattr(entity, pk_name))] = entity
+        return [self._identity_map[(entity_class, key)] for key in keys if (entity_class, key) in self._identity_map]
+
+    @staticmethod
+    def _single_primary_key(entity_class) -> Column:
+        """Returns the primary key column, find_many does not support composite keys"""
+        primary_key = inspect(entity_class).primary_key
+        if len(primary_key) != 1:
+            raise ValueError(f"find_many() requires a single-column primary key on {entity_class.__name__}")
+        return primary_key[0]
+
+    @classmethod
+    def _typed_primary_keys(cls, entity_class, primary_keys) -> Tuple[str, list]:
+        """
+        Returns the name of the primary key and primary_keys without duplicates,
+        converted to the type of the column: the identity map is keyed by the
+        typed value, so "1" must become 1. Keys that cannot be converted match
+        no row and are dropped.
+        """
+        column = cls._single_primary_key(entity_class)
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = None
+        keys = []
+        for key in primary_keys:
+            if key is None:
+                continue
+            if python_type is not None and not isinstance(key, python_type):
+                try:
+                    key = python_type(key)
+                except (TypeError, ValueError):
+                    continue
+            keys.append(key)
+        return column.name, list(dict.fromkeys(keys))
+
+    def bulk_insert(self, entity_class, rows: Iterable[Union[SQLModel, Dict[str, Any]]], chunk_size: int = 1000) -> int:
+        """
+        Inserts many rows with one multi-row INSERT per chunk, inside a single transaction.
+
+        rows are entities of entity_class or dicts of column values. Unlike persist,
+        relationships are not hydrated, the entities are not attached to the session
+        and generated primary keys are not set on them. Returns the number of rows inserted.
+        """
+        count = 0
+        with self.transaction() as session:
+            for chunk in self._bulk_chunks(entity_class, rows, chunk_size):
+                session.execute(sql_insert(entity_class), chunk)
+                count += len(chunk)
+        return count
+
+    def bulk_update(self, entity_class, rows: Iterable[Union[SQLModel, Dict[str, Any]]], chunk_size: int = 1000) -> int:
+        """
+        Updates many rows by primary key, one executemany UPDATE per chunk, inside a single transaction.
+
+        Every row must hold the primary key; the other values given are written.
+        Returns the number of rows sent.
+        """
+        count = 0
+        with self.transaction() as session:
+            for chunk in self._bulk_chunks(entity_class, rows, chunk_size):
+                self._check_primary_keys(entity_class, chunk)
+                session.execute(sql_update(entity_class), chunk)
+                count += len(chunk)
+        return count
+
+    def upsert(
+        self,
+        entity_class,
+        rows: Iterable[Union[SQLModel, Dict[str, Any]]],
+        index_elements: Optional[Sequence[str]] = None,
+        update_fields: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """
+        Inserts rows, updating the existing ones instead when they conflict on
+        index_elements (the primary key by default, MySQL uses any unique key).
+
+        update_fields are the columns overwritten on conflict, every other column
+        given by default; an empty list keeps existing rows untouched. Uses
+        ON CONFLICT on SQLite and PostgreSQL and ON DUPLICATE KEY UPDATE on MySQL.
+        Returns the number of rows sent.
+        """
+        index_elements = list(index_elements or [column.name for column in inspect(entity_class).primary_key])
+        dialect_name = self.engine.dialect.name
+        count = 0
+        with self.transaction() as session:
+            for chunk in self._bulk_chunks(entity_class, rows, chunk_size):
+                for group in self._group_by_columns(chunk):
+                    session.execute(self.upsert_statement(dialect_name, entity_class, list(group[0]), index_elements, update_fields), group)
+                count += len(chunk)
+        return count
+
+    @classmethod
+    def _bulk_chunks(cls, entity_class, rows: Iterable, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Yields the rows as lists of column dicts of at most chunk_size, without materializing the iterable"""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        columns = [attribute.key for attribute in inspect(entity_class).column_attrs]
+        primary_keys = {column.name for column in inspect(entity_class).primary_key}
+        iterator = iter(rows)
+        while True:
+            chunk = [cls._bulk_values(entity_class, row, columns, primary_keys) for row in itertools.islice(iterator, chunk_size)]
+            if not chunk:
+                return
+            yield chunk
+
+    @staticmethod
+    def _bulk_values(entity_class, row, columns: List[str], primary_keys: set) -> Dict[str, Any]:
+        if isinstance(row, dict):
+            return row
+        if not isinstance(row, entity_class):
+            raise TypeError(f"Expected {entity_class.__name__} entities or dicts, got {type(row).__name__}")
+        # An unset primary key is left to the database (autoincrement)
+        return {key: getattr(row, key) for key in columns if key not in primary_keys or getattr(row, key) is not None}
+
+    @staticmethod
+    def _check_primary_keys(entity_class, rows: List[Dict[str, Any]]) -> None:
+        primary_keys = [column.name for column in inspect(entity_class).primary_key]
+        for row in rows:
+            if any(row.get(key) is None for key in primary_keys):
+                raise ValueError(f"bulk_update() requires the primary key of every {entity_class.__name__} row")
+
+    @staticmethod
+    def _group_by_columns(rows: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Every row of an executemany batch must hold the same columns"""
+        groups: Dict[tuple, list] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        return list(groups.values())
+
+    @staticmethod
+    def upsert_statement(dialect_name: str, entity_class, columns: List[str], index_elements: List[str], update_fields=None):
+        """
+        Builds the INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE statement of the dialect
+        for rows holding columns. Rows are passed at execution (executemany), so the
+        compiled statement is cached and reused for every chunk. Public for the code
+        upserting through a session of its own.
+        """
+        if update_fields is None:
+            update_fields = [name for name in columns if name not in index_elements]
+
+        if dialect_name in ("sqlite", "postgresql"):
+            dialect_insert = sqlite.insert if dialect_name == "sqlite" else postgresql.insert
+            statement = dialect_insert(entity_class)
+            if not update_fields:
+                return statement.on_conflict_do_nothing(index_elements=index_elements)
+            return statement.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={name: statement.excluded[name] for name in update_fields},
+            )
+
+        if dialect_name in ("mysql", "mariadb"):
+            statement = mysql.insert(entity_class)
+            # Assigning a key column to itself makes the conflicting row a no-op
+            fields = update_fields or index_elements[:1]
+            return statement.on_duplicate_key_update({name: statement.inserted[name] for name in fields})
+
+        raise ValueError(f"upsert() is not supported for database '{dialect_name}'")
+
     def find_existing_entity(self, entity) -> Any:
         """
         Finds an existing entity in the database.
@@ -1,10 +1,9 @@
 import contextlib
-from typing import Any, Generator, Type
+from typing import Any, Generator, Optional, Type
 
 from sqlmodel import Session
 
-from framefox.core.orm.entity_manager import EntityManager
-from framefox.core.request.request_stack import RequestStack
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
 
 """
 Framefox Framework developed by SOMA
@@ -33,18 +32,14 @@ class EntityManagerInterface:
         """
         Retrieves the EntityManager linked to the current context:
         - The fixed EntityManager if provided during initialization
-        - The EntityManager linked to the HTTP request if in a web context
+        - The EntityManager of the current HTTP request, created on first use
         - A new default EntityManager otherwise
         """
 
         if self.entity_manager:
             return self.entity_manager
 
-        current_request = RequestStack.get_request()
-        if current_request and hasattr(current_request.state, "entity_manager"):
-            return current_request.state.entity_manager
-
-        return EntityManager()
+        return EntityManagerRegistry.get_entity_manager_for_request()
 
     @property
     def session(self) -> Session:
@@ -58,6 +53,9 @@ class EntityManagerInterface:
         with self._get_current_entity_manager().transaction() as session:
             yield session
 
+    def use_primary(self):
+        return self._get_current_entity_manager().use_primary()
+
     def commit(self) -> None:
         return self._get_current_entity_manager().commit()
 
@@ -73,12 +71,26 @@ class EntityManagerInterface:
     def refresh(self, entity) -> None:
         return self._get_current_entity_manager().refresh(entity)
 
-    def exec_statement(self, statement) -> list:
-        return self._get_current_entity_manager().exec_statement(statement)
+    def exec_statement(self, statement, unique: bool = False, cache=None, params: Optional[dict] = None) -> list:
+        return self._get_current_entity_manager().exec_statement(statement, unique=unique, cache=cache, params=params)
 
     def find(self, entity_class, primary_keys) -> Any:
         return self._get_current_entity_manager().find(entity_class, primary_keys)
 
+    def find_many(self, entity_class, primary_keys) -> list:
+        return self._get_current_entity_manager().find_many(entity_class, primary_keys)
+
+    def bulk_insert(self, entity_class, rows, chunk_size: int = 1000) -> int:
+        return self._get_current_entity_manager().bulk_insert(entity_class, rows, chunk_size=chunk_size)
+
+    def bulk_update(self, entity_class, rows, chunk_size: int = 1000) -> int:
+        return self._get_current_entity_manager().bulk_update(entity_class, rows, chunk_size=chunk_size)
+
+    def upsert(self, entity_class, rows, index_elements=None, update_fields=None, chunk_size: int = 1000) -> int:
+        return self._get_current_entity_manager().upsert(
+            entity_class, rows, index_elements=index_elements, update_fields=update_fields, chunk_size=chunk_size
+        )
+
     def find_existing_entity(self, entity) -> Any:
         return self._get_current_entity_manager().find_existing_entity(entity)
 
@@ -1,9 +1,14 @@
-from typing import Dict
+import weakref
+from contextvars import ContextVar, Token
+from typing import Dict, Optional
 
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import create_engine
 
 from framefox.core.config.settings import Settings
+from framefox.core.orm.pool_metrics import PoolMetrics
+from framefox.core.orm.replica_router import ReplicaRouter
 from framefox.core.request.request_stack import RequestStack
 
 
@@ -12,6 +17,28 @@ class EntityManagerRegistry:
 
     _instance = None
     _engines: Dict[str, Engine] = {}
+    _async_engines: Dict[str, AsyncEngine] = {}
+    _replica_routers: "weakref.WeakKeyDictionary[Engine, ReplicaRouter]" = weakref.WeakKeyDictionary()
+    # Entity managers of the current HTTP request, created on first use. The dict is
+    # shared by reference so managers created in copied contexts (threadpool, tasks)
+    # are still seen by EntityManagerMiddleware.
+    _request_scope: ContextVar[Optional[dict]] = ContextVar("entity_manager_scope", default=None)
+
+    # Pool options used when database.<option> is not configured, see
+    # `framefox debug:pool` for sizes based on the observed load
+    DEFAULT_POOL_OPTIONS = {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    }
+
+    ASYNC_DRIVERS = {
+        "sqlite": "sqlite+aiosqlite",
+        "postgresql": "postgresql+asyncpg",
+        "mysql": "mysql+aiomysql",
+    }
 
     @classmethod
     def get_instance(cls) -> "EntityManagerRegistry":
@@ -26,22 +53,111 @@ class EntityManagerRegistry:
         self._initialized = True
 
     def get_engine(self, connection_name: str = "default") -> Engine:
-        """Retrieves or creates a configured database engine"""
+        """Retrieves or creates a configured database engine, and the engines of its read replicas"""
         if connection_name not in self._engines:
             db_url = self._get_database_url_string(connection_name)
             db_config = self.settings.config.get("database", {})
 
-            self._engines[connection_name] = create_engine(
-                db_url,
-                echo=self.settings.database_echo,
-                pool_size=db_config.get("pool_size", 20),
-                max_overflow=db_config.get("max_overflow", 10),
-                pool_timeout=db_config.get("pool_timeout", 30),
-                pool_recycle=db_config.get("pool_recycle", 1800),
-                pool_pre_ping=db_config.get("pool_pre_ping", True),
-            )
+            engine = create_engine(db_url, **self._engine_options(db_url, db_config))
+            PoolMetrics.instrument(engine, connection_name)
+            replicas = []
+            for index, replica in enumerate(self.settings.database_replicas):
+                replica_engine = create_engine(replica["url"], **self._engine_options(replica["url"], {**db_config, **replica}))
+                PoolMetrics.instrument(replica_engine, f"{connection_name}:replica{index}")
+                replicas.append(replica_engine)
+            if replicas:
+                self._register_configured_replicas(engine, replicas)
+            self._engines[connection_name] = engine
         return self._engines[connection_name]
 
+    def get_async_engine(self, connection_name: str = "default") -> AsyncEngine:
+        """
+        Retrieves or creates the AsyncEngine of a connection, using the async driver
+        of its database (aiosqlite, asyncpg or aiomysql, which must be installed)
+        """
+        if connection_name not in self._async_engines:
+            db_url = self._get_async_database_url_string(connection_name)
+            db_config = self.settings.config.get("database", {})
+
+            engine = create_async_engine(db_url, **self._engine_options(db_url, db_config))
+            PoolMetrics.instrument(engine, f"{connection_name}:async")
+            replicas = []
+            for index, replica in enumerate(self.settings.database_replicas):
+                replica_url = self._to_async_url(replica["url"])
+                replica_engine = create_async_engine(replica_url, **self._engine_options(replica_url, {**db_config, **replica}))
+                PoolMetrics.instrument(replica_engine, f"{connection_name}:async:replica{index}")
+                replicas.append(replica_engine)
+            if replicas:
+                self._register_configured_replicas(engine, replicas)
+            self._async_engines[connection_name] = engine
+        return self._async_engines[connection_name]
+
+    @classmethod
+    def reset_engines(cls) -> None:
+        """
+        Forgets the engines of the process so that the next get_engine() creates new ones.
+        Used by forked worker processes: the inherited pools are dropped without closing
+        their connections, which still belong to the parent process.
+        """
+        engines = [*cls._engines.values(), *(engine.sync_engine for engine in cls._async_engines.values())]
+        for engine in engines:
+            router = cls._replica_routers.pop(engine, None)
+            for replica in router.replicas if router is not None else []:
+                replica.dispose(close=False)
+            engine.dispose(close=False)
+        cls._engines.clear()
+        cls._async_engines.clear()
+
+    def _engine_options(self, db_url: str, db_config: dict) -> dict:
+        engine_options = {"echo": self.settings.database_echo}
+        # aiosqlite does not use a QueuePool, pool sizing does not apply to it
+        if not db_url.startswith("sqlite+aiosqlite"):
+            engine_options.update({option: db_config.get(option, default) for option, default in self.DEFAULT_POOL_OPTIONS.items()})
+        return engine_options
+
+    def _register_configured_replicas(self, engine, replicas: list) -> None:
+        routing = self.settings.database_replica_routing
+        self.register_replicas(
+            engine,
+            replicas,
+            balancing=routing.get("balancing", "round_robin"),
+            sticky=routing.get("sticky", True),
+        )
+
+    @classmethod
+    def register_replicas(cls, engine, replicas: list, balancing: str = "round_robin", sticky: bool = True) -> ReplicaRouter:
+        """Routes the reads of the sessions opened on engine (Engine or AsyncEngine) to replicas"""
+        sync_replicas = [getattr(replica, "sync_engine", replica) for replica in replicas]
+        router = ReplicaRouter(sync_replicas, balancing=balancing, sticky=sticky)
+        cls._replica_routers[cls._sync_engine(engine)] = router
+        return router
+
+    @classmethod
+    def unregister_replicas(cls, engine) -> None:
+        cls._replica_routers.pop(cls._sync_engine(engine), None)
+
+    @classmethod
+    def get_replica_router(cls, engine) -> Optional[ReplicaRouter]:
+        """The ReplicaRouter of a primary engine, None when it has no replicas"""
+        return cls._replica_routers.get(cls._sync_engine(engine))
+
+    @staticmethod
+    def _sync_engine(engine):
+        return getattr(engine, "sync_engine", engine)
+
+    def _get_async_database_url_string(self, connection_name: str = "default") -> str:
+        """Rewrites the database URL to use the async driver of its dialect"""
+        return self._to_async_url(self._get_database_url_string(connection_name))
+
+    @classmethod
+    def _to_async_url(cls, db_url: str) -> str:
+        url = make_url(db_url)
+        backend = url.get_backend_name()
+        async_driver = cls.ASYNC_DRIVERS.get(backend)
+        if async_driver is None:
+            raise ValueError(f"No async driver available for database '{backend}'")
+        return url.set(drivername=async_driver).render_as_string(hide_password=False)
+
     def _get_database_url_string(self, connection_name: str = "default") -> str:
         """Retrieves the database URL according to the configuration"""
         db_config = self.settings.database_url
@@ -62,21 +178,55 @@ class EntityManagerRegistry:
 
         return f"{dialect}://{username}:{password}@{host}:{port}/{database}"
 
+    @classmethod
+    def begin_request_scope(cls) -> Token:
+        """Opens the entity manager scope of a request, managers are only created when used"""
+        return cls._request_scope.set({})
+
+    @classmethod
+    def end_request_scope(cls, token: Token) -> None:
+        cls._request_scope.reset(token)
+
+    @classmethod
+    def get_request_scope(cls) -> Optional[dict]:
+        """The entity managers created in the current request scope, None outside of one"""
+        return cls._request_scope.get()
+
     @classmethod
     def get_entity_manager_for_request(cls, request=None):
         """Gets the EntityManager for the current request or creates a new one"""
         from framefox.core.orm.entity_manager import EntityManager
 
+        return cls._get_for_request("entity_manager", EntityManager, request)
+
+    @classmethod
+    def get_async_entity_manager_for_request(cls, request=None):
+        """Gets the AsyncEntityManager for the current request or creates a new one"""
+        from framefox.core.orm.async_entity_manager import AsyncEntityManager
+
+        return cls._get_for_request("async_entity_manager", AsyncEntityManager, request)
+
+    @classmethod
+    def _get_for_request(cls, name: str, manager_class, request=None):
+        if request is not None and getattr(request.state, name, None) is not None:
+            return getattr(request.state, name)
+
+        scope = cls._request_scope.get()
+        if scope is not None:
+            if scope.get(name) is None:
+                scope[name] = manager_class()
+            return scope[name]
+
         if request is None:
             request = RequestStack.get_request()
 
-        if request and hasattr(request.state, "entity_manager"):
-            return request.state.entity_manager
+        if request and getattr(request.state, name, None) is not None:
+            return getattr(request.state, name)
 
-        em = EntityManager()
+        em = manager_class()
 
         if request:
-            request.state.entity_manager = em
+            setattr(request.state, name, em)
 
         return em
 
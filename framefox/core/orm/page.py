@@ -0,0 +1,156 @@
+import base64
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import and_, or_
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    """A page of entities returned by AbstractRepository.paginate"""
+
+    items: List[T] = field(default_factory=list)
+    size: int = 20
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class Keyset:
+    """
+    Keyset (seek) pagination over an ordering of columns.
+
+    Pages are fetched with "WHERE (columns) > (values of the last row)" instead of
+    OFFSET, so every page costs the same whatever its position. The ordering always
+    ends with the primary key to be total. Cursors are opaque url-safe strings
+    holding the values of the boundary row and the direction to move in.
+    """
+
+    NEXT = "next"
+    PREVIOUS = "previous"
+
+    def __init__(self, model, order_by: Optional[Dict[str, str]] = None):
+        self.model = model
+        self.ordering: List[Tuple[str, str]] = []
+        for name, direction in (order_by or {}).items():
+            direction = direction.lower()
+            if direction not in ("asc", "desc"):
+                raise ValueError(f"Invalid sort direction '{direction}' for '{name}', expected asc or desc")
+            if not hasattr(model, name):
+                raise ValueError(f"'{name}' is not a field of {model.__name__}")
+            self.ordering.append((name, direction))
+
+        ordered = {name for name, _ in self.ordering}
+        for pk_name in self.primary_keys(model):
+            if pk_name not in ordered:
+                self.ordering.append((pk_name, "asc"))
+
+    @staticmethod
+    def primary_keys(model) -> List[str]:
+        return [column.name for column in model.__table__.primary_key.columns]
+
+    def order_clauses(self, backwards: bool = False) -> list:
+        clauses = []
+        for name, direction in self.ordering:
+            ascending = (direction == "asc") != backwards
+            column = getattr(self.model, name)
+            clauses.append(column.asc() if ascending else column.desc())
+        return clauses
+
+    def seek_condition(self, values: list, backwards: bool = False):
+        """Rows strictly after (or before, when backwards) the row holding values, in the ordering"""
+        conditions = []
+        for index, (name, direction) in enumerate(self.ordering):
+            column = getattr(self.model, name)
+            ascending = (direction == "asc") != backwards
+            step = column > values[index] if ascending else column < values[index]
+            equals = [getattr(self.model, previous) == values[position] for position, (previous, _) in enumerate(self.ordering[:index])]
+            conditions.append(and_(*equals, step))
+        return or_(*conditions)
+
+    def encode(self, entity, direction: str) -> str:
+        payload = {
+            "o": [f"{name}:{order}" for name, order in self.ordering],
+            "v": [getattr(entity, name) for name, _ in self.ordering],
+            "d": direction,
+        }
+        raw = json.dumps(payload, default=str, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    def decode(self, cursor: str) -> Tuple[list, str]:
+        """Returns the boundary values and the direction of a cursor, raises ValueError when it is invalid"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            ordering, values, direction = payload["o"], payload["v"], payload["d"]
+        except (ValueError, TypeError, KeyError):
+            raise ValueError("Invalid pagination cursor")
+
+        if ordering != [f"{name}:{order}" for name, order in self.ordering] or len(values) != len(self.ordering):
+            raise ValueError("Pagination cursor does not match the requested ordering")
+        if direction not in (self.NEXT, self.PREVIOUS):
+            raise ValueError("Invalid pagination cursor")
+        return [self._coerce(name, value) for (name, _), value in zip(self.ordering, values)], direction
+
+    def _coerce(self, name: str, value: Any) -> Any:
+        """Rebuilds the python value of a column from its JSON form"""
+        if value is None:
+            return None
+        try:
+            python_type = self.model.__table__.columns[name].type.python_type
+        except (KeyError, NotImplementedError):
+            return value
+        try:
+            if python_type in (datetime, date, time):
+                return python_type.fromisoformat(value)
+            if python_type in (Decimal, uuid.UUID):
+                return python_type(value)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid pagination cursor")
+        return value
+
+    def build_page(self, rows: list, size: int, direction: Optional[str]) -> Page:
+        """Turns the size + 1 rows fetched for a page into a Page with its cursors"""
+        has_more = len(rows) > size
+        items = rows[:size]
+        if direction == self.PREVIOUS:
+            items.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, direction is not None
+
+        if not items:
+            return Page(items=[], size=size)
+        return Page(
+            items=items,
+            size=size,
+            next_cursor=self.encode(items[-1], self.NEXT) if has_next else None,
+            previous_cursor=self.encode(items[0], self.PREVIOUS) if has_previous else None,
+        )
@@ -0,0 +1,290 @@
+import math
+import re
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from framefox.core.debug.metrics.metrics_registry import MetricsRegistry
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+CONCURRENCY_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class PoolMetrics:
+    """
+    Instrumentation for a database connection pool.
+
+    Listens to the pool events (connect, checkout, checkin, invalidate, close)
+    and times every checkout, feeding the process-wide MetricsRegistry: checkout
+    wait histogram, concurrency histogram (connections in use at each checkout),
+    event and timeout counters, pool size gauges. While a request is being
+    profiled, the checkouts performed for that request are kept as well.
+    """
+
+    _request_checkouts: ContextVar[Optional[List[Dict]]] = ContextVar("pool_checkouts", default=None)
+    _instrumented: "weakref.WeakKeyDictionary[Engine, PoolMetrics]" = weakref.WeakKeyDictionary()
+    _pools: Dict[str, "PoolMetrics"] = {}
+
+    EVENTS = ("connect", "checkout", "checkin", "invalidate", "close")
+
+    # Thresholds used by recommend()
+    HEADROOM = 1.2
+    MIN_POOL_SIZE = 2
+    MIN_CHECKOUTS = 100
+    SLOW_WAIT = 0.01
+    CHURN_RATIO = 0.2
+
+    def __init__(self, pool_name: str):
+        self.pool_name = pool_name
+        self._lock = threading.Lock()
+        self._in_use = 0
+        registry = MetricsRegistry()
+        self.events = registry.counter(
+            "framefox_db_pool_events_total",
+            "Connection pool events",
+            labels=("pool", "event"),
+        )
+        self.timeouts = registry.counter(
+            "framefox_db_pool_timeouts_total",
+            "Checkouts that timed out waiting for a connection",
+            labels=("pool",),
+        )
+        self.wait = registry.histogram(
+            "framefox_db_pool_checkout_seconds",
+            "Time spent acquiring a connection from the pool",
+            labels=("pool",),
+        )
+        self.concurrency = registry.histogram(
+            "framefox_db_pool_concurrency",
+            "Connections checked out, sampled at each checkout",
+            labels=("pool",),
+            buckets=CONCURRENCY_BUCKETS,
+        )
+        self.checked_out = registry.gauge(
+            "framefox_db_pool_checked_out",
+            "Connections currently checked out",
+            labels=("pool",),
+        )
+        self.size = registry.gauge("framefox_db_pool_size", "Configured pool size", labels=("pool",))
+        self.max_overflow = registry.gauge("framefox_db_pool_max_overflow", "Configured pool overflow", labels=("pool",))
+
+    @classmethod
+    def instrument(cls, engine, pool_name: str) -> "PoolMetrics":
+        """Attach the pool listeners to an Engine or AsyncEngine, once per engine"""
+        sync_engine = getattr(engine, "sync_engine", engine)
+        if sync_engine in cls._instrumented:
+            return cls._instrumented[sync_engine]
+
+        metrics = cls(pool_name)
+        pool = sync_engine.pool
+        if isinstance(pool, QueuePool):
+            metrics.size.set(pool.size(), pool=pool_name)
+            metrics.max_overflow.set(pool._max_overflow, pool=pool_name)
+
+        event.listen(sync_engine, "connect", metrics._on_connect)
+        event.listen(sync_engine, "checkout", metrics._on_checkout)
+        event.listen(sync_engine, "checkin", metrics._on_checkin)
+        event.listen(sync_engine, "invalidate", metrics._on_invalidate)
+        event.listen(sync_engine, "close", metrics._on_close)
+        # Every Connection goes through raw_connection(), the pool itself is
+        # replaced by dispose() so the engine method is wrapped instead
+        sync_engine.raw_connection = metrics._timed(sync_engine.raw_connection)
+
+        cls._instrumented[sync_engine] = metrics
+        cls._pools[pool_name] = metrics
+        return metrics
+
+    @classmethod
+    def get_pools(cls) -> Dict[str, "PoolMetrics"]:
+        return dict(cls._pools)
+
+    @classmethod
+    def start_request(cls) -> None:
+        """Start recording the checkouts of the current request"""
+        cls._request_checkouts.set([])
+
+    @classmethod
+    def get_request_checkouts(cls) -> List[Dict]:
+        return cls._request_checkouts.get() or []
+
+    def _timed(self, raw_connection):
+        def timed_raw_connection():
+            start = time.perf_counter()
+            try:
+                connection = raw_connection()
+            except PoolTimeoutError:
+                self.timeouts.inc(pool=self.pool_name)
+                self._record_checkout(time.perf_counter() - start, timed_out=True)
+                raise
+            self._record_checkout(time.perf_counter() - start)
+            return connection
+
+        return timed_raw_connection
+
+    def _record_checkout(self, duration: float, timed_out: bool = False) -> None:
+        self.wait.observe(duration, pool=self.pool_name)
+        request_checkouts = self._request_checkouts.get()
+        if request_checkouts is not None:
+            request_checkouts.append(
+                {
+                    "pool": self.pool_name,
+                    "wait": round(duration * 1000, 3),
+                    "in_use": self._in_use,
+                    "timed_out": timed_out,
+                }
+            )
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self.events.inc(pool=self.pool_name, event="connect")
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self._in_use += 1
+            in_use = self._in_use
+        self.events.inc(pool=self.pool_name, event="checkout")
+        self.checked_out.set(in_use, pool=self.pool_name)
+        self.concurrency.observe(in_use, pool=self.pool_name)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._in_use = max(self._in_use - 1, 0)
+            in_use = self._in_use
+        self.events.inc(pool=self.pool_name, event="checkin")
+        self.checked_out.set(in_use, pool=self.pool_name)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self.events.inc(pool=self.pool_name, event="invalidate")
+
+    def _on_close(self, dbapi_connection, connection_record):
+        self.events.inc(pool=self.pool_name, event="close")
+
+    def snapshot(self) -> Dict:
+        """Return the figures recommend() works on for this pool"""
+        name = self.pool_name
+        size = self.size.samples().get((name,))
+        max_overflow = self.max_overflow.samples().get((name,))
+        return {
+            "pool": name,
+            "pool_size": int(size) if size is not None else None,
+            "max_overflow": int(max_overflow) if max_overflow is not None else None,
+            "checked_out": int(self.checked_out.value(pool=name)),
+            **{f"{event_name}s": self.events.value(pool=name, event=event_name) for event_name in self.EVENTS},
+            "timeouts": self.timeouts.value(pool=name),
+            "wait_p50": self.wait.quantile(0.5, pool=name),
+            "wait_p95": self.wait.quantile(0.95, pool=name),
+            "wait_max": self.wait.summary(pool=name)["max"],
+            "concurrency_p95": self.concurrency.quantile(0.95, pool=name),
+            "concurrency_max": self.concurrency.summary(pool=name)["max"],
+        }
+
+    @classmethod
+    def recommend(cls, stats: Dict) -> Dict:
+        """
+        Suggest pool_size and max_overflow from a snapshot(): the pool covers the
+        95th percentile of observed concurrency with some headroom, the overflow
+        absorbs the observed peak. Findings explain exhaustion, oversizing and churn.
+        """
+        checkouts = stats.get("checkouts", 0)
+        pool_size = stats.get("pool_size")
+        max_overflow = stats.get("max_overflow")
+        recommended_size = max(cls.MIN_POOL_SIZE, math.ceil(stats.get("concurrency_p95", 0) * cls.HEADROOM))
+        peak = math.ceil(stats.get("concurrency_max", 0) * cls.HEADROOM)
+        recommended_overflow = max(peak - recommended_size, recommended_size // 2)
+
+        findings = []
+        if stats.get("timeouts"):
+            findings.append(f"{int(stats['timeouts'])} checkouts timed out: the pool was exhausted")
+        if stats.get("wait_p95", 0) > cls.SLOW_WAIT:
+            findings.append(f"95% of checkouts waited up to {stats['wait_p95'] * 1000:.1f} ms for a connection")
+        if pool_size is not None and max_overflow is not None and stats.get("concurrency_max", 0) >= pool_size + max_overflow:
+            findings.append(f"all {pool_size + max_overflow} connections (pool_size + max_overflow) were in use at once")
+        if checkouts >= cls.MIN_CHECKOUTS:
+            if pool_size is not None and pool_size > 2 * recommended_size:
+                findings.append(
+                    f"pool_size {pool_size} is oversized: at most {int(stats.get('concurrency_max', 0))} connections were in use"
+                )
+            if stats.get("connects", 0) / checkouts > cls.CHURN_RATIO:
+                findings.append(
+                    f"{int(stats['connects'])} connections opened for {int(checkouts)} checkouts "
+                    f"({int(stats.get('invalidates', 0))} invalidated): check pool_recycle and the database idle timeout"
+                )
+        elif pool_size is not None:
+            findings.append(f"only {int(checkouts)} checkouts observed, recommendations are not reliable yet")
+
+        return {
+            "pool": stats.get("pool"),
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "recommended_pool_size": recommended_size,
+            "recommended_max_overflow": recommended_overflow,
+            "findings": findings,
+        }
+
+    @classmethod
+    def parse_metrics(cls, text: str) -> List[Dict]:
+        """Rebuild the snapshot() of every pool from a /metrics (Prometheus text) page"""
+        sample = re.compile(r"^(framefox_db_pool_\w+?)(?:\{(.*)\})?\s+(\S+)$")
+        pools: Dict[str, Dict] = {}
+        buckets: Dict[tuple, List] = {}
+
+        for line in text.splitlines():
+            match = sample.match(line.strip())
+            if not match:
+                continue
+            name, raw_labels, value = match.group(1), match.group(2) or "", float(match.group(3))
+            labels = dict(re.findall(r'(\w+)="((?:[^"\\]|\\.)*)"', raw_labels))
+            pool = labels.get("pool")
+            if pool is None:
+                continue
+            stats = pools.setdefault(pool, {"pool": pool, "pool_size": None, "max_overflow": None, "timeouts": 0})
+
+            if name == "framefox_db_pool_events_total":
+                stats[f"{labels.get('event')}s"] = value
+            elif name == "framefox_db_pool_timeouts_total":
+                stats["timeouts"] = value
+            elif name == "framefox_db_pool_size":
+                stats["pool_size"] = int(value)
+            elif name == "framefox_db_pool_max_overflow":
+                stats["max_overflow"] = int(value)
+            elif name == "framefox_db_pool_checked_out":
+                stats["checked_out"] = int(value)
+            elif name.endswith("_bucket"):
+                bound = float("inf") if labels.get("le") == "+Inf" else float(labels.get("le", "inf"))
+                buckets.setdefault((pool, name[: -len("_bucket")]), []).append((bound, value))
+
+        for (pool, histogram), pairs in buckets.items():
+            key = "wait" if histogram == "framefox_db_pool_checkout_seconds" else "concurrency"
+            pairs.sort()
+            for suffix, q in (("p50", 0.5), ("p95", 0.95), ("max", 1.0)):
+                pools[pool][f"{key}_{suffix}"] = cls._quantile(pairs, q)
+
+        for stats in pools.values():
+            for event_name in cls.EVENTS:
+                stats.setdefault(f"{event_name}s", 0)
+        return list(pools.values())
+
+    @staticmethod
+    def _quantile(pairs: List, q: float) -> float:
+        """Upper bound of the bucket holding the q quantile, the last finite bound for +Inf"""
+        count = pairs[-1][1] if pairs else 0
+        if not count:
+            return 0.0
+        finite = [bound for bound, _ in pairs if not math.isinf(bound)]
+        for bound, cumulative in pairs:
+            if cumulative >= q * count:
+                return bound if not math.isinf(bound) else (finite[-1] if finite else 0.0)
+        return finite[-1] if finite else 0.0
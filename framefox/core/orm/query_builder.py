@@ -1,6 +1,9 @@
 import logging
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Dict, Iterable, List, Optional, Type, Union
 
+from sqlalchemy import inspect
+from sqlalchemy import select as sql_select
+from sqlalchemy.orm import joinedload, selectinload, subqueryload
 from sqlalchemy.sql.expression import Delete, Update
 from sqlmodel import delete as sql_delete
 from sqlmodel import select
@@ -22,6 +25,12 @@ class QueryBuilder:
     QueryBuilder allows building and executing queries fluently for a single entity.
     """
 
+    LOADER_STRATEGIES = {
+        "selectin": selectinload,
+        "joined": joinedload,
+        "subquery": subqueryload,
+    }
+
     def __init__(self, model: Type[Any], entity_manager: EntityManager):
         self.entity_manager = entity_manager
         self.model = model
@@ -35,12 +44,45 @@ class QueryBuilder:
         self._offset = None
         self._update_values = {}
         self._params = {}
+        self._options = []
+        self._unique = False
+        self._cache = None
+        self._projection = False
         self.logger = logging.getLogger(__name__)
 
     def select(self) -> "QueryBuilder":
         self._select = select(self.model)
         return self
 
+    def select_columns(self, *columns: Any) -> "QueryBuilder":
+        """
+        Selects only the given columns, as field names or column expressions:
+
+            rows = qb.select_columns("id", "email").where(User.active).execute()
+            rows[0].email, rows[0][0]
+
+        Results are Row named tuples instead of entities: no Pydantic validation,
+        no identity map registration, only the selected columns are fetched.
+        """
+        if not columns:
+            raise ValueError("select_columns() requires at least one column")
+        self._select = sql_select(*self.columns(self.model, columns))
+        self._projection = True
+        return self
+
+    @staticmethod
+    def columns(model: Type[Any], fields: Iterable[Any]) -> List[Any]:
+        """Resolves field names to the columns of model, column expressions are kept as is"""
+        column_names = inspect(model).column_attrs.keys()
+        columns = []
+        for field in fields:
+            if isinstance(field, str):
+                if field not in column_names:
+                    raise ValueError(f"'{field}' is not a field of {model.__name__}")
+                field = getattr(model, field)
+            columns.append(field)
+        return columns
+
     def delete(self) -> "QueryBuilder":
         self._delete = sql_delete(self.model)
         return self
@@ -64,6 +106,65 @@ class QueryBuilder:
             raise ValueError("No query (select, delete, update) has been initiated.")
         return self
 
+    def options(self, *options: Any) -> "QueryBuilder":
+        """
+        Adds SQLAlchemy loader options (selectinload, joinedload, ...) to the select query
+        """
+        self._options.extend(options)
+        return self
+
+    def eager_load(self, *relations: str, strategy: str = "selectin") -> "QueryBuilder":
+        """
+        Loads the given relationships with the query instead of one query per row.
+        Nested relationships use dotted paths: eager_load("comments.author")
+        """
+        eager_load = {relation: strategy for relation in relations}
+        self._unique = self._unique or self.uses_joined_load(eager_load)
+        return self.options(*self.loader_options(self.model, eager_load))
+
+    @classmethod
+    def loader_options(cls, model: Type[Any], eager_load: Union[str, Iterable[str], Dict[str, str]]) -> List[Any]:
+        """
+        Builds loader options from relationship names (selectin strategy) or
+        from a {relationship: strategy} dict, strategy being selectin, joined or subquery.
+        """
+        if isinstance(eager_load, str):
+            eager_load = [eager_load]
+        if not isinstance(eager_load, dict):
+            eager_load = {relation: "selectin" for relation in eager_load}
+
+        options = []
+        for path, strategy in eager_load.items():
+            loader = cls.LOADER_STRATEGIES.get(strategy)
+            if loader is None:
+                raise ValueError(f"Unknown loading strategy '{strategy}', expected one of: {', '.join(cls.LOADER_STRATEGIES)}")
+
+            current_model = model
+            option = None
+            for name in path.split("."):
+                relationship = inspect(current_model).relationships.get(name)
+                if relationship is None:
+                    raise ValueError(f"'{name}' is not a relationship of {current_model.__name__}")
+                attribute = getattr(current_model, name)
+                option = loader(attribute) if option is None else getattr(option, loader.__name__)(attribute)
+                current_model = relationship.mapper.class_
+            options.append(option)
+        return options
+
+    @staticmethod
+    def uses_joined_load(eager_load) -> bool:
+        """Joined loads of collections duplicate rows, results must then be made unique"""
+        return isinstance(eager_load, dict) and "joined" in eager_load.values()
+
+    def cache(self, ttl: Optional[int] = None, key: Optional[str] = None, tags: Optional[List[str]] = None) -> "QueryBuilder":
+        """
+        Serves execute/first/last from the query cache. Entries are keyed by the
+        compiled SQL and its parameters (or key) and dropped when an entity of a
+        queried table is written, or when one of tags is invalidated.
+        """
+        self._cache = {"ttl": ttl, "key": key, "tags": list(tags or [])}
+        return self
+
     def having(self, condition: Any) -> "QueryBuilder":
         self._having.append(condition)
         return self
@@ -102,6 +203,11 @@ class QueryBuilder:
         if self._having and query_type == "select":
             query = query.having(*self._having)
 
+        if self._options and query_type == "select":
+            if self._projection:
+                raise ValueError("Loader options and eager loads do not apply to select_columns() queries")
+            query = query.options(*self._options)
+
         if self._order_by:
             query = query.order_by(*self._order_by)
 
@@ -120,8 +226,18 @@ class QueryBuilder:
         self._params.update(kwargs)
         return self
 
+    def _cache_options(self, suffix: str) -> Dict[str, Any]:
+        """first() and last() run different statements, an explicit key must not collide with execute()"""
+        options = dict(self._cache)
+        if options["key"]:
+            options["key"] = f"{options['key']}:{suffix}"
+        return options
+
     def execute(self) -> List[Any]:
         query = self.get_query()
+        if self._cache is not None and not isinstance(query, (Delete, Update)):
+            return self.entity_manager.exec_statement(query, unique=self._unique, cache=self._cache)
+
         with self.entity_manager.session as session:
 
             if isinstance(query, (Delete, Update)):
@@ -129,17 +245,21 @@ class QueryBuilder:
                 session.commit()
                 return result
             else:
-                result = session.exec(query).all()
-                return result
+                result = session.exec(query)
+                return result.unique().all() if self._unique else result.all()
 
     def first(self) -> Optional[Any]:
         query = self.get_query()
+        if self._cache is not None and not isinstance(query, (Delete, Update)):
+            results = self.entity_manager.exec_statement(query.limit(1), unique=self._unique, cache=self._cache_options("first"))
+            return results[0] if results else None
+
         with self.entity_manager.session as session:
 
             if isinstance(query, (Delete, Update)):
                 raise ValueError("The 'first' method is not applicable for delete or update queries.")
-            result = session.exec(query).first()
-            return result
+            result = session.exec(query)
+            return result.unique().first() if self._unique else result.first()
 
     def last(self) -> Optional[Any]:
         """
@@ -162,9 +282,13 @@ class QueryBuilder:
 
         query = query.order_by(*reversed_order).limit(1)
 
+        if self._cache is not None and not isinstance(query, (Delete, Update)):
+            results = self.entity_manager.exec_statement(query, unique=self._unique, cache=self._cache_options("last"))
+            return results[0] if results else None
+
         with self.entity_manager.session as session:
 
             if isinstance(query, (Delete, Update)):
                 raise ValueError("The 'last' method is not applicable for delete or update queries.")
-            result = session.exec(query).first()
-            return result
+            result = session.exec(query)
+            return result.unique().first() if self._unique else result.first()
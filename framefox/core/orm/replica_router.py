@@ -0,0 +1,108 @@
+import contextlib
+import itertools
+import threading
+from typing import Dict, Generator, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class ReplicaRouter:
+    """
+    Picks the read replica a query is sent to.
+
+    round_robin cycles through the replicas, least_connections picks the replica
+    with the fewest connections checked out of its pool. sticky keeps a session
+    on the primary once it wrote, so a request reads its own writes.
+    """
+
+    BALANCING = ("round_robin", "least_connections")
+
+    def __init__(self, replicas: List[Engine], balancing: str = "round_robin", sticky: bool = True):
+        if not replicas:
+            raise ValueError("ReplicaRouter requires at least one replica engine")
+        if balancing not in self.BALANCING:
+            raise ValueError(f"Unknown replica balancing '{balancing}', expected one of: {', '.join(self.BALANCING)}")
+        self.replicas = list(replicas)
+        self.balancing = balancing
+        self.sticky = sticky
+        self._lock = threading.Lock()
+        self._cycle = itertools.cycle(range(len(self.replicas)))
+        self._in_use: Dict[int, int] = {id(engine): 0 for engine in self.replicas}
+        for engine in self.replicas:
+            self._track_connections(engine)
+
+    def _track_connections(self, engine: Engine) -> None:
+        key = id(engine)
+
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self._in_use[key] += 1
+
+        def on_checkin(dbapi_connection, connection_record):
+            with self._lock:
+                self._in_use[key] = max(self._in_use[key] - 1, 0)
+
+        event.listen(engine, "checkout", on_checkout)
+        event.listen(engine, "checkin", on_checkin)
+
+    def connections_in_use(self, engine: Engine) -> int:
+        return self._in_use.get(id(engine), 0)
+
+    def choose(self) -> Engine:
+        with self._lock:
+            if self.balancing == "least_connections":
+                # Ties go to the next replica in turn, so idle replicas share the load
+                start = next(self._cycle)
+                order = self.replicas[start:] + self.replicas[:start]
+                return min(order, key=lambda engine: self._in_use[id(engine)])
+            return self.replicas[next(self._cycle)]
+
+
+class RoutingSession(Session):
+    """
+    Session sending SELECT statements to a read replica and everything else
+    (flushes, INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE, textual SQL) to the primary.
+    """
+
+    def __init__(self, *args, router: ReplicaRouter = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.router = router
+        self._primary_depth = 0
+        self._wrote = False
+
+    @contextlib.contextmanager
+    def use_primary(self) -> Generator["RoutingSession", None, None]:
+        """Sends every statement of the block to the primary"""
+        self._primary_depth += 1
+        try:
+            yield self
+        finally:
+            self._primary_depth -= 1
+
+    @property
+    def reads_from_primary(self) -> bool:
+        return self._primary_depth > 0 or (self._wrote and self.router.sticky)
+
+    @staticmethod
+    def is_read(clause) -> bool:
+        return bool(getattr(clause, "is_select", False)) and getattr(clause, "_for_update_arg", None) is None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.router is None:
+            return super().get_bind(mapper, clause=clause, **kw)
+        if self._flushing or not self.is_read(clause):
+            self._wrote = True
+            return super().get_bind(mapper, clause=clause, **kw)
+        if self.reads_from_primary:
+            return super().get_bind(mapper, clause=clause, **kw)
+        return self.router.choose()
@@ -0,0 +1,71 @@
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class LazySessionData(MutableMapping):
+    """
+    Dict-like proxy over the session data of the current request.
+
+    The loader (signature check + storage read) only runs the first time the
+    data is actually accessed, so requests that never touch the session do
+    no session I/O at all.
+    """
+
+    def __init__(self, loader: Callable[[], Optional[Dict[str, Any]]]):
+        self._loader = loader
+        self._data: Optional[Dict[str, Any]] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the session has been read (or written) during this request"""
+        return self._data is not None
+
+    def load(self) -> Dict[str, Any]:
+        """Load the session data if needed and return the underlying dict"""
+        if self._data is None:
+            self._data = self._loader() or {}
+            self._loader = None
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self.load()[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.load()[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.load()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.load())
+
+    def __len__(self) -> int:
+        return len(self.load())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.load()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.load().get(key, default)
+
+    def clear(self) -> None:
+        """Empty the session without reading it from storage first"""
+        self._data = {}
+        self._loader = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a plain dict copy suitable for serialization"""
+        return dict(self.load())
+
+    def __repr__(self) -> str:
+        if self._data is None:
+            return "LazySessionData(<not loaded>)"
+        return f"LazySessionData({self._data!r})"
@@ -1,7 +1,13 @@
-import json
+import heapq
 import logging
+import time
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+from framefox.core.request.session.serializer.session_payload_codec import (
+    SessionPayloadCodec,
+)
+from framefox.core.request.session.session_metrics import SessionMetrics
 
 """
 Framefox Framework developed by SOMA
@@ -20,9 +26,16 @@ class RedisSessionManager:
     Falls back gracefully if Redis is not available.
     """
 
-    def __init__(self, settings):
+    def __init__(
+        self,
+        settings,
+        codec: Optional[SessionPayloadCodec] = None,
+        metrics: Optional[SessionMetrics] = None,
+    ):
         self.settings = settings
         self.logger = logging.getLogger("REDIS_SESSION_MANAGER")
+        self.codec = codec or SessionPayloadCodec.from_settings(settings)
+        self.metrics = metrics or SessionMetrics("redis")
         self.redis_client = None
         self.prefix = self.settings.session_redis_prefix
         self.enabled = False
@@ -41,13 +54,13 @@ class RedisSessionManager:
             url = self.settings.session_redis_url
             parsed = urlparse(url)
 
-            # Create Redis client
+            # Create Redis client (raw bytes: payloads start with a format byte)
             self.redis_client = redis.Redis(
                 host=parsed.hostname or "localhost",
                 port=parsed.port or 6379,
                 db=self.settings.session_redis_db,
                 password=parsed.password,
-                decode_responses=True,
+                decode_responses=False,
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 retry_on_timeout=True,
@@ -75,28 +88,35 @@ class RedisSessionManager:
         if not self.is_enabled():
             return None
 
+        start = time.perf_counter()
         try:
             key = self._get_key(session_id)
             session_data = self.redis_client.hgetall(key)
 
             if not session_data:
+                self.metrics.record("get", time.perf_counter() - start, hit=False)
                 return None
 
             # Check if session has expired
-            expires_at = float(session_data.get("expires_at", 0))
+            expires_at = float(session_data.get(b"expires_at", 0))
             current_time = datetime.now(timezone.utc).timestamp()
 
             if expires_at < current_time:
                 self.delete_session(session_id)
+                self.metrics.record("get", time.perf_counter() - start, hit=False)
                 return None
 
-            return {
-                "data": json.loads(session_data.get("data", "{}")),
+            payload = session_data.get(b"data")
+            session = {
+                "data": self.codec.decode(payload),
                 "expires_at": expires_at,
             }
+            self.metrics.record("get", time.perf_counter() - start, size=len(payload), hit=True)
+            return session
 
         except Exception as e:
             self.logger.error(f"Error retrieving session {session_id} from Redis: {e}")
+            self.metrics.record("get", time.perf_counter() - start, hit=False, error=True)
             return None
 
     def create_session(self, session_id: str, data: Dict, max_age: int) -> None:
@@ -104,48 +124,64 @@ class RedisSessionManager:
         if not self.is_enabled():
             return
 
+        start = time.perf_counter()
         try:
             key = self._get_key(session_id)
             expires_at = datetime.now(timezone.utc).timestamp() + max_age
 
-            session_data = {"data": json.dumps(data), "expires_at": str(expires_at)}
+            payload = self.codec.encode(data)
+            session_data = {"data": payload, "expires_at": str(expires_at), "write_count": 1}
 
             # Store in Redis with TTL
-            self.redis_client.hset(key, mapping=session_data)
-            self.redis_client.expire(key, max_age)
+            pipeline = self.redis_client.pipeline()
+            pipeline.hset(key, mapping=session_data)
+            pipeline.expire(key, max_age)
+            pipeline.execute()
+            self.metrics.record("create", time.perf_counter() - start, size=len(payload))
 
         except Exception as e:
             self.logger.error(f"Error creating session {session_id} in Redis: {e}")
+            self.metrics.record("create", time.perf_counter() - start, error=True)
 
     def update_session(self, session_id: str, data: Dict, max_age: int) -> None:
         """Update an existing session and reset its expiration time"""
         if not self.is_enabled():
             return
 
+        start = time.perf_counter()
         try:
             key = self._get_key(session_id)
             expires_at = datetime.now(timezone.utc).timestamp() + max_age
 
-            session_data = {"data": json.dumps(data), "expires_at": str(expires_at)}
+            payload = self.codec.encode(data)
+            session_data = {"data": payload, "expires_at": str(expires_at)}
 
-            self.redis_client.hset(key, mapping=session_data)
-            self.redis_client.expire(key, max_age)
+            pipeline = self.redis_client.pipeline()
+            pipeline.hset(key, mapping=session_data)
+            pipeline.hincrby(key, "write_count", 1)
+            pipeline.expire(key, max_age)
+            pipeline.execute()
+            self.metrics.record("update", time.perf_counter() - start, size=len(payload))
 
         except Exception as e:
             self.logger.error(f"Error updating session {session_id} in Redis: {e}")
+            self.metrics.record("update", time.perf_counter() - start, error=True)
 
     def delete_session(self, session_id: str) -> bool:
         """Delete a session"""
         if not self.is_enabled():
             return False
 
+        start = time.perf_counter()
         try:
             key = self._get_key(session_id)
             result = self.redis_client.delete(key)
+            self.metrics.record("delete", time.perf_counter() - start)
             return result > 0
 
         except Exception as e:
             self.logger.error(f"Error deleting session {session_id} from Redis: {e}")
+            self.metrics.record("delete", time.perf_counter() - start, error=True)
             return False
 
     def cleanup_expired_sessions(self) -> None:
@@ -162,7 +198,7 @@ class RedisSessionManager:
                 try:
                     session_data = self.redis_client.hgetall(key)
                     if session_data:
-                        expires_at = float(session_data.get("expires_at", 0))
+                        expires_at = float(session_data.get(b"expires_at", 0))
                         if expires_at < current_time:
                             self.redis_client.delete(key)
                 except Exception:
@@ -171,6 +207,54 @@ class RedisSessionManager:
         except Exception as e:
             self.logger.error(f"Error during Redis session cleanup: {e}")
 
+    def inspect_sessions(self, limit: int = 10, sort: str = "size") -> List[Dict]:
+        """
+        List the largest (sort="size") or most written (sort="writes") sessions.
+        Sizes and write counts are read with HSTRLEN/HGET so payloads are only
+        fetched for the sessions that are returned.
+        """
+        if not self.is_enabled():
+            return []
+
+        candidates = []
+        try:
+            keys = list(self.redis_client.scan_iter(match=f"{self.prefix}*", count=100))
+            for offset in range(0, len(keys), 100):
+                batch = keys[offset : offset + 100]
+                pipeline = self.redis_client.pipeline()
+                for key in batch:
+                    pipeline.hstrlen(key, "data")
+                    pipeline.hget(key, "write_count")
+                results = pipeline.execute()
+                for position, key in enumerate(batch):
+                    size, write_count = results[2 * position], results[2 * position + 1]
+                    candidates.append((key, int(size or 0), int(write_count or 0)))
+
+            index = 1 if sort == "size" else 2
+            top = heapq.nlargest(limit, candidates, key=lambda item: item[index])
+
+            sessions = []
+            for key, size, write_count in top:
+                session_data = self.redis_client.hgetall(key)
+                if not session_data:
+                    continue
+                session_id = key.decode("utf-8")[len(self.prefix) :] if isinstance(key, bytes) else key[len(self.prefix) :]
+                sessions.append(
+                    SessionMetrics.describe_session(
+                        self.codec,
+                        session_id,
+                        session_data.get(b"data"),
+                        float(session_data.get(b"expires_at", 0)),
+                        write_count,
+                        size,
+                    )
+                )
+            return sessions
+
+        except Exception as e:
+            self.logger.error(f"Error inspecting Redis sessions: {e}")
+            return []
+
     def load_sessions(self) -> Dict:
         """Load all sessions (compatibility method - not efficient for Redis)"""
         return {}
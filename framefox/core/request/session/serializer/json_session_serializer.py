@@ -0,0 +1,27 @@
+import json
+from typing import Any, Dict
+
+from framefox.core.request.session.serializer.session_serializer_interface import (
+    SessionSerializerInterface,
+)
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class JsonSessionSerializer(SessionSerializerInterface):
+    """Standard library JSON serializer, always available."""
+
+    name = "json"
+    format_id = 1
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        return json.loads(payload)
@@ -0,0 +1,28 @@
+from typing import Any, Dict
+
+import msgpack
+
+from framefox.core.request.session.serializer.session_serializer_interface import (
+    SessionSerializerInterface,
+)
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class MsgpackSessionSerializer(SessionSerializerInterface):
+    """Binary serializer backed by msgpack, the most compact format."""
+
+    name = "msgpack"
+    format_id = 2
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
@@ -0,0 +1,33 @@
+from typing import Any, Dict
+
+import orjson
+
+from framefox.core.request.session.serializer.session_serializer_interface import (
+    SessionSerializerInterface,
+)
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class OrjsonSessionSerializer(SessionSerializerInterface):
+    """
+    JSON serializer backed by orjson.
+
+    Produces plain JSON, so it shares its format id with JsonSessionSerializer
+    and both can read each other's payloads.
+    """
+
+    name = "orjson"
+    format_id = 1
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data)
+
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        return orjson.loads(payload)
@@ -0,0 +1,72 @@
+from typing import Any, Dict, Optional, Union
+
+from framefox.core.request.session.serializer.json_session_serializer import (
+    JsonSessionSerializer,
+)
+from framefox.core.request.session.serializer.session_serializer_factory import (
+    SessionSerializerFactory,
+)
+from framefox.core.request.session.serializer.session_serializer_interface import (
+    SessionSerializerInterface,
+)
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class SessionPayloadCodec:
+    """
+    Frames serialized session data with a leading format byte.
+
+    Payloads are always written with the configured serializer, but any known
+    format can be read back. Rows stored before the format byte existed are
+    plain JSON text and are still decoded, so changing serializer does not
+    log anybody out: sessions are rewritten in the new format on their next save.
+    """
+
+    LEGACY_JSON_PREFIXES = (b"{", b"[")
+
+    def __init__(self, serializer: SessionSerializerInterface):
+        self.serializer = serializer
+        self._readers: Dict[int, SessionSerializerInterface] = {serializer.format_id: serializer}
+
+    @classmethod
+    def from_settings(cls, settings) -> "SessionPayloadCodec":
+        """Create a codec using the serializer configured in the settings"""
+        return cls(SessionSerializerFactory.create(settings.session_serializer))
+
+    def encode(self, data: Dict[str, Any]) -> bytes:
+        """Serialize session data and prefix it with the format byte"""
+        return bytes((self.serializer.format_id,)) + self.serializer.dumps(data)
+
+    def decode(self, payload: Optional[Union[bytes, str]]) -> Dict[str, Any]:
+        """
+        Deserialize a stored payload, whatever format it was written in.
+
+        Raises:
+            ValueError: If the payload is corrupted or uses an unknown format.
+        """
+        if not payload:
+            return {}
+
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+
+        if payload[:1] in self.LEGACY_JSON_PREFIXES:
+            return self._get_reader(JsonSessionSerializer.format_id).loads(payload)
+
+        return self._get_reader(payload[0]).loads(payload[1:])
+
+    def _get_reader(self, format_id: int) -> SessionSerializerInterface:
+        reader = self._readers.get(format_id)
+        if reader is None:
+            reader = SessionSerializerFactory.create_for_format(format_id)
+            if reader is None:
+                raise ValueError(f"Unsupported session payload format: {format_id}")
+            self._readers[format_id] = reader
+        return reader
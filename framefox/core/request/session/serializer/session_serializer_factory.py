@@ -0,0 +1,81 @@
+import logging
+from typing import Optional
+
+from framefox.core.request.session.serializer.json_session_serializer import (
+    JsonSessionSerializer,
+)
+from framefox.core.request.session.serializer.session_serializer_interface import (
+    SessionSerializerInterface,
+)
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class SessionSerializerFactory:
+    """
+    Builds session serializers by name.
+
+    orjson and msgpack are optional dependencies: when the configured one is
+    not installed, the error is logged and the JSON serializer is used instead.
+    """
+
+    SUPPORTED = ("json", "orjson", "msgpack")
+
+    @classmethod
+    def create(cls, name: str = "json") -> SessionSerializerInterface:
+        """Return the serializer registered under the given name"""
+        logger = logging.getLogger("SESSION_SERIALIZER")
+
+        if name not in cls.SUPPORTED:
+            logger.warning(f"Unknown session serializer '{name}', falling back to json. Supported: {', '.join(cls.SUPPORTED)}")
+            return JsonSessionSerializer()
+
+        try:
+            if name == "orjson":
+                from framefox.core.request.session.serializer.orjson_session_serializer import (
+                    OrjsonSessionSerializer,
+                )
+
+                return OrjsonSessionSerializer()
+
+            if name == "msgpack":
+                from framefox.core.request.session.serializer.msgpack_session_serializer import (
+                    MsgpackSessionSerializer,
+                )
+
+                return MsgpackSessionSerializer()
+        except ImportError as e:
+            logger.error(f"Session serializer '{name}' is not available: {e}. Install it with: pip install {name}")
+
+        return JsonSessionSerializer()
+
+    @classmethod
+    def create_for_format(cls, format_id: int) -> Optional[SessionSerializerInterface]:
+        """Return the fastest available serializer able to read the given format"""
+        if format_id == JsonSessionSerializer.format_id:
+            try:
+                from framefox.core.request.session.serializer.orjson_session_serializer import (
+                    OrjsonSessionSerializer,
+                )
+
+                return OrjsonSessionSerializer()
+            except ImportError:
+                return JsonSessionSerializer()
+
+        try:
+            from framefox.core.request.session.serializer.msgpack_session_serializer import (
+                MsgpackSessionSerializer,
+            )
+
+            if format_id == MsgpackSessionSerializer.format_id:
+                return MsgpackSessionSerializer()
+        except ImportError:
+            pass
+
+        return None
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class SessionSerializerInterface(ABC):
+    """
+    Contract for the encoders used to persist session payloads.
+
+    Each serializer declares the wire format it produces through ``format_id``.
+    The id is written as the first byte of every stored payload so that a
+    session written with one format can still be read after the configured
+    serializer has changed.
+    """
+
+    name: str = ""
+    format_id: int = 0
+
+    @abstractmethod
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        """Serialize the session data to bytes"""
+        pass
+
+    @abstractmethod
+    def loads(self, payload: bytes) -> Dict[str, Any]:
+        """Deserialize bytes produced by dumps"""
+        pass
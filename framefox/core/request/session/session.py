@@ -7,6 +7,7 @@ from framefox.core.config.settings import Settings
 from framefox.core.di.service_container import ServiceContainer
 from framefox.core.request.request_stack import RequestStack
 from framefox.core.request.session.flash_bag import FlashBag
+from framefox.core.request.session.lazy_session_data import LazySessionData
 from framefox.core.request.session.session_interface import SessionInterface
 
 """
@@ -28,6 +29,13 @@ class Session(SessionInterface):
         """Retrieve the current request via the RequestStack"""
         return RequestStack.get_request()
 
+    def _load_session_data(self, request: Request) -> Optional[Dict]:
+        """Force the lazy session data to load so the stored session ID is known"""
+        session_data = getattr(request.state, "session_data", None)
+        if isinstance(session_data, LazySessionData):
+            session_data.load()
+        return session_data
+
     def get(self, key: str, default: Any = None) -> Any:
         """Retrieve a value from the session"""
         request = self.get_request()
@@ -39,6 +47,7 @@ class Session(SessionInterface):
         if not hasattr(request.state, "session_data"):
             request.state.session_data = {}
 
+        self._load_session_data(request)
         if not hasattr(request.state, "session_id") or not request.state.session_id:
             request.state.session_id = str(uuid.uuid4())
 
@@ -61,16 +70,19 @@ class Session(SessionInterface):
         """Completely clear the session"""
         request = self.get_request()
         if hasattr(request.state, "session_data"):
-            request.state.session_data.clear()
+            # Resolves the stored session ID first, so invalidate() can still delete it
+            self._load_session_data(request).clear()
 
     def get_id(self) -> Optional[str]:
         """Retrieve the session ID"""
         request = self.get_request()
+        self._load_session_data(request)
         return getattr(request.state, "session_id", None)
 
     def migrate(self, destroy: bool = False) -> bool:
         """Migrate the session to a new ID"""
         request = self.get_request()
+        self._load_session_data(request)
         old_id = getattr(request.state, "session_id", None)
 
         new_id = str(uuid.uuid4())
@@ -102,11 +114,15 @@ class Session(SessionInterface):
 
     def save(self) -> None:
         """Save all session data"""
+        request = self.get_request()
+        session_data = getattr(request.state, "session_data", None)
+        if isinstance(session_data, LazySessionData) and not session_data.loaded:
+            return
+
         if self.has("_flash_initialized"):
             self._flash_bag.save_to_session(self)
-        request = self.get_request()
         session_id = self.get_id()
-        if session_id and hasattr(request.state, "session_data"):
+        if session_id and session_data is not None:
             session_manager = self.container.get_by_name("SessionManager")
             if session_manager:
-                session_manager.update_session(session_id, request.state.session_data, Settings().cookie_max_age)
+                session_manager.update_session(session_id, dict(request.state.session_data), Settings().cookie_max_age)
@@ -1,14 +1,18 @@
 import base64
 import hashlib
 import hmac
-import json
 import logging
 import os
 import sqlite3
+import time
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from framefox.core.config.settings import Settings
+from framefox.core.request.session.serializer.session_payload_codec import (
+    SessionPayloadCodec,
+)
+from framefox.core.request.session.session_metrics import SessionMetrics
 
 """
 Framefox Framework developed by SOMA
@@ -21,9 +25,12 @@ Github: https://github.com/RayenBou
 
 class SessionManager:
 
+    INSPECT_SORT_COLUMNS = {"size": "size", "writes": "write_count"}
+
     def __init__(self, settings: Settings):
         self.settings = settings
         self.logger = logging.getLogger("SESSION_MANAGER")
+        self.codec = SessionPayloadCodec.from_settings(settings)
 
         self.redis_manager = None
         if self.settings.session_redis_enabled:
@@ -32,7 +39,7 @@ class SessionManager:
                     RedisSessionManager,
                 )
 
-                self.redis_manager = RedisSessionManager(settings)
+                self.redis_manager = RedisSessionManager(settings, self.codec, SessionMetrics("redis"))
                 if self.redis_manager.is_enabled():
                     self.logger.info("Using Redis for session storage")
                 else:
@@ -44,7 +51,10 @@ class SessionManager:
             db_dir = os.path.dirname(os.path.abspath(self.settings.session_file_path))
             os.makedirs(db_dir, exist_ok=True)
             self.db_path = os.path.join(db_dir, "sessions.db")
+            self.metrics = SessionMetrics("sqlite")
             self._init_database()
+        else:
+            self.metrics = self.redis_manager.metrics
 
     def _is_using_redis(self) -> bool:
         """Check if we're using Redis for session storage"""
@@ -61,11 +71,16 @@ class SessionManager:
                 CREATE TABLE IF NOT EXISTS sessions (
                     session_id TEXT PRIMARY KEY,
                     data TEXT NOT NULL,
-                    expires_at REAL NOT NULL
+                    expires_at REAL NOT NULL,
+                    write_count INTEGER NOT NULL DEFAULT 0
                 )
             """
             )
 
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(sessions)")}
+            if "write_count" not in columns:
+                cursor.execute("ALTER TABLE sessions ADD COLUMN write_count INTEGER NOT NULL DEFAULT 0")
+
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_expires_at ON sessions(expires_at)")
 
             conn.commit()
@@ -79,26 +94,33 @@ class SessionManager:
             return self.redis_manager.get_session(session_id)
 
         # SQLite implementation
+        start = time.perf_counter()
         try:
             conn = sqlite3.connect(self.db_path)
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
 
+            # Expired rows stay until the next cleanup, they must not be read meanwhile
             cursor.execute(
-                "SELECT data, expires_at FROM sessions WHERE session_id = ?",
-                (session_id,),
+                "SELECT data, expires_at FROM sessions WHERE session_id = ? AND expires_at > ?",
+                (session_id, datetime.now(timezone.utc).timestamp()),
             )
             row = cursor.fetchone()
             conn.close()
 
             if row:
-                return {
-                    "data": json.loads(row["data"]),
+                session = {
+                    "data": self.codec.decode(row["data"]),
                     "expires_at": row["expires_at"],
                 }
-        except sqlite3.Error as e:
+                self.metrics.record("get", time.perf_counter() - start, size=len(row["data"]), hit=True)
+                return session
+        except (sqlite3.Error, ValueError) as e:
             self.logger.error(f"Error retrieving session {session_id}: {e}")
+            self.metrics.record("get", time.perf_counter() - start, hit=False, error=True)
+            return None
 
+        self.metrics.record("get", time.perf_counter() - start, hit=False)
         return None
 
     def create_session(self, session_id: str, data: Dict, max_age: int) -> None:
@@ -107,22 +129,25 @@ class SessionManager:
             self.redis_manager.create_session(session_id, data, max_age)
             return
 
+        start = time.perf_counter()
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
             expires_at = datetime.now(timezone.utc).timestamp() + max_age
-            serialized_data = json.dumps(data)
+            serialized_data = self.codec.encode(data)
 
             cursor.execute(
-                "INSERT OR REPLACE INTO sessions (session_id, data, expires_at) VALUES (?, ?, ?)",
+                "INSERT OR REPLACE INTO sessions (session_id, data, expires_at, write_count) VALUES (?, ?, ?, 1)",
                 (session_id, serialized_data, expires_at),
             )
 
             conn.commit()
             conn.close()
+            self.metrics.record("create", time.perf_counter() - start, size=len(serialized_data))
         except sqlite3.Error as e:
             self.logger.error(f"Error creating session {session_id}: {e}")
+            self.metrics.record("create", time.perf_counter() - start, error=True)
 
     def update_session(self, session_id: str, data: Dict, max_age: int) -> None:
         """Update an existing session and reset its expiration time"""
@@ -131,22 +156,25 @@ class SessionManager:
             return
 
         # SQLite implementation
+        start = time.perf_counter()
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
 
             expires_at = datetime.now(timezone.utc).timestamp() + max_age
-            serialized_data = json.dumps(data)
+            serialized_data = self.codec.encode(data)
 
             cursor.execute(
-                "UPDATE sessions SET data = ?, expires_at = ? WHERE session_id = ?",
+                "UPDATE sessions SET data = ?, expires_at = ?, write_count = write_count + 1 WHERE session_id = ?",
                 (serialized_data, expires_at, session_id),
             )
 
             conn.commit()
             conn.close()
+            self.metrics.record("update", time.perf_counter() - start, size=len(serialized_data))
         except Exception as e:
             self.logger.error(f"Error updating session {session_id}: {e}")
+            self.metrics.record("update", time.perf_counter() - start, error=True)
 
     def delete_session(self, session_id: str) -> bool:
         """Delete a session"""
@@ -154,6 +182,7 @@ class SessionManager:
             return self.redis_manager.delete_session(session_id)
 
         # SQLite implementation
+        start = time.perf_counter()
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -164,9 +193,11 @@ class SessionManager:
             conn.commit()
             conn.close()
 
+            self.metrics.record("delete", time.perf_counter() - start)
             return deleted
         except sqlite3.Error as e:
             self.logger.error(f"Error deleting session {session_id}: {e}")
+            self.metrics.record("delete", time.perf_counter() - start, error=True)
             return False
 
     def cleanup_expired_sessions(self) -> None:
@@ -176,6 +207,7 @@ class SessionManager:
             return
 
         # SQLite implementation
+        start = time.perf_counter()
         try:
             conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
@@ -189,8 +221,43 @@ class SessionManager:
 
             conn.commit()
             conn.close()
+            self.metrics.record("cleanup", time.perf_counter() - start)
         except sqlite3.Error as e:
             self.logger.error(f"Error cleaning up expired sessions: {e}")
+            self.metrics.record("cleanup", time.perf_counter() - start, error=True)
+
+    def inspect_sessions(self, limit: int = 10, sort: str = "size") -> List[Dict]:
+        """
+        List the largest (sort="size") or most written (sort="writes") sessions
+        with a breakdown of their heaviest keys
+        """
+        if sort not in self.INSPECT_SORT_COLUMNS:
+            raise ValueError(f"Unknown sort '{sort}', expected one of: {', '.join(self.INSPECT_SORT_COLUMNS)}")
+
+        if self._is_using_redis():
+            return self.redis_manager.inspect_sessions(limit, sort)
+
+        rows = []
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            order_by = self.INSPECT_SORT_COLUMNS[sort]
+            cursor.execute(
+                f"SELECT session_id, data, expires_at, write_count, length(data) AS size "
+                f"FROM sessions ORDER BY {order_by} DESC LIMIT ?",
+                (limit,),
+            )
+            rows = cursor.fetchall()
+            conn.close()
+        except sqlite3.Error as e:
+            self.logger.error(f"Error inspecting sessions: {e}")
+
+        return [
+            SessionMetrics.describe_session(self.codec, row["session_id"], row["data"], row["expires_at"], row["write_count"], row["size"])
+            for row in rows
+        ]
 
     # Compatibility methods - only used with SQLite
     def load_sessions(self) -> Dict:
@@ -209,7 +276,10 @@ class SessionManager:
 
             for row in rows:
                 session_id = row["session_id"]
-                data = json.loads(row["data"])
+                try:
+                    data = self.codec.decode(row["data"])
+                except ValueError:
+                    continue
                 expires_at = row["expires_at"]
                 sessions[session_id] = {"data": data, "expires_at": expires_at}
 
@@ -234,7 +304,7 @@ class SessionManager:
             cursor.execute("DELETE FROM sessions")
 
             for session_id, session_data in session_store.items():
-                serialized_data = json.dumps(session_data.get("data", {}))
+                serialized_data = self.codec.encode(session_data.get("data", {}))
                 expires_at = session_data.get("expires_at", 0)
 
                 cursor.execute(
@@ -0,0 +1,152 @@
+import heapq
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from framefox.core.debug.metrics.metrics_registry import MetricsRegistry
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+PAYLOAD_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class SessionMetrics:
+    """
+    Instrumentation for session store operations.
+
+    Feeds the process-wide MetricsRegistry (latency and payload size histograms,
+    hit/miss and write counters) and, while a request is being profiled, keeps
+    the list of operations performed for that request.
+    """
+
+    _request_operations: ContextVar[Optional[List[Dict]]] = ContextVar("session_operations", default=None)
+
+    def __init__(self, backend: str):
+        self.backend = backend
+        registry = MetricsRegistry()
+        self.operations = registry.counter(
+            "framefox_session_operations_total",
+            "Session store operations",
+            labels=("backend", "operation"),
+        )
+        self.errors = registry.counter(
+            "framefox_session_errors_total",
+            "Session store operations that failed",
+            labels=("backend", "operation"),
+        )
+        self.latency = registry.histogram(
+            "framefox_session_operation_seconds",
+            "Session store operation latency",
+            labels=("backend", "operation"),
+        )
+        self.payload_size = registry.histogram(
+            "framefox_session_payload_bytes",
+            "Serialized session payload size",
+            labels=("backend", "direction"),
+            buckets=PAYLOAD_BUCKETS,
+        )
+        self.lookups = registry.counter(
+            "framefox_session_lookups_total",
+            "Session lookups by result",
+            labels=("backend", "result"),
+        )
+        self.bytes_written = registry.counter(
+            "framefox_session_written_bytes_total",
+            "Bytes written to the session store",
+            labels=("backend",),
+        )
+
+    @classmethod
+    def start_request(cls) -> None:
+        """Start recording the operations of the current request"""
+        cls._request_operations.set([])
+
+    @classmethod
+    def get_request_operations(cls) -> List[Dict]:
+        return cls._request_operations.get() or []
+
+    def record(
+        self,
+        operation: str,
+        duration: float,
+        size: Optional[int] = None,
+        hit: Optional[bool] = None,
+        error: bool = False,
+    ) -> None:
+        """Record one store operation"""
+        self.operations.inc(backend=self.backend, operation=operation)
+        self.latency.observe(duration, backend=self.backend, operation=operation)
+        if error:
+            self.errors.inc(backend=self.backend, operation=operation)
+        if hit is not None:
+            self.lookups.inc(backend=self.backend, result="hit" if hit else "miss")
+        if size is not None:
+            direction = "read" if operation == "get" else "write"
+            self.payload_size.observe(size, backend=self.backend, direction=direction)
+            if direction == "write":
+                self.bytes_written.inc(size, backend=self.backend)
+
+        request_operations = self._request_operations.get()
+        if request_operations is not None:
+            request_operations.append(
+                {
+                    "operation": operation,
+                    "backend": self.backend,
+                    "duration": round(duration * 1000, 3),
+                    "size": size,
+                    "hit": hit,
+                    "error": error,
+                }
+            )
+
+    def snapshot(self) -> Dict:
+        """Return aggregated figures for this backend"""
+        hits = self.lookups.value(backend=self.backend, result="hit")
+        misses = self.lookups.value(backend=self.backend, result="miss")
+        reads = self.operations.value(backend=self.backend, operation="get")
+        writes = self.operations.value(backend=self.backend, operation="create") + self.operations.value(
+            backend=self.backend, operation="update"
+        )
+        return {
+            "backend": self.backend,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+            "reads": reads,
+            "writes": writes,
+            "writes_per_read": writes / reads if reads else 0.0,
+            "bytes_written": self.bytes_written.value(backend=self.backend),
+            "read_latency": self.latency.summary(backend=self.backend, operation="get"),
+            "write_latency": self.latency.summary(backend=self.backend, operation="update"),
+            "read_size": self.payload_size.summary(backend=self.backend, direction="read"),
+            "write_size": self.payload_size.summary(backend=self.backend, direction="write"),
+        }
+
+    @staticmethod
+    def describe_session(codec, session_id: str, payload, expires_at: float, write_count: int, size: int) -> Dict:
+        """Summarize a stored session payload: size, write count, heaviest keys and flash messages"""
+        description = {
+            "session_id": session_id,
+            "size": size,
+            "write_count": write_count,
+            "expires_at": expires_at,
+            "keys": [],
+            "flash_messages": 0,
+        }
+        try:
+            data = codec.decode(payload)
+        except ValueError as e:
+            description["error"] = str(e)
+            return description
+
+        key_sizes = ((key, len(codec.encode({key: value}))) for key, value in data.items())
+        description["keys"] = heapq.nlargest(5, key_sizes, key=lambda item: item[1])
+        flashes = data.get("_flash_messages")
+        if isinstance(flashes, dict):
+            description["flash_messages"] = sum(len(messages) for messages in flashes.values() if isinstance(messages, list))
+        return description
@@ -58,8 +58,7 @@ class Router:
         try:
             self._setup_handlers()
 
-            if self.settings.app_env == "dev":
-                self._register_framework_controllers()
+            self._register_framework_controllers()
 
             self._register_user_controllers()
 
@@ -120,7 +119,14 @@ class Router:
 
     def _register_framework_controllers(self):
         """Register framework-specific controllers (profiler, etc.)"""
-        framework_controllers = ["framefox.core.debug.profiler.profiler_controller.ProfilerController"]
+        framework_controllers = []
+        if self.settings.app_env == "dev":
+            framework_controllers.append("framefox.core.debug.profiler.profiler_controller.ProfilerController")
+        if self.settings.storage_download_enabled:
+            # S3Storage.url() falls back to /_files/ when the bucket has no public URL
+            framework_controllers.append("framefox.core.file.file_controller.FileController")
+        if self.settings.metrics_enabled:
+            framework_controllers.append("framefox.core.debug.metrics.metrics_controller.MetricsController")
 
         registered_count = 0
         for controller_path in framework_controllers:
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from framefox.core.task.entity.task import Task, TaskStatus
+from framefox.core.task.task_notifier import TaskNotifier, TaskSubscription
 
 """
 Framefox Framework developed by SOMA
@@ -27,10 +28,30 @@ class BrokerInterface(ABC):
         priority: int = 0,
         scheduled_for: Optional[datetime] = None,
         max_retries: int = 3,
+        task_id: Optional[str] = None,
     ) -> Task:
-        """Adds a task to the queue."""
+        """Adds a task to the queue, under task_id when given."""
         pass
 
+    def enqueue_many(self, tasks: List[Task]) -> List[Task]:
+        """Adds tasks built by the caller to their queues at once.
+
+        Falls back to one enqueue() per task for the brokers that cannot insert
+        them in bulk, keeping the IDs of the tasks the handles were given.
+        """
+        return [
+            self.enqueue(
+                name=task.name,
+                payload=task.get_payload(),
+                queue=task.queue,
+                priority=task.priority,
+                scheduled_for=task.scheduled_for,
+                max_retries=task.max_retries,
+                task_id=task.id,
+            )
+            for task in tasks
+        ]
+
     @abstractmethod
     def dequeue(self, queue: str = "default", batch_size: int = 1) -> List[Task]:
         """Retrieves tasks from the queue for processing."""
@@ -60,3 +81,12 @@ class BrokerInterface(ABC):
     def purge_failed_tasks(self, older_than_days: int = 30) -> int:
         """Cleans up failed tasks older than X days."""
         pass
+
+    @abstractmethod
+    def release(self, task: Task) -> None:
+        """Puts a dequeued task that never ran back in its queue."""
+        pass
+
+    def subscribe(self, queues: List[str]) -> TaskSubscription:
+        """Wake-up of the calling worker loop when a task is queued on one of queues."""
+        return TaskNotifier.get_instance().subscribe(queues)
@@ -7,6 +7,8 @@ from sqlmodel import and_, select
 from framefox.core.orm.entity_manager_interface import EntityManagerInterface
 from framefox.core.task.broker.broker_interface import BrokerInterface
 from framefox.core.task.entity.task import Task, TaskStatus
+from framefox.core.task.task_claimer import TaskClaimer
+from framefox.core.task.task_notifier import TaskNotifier, TaskSubscription
 
 
 class DatabaseBroker(BrokerInterface):
@@ -19,6 +21,8 @@ class DatabaseBroker(BrokerInterface):
     def __init__(self, entity_manager: EntityManagerInterface):
         self.entity_manager = entity_manager
         self.logger = logging.getLogger("DATABASE_BROKER")
+        self.claimer = TaskClaimer(entity_manager)
+        self.notifier = TaskNotifier.get_instance()
 
     def enqueue(
         self,
@@ -28,6 +32,7 @@ class DatabaseBroker(BrokerInterface):
         priority: int = 0,
         scheduled_for: Optional[datetime] = None,
         max_retries: int = 3,
+        task_id: Optional[str] = None,
     ) -> Task:
         task = Task(
             name=name,
@@ -36,40 +41,44 @@ class DatabaseBroker(BrokerInterface):
             scheduled_for=scheduled_for,
             max_retries=max_retries,
         )
+        if task_id is not None:
+            task.id = task_id
         task.set_payload(payload)
 
         self.entity_manager.persist(task)
+        if self.entity_manager.session.get_bind().dialect.name == "postgresql":
+            # Delivered to the LISTENing workers when the task is committed
+            self.entity_manager.session.execute(TaskNotifier.notify_statement(queue))
+        # A worker may run and delete the task as soon as it is committed: the
+        # instance returned is detached rather than expired by the commit
+        self.entity_manager.session.flush()
+        self.entity_manager.session.expunge(task)
         self.entity_manager.commit()
+        self.notifier.notify(queue)
         self.logger.info(f"Task {task.id} ({task.name}) added to queue '{queue}'")
         return task
 
-    def dequeue(self, queue: str = "default", batch_size: int = 1) -> List[Task]:
-        now = datetime.now()
-
-        statement = (
-            select(Task)
-            .where(
-                and_(
-                    Task.queue == queue,
-                    Task.status == TaskStatus.PENDING,
-                    (Task.scheduled_for == None) | (Task.scheduled_for <= now),
-                )
-            )
-            .order_by(Task.priority.desc(), Task.created_at)
-            .limit(batch_size)
-        )
-
-        tasks = self.entity_manager.exec_statement(statement)
-
-        if tasks:
-            for task in tasks:
-                task.status = TaskStatus.RUNNING
-                task.started_at = datetime.now()
-                self.entity_manager.persist(task)
+    def enqueue_many(self, tasks: List[Task]) -> List[Task]:
+        if not tasks:
+            return tasks
+        queues = list(dict.fromkeys(task.queue for task in tasks))
+        with self.entity_manager.transaction() as session:
+            # One multi-row INSERT and one transaction, the tasks stay out of the session
+            self.entity_manager.bulk_insert(Task, tasks)
+            if session.get_bind().dialect.name == "postgresql":
+                for queue in queues:
+                    session.execute(TaskNotifier.notify_statement(queue))
+        for queue in queues:
+            self.notifier.notify(queue)
+        self.logger.info(f"{len(tasks)} tasks added to queues {', '.join(queues)}")
+        return tasks
 
-            self.entity_manager.commit()
+    def dequeue(self, queue: str = "default", batch_size: int = 1) -> List[Task]:
+        return self.claimer.claim(queue, batch_size)
 
-        return tasks
+    def subscribe(self, queues: List[str]) -> TaskSubscription:
+        self.notifier.listen(self.entity_manager.session.get_bind())
+        return super().subscribe(queues)
 
     def complete_task(self, task: Task) -> None:
         self.logger.info(f"Task {task.id} ({task.name}) successfully completed - deleting")
@@ -87,7 +96,20 @@ class DatabaseBroker(BrokerInterface):
             self.logger.error(f"Task {task.id} ({task.name}) permanently failed: {error}")
 
         task.updated_at = datetime.now()
+        self._save(task)
+
+    def release(self, task: Task) -> None:
+        task.status = TaskStatus.PENDING
+        task.started_at = None
+        task.updated_at = datetime.now()
+        self._save(task)
+        self.logger.info(f"Task {task.id} ({task.name}) released to queue '{task.queue}'")
+
+    def _save(self, task: Task) -> None:
+        """Commits the changes of task, which stays readable from the worker loop once detached"""
         self.entity_manager.persist(task)
+        self.entity_manager.session.flush()
+        self.entity_manager.session.expunge(task)
         self.entity_manager.commit()
 
     def get_task(self, task_id: str) -> Optional[Task]:
@@ -36,6 +36,7 @@ class RabbitMQBroker(BrokerInterface):
         priority: int = 0,
         scheduled_for: Optional[datetime] = None,
         max_retries: int = 3,
+        task_id: Optional[str] = None,
     ) -> Task:
         task = Task(
             name=name,
@@ -44,6 +45,8 @@ class RabbitMQBroker(BrokerInterface):
             scheduled_for=scheduled_for,
             max_retries=max_retries,
         )
+        if task_id is not None:
+            task.id = task_id
         task.set_payload(payload)
 
         self.entity_manager.persist(task)
@@ -54,6 +57,16 @@ class RabbitMQBroker(BrokerInterface):
         self.logger.info(f"Task {task.id} ({task.name}) added to queue '{queue}' and published to RabbitMQ")
         return task
 
+    def enqueue_many(self, tasks: List[Task]) -> List[Task]:
+        if not tasks:
+            return tasks
+        self.entity_manager.bulk_insert(Task, tasks)
+
+        self.transport.publish_many(tasks)
+
+        self.logger.info(f"{len(tasks)} tasks added and published to RabbitMQ")
+        return tasks
+
     def dequeue(self, queue: str = "default", batch_size: int = 1) -> List[Task]:
         return self.transport.consume(queue, batch_size)
 
@@ -69,8 +82,7 @@ class RabbitMQBroker(BrokerInterface):
             task.retry_count += 1
             task.error_message = error
             task.updated_at = datetime.now()
-            self.entity_manager.persist(task)
-            self.entity_manager.commit()
+            self._save(task)
 
             self.transport.reject(task, requeue=True)
             self.logger.warning(f"Task {task.id} ({task.name}) failed, retrying {task.retry_count}/{task.max_retries}")
@@ -78,12 +90,27 @@ class RabbitMQBroker(BrokerInterface):
             task.status = TaskStatus.FAILED
             task.error_message = error
             task.updated_at = datetime.now()
-            self.entity_manager.persist(task)
-            self.entity_manager.commit()
+            self._save(task)
 
             self.transport.reject(task, requeue=False)
             self.logger.error(f"Task {task.id} ({task.name}) permanently failed: {error}")
 
+    def release(self, task: Task) -> None:
+        task.status = TaskStatus.PENDING
+        task.started_at = None
+        task.updated_at = datetime.now()
+        self._save(task)
+
+        self.transport.reject(task, requeue=True)
+        self.logger.info(f"Task {task.id} ({task.name}) released to queue '{task.queue}'")
+
+    def _save(self, task: Task) -> None:
+        """Commits the changes of task, which stays readable from the worker loop once detached"""
+        self.entity_manager.persist(task)
+        self.entity_manager.session.flush()
+        self.entity_manager.session.expunge(task)
+        self.entity_manager.commit()
+
     def get_task(self, task_id: str) -> Optional[Task]:
         return self.entity_manager.find(Task, task_id)
 
@@ -5,6 +5,8 @@ from typing import Callable, Optional, Union
 
 from framefox.core.di.service_container import ServiceContainer
 from framefox.core.task.broker.broker_interface import BrokerInterface
+from framefox.core.task.result.task_handle import TaskHandle
+from framefox.core.task.task_manager import TaskManager
 from framefox.core.task.worker_manager import WorkerManager
 
 
@@ -16,12 +18,19 @@ class AsyncTask:
         max_retries: int = 3,
         delay: Optional[Union[int, timedelta]] = None,
         schedule_at: Optional[datetime] = None,
+        executor: str = "thread",
+        timeout: Optional[float] = None,
     ):
+        # executor="process" runs a CPU-bound sync handler in the process pool of the
+        # worker, its arguments and result must then be picklable
+        # timeout (seconds) fails the task when it runs longer, tasks.worker.task_timeout otherwise
         self.queue = queue
         self.priority = priority
         self.max_retries = max_retries
         self.delay = delay
         self.schedule_at = schedule_at
+        self.executor = executor
+        self.timeout = timeout
 
     def __call__(self, func: Callable):
         if hasattr(func, "__qualname__") and "." in func.__qualname__:
@@ -32,7 +41,7 @@ class AsyncTask:
 
         is_coroutine = asyncio.iscoroutinefunction(func)
 
-        WorkerManager.register_task_handler(task_name, func, is_coroutine)
+        WorkerManager.register_task_handler(task_name, func, is_coroutine, executor=self.executor, timeout=self.timeout)
 
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
@@ -48,10 +57,7 @@ class AsyncTask:
         return wrapper
 
     def _create_delay_method(self, func: Callable, task_name: str) -> Callable:
-        def delay_execution(*args, **kwargs) -> str:
-            container = ServiceContainer()
-            broker = container.get(BrokerInterface)
-
+        def delay_execution(*args, **kwargs) -> TaskHandle:
             scheduled_for = self._calculate_schedule_time()
 
             payload = {}
@@ -60,6 +66,20 @@ class AsyncTask:
             if kwargs:
                 payload["kwargs"] = kwargs
 
+            # Inside a TaskManager.batch(), written with the rest of the batch
+            task = TaskManager.buffer(
+                name=task_name,
+                payload=payload,
+                queue=self.queue,
+                priority=self.priority,
+                scheduled_for=scheduled_for,
+                max_retries=self.max_retries,
+            )
+            if task is not None:
+                return TaskHandle(task.id)
+
+            container = ServiceContainer()
+            broker = container.get(BrokerInterface)
             task = broker.enqueue(
                 name=task_name,
                 payload=payload,
@@ -69,7 +89,8 @@ class AsyncTask:
                 max_retries=self.max_retries,
             )
 
-            return task.id
+            # await handle.result() once tasks.results.backend keeps the results
+            return TaskHandle(task.id)
 
         return delay_execution
 
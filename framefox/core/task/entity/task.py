@@ -4,6 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field
 
 from framefox.core.orm.abstract_entity import AbstractEntity
@@ -18,6 +19,9 @@ class TaskStatus(str, Enum):
 
 
 class Task(AbstractEntity, table=True):
+    # Serves the claim of the next due tasks of a queue (see TaskClaimer)
+    __table_args__ = (Index("ix_task_claim", "queue", "status", "scheduled_for", "priority", "created_at"),)
+
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
     name: str
     queue: str = "default"
@@ -0,0 +1,15 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, LargeBinary
+from sqlmodel import Field
+
+from framefox.core.orm.abstract_entity import AbstractEntity
+
+
+class TaskResult(AbstractEntity, table=True):
+    # Outcome of a task, kept by DatabaseResultBackend until expires_at
+    task_id: str = Field(primary_key=True)
+    payload: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    created_at: datetime = Field(default_factory=datetime.now)
+    expires_at: Optional[datetime] = Field(default=None, index=True)
@@ -0,0 +1,48 @@
+import math
+from typing import Dict, Iterable, List, Optional
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: Boumaza Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class QueueScheduler:
+    """
+    Shares the task slots of a worker between its queues by weight.
+
+    next() is a smooth weighted round robin over the queues having tasks ready:
+    with weights {"mails": 3, "reports": 1} and both queues busy, three mails
+    start for each report, interleaved rather than in bursts. A queue without
+    weight counts as 1.
+    """
+
+    def __init__(self, queues: Iterable[str], weights: Optional[Dict[str, int]] = None):
+        self.queues: List[str] = list(queues)
+        weights = weights or {}
+        for queue, weight in weights.items():
+            if weight < 1:
+                raise ValueError(f"The weight of queue '{queue}' must be at least 1")
+        self.weights = {queue: weights.get(queue, 1) for queue in self.queues}
+        self._current = {queue: 0 for queue in self.queues}
+
+    def next(self, ready: Iterable[str]) -> Optional[str]:
+        """The queue whose task starts next among the ready ones, None when none is ready"""
+        ready = set(ready)
+        ready = [queue for queue in self.queues if queue in ready]
+        if not ready:
+            return None
+        total = 0
+        for queue in ready:
+            self._current[queue] += self.weights[queue]
+            total += self.weights[queue]
+        chosen = max(ready, key=lambda queue: self._current[queue])
+        self._current[chosen] -= total
+        return chosen
+
+    def share(self, queue: str, slots: int) -> int:
+        """The part of slots going to queue, at least one"""
+        return max(1, math.ceil(slots * self.weights[queue] / sum(self.weights.values())))
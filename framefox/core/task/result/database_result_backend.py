@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, or_, select
+from sqlmodel import Session
+
+from framefox.core.orm.entity_manager import EntityManager
+from framefox.core.request.session.serializer.session_payload_codec import (
+    SessionPayloadCodec,
+)
+from framefox.core.task.entity.task_result import TaskResult
+from framefox.core.task.result.result_backend_interface import ResultBackendInterface
+from framefox.core.task.task_notifier import TaskNotifier
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: Boumaza Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class DatabaseResultBackend(ResultBackendInterface):
+    """
+    Outcomes kept in the task_result table, shared by every process using the database.
+
+    Each call uses a short session of its own, so the outcomes can be read
+    from any thread while the broker session is busy. On PostgreSQL the
+    outcome is announced with a NOTIFY on TaskNotifier.CHANNEL in the
+    transaction storing it, and waiters LISTEN to it; on the other databases
+    a waiter in another process than the worker sees the outcome on its next
+    check. Expired rows are ignored on read and deleted by purge_expired(),
+    which the worker calls with its cleanup.
+    """
+
+    name = "database"
+
+    def __init__(self, engine, ttl: Optional[int] = 3600, codec: Optional[SessionPayloadCodec] = None):
+        super().__init__(ttl, codec)
+        self.engine = engine
+
+    def _write(self, task_id: str, payload: bytes) -> None:
+        now = datetime.now()
+        row = {
+            "task_id": task_id,
+            "payload": payload,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=self.ttl) if self.ttl else None,
+        }
+        dialect_name = self.engine.dialect.name
+        with Session(self.engine) as session:
+            # A task run again after a crash overwrites its previous outcome
+            session.execute(EntityManager.upsert_statement(dialect_name, TaskResult, list(row), ["task_id"]), [row])
+            if dialect_name == "postgresql":
+                session.execute(TaskNotifier.notify_statement(self.notification_key(task_id)))
+            session.commit()
+
+    def _read(self, task_id: str) -> Optional[bytes]:
+        statement = select(TaskResult.payload).where(
+            TaskResult.task_id == task_id,
+            or_(TaskResult.expires_at.is_(None), TaskResult.expires_at > datetime.now()),
+        )
+        with Session(self.engine) as session:
+            return session.execute(statement).scalar_one_or_none()
+
+    async def wait(self, task_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        self.notifier.listen(self.engine)
+        return await super().wait(task_id, timeout)
+
+    def purge_expired(self) -> int:
+        with Session(self.engine) as session:
+            result = session.execute(delete(TaskResult).where(TaskResult.expires_at <= datetime.now()))
+            session.commit()
+            return result.rowcount
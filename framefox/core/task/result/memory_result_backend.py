@@ -0,0 +1,35 @@
+from typing import Optional
+
+from framefox.core.cache.memory_cache import MemoryCache
+from framefox.core.request.session.serializer.session_payload_codec import (
+    SessionPayloadCodec,
+)
+from framefox.core.task.result.result_backend_interface import ResultBackendInterface
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: Boumaza Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class MemoryResultBackend(ResultBackendInterface):
+    """
+    Outcomes kept in the memory of the process, for the tests and for
+    applications running their worker in the same process. Holds at most
+    max_entries outcomes, dropping the least recently used one.
+    """
+
+    name = "memory"
+
+    def __init__(self, ttl: Optional[int] = 3600, codec: Optional[SessionPayloadCodec] = None, max_entries: int = 10000):
+        super().__init__(ttl, codec)
+        self.cache = MemoryCache(max_entries=max_entries)
+
+    def _write(self, task_id: str, payload: bytes) -> None:
+        self.cache.set(task_id, payload, self.ttl)
+
+    def _read(self, task_id: str) -> Optional[bytes]:
+        return self.cache.get(task_id)
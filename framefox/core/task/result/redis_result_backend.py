@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Optional
+
+from framefox.core.request.session.serializer.session_payload_codec import (
+    SessionPayloadCodec,
+)
+from framefox.core.task.result.result_backend_interface import ResultBackendInterface
+from framefox.core.task.task_notifier import TaskSubscription
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: Boumaza Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class RedisResultBackend(ResultBackendInterface):
+    """
+    Outcomes kept in Redis, which expires them after ttl seconds.
+
+    Storing an outcome also pushes a token on a list of the task, on which
+    the waiters block with BLMOVE (the list moved onto itself, so every
+    waiter sees the token): the worker wakes them up from any process. Each
+    waiter holds a connection of the pool while it blocks.
+    Requires redis 6.2+ and the redis package (pip install redis).
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379",
+        prefix: str = "framefox:result:",
+        db: int = 0,
+        ttl: Optional[int] = 3600,
+        codec: Optional[SessionPayloadCodec] = None,
+        client=None,
+    ):
+        super().__init__(ttl, codec)
+        self.prefix = prefix
+        self.logger = logging.getLogger("REDIS_RESULT_BACKEND")
+        self.client = client or self._create_client(url, db)
+
+    def _create_client(self, url: str, db: int):
+        try:
+            import redis
+        except ImportError as e:
+            self.logger.error(f"Redis package not installed: {e}. To enable the Redis result backend, install with: pip install redis")
+            raise
+
+        # No socket timeout: a waiter blocks on the connection until its outcome is stored
+        return redis.Redis.from_url(url, db=db, socket_connect_timeout=2)
+
+    def _write(self, task_id: str, payload: bytes) -> None:
+        key = self.prefix + task_id
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.set(key, payload, ex=self.ttl or None)
+        pipeline.rpush(f"{key}:done", 1)
+        if self.ttl:
+            pipeline.expire(f"{key}:done", self.ttl)
+        pipeline.execute()
+
+    def _read(self, task_id: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + task_id)
+
+    async def _wait_notified(self, task_id: str, subscription: TaskSubscription, seconds: float) -> None:
+        key = f"{self.prefix}{task_id}:done"
+        try:
+            await asyncio.to_thread(self.client.blmove, key, key, seconds, "RIGHT", "LEFT")
+        except Exception as e:
+            self.logger.warning(f"Waiting for the result of task {task_id} failed: {e}")
+            await subscription.wait(seconds)
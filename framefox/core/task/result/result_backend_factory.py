@@ -0,0 +1,69 @@
+import logging
+from typing import Dict, Optional
+
+from framefox.core.request.session.serializer.session_payload_codec import (
+    SessionPayloadCodec,
+)
+from framefox.core.request.session.serializer.session_serializer_factory import (
+    SessionSerializerFactory,
+)
+from framefox.core.task.result.result_backend_interface import ResultBackendInterface
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: Boumaza Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class ResultBackendFactory:
+    """Creates the task result backend from the tasks.results configuration (backend, ttl, serializer, redis)"""
+
+    SUPPORTED = ("none", "memory", "database", "redis")
+
+    @staticmethod
+    def create(config: Dict, engine=None) -> Optional[ResultBackendInterface]:
+        """Returns None when the results are not kept (the default)"""
+        logger = logging.getLogger("RESULT_BACKEND_FACTORY")
+        backend = config.get("backend") or "none"
+        ttl = config.get("ttl", 3600)
+        codec = SessionPayloadCodec(SessionSerializerFactory.create(config.get("serializer", "msgpack")))
+
+        if backend == "none":
+            return None
+
+        if backend == "memory":
+            from framefox.core.task.result.memory_result_backend import (
+                MemoryResultBackend,
+            )
+
+            return MemoryResultBackend(ttl=ttl, codec=codec, max_entries=int(config.get("max_entries", 10000)))
+
+        if backend == "redis":
+            redis_config = config.get("redis", {})
+            try:
+                from framefox.core.task.result.redis_result_backend import (
+                    RedisResultBackend,
+                )
+
+                return RedisResultBackend(
+                    url=redis_config.get("url", "redis://localhost:6379"),
+                    prefix=redis_config.get("prefix", "framefox:result:"),
+                    db=int(redis_config.get("db", 0)),
+                    ttl=ttl,
+                    codec=codec,
+                )
+            except ImportError:
+                logger.error("Falling back to the database result backend")
+        elif backend != "database":
+            logger.error(
+                f"Unknown result backend '{backend}', expected one of: {', '.join(ResultBackendFactory.SUPPORTED)}. Using the database"
+            )
+
+        from framefox.core.task.result.database_result_backend import (
+            DatabaseResultBackend,
+        )
+
+        return DatabaseResultBackend(engine, ttl=ttl, codec=codec)
@@ -0,0 +1,106 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from framefox.core.request.session.serializer.session_payload_codec import (
+    SessionPayloadCodec,
+)
+from framefox.core.request.session.serializer.session_serializer_factory import (
+    SessionSerializerFactory,
+)
+from framefox.core.task.task_notifier import TaskNotifier, TaskSubscription
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: Boumaza Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class ResultBackendInterface(ABC):
+    """
+    Keeps the outcome of the tasks for ttl seconds so that their TaskHandle can await it.
+
+    An outcome is a dict: {"status": "completed", "value": ...} or
+    {"status": "failed", "error": "..."}, written with the session payload
+    codec (msgpack by default, JSON when msgpack is not installed), so values
+    must be msgpack or JSON serializable. Waiters are woken up through the
+    TaskNotifier when an outcome is stored, and check the backend again after
+    a growing delay in case the notification came from another process.
+    """
+
+    name: str = None
+
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    # Delays between two checks of a waiter, doubling from the first to the second
+    MIN_CHECK_INTERVAL = 0.05
+    MAX_CHECK_INTERVAL = 2.0
+
+    def __init__(self, ttl: Optional[int] = 3600, codec: Optional[SessionPayloadCodec] = None):
+        self.ttl = ttl
+        self.codec = codec or SessionPayloadCodec(SessionSerializerFactory.create("msgpack"))
+        self.notifier = TaskNotifier.get_instance()
+
+    @abstractmethod
+    def _write(self, task_id: str, payload: bytes) -> None:
+        """Stores the encoded outcome of task_id for ttl seconds"""
+        pass
+
+    @abstractmethod
+    def _read(self, task_id: str) -> Optional[bytes]:
+        """Returns the encoded outcome of task_id, None when missing or expired"""
+        pass
+
+    def store_result(self, task_id: str, value: Any) -> None:
+        """Stores the return value of a completed task, raises TypeError when it cannot be serialized"""
+        self._store(task_id, {"status": self.COMPLETED, "value": value})
+
+    def store_error(self, task_id: str, error: str) -> None:
+        """Stores the error of a task that failed for good"""
+        self._store(task_id, {"status": self.FAILED, "error": error})
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the outcome of task_id, None while the task has not finished"""
+        payload = self._read(task_id)
+        return self.codec.decode(payload) if payload else None
+
+    async def wait(self, task_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Waits for the outcome of task_id, None when timeout seconds went by first"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+        delay = self.MIN_CHECK_INTERVAL
+        subscription = self.notifier.subscribe([self.notification_key(task_id)])
+        try:
+            while True:
+                subscription.clear()
+                outcome = await asyncio.to_thread(self.get, task_id)
+                if outcome is not None:
+                    return outcome
+                seconds = delay if deadline is None else min(delay, deadline - loop.time())
+                if seconds <= 0:
+                    return None
+                await self._wait_notified(task_id, subscription, seconds)
+                delay = min(delay * 2, self.MAX_CHECK_INTERVAL)
+        finally:
+            subscription.close()
+
+    def purge_expired(self) -> int:
+        """Removes the expired outcomes the backend does not expire by itself, returns how many"""
+        return 0
+
+    @staticmethod
+    def notification_key(task_id: str) -> str:
+        """The TaskNotifier key notified when the outcome of task_id is stored"""
+        return f"result:{task_id}"
+
+    def _store(self, task_id: str, outcome: Dict[str, Any]) -> None:
+        self._write(task_id, self.codec.encode(outcome))
+        self.notifier.notify(self.notification_key(task_id))
+
+    async def _wait_notified(self, task_id: str, subscription: TaskSubscription, seconds: float) -> None:
+        """Returns after seconds, or as soon as the outcome of task_id may have been stored"""
+        await subscription.wait(seconds)
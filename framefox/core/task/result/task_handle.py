@@ -0,0 +1,73 @@
+from typing import Any, Dict, Optional
+
+from framefox.core.debug.exception.di_exception import ServiceContainerError
+from framefox.core.di.service_container import ServiceContainer
+from framefox.core.task.result.result_backend_interface import ResultBackendInterface
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: Boumaza Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class TaskFailedError(Exception):
+    """Raised by TaskHandle.result() when the task failed for good"""
+
+    def __init__(self, task_id: str, error: str):
+        self.task_id = task_id
+        self.error = error
+        super().__init__(f"Task {task_id} failed: {error}")
+
+
+class TaskHandle(str):
+    """
+    ID of a queued task, returned by delay() and TaskManager.queue_task().
+
+    Still the plain task ID wherever a string is expected; result() awaits
+    the outcome of the task from the result backend configured under
+    tasks.results.
+    """
+
+    def __new__(cls, task_id: str, backend: Optional[ResultBackendInterface] = None):
+        handle = super().__new__(cls, task_id)
+        handle.backend = backend
+        return handle
+
+    @property
+    def id(self) -> str:
+        return str(self)
+
+    async def result(self, timeout: Optional[float] = None) -> Any:
+        """
+        Waits for the task to finish and returns the value returned by its handler.
+
+        Raises:
+            TaskFailedError: If the task failed and has no retry left.
+            TimeoutError: If the task has not finished after timeout seconds.
+        """
+        outcome = await self._get_backend().wait(self.id, timeout)
+        if outcome is None:
+            raise TimeoutError(f"Task {self.id} has not finished after {timeout}s")
+        return self._unwrap(outcome)
+
+    def ready(self) -> bool:
+        """Whether the task has finished, without waiting"""
+        return self._get_backend().get(self.id) is not None
+
+    def _unwrap(self, outcome: Dict[str, Any]) -> Any:
+        if outcome.get("status") == ResultBackendInterface.FAILED:
+            raise TaskFailedError(self.id, outcome.get("error"))
+        return outcome.get("value")
+
+    def _get_backend(self) -> ResultBackendInterface:
+        if self.backend is None:
+            try:
+                self.backend = ServiceContainer().get(ResultBackendInterface)
+            except ServiceContainerError:
+                self.backend = None
+            if self.backend is None:
+                raise RuntimeError("No task result backend configured, set tasks.results.backend to keep the results")
+        return self.backend
@@ -0,0 +1,91 @@
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import and_, or_, select, update
+
+from framefox.core.orm.entity_manager_interface import EntityManagerInterface
+from framefox.core.task.entity.task import Task, TaskStatus
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: Boumaza Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class TaskClaimer:
+    """Atomically moves due PENDING tasks of a queue to RUNNING for one worker.
+
+    The candidates are chosen and flagged by a single UPDATE, so two workers
+    polling the same queue never get the same task. On PostgreSQL the candidate
+    subquery is locked with FOR UPDATE SKIP LOCKED and the claimed ids come back
+    with RETURNING; SQLite (3.35+) serializes writers and uses the same
+    UPDATE ... WHERE id IN (subquery) RETURNING. MySQL can neither return rows
+    from an UPDATE nor LIMIT an IN subquery, so the ids are locked first with
+    SELECT ... FOR UPDATE SKIP LOCKED and flagged by one UPDATE in the same
+    transaction.
+    """
+
+    SKIP_LOCKED_DIALECTS = ("postgresql", "mysql", "mariadb")
+
+    def __init__(self, entity_manager: EntityManagerInterface):
+        self.entity_manager = entity_manager
+
+    def claim(self, queue: str = "default", batch_size: int = 1) -> List[Task]:
+        if batch_size < 1:
+            return []
+        now = datetime.now()
+        with self.entity_manager.transaction() as session:
+            dialect = session.get_bind().dialect
+            candidates = self._candidates(queue, batch_size, now)
+            if dialect.name in self.SKIP_LOCKED_DIALECTS:
+                candidates = candidates.with_for_update(skip_locked=True)
+
+            if dialect.update_returning:
+                statement = self._claim_statement(Task.id.in_(candidates.scalar_subquery()), now).returning(Task.id)
+                ids = list(session.execute(statement).scalars())
+            else:
+                ids = list(session.execute(candidates).scalars())
+                if ids:
+                    session.execute(self._claim_statement(Task.id.in_(ids), now))
+        if not ids:
+            return []
+
+        # The commit expired the claimed tasks: load them all at once rather
+        # than one refresh per task, in the order of the queue
+        session = self.entity_manager.session
+        statement = select(Task).where(Task.id.in_(ids)).order_by(Task.priority.desc(), Task.created_at)
+        tasks = list(session.execute(statement, execution_options={"populate_existing": True}).scalars())
+        # Detached: the tasks are read by the worker while other commits of the
+        # session go on, an expired task would be refreshed from another thread
+        for task in tasks:
+            session.expunge(task)
+        return tasks
+
+    @staticmethod
+    def _candidates(queue: str, batch_size: int, now: datetime):
+        return (
+            select(Task.id)
+            .where(
+                and_(
+                    Task.queue == queue,
+                    Task.status == TaskStatus.PENDING,
+                    or_(Task.scheduled_for.is_(None), Task.scheduled_for <= now),
+                )
+            )
+            .order_by(Task.priority.desc(), Task.created_at)
+            .limit(batch_size)
+        )
+
+    @staticmethod
+    def _claim_statement(selection, now: datetime):
+        # Re-checking the status keeps a row claimed by another worker between
+        # the subquery and the update (READ COMMITTED re-evaluation) out of the batch
+        return (
+            update(Task)
+            .where(selection, Task.status == TaskStatus.PENDING)
+            .values(status=TaskStatus.RUNNING, started_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
@@ -1,10 +1,15 @@
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
-from typing import Callable, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 
 from framefox.core.config.settings import Settings
 from framefox.core.di.service_container import ServiceContainer
 from framefox.core.task.broker.broker_interface import BrokerInterface
+from framefox.core.task.entity.task import Task
+from framefox.core.task.result.result_backend_interface import ResultBackendInterface
+from framefox.core.task.result.task_handle import TaskHandle
 from framefox.core.task.worker_service_provider import WorkerServiceProvider
 
 """
@@ -15,6 +20,9 @@ Author: Boumaza Rayen
 Github: https://github.com/RayenBou
 """
 
+# Tasks queued inside TaskManager.batch(), per thread and per asyncio task
+_batch: ContextVar[Optional[List[Task]]] = ContextVar("framefox_task_batch", default=None)
+
 
 class TaskManager:
     """
@@ -22,8 +30,9 @@ class TaskManager:
     Allows creating and sending tasks to queues in a generic way.
     """
 
-    def __init__(self, broker: BrokerInterface):
+    def __init__(self, broker: BrokerInterface, result_backend: Optional[ResultBackendInterface] = None):
         self.broker = broker
+        self.result_backend = result_backend
         self.container = ServiceContainer()
         self.logger = logging.getLogger("TASK_MANAGER")
         settings = Settings()
@@ -38,7 +47,7 @@ class TaskManager:
         delay: Optional[Union[int, timedelta]] = None,
         schedule_at: Optional[datetime] = None,
         **kwargs,
-    ) -> str:
+    ) -> TaskHandle:
         """
         Adds a task to the queue for asynchronous execution.
 
@@ -52,16 +61,9 @@ class TaskManager:
             **kwargs: Arguments to pass to the task
 
         Returns:
-            ID of the created task
+            Handle of the created task, its ID awaiting the result with result()
         """
-        if self.broker is None:
-
-            self.broker = self.container.get(BrokerInterface)
-            if self.broker is None:
-                WorkerServiceProvider.register()
-                self.broker = self.container.get(BrokerInterface)
-            if self.broker is None:
-                raise RuntimeError("Unable to initialize the task broker")
+        self._ensure_broker()
 
         queue = queue if queue is not None else self.defaults.get("queue")
         priority = priority if priority is not None else self.defaults.get("priority")
@@ -70,6 +72,17 @@ class TaskManager:
         task_name = self._get_task_name(task)
         payload = {"kwargs": kwargs}
 
+        task_entity = self.buffer(
+            name=task_name,
+            payload=payload,
+            queue=queue,
+            priority=priority,
+            scheduled_for=scheduled_for,
+            max_retries=max_retries,
+        )
+        if task_entity is not None:
+            return TaskHandle(task_entity.id, self.result_backend)
+
         task_entity = self.broker.enqueue(
             name=task_name,
             payload=payload,
@@ -80,7 +93,79 @@ class TaskManager:
         )
 
         self.logger.info(f"Task {task_entity.id} ({task_name}) queued")
-        return task_entity.id
+        return TaskHandle(task_entity.id, self.result_backend)
+
+    def queue_many(self, tasks: Iterable[Dict[str, Any]]) -> List[TaskHandle]:
+        """
+        Adds several tasks to their queues in one bulk insert.
+
+        Args:
+            tasks: The arguments of queue_task for each task, e.g.
+                [{"task": send_mail, "queue": "mails", "user_id": 1}, ...]
+
+        Returns:
+            Handles of the created tasks
+        """
+        with self.batch():
+            return [self.queue_task(**arguments) for arguments in tasks]
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Buffers the tasks queued inside the block, through queue_task or the
+        delay() of an @AsyncTask, and writes them in one bulk insert when the
+        block exits. Nothing is queued if the block raises. A batch opened
+        inside another one joins it.
+        """
+        if _batch.get() is not None:
+            yield
+            return
+
+        token = _batch.set([])
+        try:
+            yield
+            tasks = _batch.get()
+        finally:
+            _batch.reset(token)
+
+        if tasks:
+            self._ensure_broker()
+            self.broker.enqueue_many(tasks)
+            self.logger.info(f"{len(tasks)} tasks queued")
+
+    @staticmethod
+    def buffer(
+        name: str,
+        payload: Dict[str, Any],
+        queue: str = "default",
+        priority: int = 0,
+        scheduled_for: Optional[datetime] = None,
+        max_retries: int = 3,
+    ) -> Optional[Task]:
+        """Adds the task to the current batch, returns None outside of a batch"""
+        tasks = _batch.get()
+        if tasks is None:
+            return None
+        task = Task(
+            name=name,
+            queue=queue,
+            priority=priority,
+            scheduled_for=scheduled_for,
+            max_retries=max_retries,
+        )
+        task.set_payload(payload)
+        tasks.append(task)
+        return task
+
+    def _ensure_broker(self) -> None:
+        if self.broker is None:
+
+            self.broker = self.container.get(BrokerInterface)
+            if self.broker is None:
+                WorkerServiceProvider.register()
+                self.broker = self.container.get(BrokerInterface)
+            if self.broker is None:
+                raise RuntimeError("Unable to initialize the task broker")
 
     def _get_task_name(self, task: Union[str, Callable]) -> str:
         """Determines the full name of the task from different types of arguments"""
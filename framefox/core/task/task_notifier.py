@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import select
+import threading
+import weakref
+from typing import Iterable, List
+
+from sqlalchemy import text
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: Boumaza Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class TaskSubscription:
+    """Wake-up of one worker loop, set when a task is queued on one of its queues.
+
+    The worker clears it before claiming tasks and waits on it when the claim
+    came back empty, so a task queued in between is never missed.
+    """
+
+    def __init__(self, notifier: "TaskNotifier", queues: Iterable[str], loop: asyncio.AbstractEventLoop):
+        self.notifier = notifier
+        self.queues = set(queues)
+        self.loop = loop
+        self.event = asyncio.Event()
+
+    def clear(self) -> None:
+        self.event.clear()
+
+    def set(self) -> None:
+        """Thread-safe, may be called from any thread"""
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            # The loop of the worker is closed
+            self.close()
+
+    async def wait(self, timeout: float) -> bool:
+        """Waits for a task to be queued, False when timeout seconds went by first"""
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def close(self) -> None:
+        self.notifier.unsubscribe(self)
+
+
+class TaskNotifier:
+    """
+    Wakes the workers up when a task is queued instead of leaving them to poll.
+
+    notify() wakes the workers of the current process (producer and worker
+    sharing a process). On PostgreSQL the brokers also send a NOTIFY on CHANNEL
+    in the transaction of the enqueue, and listen() starts a thread LISTENing
+    on it which wakes the workers of this process up, wherever the task was
+    queued from.
+    """
+
+    _instance = None
+
+    CHANNEL = "framefox_tasks"
+
+    def __init__(self):
+        self.logger = logging.getLogger("TASK_NOTIFIER")
+        self._lock = threading.Lock()
+        self._subscriptions: List[TaskSubscription] = []
+        self._listeners: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def get_instance(cls) -> "TaskNotifier":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def subscribe(self, queues: Iterable[str]) -> TaskSubscription:
+        """Subscribes the running event loop to the tasks queued on queues"""
+        subscription = TaskSubscription(self, queues, asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: TaskSubscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def notify(self, queue: str) -> None:
+        """Wakes the workers of this process consuming queue"""
+        with self._lock:
+            subscriptions = [subscription for subscription in self._subscriptions if queue in subscription.queues]
+        for subscription in subscriptions:
+            subscription.set()
+
+    @classmethod
+    def notify_statement(cls, queue: str):
+        """The PostgreSQL NOTIFY sent when the transaction queuing a task on queue commits"""
+        return text("SELECT pg_notify(:channel, :queue)").bindparams(channel=cls.CHANNEL, queue=queue)
+
+    def listen(self, engine) -> bool:
+        """
+        Starts (once per engine) the thread LISTENing to the tasks queued on a
+        PostgreSQL database. Returns False when the database cannot notify, the
+        workers then rely on polling alone.
+        """
+        if engine.dialect.name != "postgresql" or engine.dialect.driver != "psycopg2":
+            return False
+        with self._lock:
+            if engine not in self._listeners:
+                listener = PostgresTaskListener(self, engine)
+                self._listeners[engine] = listener
+                listener.start()
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            listeners = list(self._listeners.values())
+            self._listeners.clear()
+            self._subscriptions.clear()
+        for listener in listeners:
+            listener.stop()
+
+
+class PostgresTaskListener(threading.Thread):
+    """LISTENs on TaskNotifier.CHANNEL on a dedicated psycopg2 connection and forwards the notifications"""
+
+    def __init__(self, notifier: TaskNotifier, engine, timeout: float = 1.0):
+        super().__init__(name="framefox-task-listener", daemon=True)
+        self.notifier = notifier
+        self.engine = engine
+        self.timeout = timeout
+        self.logger = logging.getLogger("TASK_NOTIFIER")
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def run(self) -> None:
+        failures = 0
+        while not self._stopped.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                failures = 0
+                while not self._stopped.is_set():
+                    if select.select([connection], [], [], self.timeout)[0]:
+                        connection.poll()
+                        while connection.notifies:
+                            self.notifier.notify(connection.notifies.pop(0).payload)
+            except Exception as e:
+                failures += 1
+                self.logger.warning(f"Task notifications interrupted, workers fall back to polling: {e}")
+                self._stopped.wait(min(30, 2 ** min(failures, 5)))
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def _connect(self):
+        # A connection of its own, LISTEN keeps it busy for the life of the worker
+        connection = self.engine.raw_connection()
+        driver_connection = connection.driver_connection
+        connection.detach()
+        driver_connection.autocommit = True
+        with driver_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {TaskNotifier.CHANNEL}")
+        self.logger.debug(f"Listening to task notifications on {TaskNotifier.CHANNEL}")
+        return driver_connection
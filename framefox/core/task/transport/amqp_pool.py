@@ -0,0 +1,232 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, List, Optional, Set
+
+import pika
+from pika.adapters.asyncio_connection import AsyncioConnection
+from pika.spec import Basic
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: Boumaza Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class AmqpError(ConnectionError):
+    """A channel or a connection closed, or RabbitMQ refused a message"""
+
+
+class AmqpChannel:
+    """
+    Awaitable wrapper of a channel of a pika AsyncioConnection.
+
+    The pika methods taking a callback are awaited through call(). In confirm
+    mode publish() returns a future resolved once RabbitMQ confirms the
+    message, RabbitMQ confirming a batch of messages with a single Basic.Ack.
+    Waiters and unconfirmed messages fail with AmqpError when the channel
+    closes.
+    """
+
+    OPEN_TIMEOUT = 10
+
+    def __init__(self, channel, loop: asyncio.AbstractEventLoop):
+        self.channel = channel
+        self.loop = loop
+        self.is_open = True
+        self.closed = loop.create_future()
+        self._waiters: Set[asyncio.Future] = set()
+        self._confirms: Dict[int, asyncio.Future] = {}
+        self._published = 0
+        channel.add_on_close_callback(self._on_close)
+
+    @classmethod
+    async def open(cls, connection, loop: asyncio.AbstractEventLoop, confirm: bool = False) -> "AmqpChannel":
+        opened = loop.create_future()
+        connection.channel(on_open_callback=lambda channel: opened.done() or opened.set_result(channel))
+        channel = cls(await asyncio.wait_for(opened, cls.OPEN_TIMEOUT), loop)
+        if confirm:
+            await channel.call(channel.channel.confirm_delivery, channel._on_confirm)
+        return channel
+
+    async def call(self, method: Callable, *args, **kwargs):
+        """Calls a pika method taking a callback and waits for the reply of RabbitMQ"""
+        if not self.is_open:
+            raise AmqpError("Channel closed")
+        reply = self.loop.create_future()
+        self._waiters.add(reply)
+        try:
+            method(*args, callback=lambda frame: reply.done() or reply.set_result(frame), **kwargs)
+            return await reply
+        finally:
+            self._waiters.discard(reply)
+
+    def publish(self, exchange: str, routing_key: str, body: str, properties: pika.BasicProperties) -> asyncio.Future:
+        if not self.is_open:
+            raise AmqpError("Channel closed")
+        self.channel.basic_publish(exchange=exchange, routing_key=routing_key, body=body, properties=properties)
+        self._published += 1
+        confirmed = self.loop.create_future()
+        self._confirms[self._published] = confirmed
+        return confirmed
+
+    def close(self) -> None:
+        if self.is_open:
+            self.channel.close()
+
+    def _on_confirm(self, frame) -> None:
+        method = frame.method
+        if method.multiple:
+            tags = [tag for tag in self._confirms if tag <= method.delivery_tag]
+        else:
+            tags = [method.delivery_tag]
+        for tag in tags:
+            confirmed = self._confirms.pop(tag, None)
+            if confirmed is None or confirmed.done():
+                continue
+            if isinstance(method, Basic.Ack):
+                confirmed.set_result(True)
+            else:
+                confirmed.set_exception(AmqpError(f"RabbitMQ refused message {tag}"))
+
+    def _on_close(self, channel, reason) -> None:
+        self.is_open = False
+        error = AmqpError(f"Channel closed: {reason}")
+        for future in list(self._waiters) + list(self._confirms.values()):
+            if not future.done():
+                future.set_exception(error)
+        self._confirms.clear()
+        if not self.closed.done():
+            self.closed.set_result(reason)
+
+
+class AmqpConnectionPool:
+    """
+    Connections to RabbitMQ shared by the channels of a transport.
+
+    Connections are opened on first use and reopened when they drop, the
+    backoff between attempts being an asyncio sleep: the loop keeps serving
+    the other connections and channels meanwhile. Confirm-mode channels used
+    to publish are pooled, a channel publishing one batch at a time.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        loop: asyncio.AbstractEventLoop,
+        size: int = 1,
+        channels: int = 4,
+        backoff: float = 1,
+        max_backoff: float = 30,
+        connection_factory: Optional[Callable] = None,
+    ):
+        self.parameters = pika.URLParameters(url)
+        self.loop = loop
+        self.size = size
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.connection_factory = connection_factory or AsyncioConnection
+        self.logger = logging.getLogger("RABBITMQ_TRANSPORT")
+        self.closing = False
+        self._connections: List = [None] * size
+        self._connecting: List[Optional[asyncio.Task]] = [None] * size
+        self._closed: Dict[int, asyncio.Future] = {}
+        self._failures = 0
+        self._channels = asyncio.Semaphore(channels)
+        self._idle: List[AmqpChannel] = []
+        self._opened = 0
+
+    async def connection(self, index: int = 0):
+        """An open connection, waiting for it to be (re)opened if needed"""
+        index %= self.size
+        connection = self._connections[index]
+        if connection is not None and connection.is_open:
+            return connection
+        if self._connecting[index] is None or self._connecting[index].done():
+            self._connecting[index] = self.loop.create_task(self._connect(index))
+        return await asyncio.shield(self._connecting[index])
+
+    @asynccontextmanager
+    async def channel(self):
+        """A confirm-mode channel of the pool, given back once the block exits"""
+        async with self._channels:
+            channel = None
+            while self._idle and channel is None:
+                candidate = self._idle.pop()
+                if candidate.is_open:
+                    channel = candidate
+            if channel is None:
+                connection = await self.connection(self._opened)
+                self._opened += 1
+                channel = await AmqpChannel.open(connection, self.loop, confirm=True)
+            try:
+                yield channel
+            finally:
+                if channel.is_open:
+                    self._idle.append(channel)
+
+    async def close(self, timeout: float = 5) -> None:
+        self.closing = True
+        for connecting in self._connecting:
+            if connecting is not None and not connecting.done():
+                connecting.cancel()
+        for channel in self._idle:
+            channel.close()
+        self._idle.clear()
+        waiting = []
+        for connection in self._connections:
+            if connection is not None and connection.is_open:
+                waiting.append(self._closed.setdefault(id(connection), self.loop.create_future()))
+                connection.close()
+        if waiting:
+            await asyncio.wait(waiting, timeout=timeout)
+
+    async def _connect(self, index: int):
+        while True:
+            if self.closing:
+                raise AmqpError("Connection pool closed")
+            opened = self.loop.create_future()
+
+            # Bound per attempt: a late callback of a previous attempt resolves its own future
+            def on_open(connection, opened=opened):
+                if not opened.done():
+                    opened.set_result(connection)
+
+            def on_open_error(connection, error, opened=opened):
+                if not opened.done():
+                    opened.set_exception(AmqpError(f"Cannot connect to RabbitMQ: {error}"))
+
+            self.connection_factory(
+                self.parameters,
+                on_open_callback=on_open,
+                on_open_error_callback=on_open_error,
+                on_close_callback=self._on_connection_closed,
+                custom_ioloop=self.loop,
+            )
+            try:
+                connection = await opened
+            except AmqpError as e:
+                self._failures += 1
+                backoff = min(self.max_backoff, self.backoff * 2 ** min(self._failures - 1, 10))
+                if self._failures == 1 or backoff == self.max_backoff:
+                    self.logger.warning(f"{e}, retrying in {backoff}s")
+                await asyncio.sleep(backoff)
+                continue
+
+            self._failures = 0
+            self._connections[index] = connection
+            self.logger.info(f"Connected to RabbitMQ at {self.parameters.host}:{self.parameters.port}")
+            return connection
+
+    def _on_connection_closed(self, connection, reason) -> None:
+        for index, opened in enumerate(self._connections):
+            if opened is connection:
+                self._connections[index] = None
+        closed = self._closed.pop(id(connection), None)
+        if closed is not None and not closed.done():
+            closed.set_result(reason)
+        if not self.closing:
+            self.logger.warning(f"RabbitMQ connection lost: {reason}")
@@ -2,10 +2,9 @@ import logging
 from datetime import datetime
 from typing import List
 
-from sqlmodel import and_, select
-
 from framefox.core.orm.entity_manager_interface import EntityManagerInterface
 from framefox.core.task.entity.task import Task, TaskStatus
+from framefox.core.task.task_claimer import TaskClaimer
 from framefox.core.task.transport.transport_interface import TransportInterface
 
 """
@@ -23,37 +22,13 @@ class DatabaseTransport(TransportInterface):
     def __init__(self, entity_manager: EntityManagerInterface):
         self.entity_manager = entity_manager
         self.logger = logging.getLogger("DATABASE_TRANSPORT")
+        self.claimer = TaskClaimer(entity_manager)
 
     def publish(self, task: Task) -> None:
         pass
 
     def consume(self, queue: str, batch_size: int) -> List[Task]:
-        now = datetime.now()
-
-        statement = (
-            select(Task)
-            .where(
-                and_(
-                    Task.queue == queue,
-                    Task.status == TaskStatus.PENDING,
-                    (Task.scheduled_for == None) | (Task.scheduled_for <= now),
-                )
-            )
-            .order_by(Task.priority.desc(), Task.created_at)
-            .limit(batch_size)
-        )
-
-        tasks = self.entity_manager.exec_statement(statement)
-
-        for task in tasks:
-            task.status = TaskStatus.RUNNING
-            task.started_at = datetime.now()
-            self.entity_manager.persist(task)
-
-        if tasks:
-            self.entity_manager.commit()
-
-        return tasks
+        return self.claimer.claim(queue, batch_size)
 
     def acknowledge(self, task: Task) -> None:
         self.entity_manager.delete(task)
@@ -1,13 +1,20 @@
+import asyncio
+import concurrent.futures
+import functools
 import json
 import logging
-import time
+import os
+import threading
+from collections import deque
 from datetime import datetime
-from typing import List
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
 
 import pika
 
 from framefox.core.orm.entity_manager_interface import EntityManagerInterface
 from framefox.core.task.entity.task import Task, TaskStatus
+from framefox.core.task.task_notifier import TaskNotifier
+from framefox.core.task.transport.amqp_pool import AmqpChannel, AmqpConnectionPool
 from framefox.core.task.transport.transport_interface import TransportInterface
 
 """
@@ -18,251 +25,360 @@ Author: Boumaza Rayen
 Github: https://github.com/RayenBou
 """
 
+# A message pushed by RabbitMQ: the channel it came on, its delivery tag and its body
+Delivery = Tuple[AmqpChannel, int, bytes]
 
-class RabbitMQTransport(TransportInterface):
-    """Transport using RabbitMQ for task communication"""
 
-    def __init__(self, entity_manager: EntityManagerInterface, task_transport_url: str):
+class RabbitMQTransport(TransportInterface):
+    """
+    Transport using RabbitMQ for task communication.
+
+    The AMQP connections run on an asyncio loop of their own, in a thread
+    started on first use: heartbeats are answered and messages received
+    while the worker runs its tasks, and the methods of TransportInterface,
+    called from the broker, wait on that loop without blocking the loop of
+    the worker.
+
+    Once setup() is called RabbitMQ pushes the tasks of the queues to a
+    channel whose prefetch (basic_qos) is the number of tasks the worker
+    holds, running or waiting for a slot, and every message wakes the worker
+    up. Acknowledgements are sent in batches, publications wait for the
+    confirms of RabbitMQ.
+    """
+
+    EXCHANGE = "tasks"
+    DEAD_LETTER_EXCHANGE = "tasks.dead"
+
+    def __init__(
+        self,
+        entity_manager: EntityManagerInterface,
+        task_transport_url: str,
+        connections: int = 1,
+        channels: int = 4,
+        prefetch_count: int = 10,
+        ack_interval: float = 0.01,
+        timeout: float = 10,
+        reconnect_backoff: float = 1,
+        connection_factory: Optional[Callable] = None,
+    ):
         self.entity_manager = entity_manager
         self.task_transport_url = task_transport_url
+        self.connections = connections
+        self.channels = channels
+        self.prefetch_count = prefetch_count
+        self.ack_interval = ack_interval
+        self.timeout = timeout
+        self.reconnect_backoff = reconnect_backoff
+        self.connection_factory = connection_factory
+        self.notifier = TaskNotifier.get_instance()
         self.logger = logging.getLogger("RABBITMQ_TRANSPORT")
 
         self._configure_pika_logging()
 
-        self.connection = None
-        self.channel = None
-        self.consumer_tag = None
-        self._reconnect_attempts = 0
-        self._max_reconnect_attempts = 5
-        self._last_connection_error_time = 0
-        self._min_error_log_interval = 10
-
-        self._setup_connection()
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[AmqpConnectionPool] = None
+        self._closing = False
+        self._declared: Set[str] = set()
+        # Consumer side, only touched from the loop of the transport
+        self._queues: List[str] = []
+        self._deliveries: Dict[str, Deque[Delivery]] = {}
+        self._consumer: Optional[AmqpChannel] = None
+        self._consuming: Set[str] = set()
+        self._consumer_task: Optional[asyncio.Task] = None
+        self._consumer_ready: Optional[asyncio.Event] = None
+        self._unacked: Dict[int, None] = {}
+        self._acks: Set[int] = set()
+        self._ack_flush: Optional[asyncio.TimerHandle] = None
 
     def _configure_pika_logging(self):
         for logger_name in [
             "pika",
             "pika.adapters",
             "pika.adapters.utils",
-            "pika.adapters.select_connection",
-            "pika.adapters.blocking_connection",
+            "pika.adapters.asyncio_connection",
             "pika.adapters.utils.io_services_utils",
             "pika.adapters.utils.connection_workflow",
-            "pika.adapters.utils.selector_ioloop_adapter",
         ]:
             logging.getLogger(logger_name).setLevel(logging.WARNING)
 
-    def _setup_connection(self):
-        try:
-            parameters = pika.URLParameters(self.task_transport_url)
-            self.connection = pika.BlockingConnection(parameters)
-            self.channel = self.connection.channel()
-            self.logger.info(f"Connected to RabbitMQ at {self.task_transport_url}")
-            self._reconnect_attempts = 0
-        except Exception as e:
-            self.logger.error(f"Failed to connect to RabbitMQ: {str(e)}")
-
-        def _ensure_connection(self):
-            try:
-                if self.connection is None or not self.connection.is_open:
-                    return self._reconnect_with_backoff()
-                elif self.channel is None or not self.channel.is_open:
-                    self.channel = self.connection.channel()
-                return True
-            except Exception as e:
-                current_time = time.time()
-                if (current_time - self._last_connection_error_time) > self._min_error_log_interval:
-                    self.logger.error(f"Failed to ensure connection: {str(e)}")
-                    self._last_connection_error_time = current_time
-                return self._reconnect_with_backoff()
-
-    def _setup_exchange_and_queue(self, queue: str):
-        try:
-            self.channel.exchange_declare(exchange="tasks", exchange_type="direct", durable=True)
-
-            self.channel.queue_declare(
-                queue=queue,
-                durable=True,
-                arguments={
-                    "x-dead-letter-exchange": "tasks.dead",
-                    "x-dead-letter-routing-key": f"{queue}.dead",
-                },
-            )
-
-            self.channel.queue_bind(exchange="tasks", queue=queue, routing_key=queue)
+    def set_prefetch_count(self, count: int) -> None:
+        """Tasks RabbitMQ pushes ahead of their acknowledgement, applied when the consumer channel opens"""
+        self.prefetch_count = max(1, count)
 
-            self.channel.exchange_declare(exchange="tasks.dead", exchange_type="direct", durable=True)
-
-            self.channel.queue_declare(queue=f"{queue}.dead", durable=True)
-
-            self.channel.queue_bind(
-                exchange="tasks.dead",
-                queue=f"{queue}.dead",
-                routing_key=f"{queue}.dead",
-            )
-
-        except Exception as e:
-            self.logger.error(f"Failed to setup exchange and queue: {e}")
-            raise
-
-    def _reconnect_with_backoff(self):
-        self._reconnect_attempts += 1
-
-        if self._reconnect_attempts > self._max_reconnect_attempts:
-            current_time = time.time()
-            if (current_time - self._last_connection_error_time) > 60:
-                self.logger.warning(
-                    f"Reconnection attempt limit reached ({self._max_reconnect_attempts}). "
-                    "Will continue trying periodically, but some operations might fail."
-                )
-                self._last_connection_error_time = current_time
-            return False
-
-        backoff_seconds = min(30, 2 ** (self._reconnect_attempts - 1))
-
-        if self._reconnect_attempts == 1:
-            self.logger.info(f"RabbitMQ connection lost, trying to reconnect in {backoff_seconds}s...")
-
-        time.sleep(backoff_seconds)
-
-        try:
-            self._setup_connection()
-            if self.connection is not None and self.connection.is_open:
-                self.logger.info("Successfully reconnected to RabbitMQ")
-                return True
-        except Exception:
-            pass
-
-        return False
+    # ---- sync API (TransportInterface) ----
 
     def publish(self, task: Task) -> None:
-        if not self._ensure_connection():
-            self.logger.error("Cannot publish task: no connection")
-            return
+        self.publish_many([task])
 
+    def publish_many(self, tasks: List[Task]) -> None:
+        if not tasks:
+            return
         try:
-            self._setup_exchange_and_queue(task.queue)
-
-            message = {
-                "task_id": task.id,
-                "name": task.name,
-                "payload": task.get_payload(),
-            }
-
-            properties = pika.BasicProperties(
-                delivery_mode=2,
-                priority=task.priority,
-                headers={"x-delay": (int((task.scheduled_for - datetime.now()).total_seconds() * 1000) if task.scheduled_for else None)},
-                content_type="application/json",
-            )
-
-            self.channel.basic_publish(
-                exchange="tasks",
-                routing_key=task.queue,
-                body=json.dumps(message),
-                properties=properties,
-            )
-
-            self.logger.info(f"Task {task.id} ({task.name}) published to queue '{task.queue}'")
-
+            self._run(self._publish(tasks))
+            self.logger.info(f"{len(tasks)} tasks published and confirmed")
         except Exception as e:
-            self.logger.error(f"Failed to publish task {task.id}: {e}")
-            try:
-                self._setup_connection()
-            except Exception:
-                pass
+            self.logger.error(f"Failed to publish {len(tasks)} tasks: {e!r}")
 
     def consume(self, queue: str, batch_size: int) -> List[Task]:
         tasks = []
-        if not self._ensure_connection():
-            return tasks
-
         try:
-            self._setup_exchange_and_queue(queue)
-
-            for _ in range(batch_size):
-                method_frame, properties, body = self.channel.basic_get(queue=queue, auto_ack=False)
-
-                if method_frame is None:
-                    break
-
-                message = json.loads(body)
-                task_id = message.get("task_id")
-
-                task = self.entity_manager.find(Task, task_id)
+            if queue not in self._queues:
+                self._run(self._subscribe([queue]))
+            deliveries = self._run(self._take(queue, batch_size))
+        except Exception as e:
+            self.logger.error(f"Error consuming tasks: {e!r}")
+            return tasks
 
-                if task and task.status == TaskStatus.PENDING:
-                    task._delivery_tag = method_frame.delivery_tag
-                    task.status = TaskStatus.RUNNING
-                    task.started_at = datetime.now()
-                    self.entity_manager.persist(task)
-                    tasks.append(task)
-                else:
-                    self.channel.basic_ack(delivery_tag=method_frame.delivery_tag)
+        for channel, delivery_tag, body in deliveries:
+            message = json.loads(body)
+            task = self.entity_manager.find(Task, message.get("task_id"))
 
-            if tasks:
-                self.entity_manager.commit()
+            if task and task.status == TaskStatus.PENDING:
+                task._delivery = (channel, delivery_tag)
+                task.status = TaskStatus.RUNNING
+                task.started_at = datetime.now()
+                self.entity_manager.persist(task)
+                tasks.append(task)
+            else:
+                self._call_soon(self._ack, channel, delivery_tag)
 
-            return tasks
+        if tasks:
+            # Detached, like the tasks claimed from the database (see TaskClaimer)
+            self.entity_manager.session.flush()
+            for task in tasks:
+                self.entity_manager.session.expunge(task)
+            self.entity_manager.commit()
 
-        except Exception as e:
-            self.logger.error(f"Error consuming tasks: {e}")
-            try:
-                self._setup_connection()
-            except Exception:
-                pass
-            return []
+        return tasks
 
     def acknowledge(self, task: Task) -> None:
-        if not self._ensure_connection():
-            self.logger.error(f"Cannot acknowledge task {task.id}: no connection")
-            return
-
-        try:
-            if hasattr(task, "_delivery_tag"):
-                self.channel.basic_ack(delivery_tag=task._delivery_tag)
-                self.logger.info(f"Task {task.id} acknowledged")
-        except Exception as e:
-            self.logger.error(f"Failed to acknowledge task {task.id}: {e}")
-            try:
-                self._setup_connection()
-            except Exception:
-                pass
+        delivery = getattr(task, "_delivery", None)
+        if delivery is not None:
+            self._call_soon(self._ack, *delivery)
+            self.logger.debug(f"Task {task.id} acknowledged")
 
     def reject(self, task: Task, requeue: bool = False) -> None:
-        if not self._ensure_connection():
-            self.logger.error(f"Cannot reject task {task.id}: no connection")
-            return
-
-        try:
-            if hasattr(task, "_delivery_tag"):
-                self.channel.basic_reject(delivery_tag=task._delivery_tag, requeue=requeue)
-                self.logger.info(f"Task {task.id} rejected (requeue={requeue})")
-        except Exception as e:
-            self.logger.error(f"Failed to reject task {task.id}: {e}")
-            try:
-                self._setup_connection()
-            except Exception:
-                pass
+        delivery = getattr(task, "_delivery", None)
+        if delivery is not None:
+            self._call_soon(self._reject, *delivery, requeue)
+            self.logger.info(f"Task {task.id} rejected (requeue={requeue})")
 
     def setup(self, queues: List[str]) -> None:
-        if not self._ensure_connection():
-            self.logger.error("Cannot setup transport: no connection")
-            return
-
         try:
-            for queue in queues:
-                self._setup_exchange_and_queue(queue)
+            self._run(self._subscribe(queues))
             self.logger.info(f"RabbitMQ transport setup complete for queues: {', '.join(queues)}")
         except Exception as e:
-            self.logger.error(f"Failed to setup RabbitMQ transport: {e}")
+            self.logger.error(f"Failed to setup RabbitMQ transport: {e!r}")
 
     def shutdown(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or self._pid != os.getpid():
+                return
         try:
-            if self.channel and self.channel.is_open:
-                self.channel.close()
-            if self.connection and self.connection.is_open:
-                self.connection.close()
-            self.logger.info("RabbitMQ transport shutdown")
+            self._run(self._close())
         except Exception as e:
-            self.logger.error(f"Error during RabbitMQ transport shutdown: {e}")
+            self.logger.error(f"Error during RabbitMQ transport shutdown: {e!r}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(self.timeout)
+        loop.close()
+        with self._lock:
+            self._reset()
+        self.logger.info("RabbitMQ transport shutdown")
+
+    # ---- loop of the transport ----
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked: the loop thread and the connections stayed in the parent
+                self._reset()
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._pool = AmqpConnectionPool(
+                    self.task_transport_url,
+                    self._loop,
+                    size=self.connections,
+                    channels=self.channels,
+                    backoff=self.reconnect_backoff,
+                    connection_factory=self.connection_factory,
+                )
+                self._thread = threading.Thread(target=self._loop.run_forever, name="framefox-amqp", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _run(self, coroutine, timeout: Optional[float] = None):
+        """Runs coroutine on the loop of the transport and waits for its result"""
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._start())
+        try:
+            return future.result(timeout or self.timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError("RabbitMQ did not answer in time") from None
+
+    def _call_soon(self, callback: Callable, *args) -> None:
+        self._start().call_soon_threadsafe(callback, *args)
+
+    async def _publish(self, tasks: List[Task]) -> None:
+        async with self._pool.channel() as channel:
+            for queue in dict.fromkeys(task.queue for task in tasks):
+                if queue not in self._declared:
+                    await self._declare(channel, queue)
+                    self._declared.add(queue)
+            confirms = [channel.publish(self.EXCHANGE, task.queue, *self._message(task)) for task in tasks]
+            # RabbitMQ confirms the batch as a whole, usually with a single Basic.Ack
+            results = await asyncio.gather(*confirms, return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+
+    def _message(self, task: Task) -> Tuple[str, pika.BasicProperties]:
+        message = {
+            "task_id": task.id,
+            "name": task.name,
+            "payload": task.get_payload(),
+        }
+
+        properties = pika.BasicProperties(
+            delivery_mode=2,
+            priority=task.priority,
+            headers={"x-delay": (int((task.scheduled_for - datetime.now()).total_seconds() * 1000) if task.scheduled_for else None)},
+            content_type="application/json",
+        )
+        return json.dumps(message), properties
+
+    async def _declare(self, channel: AmqpChannel, queue: str) -> None:
+        await channel.call(channel.channel.exchange_declare, exchange=self.EXCHANGE, exchange_type="direct", durable=True)
+        await channel.call(
+            channel.channel.queue_declare,
+            queue=queue,
+            durable=True,
+            arguments={
+                "x-dead-letter-exchange": self.DEAD_LETTER_EXCHANGE,
+                "x-dead-letter-routing-key": f"{queue}.dead",
+            },
+        )
+        await channel.call(channel.channel.queue_bind, queue=queue, exchange=self.EXCHANGE, routing_key=queue)
+
+        await channel.call(channel.channel.exchange_declare, exchange=self.DEAD_LETTER_EXCHANGE, exchange_type="direct", durable=True)
+        await channel.call(channel.channel.queue_declare, queue=f"{queue}.dead", durable=True)
+        await channel.call(
+            channel.channel.queue_bind, queue=f"{queue}.dead", exchange=self.DEAD_LETTER_EXCHANGE, routing_key=f"{queue}.dead"
+        )
+
+    async def _subscribe(self, queues: List[str]) -> None:
+        for queue in queues:
+            if queue not in self._queues:
+                self._queues.append(queue)
+                self._deliveries[queue] = deque()
+        if self._consumer_task is None:
+            self._consumer_ready = asyncio.Event()
+            self._consumer_task = self._loop.create_task(self._consume())
+        elif self._consumer_ready.is_set() and self._consumer is not None and self._consumer.is_open:
+            for queue in queues:
+                await self._start_consuming(self._consumer, queue)
+        await self._consumer_ready.wait()
+
+    async def _consume(self) -> None:
+        """Keeps a channel consuming the queues, opening a new one when the connection drops"""
+        while not self._closing:
+            channel = None
+            try:
+                connection = await self._pool.connection()
+                channel = await AmqpChannel.open(connection, self._loop)
+                await channel.call(channel.channel.basic_qos, prefetch_count=self.prefetch_count, global_qos=True)
+                self._consumer = channel
+                self._consuming = set()
+                self._unacked.clear()
+                self._acks.clear()
+                index = 0
+                while index < len(self._queues):
+                    await self._start_consuming(channel, self._queues[index])
+                    index += 1
+                self._consumer_ready.set()
+                reason = await channel.closed
+                if not self._closing:
+                    self.logger.warning(f"RabbitMQ consumer channel closed: {reason}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"RabbitMQ consumer interrupted: {e!r}")
+            finally:
+                # RabbitMQ delivers the unacknowledged messages of the channel again
+                for queue, deliveries in self._deliveries.items():
+                    self._deliveries[queue] = deque(delivery for delivery in deliveries if delivery[0] is not channel)
+                if self._consumer is channel:
+                    self._consumer = None
+            if not self._closing:
+                await asyncio.sleep(self.reconnect_backoff)
+
+    async def _start_consuming(self, channel: AmqpChannel, queue: str) -> None:
+        if queue in self._consuming:
+            return
+        self._consuming.add(queue)
+        if queue not in self._declared:
+            await self._declare(channel, queue)
+            self._declared.add(queue)
+        await channel.call(channel.channel.basic_consume, queue, functools.partial(self._on_message, channel, queue))
+
+    def _on_message(self, channel: AmqpChannel, queue: str, pika_channel, method, properties, body) -> None:
+        self._unacked[method.delivery_tag] = None
+        self._deliveries[queue].append((channel, method.delivery_tag, body))
+        self.notifier.notify(queue)
+
+    async def _take(self, queue: str, count: int) -> List[Delivery]:
+        deliveries = self._deliveries.get(queue, ())
+        return [deliveries.popleft() for _ in range(min(count, len(deliveries)))]
+
+    def _ack(self, channel: AmqpChannel, delivery_tag: int) -> None:
+        if channel is not self._consumer or not channel.is_open:
+            # The channel is gone, RabbitMQ delivers the message again
+            return
+        self._acks.add(delivery_tag)
+        if self._ack_flush is None:
+            self._ack_flush = self._loop.call_later(self.ack_interval, self._flush_acks)
+
+    def _flush_acks(self) -> None:
+        self._ack_flush = None
+        channel = self._consumer
+        if channel is None or not channel.is_open:
+            self._acks.clear()
+            return
+        # One multiple=True ack for the messages delivered before the oldest
+        # one still running, the others one by one
+        last = None
+        for delivery_tag in list(self._unacked):
+            if delivery_tag not in self._acks:
+                break
+            last = delivery_tag
+            del self._unacked[delivery_tag]
+            self._acks.discard(delivery_tag)
+        if last is not None:
+            channel.channel.basic_ack(delivery_tag=last, multiple=True)
+        for delivery_tag in sorted(self._acks):
+            self._unacked.pop(delivery_tag, None)
+            channel.channel.basic_ack(delivery_tag=delivery_tag)
+        self._acks.clear()
+
+    def _reject(self, channel: AmqpChannel, delivery_tag: int, requeue: bool) -> None:
+        if channel is not self._consumer or not channel.is_open:
+            return
+        self._unacked.pop(delivery_tag, None)
+        channel.channel.basic_reject(delivery_tag=delivery_tag, requeue=requeue)
+
+    async def _close(self) -> None:
+        self._closing = True
+        if self._ack_flush is not None:
+            self._ack_flush.cancel()
+            self._flush_acks()
+        if self._consumer_task is not None:
+            self._consumer_task.cancel()
+        if self._consumer is not None:
+            self._consumer.close()
+        await self._pool.close()
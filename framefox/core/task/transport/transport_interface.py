@@ -20,6 +20,11 @@ class TransportInterface(ABC):
         """Publishes a task to the transport"""
         pass
 
+    def publish_many(self, tasks: List[Task]) -> None:
+        """Publishes several tasks to the transport"""
+        for task in tasks:
+            self.publish(task)
+
     @abstractmethod
     def consume(self, queue: str, batch_size: int) -> List[Task]:
         """Consumes tasks from the transport"""
@@ -1,17 +1,24 @@
 import asyncio
 import concurrent.futures
+import functools
 import importlib
 import logging
+import os
 import signal
 import sys
 import traceback
+from collections import deque
 from datetime import datetime
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
 
 from framefox.core.di.service_container import ServiceContainer
 from framefox.core.events.event_dispatcher import dispatcher
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
 from framefox.core.task.broker.broker_interface import BrokerInterface
 from framefox.core.task.entity.task import Task
+from framefox.core.task.queue_scheduler import QueueScheduler
+from framefox.core.task.result.result_backend_interface import ResultBackendInterface
+from framefox.core.task.task_notifier import TaskSubscription
 from framefox.core.task.transport.transport_interface import TransportInterface
 
 """
@@ -23,8 +30,27 @@ Github: https://github.com/RayenBou
 """
 
 
+def _run_handler_in_process(task_name: str, args: list, kwargs: dict):
+    """Runs a sync handler in a process of the pool, where it is resolved again from its name"""
+    worker_manager = WorkerManager(None)
+    handler_info = worker_manager._get_task_handler(task_name)
+    if handler_info is None:
+        # module.function tasks are registered by importing their module
+        importlib.import_module(task_name.rsplit(".", 1)[0])
+        handler_info = worker_manager._get_task_handler(task_name)
+    if handler_info is None:
+        raise LookupError(f"No handler found for task {task_name}")
+    handler_func = worker_manager._bind_handler_to_instance(handler_info[0], task_name)
+    return handler_func(*args, **kwargs)
+
+
 class WorkerManager:
     _task_handlers: Dict[str, Tuple[Callable, bool]] = {}
+    # Executor of the sync handlers, "thread" unless registered otherwise
+    _task_executors: Dict[str, str] = {}
+    # Per-task timeouts in seconds, the worker task_timeout otherwise
+    _task_timeouts: Dict[str, float] = {}
+    EXECUTORS = ("thread", "process")
 
     def __init__(self, broker: BrokerInterface):
         self.broker = broker
@@ -32,16 +58,38 @@ class WorkerManager:
         self.running = False
         self.queues = ["default"]
         self.polling_interval = 5
+        self.min_polling_interval = 0.05
         self.concurrent_tasks = 5
+        self.prefetch: Optional[int] = None
+        self.queue_weights: Dict[str, int] = {}
+        self.task_timeout: Optional[float] = None
+        self.result_backend: Optional[ResultBackendInterface] = None
         self.cleanup_interval = 3600
         self.retain_tasks_days = 7
         self.last_cleanup_time = 0
+        self._executors: Dict[str, concurrent.futures.Executor] = {}
+        self._loop_finished: Optional[asyncio.Event] = None
+        self._subscription: Optional[TaskSubscription] = None
 
     @classmethod
-    def register_task_handler(cls, task_name: str, handler_func: Callable, is_coroutine: bool = None) -> None:
+    def register_task_handler(
+        cls,
+        task_name: str,
+        handler_func: Callable,
+        is_coroutine: bool = None,
+        executor: str = "thread",
+        timeout: Optional[float] = None,
+    ) -> None:
+        if executor not in cls.EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}', expected one of: {', '.join(cls.EXECUTORS)}")
         if is_coroutine is None:
             is_coroutine = asyncio.iscoroutinefunction(handler_func)
         cls._task_handlers[task_name] = (handler_func, is_coroutine)
+        cls._task_executors[task_name] = executor
+        if timeout is not None:
+            cls._task_timeouts[task_name] = timeout
+        else:
+            cls._task_timeouts.pop(task_name, None)
 
     def set_queues(self, queues: List[str]) -> None:
         self.queues = queues
@@ -49,9 +97,28 @@ class WorkerManager:
     def set_polling_interval(self, seconds: int) -> None:
         self.polling_interval = seconds
 
+    def set_min_polling_interval(self, seconds: float) -> None:
+        self.min_polling_interval = seconds
+
     def set_concurrent_tasks(self, count: int) -> None:
         self.concurrent_tasks = count
 
+    def set_prefetch(self, count: Optional[int]) -> None:
+        """Claimed tasks kept waiting for a free slot, as many as the concurrency when None"""
+        self.prefetch = count
+
+    def set_queue_weights(self, weights: Dict[str, int]) -> None:
+        """Share of the slots of each queue when several have tasks waiting, 1 by default"""
+        self.queue_weights = dict(weights)
+
+    def set_task_timeout(self, seconds: Optional[float]) -> None:
+        """Time after which a task fails, unless its @AsyncTask sets its own timeout"""
+        self.task_timeout = seconds
+
+    def set_result_backend(self, backend: Optional[ResultBackendInterface]) -> None:
+        """Backend keeping the outcome of the tasks for their TaskHandle, the outcomes are dropped when None"""
+        self.result_backend = backend
+
     def set_cleanup_config(self, interval_hours: int = 1, retain_days: int = 7) -> None:
         self.cleanup_interval = interval_hours * 3600
         self.retain_tasks_days = retain_days
@@ -63,38 +130,73 @@ class WorkerManager:
         loop = asyncio.get_event_loop()
         for sig in (signal.SIGINT, signal.SIGTERM):
             loop.add_signal_handler(sig, lambda: asyncio.create_task(self.stop()))
-        await self._process_loop()
+        self._loop_finished = asyncio.Event()
+        try:
+            await self._process_loop()
+        finally:
+            self._loop_finished.set()
+            await asyncio.to_thread(self.shutdown_executors)
 
     async def stop(self) -> None:
         self.logger.info("Stopping worker manager...")
         self.running = False
+        if self._subscription is not None:
+            self._subscription.set()
+        # Running tasks finish and prefetched ones go back to their queue before the executors go
+        if self._loop_finished is not None:
+            await self._loop_finished.wait()
+        await asyncio.to_thread(self.shutdown_executors)
+
+    def get_executor(self, kind: str = "thread") -> concurrent.futures.Executor:
+        """The executor shared by the sync handlers of this worker, created on first use"""
+        if kind not in self._executors:
+            if kind == "process":
+                # The forked processes must not reuse the pooled connections of the worker
+                self._executors[kind] = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=max(1, min(self.concurrent_tasks, os.cpu_count() or 1)),
+                    initializer=EntityManagerRegistry.reset_engines,
+                )
+            elif kind == "broker":
+                # One thread: the session of the broker is never used by two calls at once
+                self._executors[kind] = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="framefox-broker")
+            else:
+                self._executors[kind] = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.concurrent_tasks, thread_name_prefix="framefox-task"
+                )
+        return self._executors[kind]
+
+    def shutdown_executors(self) -> None:
+        """Waits for the running sync handlers and releases the threads and processes of the executors"""
+        executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=True)
+
+    async def _call_broker(self, method: Callable, *args):
+        """Runs a broker call off the event loop, the calls running one at a time"""
+        return await asyncio.get_running_loop().run_in_executor(self.get_executor("broker"), functools.partial(method, *args))
 
     async def _cleanup_tasks(self) -> None:
         try:
-            loop = asyncio.get_event_loop()
-            count = await loop.run_in_executor(None, self.broker.purge_failed_tasks, 2)
+            count = await self._call_broker(self.broker.purge_failed_tasks, 2)
             if count > 0:
                 self.logger.info(f"Scheduled cleanup: {count} failed tasks removed")
         except Exception as e:
             self.logger.error(f"Error during task cleanup: {e}")
-
-    async def _process_queue(self, queue: str) -> None:
-        try:
-            tasks = self.broker.dequeue(queue, self.concurrent_tasks)
-            if not tasks:
-                return
-            self.logger.info(f"Processing {len(tasks)} tasks from queue '{queue}'")
-            worker_tasks = [self._execute_task(task) for task in tasks]
-            await asyncio.gather(*worker_tasks)
-        except Exception as e:
-            self.logger.error(f"Error while processing queue '{queue}': {e}")
+        if self.result_backend is not None:
+            try:
+                count = await self._call_broker(self.result_backend.purge_expired)
+                if count > 0:
+                    self.logger.info(f"Scheduled cleanup: {count} expired task results removed")
+            except Exception as e:
+                self.logger.error(f"Error during task result cleanup: {e}")
 
     async def _execute_task(self, task: Task) -> None:
         try:
             handler_info = self._get_task_handler(task.name)
             if handler_info is None:
                 self.logger.error(f"No handler found for task {task.name}")
-                self.broker.fail_task(task, f"No handler found for task {task.name}")
+                await self._store_error(task, f"No handler found for task {task.name}")
+                await self._call_broker(self.broker.fail_task, task, f"No handler found for task {task.name}")
                 return
             handler_func, is_coroutine = handler_info
             handler_func = self._bind_handler_to_instance(handler_func, task.name)
@@ -102,18 +204,28 @@ class WorkerManager:
             payload = task.get_payload()
             args = payload.get("args", [])
             kwargs = payload.get("kwargs", {})
+            timeout = self._task_timeouts.get(task.name, self.task_timeout)
             self.logger.info(f"Executing task {task.id} ({task.name}), coroutine: {is_coroutine}")
             result = None
             try:
                 if is_coroutine:
-                    result = await handler_func(*args, **kwargs)
+                    call = handler_func(*args, **kwargs)
+                elif self._task_executors.get(task.name) == "process":
+                    loop = asyncio.get_running_loop()
+                    call = loop.run_in_executor(self.get_executor("process"), _run_handler_in_process, task.name, args, kwargs)
                 else:
-                    loop = asyncio.get_event_loop()
-                    result = await loop.run_in_executor(
-                        concurrent.futures.ThreadPoolExecutor(),
-                        lambda: handler_func(*args, **kwargs),
-                    )
-                self.broker.complete_task(task)
+                    loop = asyncio.get_running_loop()
+                    call = loop.run_in_executor(self.get_executor("thread"), lambda: handler_func(*args, **kwargs))
+                if timeout:
+                    try:
+                        result = await asyncio.wait_for(call, timeout)
+                    except asyncio.TimeoutError:
+                        # A sync handler keeps its thread until it returns, only its task is failed
+                        raise TimeoutError(f"Task {task.name} timed out after {timeout}s") from None
+                else:
+                    result = await call
+                await self._store_result(task, result)
+                await self._call_broker(self.broker.complete_task, task)
                 dispatcher.dispatch(
                     "worker.task.after_execution",
                     {"task": task, "success": True, "result": result},
@@ -121,14 +233,36 @@ class WorkerManager:
             except Exception as e:
                 error_msg = f"{str(e)}\n{traceback.format_exc()}"
                 self.logger.error(f"Error while executing task {task.id} ({task.name}): {error_msg}")
-                self.broker.fail_task(task, error_msg)
+                await self._store_error(task, error_msg)
+                await self._call_broker(self.broker.fail_task, task, error_msg)
                 dispatcher.dispatch(
                     "worker.task.execution_error",
                     {"task": task, "error": e, "traceback": traceback.format_exc()},
                 )
         except Exception as outer_e:
             self.logger.error(f"External error while processing task {task.id}: {outer_e}")
-            self.broker.fail_task(task, str(outer_e))
+            await self._store_error(task, str(outer_e))
+            await self._call_broker(self.broker.fail_task, task, str(outer_e))
+
+    async def _store_result(self, task: Task, value) -> None:
+        """Hands the return value of task to the result backend, before the task is completed"""
+        if self.result_backend is None:
+            return
+        try:
+            await self._call_broker(self.result_backend.store_result, task.id, value)
+        except Exception as e:
+            self.logger.error(f"Unable to store the result of task {task.id} ({task.name}): {e}")
+            # The handle of the task fails rather than waiting for a result that never comes
+            await self._store_error(task, f"The result of task {task.name} could not be stored: {e}", final=True)
+
+    async def _store_error(self, task: Task, error: str, final: bool = False) -> None:
+        """Hands the error of task to the result backend once the broker will not retry it"""
+        if self.result_backend is None or (not final and task.retry_count < task.max_retries):
+            return
+        try:
+            await self._call_broker(self.result_backend.store_error, task.id, error)
+        except Exception as e:
+            self.logger.error(f"Unable to store the error of task {task.id} ({task.name}): {e}")
 
     def _get_task_handler(self, task_name: str) -> Optional[Tuple[Callable, bool]]:
         if task_name in self._task_handlers:
@@ -179,47 +313,117 @@ class WorkerManager:
 
         transport = ServiceContainer().get(TransportInterface)
         is_push_mode = isinstance(transport, RabbitMQTransport)
+        prefetch = self.prefetch if self.prefetch is not None else self.concurrent_tasks
 
         if is_push_mode:
             self.logger.info("Starting in push mode (waiting for messages)")
-            transport.setup(self.queues)
+            # RabbitMQ pushes as many tasks as the worker holds, running or prefetched
+            transport.set_prefetch_count(self.concurrent_tasks + prefetch)
+            await self._call_broker(transport.setup, self.queues)
 
         consecutive_errors = 0
         max_consecutive_errors = 5
+        loop = asyncio.get_running_loop()
+        scheduler = QueueScheduler(self.queues, self.queue_weights)
+        # Tasks claimed ahead of a free slot, topped up every time a slot frees up
+        buffers: Dict[str, Deque[Task]] = {queue: deque() for queue in self.queues}
+        idle_polls = {queue: 0 for queue in self.queues}
+        next_poll = {queue: 0.0 for queue in self.queues}
+        running: Set[asyncio.Task] = set()
+        # Queued (or, in push mode, delivered) tasks wake the loop up, polling only backs the notifications up
+        self._subscription = self.broker.subscribe(self.queues)
 
-        while self.running:
-            try:
-                tasks = []
-                for queue in self.queues:
-                    queue_tasks = await asyncio.to_thread(self.broker.dequeue, queue, self.concurrent_tasks)
-                    tasks.extend([self._execute_task(task) for task in queue_tasks])
+        def wanted(queue: str) -> int:
+            return scheduler.share(queue, self.concurrent_tasks - len(running) + prefetch) - len(buffers[queue])
+
+        try:
+            while self.running:
+                try:
+                    if self._subscription is not None:
+                        self._subscription.clear()
 
-                if tasks:
-                    await asyncio.gather(*tasks)
+                    for queue in self.queues:
+                        count = wanted(queue)
+                        if count <= 0 or loop.time() < next_poll[queue]:
+                            continue
+                        tasks = await self._call_broker(self.broker.dequeue, queue, count)
+                        buffers[queue].extend(tasks)
+                        if len(tasks) < count:
+                            # The queue is drained: back off until a task is queued
+                            idle_polls[queue] = 0 if tasks else idle_polls[queue] + 1
+                            next_poll[queue] = loop.time() + self._idle_delay(max(1, idle_polls[queue]))
+                        else:
+                            idle_polls[queue] = 0
+                            next_poll[queue] = 0.0
 
-                # Cleanup logic
-                current_time = datetime.now().timestamp()
-                if current_time - self.last_cleanup_time > self.cleanup_interval:
-                    await self._cleanup_tasks()
-                    self.last_cleanup_time = current_time
+                    while len(running) < self.concurrent_tasks:
+                        queue = scheduler.next(queue for queue in self.queues if buffers[queue])
+                        if queue is None:
+                            break
+                        execution = asyncio.create_task(self._execute_task(buffers[queue].popleft()))
+                        running.add(execution)
+                        execution.add_done_callback(running.discard)
 
-                consecutive_errors = 0
+                    # Cleanup logic
+                    current_time = datetime.now().timestamp()
+                    if current_time - self.last_cleanup_time > self.cleanup_interval:
+                        await self._cleanup_tasks()
+                        self.last_cleanup_time = current_time
 
-                if not is_push_mode:
-                    await asyncio.sleep(self.polling_interval)
-                else:
-                    await asyncio.sleep(0.1)
+                    consecutive_errors = 0
 
-            except Exception as e:
-                consecutive_errors += 1
-                error_msg = f"Error in processing loop: {e}"
+                    # Sleep until a slot frees up, a task is queued or a queue is due for a poll
+                    due = [next_poll[queue] for queue in self.queues if wanted(queue) > 0]
+                    timeout = max(0.0, min(due) - loop.time()) if due else None
+                    waiters = set(running)
+                    wake_up = None
+                    if self._subscription is not None:
+                        wake_up = asyncio.ensure_future(self._subscription.event.wait())
+                        waiters.add(wake_up)
+                    if waiters:
+                        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                    else:
+                        await asyncio.sleep(timeout if timeout is not None else self.polling_interval)
+                    if wake_up is not None:
+                        if wake_up.done():
+                            idle_polls = dict.fromkeys(self.queues, 0)
+                            next_poll = dict.fromkeys(self.queues, 0.0)
+                        else:
+                            wake_up.cancel()
 
-                if consecutive_errors > max_consecutive_errors:
-                    if consecutive_errors % 60 == 0:
-                        self.logger.error(f"{error_msg} (errors continue)")
-                else:
-                    self.logger.error(error_msg)
-                    traceback.print_exc()
+                except Exception as e:
+                    consecutive_errors += 1
+                    error_msg = f"Error in processing loop: {e}"
+
+                    if consecutive_errors > max_consecutive_errors:
+                        if consecutive_errors % 60 == 0:
+                            self.logger.error(f"{error_msg} (errors continue)")
+                    else:
+                        self.logger.error(error_msg)
+                        traceback.print_exc()
+
+                    backoff_seconds = min(30, 1 * (2 ** min(5, consecutive_errors - 1)))
+                    await asyncio.sleep(backoff_seconds)
+        finally:
+            if self._subscription is not None:
+                self._subscription.close()
+                self._subscription = None
+            if running:
+                self.logger.info(f"Waiting for {len(running)} running tasks to finish")
+                await asyncio.gather(*running, return_exceptions=True)
+            await self._release(task for queue in self.queues for task in buffers[queue])
+            if is_push_mode:
+                # Sends the acknowledgements still batched before the worker exits
+                await self._call_broker(transport.shutdown)
+
+    async def _release(self, tasks) -> None:
+        """Gives the prefetched tasks that never started back to their queue"""
+        for task in tasks:
+            try:
+                await self._call_broker(self.broker.release, task)
+            except Exception as e:
+                self.logger.error(f"Unable to release task {task.id} ({task.name}): {e}")
 
-                backoff_seconds = min(30, 1 * (2 ** min(5, consecutive_errors - 1)))
-                await asyncio.sleep(backoff_seconds)
+    def _idle_delay(self, idle_polls: int) -> float:
+        """Seconds to wait after idle_polls empty polls in a row, doubling from min_polling_interval up to polling_interval"""
+        return min(self.polling_interval, self.min_polling_interval * 2 ** min(idle_polls - 1, 16))
@@ -23,6 +23,12 @@ class WorkerServiceProvider:
         container.set_instance(EntityManagerInterface, entity_manager_interface)
         from framefox.core.task.broker.broker_interface import BrokerInterface
         from framefox.core.task.broker.database_broker import DatabaseBroker
+        from framefox.core.task.result.result_backend_factory import (
+            ResultBackendFactory,
+        )
+        from framefox.core.task.result.result_backend_interface import (
+            ResultBackendInterface,
+        )
         from framefox.core.task.task_manager import TaskManager
         from framefox.core.task.transport.database_transport import DatabaseTransport
         from framefox.core.task.transport.transport_interface import TransportInterface
@@ -39,7 +45,12 @@ class WorkerServiceProvider:
             )
 
             task_transport = settings.task_transport_url
-            transport = RabbitMQTransport(entity_manager_interface, task_transport)
+            transport = RabbitMQTransport(
+                entity_manager_interface,
+                task_transport,
+                connections=settings.task_rabbitmq_connections,
+                channels=settings.task_rabbitmq_channels,
+            )
             container.set_instance(TransportInterface, transport)
             container.set_instance(RabbitMQTransport, transport)
 
@@ -56,8 +67,13 @@ class WorkerServiceProvider:
 
             container.set_instance(BrokerInterface, broker)
 
+        # None unless tasks.results.backend is set: the handles then have no result to await
+        result_backend = ResultBackendFactory.create(settings.task_results_config, entity_manager.engine)
+        container.set_instance(ResultBackendInterface, result_backend)
+
         worker_manager = WorkerManager(broker)
+        worker_manager.set_result_backend(result_backend)
         container.set_instance(WorkerManager, worker_manager)
 
-        task_manager = TaskManager(broker)
+        task_manager = TaskManager(broker, result_backend)
         container.set_instance(TaskManager, task_manager)
@@ -0,0 +1,145 @@
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from multiprocessing.connection import wait
+from typing import Callable, List, Optional
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: Boumaza Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class WorkerSupervisor:
+    """Runs a worker in several forked processes and keeps them alive.
+
+    target(index) runs the worker of one process until it is asked to stop; it
+    is called in a freshly forked child, which must open its own database
+    engine and broker connections. A child exiting while the supervisor is
+    running is restarted after an exponential backoff, reset once a process
+    has stayed up for stable_after seconds. SIGTERM or SIGINT sends SIGTERM to
+    every child so it can finish its running tasks, and the children still
+    alive after shutdown_timeout seconds are killed.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[int], None],
+        processes: int,
+        shutdown_timeout: float = 30,
+        restart_backoff: float = 1,
+        max_restart_backoff: float = 60,
+        stable_after: float = 60,
+    ):
+        if processes < 1:
+            raise ValueError("processes must be at least 1")
+        self.target = target
+        self.processes = processes
+        self.shutdown_timeout = shutdown_timeout
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+        self.stable_after = stable_after
+        self.logger = logging.getLogger("WORKER_SUPERVISOR")
+        self.context = multiprocessing.get_context("fork")
+        self.children: List[Optional[multiprocessing.Process]] = [None] * processes
+        self.started_at = [0.0] * processes
+        self.restart_at: List[Optional[float]] = [None] * processes
+        self.crashes = [0] * processes
+        self.restarts = 0
+        self.stopping = False
+        self._wakeup = None
+
+    def run(self) -> None:
+        previous_handlers = {sig: signal.signal(sig, self._handle_signal) for sig in (signal.SIGINT, signal.SIGTERM)}
+        # stop() writes to this pipe to interrupt the wait for the children
+        self._wakeup = os.pipe()
+        try:
+            self.logger.info(f"Starting {self.processes} worker processes")
+            for index in range(self.processes):
+                self._spawn(index)
+            while not self.stopping:
+                self._watch(timeout=self._next_restart_delay())
+            self._drain()
+        finally:
+            for sig, handler in previous_handlers.items():
+                signal.signal(sig, handler)
+            for fd in self._wakeup:
+                os.close(fd)
+            self._wakeup = None
+
+    def stop(self) -> None:
+        if self.stopping:
+            return
+        self.stopping = True
+        if self._wakeup is not None:
+            os.write(self._wakeup[1], b"\0")
+
+    def _handle_signal(self, signum, frame) -> None:
+        if not self.stopping:
+            self.logger.info(f"Received {signal.Signals(signum).name}, draining worker processes...")
+            self.stop()
+
+    def _spawn(self, index: int) -> None:
+        process = self.context.Process(target=self._run_child, args=(index,), name=f"framefox-worker-{index}")
+        process.start()
+        self.children[index] = process
+        self.started_at[index] = time.monotonic()
+        self.restart_at[index] = None
+        self.logger.info(f"Worker process {index} started (pid {process.pid})")
+
+    def _run_child(self, index: int) -> None:
+        # The child inherits the handlers of the supervisor, the worker installs its own
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        os.close(self._wakeup[0])
+        os.close(self._wakeup[1])
+        self.target(index)
+
+    def _watch(self, timeout: float) -> None:
+        """Waits for a child to exit (or a restart to be due) and schedules or performs restarts"""
+        wait([self._wakeup[0]] + [process.sentinel for process in self.children if process is not None], timeout=timeout)
+        if self.stopping:
+            return
+
+        now = time.monotonic()
+        for index, process in enumerate(self.children):
+            if process is not None and not process.is_alive():
+                process.join()
+                self.children[index] = None
+                self.crashes[index] = 0 if now - self.started_at[index] >= self.stable_after else self.crashes[index] + 1
+                backoff = min(self.max_restart_backoff, self.restart_backoff * 2 ** (self.crashes[index] - 1)) if self.crashes[index] else 0
+                self.restart_at[index] = now + backoff
+                self.logger.error(
+                    f"Worker process {index} (pid {process.pid}) exited with code {process.exitcode}, restarting in {backoff:g}s"
+                )
+            if self.children[index] is None and self.restart_at[index] is not None and self.restart_at[index] <= now:
+                self.restarts += 1
+                self._spawn(index)
+
+    def _next_restart_delay(self) -> float:
+        pending = [restart_at for restart_at in self.restart_at if restart_at is not None]
+        if not pending:
+            return 1.0
+        return max(0.0, min(1.0, min(pending) - time.monotonic()))
+
+    def _drain(self) -> None:
+        alive = [process for process in self.children if process is not None and process.is_alive()]
+        for process in alive:
+            process.terminate()
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in alive:
+            process.join(max(0.0, deadline - time.monotonic()))
+        for process in alive:
+            if process.is_alive():
+                self.logger.warning(
+                    f"Worker process {process.name} (pid {process.pid}) did not stop in {self.shutdown_timeout:g}s, killing it"
+                )
+                process.kill()
+                process.join()
+        self.logger.info("All worker processes stopped")
@@ -0,0 +1,94 @@
+import urllib.error
+import urllib.request
+from typing import Annotated
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from framefox.core.orm.pool_metrics import PoolMetrics
+from framefox.terminal.commands.abstract_command import AbstractCommand
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class DebugPoolCommand(AbstractCommand):
+    """
+    Reads the connection pool metrics of a running application from its /metrics
+    endpoint and recommends pool_size and max_overflow from the observed
+    concurrency and checkout wait times.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+    def execute(
+        self,
+        url: Annotated[str, typer.Option("--url", "-u", help="URL of the application /metrics endpoint")] = "http://127.0.0.1:8000/metrics",
+        timeout: Annotated[float, typer.Option("--timeout", "-t", help="HTTP timeout in seconds")] = 5.0,
+    ):
+        """
+        Recommend connection pool sizes from the metrics of a running application\n
+        Args:
+            url (str): The /metrics endpoint to read (enable it with debug.metrics.enabled outside dev).
+
+            timeout (float): HTTP timeout in seconds. Defaults to 5.
+        """
+        console = Console()
+        print("")
+
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                text = response.read().decode("utf-8")
+        except (urllib.error.URLError, OSError) as e:
+            self.printer.print_msg(f"Could not read {url}: {e}", theme="error")
+            return
+
+        pools = PoolMetrics.parse_metrics(text)
+        if not pools:
+            self.printer.print_msg("No connection pool metrics found, has the application used the database yet?", theme="warning")
+            return
+
+        table = Table(title="Connection pools", show_header=True, header_style="bold orange1")
+        table.add_column("Pool", style="bold orange3", no_wrap=True)
+        table.add_column("Checkouts", justify="right", style="white")
+        table.add_column("Concurrency p95 / max", justify="right", style="white")
+        table.add_column("Wait p95", justify="right", style="white")
+        table.add_column("Timeouts", justify="right", style="white")
+        table.add_column("pool_size", justify="right", style="white")
+        table.add_column("max_overflow", justify="right", style="white")
+
+        recommendations = []
+        for stats in pools:
+            recommendation = PoolMetrics.recommend(stats)
+            recommendations.append(recommendation)
+            table.add_row(
+                stats["pool"],
+                str(int(stats.get("checkouts", 0))),
+                f"{int(stats.get('concurrency_p95', 0))} / {int(stats.get('concurrency_max', 0))}",
+                f"{stats.get('wait_p95', 0) * 1000:.1f} ms",
+                str(int(stats.get("timeouts", 0))),
+                self._format_change(recommendation["pool_size"], recommendation["recommended_pool_size"]),
+                self._format_change(recommendation["max_overflow"], recommendation["recommended_max_overflow"]),
+            )
+
+        console.print(table)
+        print("")
+        for recommendation in recommendations:
+            for finding in recommendation["findings"]:
+                self.printer.print_msg(f"{recommendation['pool']}: {finding}", theme="warning")
+        print("")
+
+    @staticmethod
+    def _format_change(current, recommended: int) -> str:
+        if current is None:
+            return f"{recommended}"
+        if current == recommended:
+            return f"{current}"
+        return f"{current} -> [bold]{recommended}[/bold]"
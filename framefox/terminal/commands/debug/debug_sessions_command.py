@@ -0,0 +1,91 @@
+from datetime import datetime
+from typing import Annotated
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from framefox.core.request.session.session_manager import SessionManager
+from framefox.terminal.commands.abstract_command import AbstractCommand
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class DebugSessionsCommand(AbstractCommand):
+    """
+    Lists the largest or most written sessions of the configured session store
+    (SQLite or Redis) with their heaviest keys, to track down bloated flash bags
+    and oversized payloads.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+    def execute(
+        self,
+        limit: Annotated[int, typer.Option("--limit", "-l", help="Number of sessions to display")] = 10,
+        sort: Annotated[str, typer.Option("--sort", "-s", help="Sort by 'size' or 'writes'")] = "size",
+    ):
+        """
+        Display the heaviest sessions of the session store\n
+        Args:
+            limit (int): Number of sessions to display. Defaults to 10.
+
+            sort (str): 'size' for the largest payloads, 'writes' for the most written sessions.
+        """
+        console = Console()
+        print("")
+
+        if sort not in SessionManager.INSPECT_SORT_COLUMNS:
+            self.printer.print_msg(
+                f"Invalid sort '{sort}'. Use one of: {', '.join(SessionManager.INSPECT_SORT_COLUMNS)}",
+                theme="error",
+            )
+            return
+
+        session_manager = SessionManager(self.get_settings())
+        backend = session_manager.metrics.backend
+        sessions = session_manager.inspect_sessions(limit=limit, sort=sort)
+
+        if not sessions:
+            self.printer.print_msg(f"No sessions found in the {backend} session store.", theme="warning")
+            return
+
+        title = "Largest sessions" if sort == "size" else "Most written sessions"
+        table = Table(title=f"{title} ({backend})", show_header=True, header_style="bold orange1")
+        table.add_column("Session ID", style="bold orange3", no_wrap=True)
+        table.add_column("Size", justify="right", style="white")
+        table.add_column("Writes", justify="right", style="white")
+        table.add_column("Flash", justify="right", style="white")
+        table.add_column("Heaviest keys", style="bright_cyan")
+        table.add_column("Expires", style="dim")
+
+        for session in sessions:
+            keys = ", ".join(f"{key} ({self._format_size(size)})" for key, size in session["keys"])
+            if session.get("error"):
+                keys = f"[red]{session['error']}[/red]"
+            table.add_row(
+                session["session_id"],
+                self._format_size(session["size"]),
+                str(session["write_count"]),
+                str(session["flash_messages"]),
+                keys,
+                datetime.fromtimestamp(session["expires_at"]).strftime("%Y-%m-%d %H:%M:%S"),
+            )
+
+        console.print(table)
+        print("")
+
+    @staticmethod
+    def _format_size(size: int) -> str:
+        if size >= 1024 * 1024:
+            return f"{size / (1024 * 1024):.1f} MB"
+        if size >= 1024:
+            return f"{size / 1024:.1f} KB"
+        return f"{size} B"
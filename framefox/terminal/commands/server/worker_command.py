@@ -1,12 +1,17 @@
 import asyncio
 import logging
+from typing import Annotated, Optional
+
+import typer
 
 from framefox.core.config.settings import Settings
 from framefox.core.di.service_container import ServiceContainer
 from framefox.core.logging.filter.worker_polling_filter import WorkerPollingFilter
 from framefox.core.logging.worker_logger_configurator import WorkerLoggerConfigurator
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
 from framefox.core.task.worker_manager import WorkerManager
 from framefox.core.task.worker_service_provider import WorkerServiceProvider
+from framefox.core.task.worker_supervisor import WorkerSupervisor
 from framefox.terminal.commands.abstract_command import AbstractCommand
 
 """
@@ -25,36 +30,63 @@ class WorkerCommand(AbstractCommand):
         WorkerLoggerConfigurator.configure()
         sql_logger = logging.getLogger("SQLMODEL")
         sql_logger.addFilter(WorkerPollingFilter())
-        WorkerServiceProvider.register()
         self.settings = Settings()
 
-    def execute(self) -> None:
+    def execute(
+        self,
+        processes: Annotated[Optional[int], typer.Option("--processes", "-p", help="Number of worker processes")] = None,
+        concurrency: Annotated[Optional[int], typer.Option("--concurrency", "-c", help="Simultaneous tasks per process")] = None,
+    ) -> None:
         """
         Start the worker process to consume tasks from the queue.\n
         This command initializes the worker manager with the configured queues,\n
         concurrency, and polling interval. It also sets up cleanup configurations\n
         for task retention and cleanup intervals. The worker manager is then started\n
         to begin processing tasks asynchronously.\n
+        Args:
+            processes (int): Number of worker processes, each with its own database connections. Defaults to tasks.worker.processes.
+
+            concurrency (int): Simultaneous tasks in each process. Defaults to tasks.worker.concurrency.
         """
 
         queues = self.settings.task_default_queues
-        concurrency = self.settings.task_worker_concurrency
+        processes = processes or self.settings.task_worker_processes
+        concurrency = concurrency or self.settings.task_worker_concurrency
         interval = self.settings.task_polling_interval
 
         self.printer.print_msg(f"Starting workers (queues: {', '.join(queues)})", "info")
-        self.printer.print_msg(f"Concurrency: {concurrency}, interval: {interval}s", "info")
+        self.printer.print_msg(f"Processes: {processes}, concurrency: {concurrency} per process, interval: {interval}s", "info")
+
+        try:
+            if processes == 1:
+                self._run_worker(concurrency)
+            else:
+                supervisor = WorkerSupervisor(
+                    lambda index: self._run_worker(concurrency, forked=True),
+                    processes,
+                    shutdown_timeout=self.settings.task_worker_shutdown_timeout,
+                )
+                supervisor.run()
+        except KeyboardInterrupt:
+            self.printer.print_msg("Stopping workers...", "warning")
+
+    def _run_worker(self, concurrency: int, forked: bool = False) -> None:
+        if forked:
+            # Connections must not be shared with the parent or the other processes
+            EntityManagerRegistry.reset_engines()
+        WorkerServiceProvider.register()
 
         worker_manager = self.service_container.get(WorkerManager)
-        worker_manager.set_queues(queues)
+        worker_manager.set_queues(self.settings.task_default_queues)
         worker_manager.set_concurrent_tasks(concurrency)
-        worker_manager.set_polling_interval(interval)
+        worker_manager.set_polling_interval(self.settings.task_polling_interval)
+        worker_manager.set_min_polling_interval(self.settings.task_min_polling_interval)
+        worker_manager.set_prefetch(self.settings.task_worker_prefetch)
+        worker_manager.set_queue_weights(self.settings.task_worker_queue_weights)
+        worker_manager.set_task_timeout(self.settings.task_worker_task_timeout)
 
         cleanup_hours = self.settings.task_cleanup_interval
         retention_days = self.settings.task_retention_days
         worker_manager.set_cleanup_config(cleanup_hours, retention_days)
 
-        try:
-
-            asyncio.run(worker_manager.start())
-        except KeyboardInterrupt:
-            self.printer.print_msg("Stopping workers...", "warning")
+        asyncio.run(worker_manager.start())
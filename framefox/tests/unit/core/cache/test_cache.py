@@ -0,0 +1,86 @@
+import fnmatch
+from unittest.mock import patch
+
+import pytest
+
+from framefox.core.cache.memory_cache import MemoryCache
+from framefox.core.cache.redis_cache import RedisCache
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class InMemoryRedisClient:
+    """Minimal stand-in for the redis client calls used by RedisCache (expiry is not simulated)"""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, name):
+        return self.values.get(name)
+
+    def set(self, name, value, ex=None):
+        self.values[name] = value
+
+    def delete(self, *names):
+        for name in names:
+            self.values.pop(name, None)
+
+    def scan_iter(self, match=None, count=None):
+        return [name for name in list(self.values) if fnmatch.fnmatchcase(name, match)]
+
+
+class TestCache:
+    @pytest.fixture(params=["memory", "redis"])
+    def cache(self, request):
+        """Fixture for each cache backend"""
+        if request.param == "memory":
+            return MemoryCache()
+        return RedisCache(prefix="test:", client=InMemoryRedisClient())
+
+    def test_set_get_delete(self, cache):
+        cache.set("entity:user:1", {"id": 1, "name": "Ada"}, ttl=60)
+
+        assert cache.get("entity:user:1") == {"id": 1, "name": "Ada"}
+        cache.delete("entity:user:1")
+        assert cache.get("entity:user:1") is None
+
+    def test_delete_prefix_only_removes_the_namespace(self, cache):
+        cache.set("entity:user:1", 1)
+        cache.set("entity:user:2", 2)
+        cache.set("entity:user_role:1", 3)
+
+        cache.delete_prefix("entity:user:")
+
+        assert cache.get("entity:user:1") is None
+        assert cache.get("entity:user:2") is None
+        assert cache.get("entity:user_role:1") == 3
+
+
+class TestMemoryCache:
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert len(cache) == 2
+
+    def test_entries_expire_after_ttl(self):
+        cache = MemoryCache()
+        with patch("framefox.core.cache.memory_cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1, ttl=10)
+
+        with patch("framefox.core.cache.memory_cache.time.monotonic", return_value=109.0):
+            assert cache.get("a") == 1
+        with patch("framefox.core.cache.memory_cache.time.monotonic", return_value=110.0):
+            assert cache.get("a") is None
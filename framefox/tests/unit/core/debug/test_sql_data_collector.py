@@ -0,0 +1,44 @@
+from framefox.core.debug.profiler.collector.sql_data_collector import SQLDataCollector
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+def make_query(sql: str, parameters=None, duration: float = 1.0) -> dict:
+    return {"query": sql, "parameters": parameters, "duration": duration}
+
+
+class TestNPlusOneDetection:
+    def test_repeated_select_with_different_parameters_is_reported(self):
+        queries = [make_query("SELECT * FROM article")]
+        queries += [make_query("SELECT * FROM comment WHERE article_id = ?", (article_id,)) for article_id in range(5)]
+
+        suspects = SQLDataCollector.detect_n_plus_one(queries)
+
+        assert len(suspects) == 1
+        assert suspects[0]["count"] == 5
+        assert suspects[0]["distinct_parameters"] == 5
+        assert suspects[0]["first_index"] == 2
+        assert suspects[0]["total_duration"] == 5.0
+
+    def test_same_parameters_or_few_executions_are_ignored(self):
+        queries = [make_query("SELECT * FROM config WHERE id = ?", (1,)) for _ in range(5)]
+        queries += [make_query("SELECT * FROM user WHERE id = ?", (user_id,)) for user_id in range(2)]
+        queries += [make_query("UPDATE article SET views = ?", (views,)) for views in range(5)]
+
+        assert SQLDataCollector.detect_n_plus_one(queries) == []
+
+    def test_parameters_logged_separately_are_attached_to_the_statement(self):
+        collector = SQLDataCollector.__new__(SQLDataCollector)
+        collector.request_active = True
+        collector.queries = []
+
+        collector.add_query("SELECT * FROM comment WHERE article_id = ?", 0.0)
+        collector.attach_parameters((7,))
+
+        assert collector.queries[0]["parameters"] == (7,)
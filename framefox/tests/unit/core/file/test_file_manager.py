@@ -0,0 +1,73 @@
+import hashlib
+import os
+from tempfile import SpooledTemporaryFile
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from framefox.core.file.file_manager import FileManager
+from framefox.core.file.storage.local_storage import LocalStorage
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+def make_upload(content: bytes, filename: str = "report.pdf", max_memory: int = 1024) -> UploadFile:
+    spool = SpooledTemporaryFile(max_size=max_memory)
+    spool.write(content)
+    spool.seek(0)
+    return UploadFile(file=spool, filename=filename, size=None)
+
+
+class TestFileManager:
+    @pytest.fixture
+    def file_manager(self, tmp_path, monkeypatch):
+        """Fixture for a file manager rooted in a temporary directory"""
+        monkeypatch.chdir(tmp_path)
+        return FileManager(LocalStorage(str(tmp_path)))
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("max_memory", [10 * 1024 * 1024, 1024])
+    async def test_store_streams_content_and_hashes(self, file_manager, max_memory):
+        """Test in-memory and disk-spooled uploads are copied and hashed"""
+        content = os.urandom(3 * LocalStorage.CHUNK_SIZE + 123)
+        upload = make_upload(content, max_memory=max_memory)
+
+        stored = await file_manager.store(upload, subdirectory="public/uploads")
+
+        assert stored.path.startswith("public/uploads/")
+        assert stored.size == len(content)
+        assert stored.sha256 == hashlib.sha256(content).hexdigest()
+        with open(stored.path, "rb") as f:
+            assert f.read() == content
+
+    @pytest.mark.asyncio
+    async def test_save_returns_relative_path(self, file_manager):
+        upload = make_upload(b"hello", filename="notes.txt")
+
+        path = await file_manager.save(upload, subdirectory="uploads", rename=False)
+
+        assert path == os.path.join("uploads", "notes.txt")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("max_memory", [10 * 1024 * 1024, 1024])
+    async def test_max_size_rejects_and_cleans_up(self, file_manager, tmp_path, max_memory):
+        """Test that oversized uploads are rejected without leaving partial files"""
+        upload = make_upload(b"x" * 4096, max_memory=max_memory)
+
+        with pytest.raises(ValueError, match="too large"):
+            await file_manager.store(upload, subdirectory="uploads", max_size=1000)
+
+        assert os.listdir(tmp_path / "uploads") == []
+
+    @pytest.mark.asyncio
+    async def test_rejects_disallowed_extension(self, file_manager):
+        upload = make_upload(b"#!/bin/sh", filename="script.sh")
+
+        with pytest.raises(ValueError, match="Unauthorized file type"):
+            await file_manager.store(upload, allowed_extensions=[".pdf"])
@@ -0,0 +1,200 @@
+import hashlib
+import io
+from datetime import datetime, timezone
+from tempfile import SpooledTemporaryFile
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from starlette.datastructures import UploadFile
+from starlette.requests import Request
+
+from framefox.core.file.file_controller import FileController
+from framefox.core.file.storage.local_storage import LocalStorage
+from framefox.core.file.storage.s3_storage import S3Storage
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class InMemoryS3Client:
+    """Minimal stand-in for an S3-compatible server (MinIO-like) used by S3Storage"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+        data = bytearray()
+        while True:
+            chunk = fileobj.read(8192)
+            if not chunk:
+                break
+            data.extend(chunk)
+        self.objects[(bucket, key)] = {
+            "body": bytes(data),
+            "content_type": (ExtraArgs or {}).get("ContentType"),
+            "last_modified": datetime.now(timezone.utc),
+        }
+
+    def head_object(self, Bucket, Key):
+        obj = self.objects.get((Bucket, Key))
+        if obj is None:
+            raise KeyError(Key)
+        return {
+            "ContentLength": len(obj["body"]),
+            "ETag": f'"{hashlib.md5(obj["body"]).hexdigest()}"',
+            "ContentType": obj["content_type"],
+            "LastModified": obj["last_modified"],
+        }
+
+    def get_object(self, Bucket, Key, Range=None):
+        body = self.objects[(Bucket, Key)]["body"]
+        start, _, end = Range.removeprefix("bytes=").partition("-")
+        return {"Body": io.BytesIO(body[int(start) : int(end) + 1 if end else None])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+
+def make_upload(content: bytes, filename: str = "movie.mp4") -> UploadFile:
+    spool = SpooledTemporaryFile(max_size=1024)
+    spool.write(content)
+    spool.seek(0)
+    return UploadFile(file=spool, filename=filename, headers={"content-type": "video/mp4"})
+
+
+def make_request(headers: dict = None, method: str = "GET") -> Request:
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": method, "path": "/", "headers": raw_headers, "query_string": b""})
+
+
+async def collect(response) -> bytes:
+    body = b""
+    async for chunk in response.body_iterator:
+        body += chunk if isinstance(chunk, bytes) else chunk.encode()
+    return body
+
+
+class TestStorage:
+    @pytest.fixture
+    def content(self):
+        return bytes(range(256)) * 64
+
+    @pytest.fixture(params=["local", "s3"])
+    def storage(self, request, tmp_path):
+        """Fixture for each storage backend"""
+        if request.param == "local":
+            return LocalStorage(str(tmp_path))
+        return S3Storage(bucket="media", prefix="app", client=InMemoryS3Client())
+
+    @pytest.mark.asyncio
+    async def test_write_stat_and_read_range(self, storage, content):
+        size, checksum = await storage.write(make_upload(content), "public/uploads/movie.mp4")
+
+        stat = storage.stat("public/uploads/movie.mp4")
+        chunks = [chunk async for chunk in storage.iter_range("public/uploads/movie.mp4", 10, 99)]
+
+        assert size == len(content)
+        assert checksum == hashlib.sha256(content).hexdigest()
+        assert stat.size == len(content)
+        assert stat.etag
+        assert b"".join(chunks) == content[10:100]
+
+    @pytest.mark.asyncio
+    async def test_write_enforces_max_size(self, storage, content):
+        with pytest.raises(ValueError, match="too large"):
+            await storage.write(make_upload(content), "public/uploads/movie.mp4", max_size=100)
+
+    def test_rejects_parent_directory_keys(self, storage):
+        with pytest.raises(ValueError):
+            storage.normalize_key("public/../../etc/passwd")
+
+    @pytest.mark.asyncio
+    async def test_delete(self, storage, content):
+        await storage.write(make_upload(content), "public/uploads/movie.mp4")
+
+        assert storage.delete("public/uploads/movie.mp4") is True
+        assert storage.stat("public/uploads/movie.mp4") is None
+        assert storage.delete("public/uploads/movie.mp4") is False
+
+    @pytest.mark.asyncio
+    async def test_local_copy_falls_back_when_the_kernel_copy_stops(self, tmp_path, content):
+        storage = LocalStorage(str(tmp_path))
+
+        with patch.object(LocalStorage, "_copy_range", return_value=0):
+            size, checksum = await storage.write(make_upload(content), "public/uploads/movie.mp4")
+
+        assert size == len(content)
+        assert checksum == hashlib.sha256(content).hexdigest()
+        assert (tmp_path / "public/uploads/movie.mp4").read_bytes() == content
+
+    @pytest.mark.asyncio
+    async def test_local_copy_never_commits_a_truncated_file(self, tmp_path, content):
+        storage = LocalStorage(str(tmp_path))
+
+        with patch.object(LocalStorage, "_copy_range", return_value=0), patch.object(LocalStorage, "_read_write", return_value=0):
+            with pytest.raises(OSError, match="truncated"):
+                await storage.write(make_upload(content), "public/uploads/movie.mp4")
+
+        assert storage.stat("public/uploads/movie.mp4") is None
+
+
+class TestFileController:
+    @pytest.fixture
+    def controller(self):
+        """Fixture for a controller serving an S3 stand-in without settings"""
+        controller = FileController.__new__(FileController)
+        controller.storage = S3Storage(bucket="media", client=InMemoryS3Client())
+        controller.allowed_prefixes = ["public/uploads/"]
+        return controller
+
+    @pytest_asyncio.fixture
+    async def stored(self, controller):
+        content = b"0123456789" * 100
+        await controller.storage.write(make_upload(content), "public/uploads/movie.mp4")
+        return content
+
+    @pytest.mark.parametrize(
+        "header,expected",
+        [
+            ("bytes=0-9", (0, 9)),
+            ("bytes=990-", (990, 999)),
+            ("bytes=-10", (990, 999)),
+            ("bytes=5-5000", (5, 999)),
+            ("bytes=0-1,5-6", None),
+            ("items=0-1", None),
+        ],
+    )
+    def test_parse_range(self, header, expected):
+        assert FileController.parse_range(header, 1000) == expected
+
+    def test_parse_range_unsatisfiable(self):
+        with pytest.raises(ValueError):
+            FileController.parse_range("bytes=1000-", 1000)
+
+    @pytest.mark.asyncio
+    async def test_range_request_returns_partial_content(self, controller, stored):
+        response = await controller.download("public/uploads/movie.mp4", make_request({"Range": "bytes=10-19"}))
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == "bytes 10-19/1000"
+        assert await collect(response) == stored[10:20]
+
+    @pytest.mark.asyncio
+    async def test_if_none_match_returns_not_modified(self, controller, stored):
+        etag = controller.storage.stat("public/uploads/movie.mp4").etag
+
+        response = await controller.download("public/uploads/movie.mp4", make_request({"If-None-Match": etag}))
+
+        assert response.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_keys_outside_prefixes_are_not_served(self, controller, stored):
+        response = await controller.download("config/security.yaml", make_request())
+
+        assert response.status_code == 404
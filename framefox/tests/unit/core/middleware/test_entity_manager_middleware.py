@@ -0,0 +1,134 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from framefox.core.middleware.middlewares.entity_manager_middleware import (
+    EntityManagerMiddleware,
+)
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+def make_app(handler=None, status: int = 200):
+    async def app(scope, receive, send):
+        if handler is not None:
+            await handler()
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+async def call(middleware):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await middleware({"type": "http", "method": "GET", "path": "/", "headers": []}, AsyncMock(), send)
+    return sent
+
+
+class TestEntityManagerMiddleware:
+    @pytest.fixture
+    def manager_class(self):
+        """Fixture replacing EntityManager with a mock class whose instances opened a session"""
+        with patch("framefox.core.orm.entity_manager.EntityManager") as manager_class:
+            manager_class.side_effect = lambda: Mock(has_session=True)
+            yield manager_class
+
+    @pytest.mark.asyncio
+    async def test_request_without_database_creates_nothing(self, manager_class):
+        with patch.object(EntityManagerRegistry, "get_instance") as get_instance:
+            await call(EntityManagerMiddleware(make_app()))
+
+        manager_class.assert_not_called()
+        get_instance.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_manager_is_created_once_and_committed(self, manager_class):
+        used = []
+
+        async def handler():
+            used.append(EntityManagerRegistry.get_entity_manager_for_request())
+            used.append(EntityManagerRegistry.get_entity_manager_for_request())
+
+        await call(EntityManagerMiddleware(make_app(handler)))
+
+        assert manager_class.call_count == 1
+        assert used[0] is used[1]
+        used[0].commit.assert_called_once()
+        used[0].close_session.assert_called_once()
+        assert EntityManagerRegistry.get_request_scope() is None
+
+    @pytest.mark.asyncio
+    async def test_manager_created_in_a_thread_is_committed(self, manager_class):
+        used = []
+
+        async def handler():
+            used.append(await asyncio.to_thread(EntityManagerRegistry.get_entity_manager_for_request))
+
+        await call(EntityManagerMiddleware(make_app(handler)))
+
+        used[0].commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_manager_without_session_is_not_committed(self, manager_class):
+        manager_class.side_effect = lambda: Mock(has_session=False)
+        used = []
+
+        async def handler():
+            used.append(EntityManagerRegistry.get_entity_manager_for_request())
+
+        await call(EntityManagerMiddleware(make_app(handler)))
+
+        used[0].commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_error_status_is_not_committed(self, manager_class):
+        used = []
+
+        async def handler():
+            used.append(EntityManagerRegistry.get_entity_manager_for_request())
+
+        await call(EntityManagerMiddleware(make_app(handler, status=400)))
+
+        used[0].commit.assert_not_called()
+        used[0].close_session.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_exception_rolls_back(self, manager_class):
+        used = []
+
+        async def handler():
+            used.append(EntityManagerRegistry.get_entity_manager_for_request())
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await call(EntityManagerMiddleware(make_app(handler)))
+
+        used[0].rollback.assert_called_once()
+        used[0].commit.assert_not_called()
+        used[0].close_session.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_async_manager_is_committed_and_closed(self):
+        used = []
+
+        async def handler():
+            used.append(EntityManagerRegistry.get_async_entity_manager_for_request())
+
+        with patch("framefox.core.orm.async_entity_manager.AsyncEntityManager") as manager_class:
+            manager_class.side_effect = lambda: AsyncMock(has_session=True)
+            await call(EntityManagerMiddleware(make_app(handler)))
+
+        used[0].commit.assert_awaited_once()
+        used[0].close_session.assert_awaited_once()
@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import event
+
+from framefox.core.orm.entity_manager import EntityManager
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+@contextmanager
+def recorded_statements(engine, keyword: str):
+    """Records the statements starting with keyword sent to the database"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(keyword):
+            executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def statements(engine):
+    """Fixture recording the SELECT statements sent to the test engine"""
+    with recorded_statements(engine, "SELECT") as executed:
+        yield executed
+
+
+@pytest.fixture
+def inserts(engine):
+    """Fixture recording the INSERT statements sent to the test engine"""
+    with recorded_statements(engine, "INSERT") as executed:
+        yield executed
+
+
+@pytest.fixture
+def make_entity_manager(engine):
+    """Fixture building EntityManager instances bound to the test engine, each one standing for a request"""
+    registry = Mock()
+    registry.get_engine.return_value = engine
+    managers = []
+
+    def make():
+        with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+            manager = EntityManager()
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.close_session()
+
+
+@pytest.fixture
+def entity_manager(make_entity_manager):
+    """Fixture for an EntityManager bound to the test engine"""
+    return make_entity_manager()
@@ -1,9 +1,12 @@
 from typing import Optional
+from unittest.mock import patch
 
 from pydantic import BaseModel
 from sqlmodel import Field
 
+from framefox.core.orm import abstract_entity
 from framefox.core.orm.abstract_entity import AbstractEntity
+from framefox.core.orm.abstract_repository import AbstractRepository
 
 """
 Framefox Framework developed by SOMA
@@ -23,6 +26,12 @@ class TestUser(AbstractEntity, table=True):
     age: Optional[int] = None
 
 
+class TestAdmin(TestUser):
+    """Test subclass of an entity, it must get its own generated models"""
+
+    level: int = 0
+
+
 class TestAbstractEntity:
     def test_generate_create_model(self):
         """Test the generation of the create model"""
@@ -71,3 +80,48 @@ class TestAbstractEntity:
         assert user.email == "test@example.com"
         assert user.age == 25
         assert user.id is None
+
+    def test_generate_patch_model(self):
+        """Test the generation of the patch model"""
+        patch_model = TestUser.generate_patch_model()
+
+        assert patch_model.__name__ == "TestUserPatch"
+        assert "id" not in patch_model.model_fields
+        assert patch_model().model_dump() == {"name": None, "email": None, "age": None}
+
+    def test_generated_models_are_built_once_per_class(self):
+        """Test that the generated models are memoized on the entity class"""
+        assert TestUser.generate_create_model() is TestUser.generate_create_model()
+        assert TestUser.generate_find_model() is TestUser.generate_find_model()
+        assert TestUser.generate_patch_model() is TestUser.generate_patch_model()
+
+    def test_subclass_gets_its_own_models(self):
+        """Test that a subclass does not reuse the models of its parent"""
+        TestUser.generate_create_model()
+
+        create_model = TestAdmin.generate_create_model()
+
+        assert create_model.__name__ == "TestAdminCreate"
+        assert "level" in create_model.model_fields
+        assert "level" not in TestUser.generate_create_model().model_fields
+
+    def test_primary_keys_are_inspected_once(self):
+        """Test that the mapper is only inspected on the first call"""
+
+        class TestToken(AbstractEntity, table=True):
+            token: str = Field(primary_key=True)
+
+        with patch.object(abstract_entity, "inspect", wraps=abstract_entity.inspect) as inspect:
+            assert TestToken.get_primary_keys() == ["token"]
+            TestToken.get_primary_keys().append("mutated")
+
+            assert TestToken.get_primary_keys() == ["token"]
+            assert inspect.call_count == 1
+
+    def test_repository_reuses_the_create_model(self):
+        """Test that instantiating repositories does not rebuild the create model"""
+        with patch.object(abstract_entity, "create_model", wraps=abstract_entity.create_model) as create_model:
+            repositories = [AbstractRepository(TestAdmin) for _ in range(3)]
+
+        assert repositories[0].create_model is repositories[2].create_model
+        assert create_model.call_count <= 1
@@ -0,0 +1,137 @@
+import asyncio
+from typing import Optional
+from unittest.mock import Mock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Field, SQLModel, select
+
+from framefox.core.orm.async_entity_manager import AsyncEntityManager
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class AsyncArticle(SQLModel, table=True):
+    __tablename__ = "test_async_article"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    title: str
+
+    @classmethod
+    def get_primary_keys(cls):
+        return ["id"]
+
+
+class TestAsyncEntityManager:
+    @pytest_asyncio.fixture
+    async def engine(self, tmp_path):
+        """Fixture for an aiosqlite engine on a temporary database"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(AsyncArticle.__table__.create)
+        yield engine
+        await engine.dispose()
+
+    @pytest.fixture
+    def make_entity_manager(self, engine):
+        """Fixture building AsyncEntityManager instances bound to the test engine"""
+        registry = Mock()
+        registry.get_async_engine.return_value = engine
+        with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+            yield AsyncEntityManager
+
+    @pytest.mark.asyncio
+    async def test_persist_commit_and_find(self, make_entity_manager):
+        entity_manager = make_entity_manager()
+        article = await entity_manager.persist(AsyncArticle(title="Hello"))
+        await entity_manager.commit()
+        await entity_manager.close_session()
+
+        reader = make_entity_manager()
+        found = await reader.find(AsyncArticle, article.id)
+
+        assert found is not None
+        assert found.title == "Hello"
+        assert await reader.find(AsyncArticle, article.id) is found
+        await reader.close_session()
+
+    @pytest.mark.asyncio
+    async def test_transaction_rolls_back_on_error(self, make_entity_manager):
+        entity_manager = make_entity_manager()
+
+        with pytest.raises(RuntimeError):
+            async with entity_manager.transaction():
+                await entity_manager.persist(AsyncArticle(title="Lost"))
+                raise RuntimeError("boom")
+
+        assert await entity_manager.exec_statement(select(AsyncArticle)) == []
+        await entity_manager.close_session()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sessions(self, make_entity_manager):
+        writer = make_entity_manager()
+        for index in range(10):
+            await writer.persist(AsyncArticle(title=f"Article {index}"))
+        await writer.commit()
+        await writer.close_session()
+
+        async def count_articles():
+            entity_manager = make_entity_manager()
+            try:
+                return len(await entity_manager.exec_statement(select(AsyncArticle)))
+            finally:
+                await entity_manager.close_session()
+
+        assert await asyncio.gather(*(count_articles() for _ in range(20))) == [10] * 20
+
+    @pytest.mark.asyncio
+    async def test_find_many_converts_string_ids(self, make_entity_manager):
+        writer = make_entity_manager()
+        articles = [await writer.persist(AsyncArticle(title=f"Article {index}")) for index in range(3)]
+        await writer.commit()
+        ids = [article.id for article in articles]
+        await writer.close_session()
+
+        reader = make_entity_manager()
+        found = await reader.find_many(AsyncArticle, [str(ids[2]), str(ids[0])])
+
+        assert [article.id for article in found] == [ids[2], ids[0]]
+        await reader.close_session()
+
+    def test_session_is_lazy(self, make_entity_manager):
+        entity_manager = make_entity_manager()
+
+        assert entity_manager.has_session is False
+        entity_manager.session
+        assert entity_manager.has_session is True
+
+
+class TestAsyncDatabaseUrl:
+    @pytest.mark.parametrize(
+        "url,expected",
+        [
+            ("sqlite:///var/app.db", "sqlite+aiosqlite:///var/app.db"),
+            ("postgresql://user:secret@db:5432/app", "postgresql+asyncpg://user:secret@db:5432/app"),
+            ("mysql+pymysql://user:secret@db:3306/app", "mysql+aiomysql://user:secret@db:3306/app"),
+        ],
+    )
+    def test_async_driver_is_selected(self, url, expected):
+        registry = EntityManagerRegistry.__new__(EntityManagerRegistry)
+        registry.settings = Mock(database_url=url)
+
+        assert registry._get_async_database_url_string() == expected
+
+    def test_unknown_dialect_is_rejected(self):
+        registry = EntityManagerRegistry.__new__(EntityManagerRegistry)
+        registry.settings = Mock(database_url="oracle://user:secret@db/app")
+
+        with pytest.raises(ValueError):
+            registry._get_async_database_url_string()
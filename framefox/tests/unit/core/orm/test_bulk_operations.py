@@ -0,0 +1,172 @@
+from typing import Optional
+from unittest.mock import Mock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Field, SQLModel, create_engine, select
+
+from framefox.core.cache.memory_cache import MemoryCache
+from framefox.core.orm.async_entity_manager import AsyncEntityManager
+from framefox.core.orm.cache.entity_cache import EntityCache
+from framefox.core.orm.entity_manager import EntityManager
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class BulkProduct(SQLModel, table=True):
+    __tablename__ = "test_bulk_product"
+    __cache__ = True
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    sku: str = Field(unique=True)
+    name: str
+    stock: int = 0
+
+    @classmethod
+    def get_primary_keys(cls):
+        return ["id"]
+
+
+def products(session) -> dict:
+    return {product.sku: (product.name, product.stock) for product in session.exec(select(BulkProduct)).all()}
+
+
+class TestBulkOperations:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Fixture for a SQLite engine with an empty product table"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+        BulkProduct.__table__.create(engine)
+        yield engine
+        engine.dispose()
+
+    def test_bulk_insert_entities_and_dicts_in_chunks(self, entity_manager, inserts):
+        rows = [BulkProduct(sku=f"SKU-{i}", name=f"Product {i}") for i in range(5)]
+        rows += [{"sku": f"SKU-{i}", "name": f"Product {i}", "stock": i} for i in range(5, 10)]
+
+        count = entity_manager.bulk_insert(BulkProduct, rows, chunk_size=4)
+
+        assert count == 10
+        assert len(inserts) == 3
+        assert len(products(entity_manager.session)) == 10
+        assert products(entity_manager.session)["SKU-7"] == ("Product 7", 7)
+
+    def test_bulk_insert_consumes_generators(self, entity_manager):
+        count = entity_manager.bulk_insert(BulkProduct, ({"sku": f"SKU-{i}", "name": "Product"} for i in range(25)), chunk_size=10)
+
+        assert count == 25
+        assert len(products(entity_manager.session)) == 25
+
+    def test_bulk_insert_runs_in_one_transaction(self, entity_manager):
+        rows = [{"sku": f"SKU-{i}", "name": "Product"} for i in range(5)] + [{"sku": "SKU-0", "name": "Duplicate"}]
+
+        with pytest.raises(IntegrityError):
+            entity_manager.bulk_insert(BulkProduct, rows, chunk_size=5)
+
+        assert products(entity_manager.session) == {}
+
+    def test_bulk_insert_rejects_other_entities(self, entity_manager):
+        with pytest.raises(TypeError):
+            entity_manager.bulk_insert(BulkProduct, [object()])
+
+    def test_bulk_update_by_primary_key(self, entity_manager):
+        entity_manager.bulk_insert(BulkProduct, [{"id": i, "sku": f"SKU-{i}", "name": "Product"} for i in range(1, 6)])
+
+        count = entity_manager.bulk_update(BulkProduct, [{"id": i, "stock": i * 10} for i in range(1, 6)], chunk_size=2)
+
+        assert count == 5
+        assert products(entity_manager.session)["SKU-3"] == ("Product", 30)
+
+    def test_bulk_update_requires_primary_key(self, entity_manager):
+        with pytest.raises(ValueError, match="primary key"):
+            entity_manager.bulk_update(BulkProduct, [{"stock": 1}])
+
+    def test_upsert_inserts_and_updates(self, entity_manager):
+        entity_manager.bulk_insert(BulkProduct, [{"id": 1, "sku": "SKU-1", "name": "Old", "stock": 1}])
+
+        entity_manager.upsert(
+            BulkProduct,
+            [{"id": 1, "sku": "SKU-1", "name": "New", "stock": 5}, {"id": 2, "sku": "SKU-2", "name": "Other", "stock": 2}],
+        )
+
+        assert products(entity_manager.session) == {"SKU-1": ("New", 5), "SKU-2": ("Other", 2)}
+
+    def test_upsert_on_unique_column_with_selected_fields(self, entity_manager):
+        entity_manager.bulk_insert(BulkProduct, [{"sku": "SKU-1", "name": "Keep", "stock": 1}])
+
+        entity_manager.upsert(
+            BulkProduct,
+            [{"sku": "SKU-1", "name": "Ignored", "stock": 9}, {"sku": "SKU-2", "name": "Added", "stock": 3}],
+            index_elements=["sku"],
+            update_fields=["stock"],
+        )
+
+        assert products(entity_manager.session) == {"SKU-1": ("Keep", 9), "SKU-2": ("Added", 3)}
+
+    def test_upsert_without_update_fields_keeps_existing_rows(self, entity_manager):
+        entity_manager.bulk_insert(BulkProduct, [{"id": 1, "sku": "SKU-1", "name": "Keep"}])
+
+        entity_manager.upsert(BulkProduct, [{"id": 1, "sku": "SKU-1", "name": "Ignored"}], update_fields=[])
+
+        assert products(entity_manager.session) == {"SKU-1": ("Keep", 0)}
+
+    def test_upsert_invalidates_entity_cache(self, entity_manager):
+        cache = MemoryCache()
+        entity_manager.bulk_insert(BulkProduct, [{"id": 1, "sku": "SKU-1", "name": "Old"}])
+        with patch.object(EntityCache, "_instance", EntityCache(cache, default_ttl=60)):
+            entity_manager.entity_cache = EntityCache._instance
+            entity_manager.find(BulkProduct, 1)
+            assert cache.get("entity:test_bulk_product:1") is not None
+
+            entity_manager.upsert(BulkProduct, [{"id": 1, "sku": "SKU-1", "name": "New"}])
+
+            assert cache.get("entity:test_bulk_product:1") is None
+
+    def test_upsert_statements_per_dialect(self):
+        columns = ["id", "sku", "name"]
+
+        postgres = EntityManager.upsert_statement("postgresql", BulkProduct, columns, ["id"])
+        mariadb = EntityManager.upsert_statement("mysql", BulkProduct, columns, ["id"])
+
+        assert "ON CONFLICT (id) DO UPDATE SET sku = excluded.sku" in str(postgres.compile(dialect=postgresql.dialect()))
+        assert "ON DUPLICATE KEY UPDATE sku = VALUES(sku)" in str(mariadb.compile(dialect=mysql.dialect()))
+
+    def test_upsert_unsupported_dialect(self):
+        with pytest.raises(ValueError, match="not supported"):
+            EntityManager.upsert_statement("oracle", BulkProduct, ["id"], ["id"])
+
+
+class TestAsyncBulkOperations:
+    @pytest_asyncio.fixture
+    async def entity_manager(self, tmp_path):
+        """Fixture for an AsyncEntityManager bound to an aiosqlite engine"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bulk.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(lambda sync_connection: BulkProduct.__table__.create(sync_connection))
+        registry = Mock()
+        registry.get_async_engine.return_value = engine
+        with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+            entity_manager = AsyncEntityManager()
+        yield entity_manager
+        await entity_manager.close_session()
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_bulk_insert_update_and_upsert(self, entity_manager):
+        await entity_manager.bulk_insert(BulkProduct, [{"id": i, "sku": f"SKU-{i}", "name": "Product"} for i in range(1, 4)], chunk_size=2)
+        await entity_manager.bulk_update(BulkProduct, [{"id": 2, "stock": 7}])
+        await entity_manager.upsert(BulkProduct, [{"id": 3, "sku": "SKU-3", "name": "Renamed"}, {"id": 4, "sku": "SKU-4", "name": "New"}])
+
+        rows = await entity_manager.exec_statement(select(BulkProduct).order_by(BulkProduct.id))
+
+        assert [(product.name, product.stock) for product in rows] == [("Product", 0), ("Product", 7), ("Renamed", 0), ("New", 0)]
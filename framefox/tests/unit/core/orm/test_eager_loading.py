@@ -0,0 +1,139 @@
+from typing import List, Optional
+
+import pytest
+from sqlmodel import Field, Relationship, SQLModel, create_engine
+
+from framefox.core.orm.abstract_repository import AbstractRepository
+from framefox.core.orm.query_builder import QueryBuilder
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class EagerAuthor(SQLModel, table=True):
+    __tablename__ = "test_eager_author"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    books: List["EagerBook"] = Relationship(back_populates="author")
+
+    @classmethod
+    def get_primary_keys(cls):
+        return ["id"]
+
+
+class EagerBook(SQLModel, table=True):
+    __tablename__ = "test_eager_book"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    title: str
+    author_id: Optional[int] = Field(default=None, foreign_key="test_eager_author.id")
+    author: Optional[EagerAuthor] = Relationship(back_populates="books")
+
+    @classmethod
+    def get_primary_keys(cls):
+        return ["id"]
+
+
+class EagerAuthorRepository(AbstractRepository):
+    def __init__(self, entity_manager):
+        self.model = EagerAuthor
+        self._entity_manager = entity_manager
+
+    @property
+    def entity_manager(self):
+        return self._entity_manager
+
+
+class EagerBookRepository(AbstractRepository):
+    def __init__(self, entity_manager):
+        self.model = EagerBook
+        self._entity_manager = entity_manager
+
+    @property
+    def entity_manager(self):
+        return self._entity_manager
+
+
+class TestEagerLoading:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Fixture for a SQLite engine with three authors of two books each"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'eager.db'}")
+        EagerAuthor.__table__.create(engine)
+        EagerBook.__table__.create(engine)
+        with engine.begin() as connection:
+            for author_id in (1, 2, 3):
+                connection.execute(EagerAuthor.__table__.insert().values(id=author_id, name=f"Author {author_id}"))
+                for index in range(2):
+                    connection.execute(EagerBook.__table__.insert().values(title=f"Book {author_id}.{index}", author_id=author_id))
+        yield engine
+        engine.dispose()
+
+    def test_find_many_uses_a_single_query(self, entity_manager, statements):
+        authors = entity_manager.find_many(EagerAuthor, [3, 1, 42, 3])
+
+        assert [author.id for author in authors] == [3, 1]
+        assert len(statements) == 1
+        assert " IN " in statements[0]
+
+    def test_find_many_skips_entities_in_identity_map(self, entity_manager, statements):
+        entity_manager.find(EagerAuthor, 1)
+
+        entity_manager.find_many(EagerAuthor, [1, 2])
+
+        assert len(statements) == 2
+
+    def test_find_many_converts_string_ids(self, entity_manager, statements):
+        entity_manager.find(EagerAuthor, 1)
+
+        authors = entity_manager.find_many(EagerAuthor, ["2", "1", "x", 2])
+
+        assert [author.id for author in authors] == [2, 1]
+        assert len(statements) == 2
+
+    @pytest.mark.parametrize("eager_load", [["books"], {"books": "selectin"}, {"books": "joined"}])
+    def test_find_by_eager_loads_relationships(self, entity_manager, statements, eager_load):
+        repository = EagerAuthorRepository(entity_manager)
+
+        authors = repository.find_by({}, order_by={"id": "asc"}, eager_load=eager_load)
+        query_count = len(statements)
+        titles = [[book.title for book in author.books] for author in authors]
+
+        assert len(authors) == 3
+        assert len(statements) == query_count <= 2
+        assert titles[0] == ["Book 1.0", "Book 1.1"]
+
+    def test_find_by_a_relationship(self, entity_manager):
+        repository = EagerBookRepository(entity_manager)
+        author = entity_manager.find(EagerAuthor, 2)
+
+        books = repository.find_by({"author": author}, order_by={"id": "asc"})
+        other_books = repository.find_by({"author": entity_manager.find(EagerAuthor, 3), "title": "Book 3.1"})
+
+        assert [book.title for book in books] == ["Book 2.0", "Book 2.1"]
+        assert [book.title for book in other_books] == ["Book 3.1"]
+
+    def test_lazy_loading_issues_one_query_per_author(self, entity_manager, statements):
+        repository = EagerAuthorRepository(entity_manager)
+
+        for author in repository.find_by({}):
+            author.books
+
+        assert len(statements) == 4
+
+    def test_query_builder_eager_load_nested_path(self, entity_manager, statements):
+        books = QueryBuilder(EagerBook, entity_manager).select().eager_load("author.books", strategy="joined").execute()
+
+        assert len(books) == 6
+        assert len(books[0].author.books) == 2
+        assert len(statements) == 1
+
+    def test_unknown_relationship_is_rejected(self):
+        with pytest.raises(ValueError, match="not a relationship"):
+            QueryBuilder.loader_options(EagerAuthor, ["publisher"])
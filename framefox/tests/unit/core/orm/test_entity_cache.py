@@ -0,0 +1,98 @@
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import Field, SQLModel, create_engine, update
+
+from framefox.core.cache.memory_cache import MemoryCache
+from framefox.core.orm.cache.entity_cache import EntityCache
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class CachedRole(SQLModel, table=True):
+    __tablename__ = "test_cached_role"
+    __cache__ = {"ttl": 60}
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+
+    @classmethod
+    def get_primary_keys(cls):
+        return ["id"]
+
+
+class TestEntityCache:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Fixture for a SQLite engine holding two roles"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+        CachedRole.__table__.create(engine)
+        with engine.begin() as connection:
+            connection.execute(CachedRole.__table__.insert(), [{"id": 1, "name": "admin"}, {"id": 2, "name": "editor"}])
+        yield engine
+        engine.dispose()
+
+    @pytest.fixture(autouse=True)
+    def cache(self):
+        """Fixture installing an entity cache backed by a fresh MemoryCache"""
+        cache = MemoryCache()
+        with patch.object(EntityCache, "_instance", EntityCache(cache, default_ttl=60)):
+            yield cache
+
+    def test_second_request_is_served_from_cache(self, make_entity_manager, statements):
+        make_entity_manager().find(CachedRole, 1)
+
+        role = make_entity_manager().find(CachedRole, 1)
+
+        assert role.name == "admin"
+        assert len(statements) == 1
+
+    def test_cached_entity_is_attached_to_the_session(self, make_entity_manager):
+        make_entity_manager().find(CachedRole, 1)
+        entity_manager = make_entity_manager()
+
+        role = entity_manager.find(CachedRole, 1)
+        role.name = "root"
+        entity_manager.commit()
+
+        assert make_entity_manager().session.get(CachedRole, 1).name == "root"
+
+    def test_update_invalidates_entry_on_commit(self, make_entity_manager, cache):
+        make_entity_manager().find(CachedRole, 1)
+        writer = make_entity_manager()
+        role = writer.session.get(CachedRole, 1)
+        role.name = "superadmin"
+        writer.session.add(role)
+
+        writer.commit()
+
+        assert cache.get("entity:test_cached_role:1") is None
+        assert make_entity_manager().find(CachedRole, 1).name == "superadmin"
+
+    def test_delete_invalidates_entry(self, make_entity_manager, cache):
+        make_entity_manager().find(CachedRole, 2)
+        writer = make_entity_manager()
+        writer.delete(writer.session.get(CachedRole, 2))
+
+        writer.commit()
+
+        assert make_entity_manager().find(CachedRole, 2) is None
+
+    def test_bulk_update_invalidates_the_entity_namespace(self, make_entity_manager, cache):
+        reader = make_entity_manager()
+        reader.find(CachedRole, 1)
+        reader.find(CachedRole, 2)
+        writer = make_entity_manager()
+
+        writer.session.exec(update(CachedRole).values(name="guest"))
+        writer.commit()
+
+        assert len(cache) == 0
+        assert make_entity_manager().find(CachedRole, 2).name == "guest"
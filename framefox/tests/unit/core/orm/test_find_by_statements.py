@@ -0,0 +1,147 @@
+from typing import Optional
+from unittest.mock import Mock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Field, SQLModel, create_engine
+
+from framefox.core.orm.abstract_repository import AbstractRepository
+from framefox.core.orm.async_abstract_repository import AsyncAbstractRepository
+from framefox.core.orm.async_entity_manager import AsyncEntityManager
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+ACCOUNTS = [
+    {"id": 1, "email": "ada@example.com", "role": "admin", "team": "core"},
+    {"id": 2, "email": "alan@example.com", "role": "user", "team": "core"},
+    {"id": 3, "email": "grace@example.com", "role": "user", "team": None},
+]
+
+
+class LookupAccount(SQLModel, table=True):
+    __tablename__ = "test_lookup_account"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    email: str
+    role: str
+    team: Optional[str] = None
+
+    @classmethod
+    def get_primary_keys(cls):
+        return ["id"]
+
+
+class LookupAccountRepository(AbstractRepository):
+    def __init__(self, entity_manager):
+        self.model = LookupAccount
+        self._entity_manager = entity_manager
+
+    @property
+    def entity_manager(self):
+        return self._entity_manager
+
+
+class TestFindByStatements:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Fixture for a SQLite engine holding three accounts"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'lookup.db'}")
+        LookupAccount.__table__.create(engine)
+        with engine.begin() as connection:
+            connection.execute(LookupAccount.__table__.insert(), ACCOUNTS)
+        yield engine
+        engine.dispose()
+
+    @pytest.fixture
+    def cache_hits(self, engine):
+        """Fixture recording, for each statement, whether its compiled form came from the engine cache"""
+        hits = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            hits.append(context.cache_hit == CacheStats.CACHE_HIT)
+
+        event.listen(engine, "after_cursor_execute", record)
+        yield hits
+        event.remove(engine, "after_cursor_execute", record)
+
+    @pytest.fixture
+    def repository(self, entity_manager):
+        """Fixture for a repository bound to an EntityManager on the SQLite engine"""
+        return LookupAccountRepository(entity_manager)
+
+    def test_statement_is_built_once_per_shape(self, repository):
+        first, first_params = repository._build_find_by_statement({"email": "ada@example.com", "role": "admin"})
+        second, second_params = repository._build_find_by_statement({"role": "user", "email": "alan@example.com"})
+
+        assert first is second
+        assert first_params == {"criterion_email": "ada@example.com", "criterion_role": "admin"}
+        assert second_params == {"criterion_email": "alan@example.com", "criterion_role": "user"}
+
+    def test_lookups_hit_the_compiled_cache(self, repository, cache_hits):
+        for account in ACCOUNTS:
+            assert repository.find_one_by({"email": account["email"]}).id == account["id"]
+
+        assert cache_hits == [False, True, True]
+
+    def test_criteria_order_does_not_recompile(self, repository, cache_hits):
+        repository.find_by({"role": "user", "team": "core"})
+        repository.find_by({"team": "core", "role": "admin"})
+
+        assert cache_hits == [False, True]
+
+    def test_none_criteria_match_null(self, repository):
+        assert [account.id for account in repository.find_by({"team": None})] == [3]
+        assert [account.id for account in repository.find_by({"team": "core", "role": "user"})] == [2]
+
+    def test_order_limit_and_offset_are_bound(self, repository, cache_hits):
+        first = repository.find_by({"role": "user"}, order_by={"id": "desc"}, limit=1, offset=0)
+        second = repository.find_by({"role": "user"}, order_by={"id": "desc"}, limit=1, offset=1)
+
+        assert [account.id for account in first + second] == [3, 2]
+        assert cache_hits == [False, True]
+
+    def test_iterate_uses_the_criteria(self, repository):
+        assert [account.id for account in repository.iterate(batch_size=1, criteria={"role": "user"})] == [2, 3]
+
+
+class LookupAccountAsyncRepository(AsyncAbstractRepository):
+    def __init__(self, entity_manager):
+        self.model = LookupAccount
+        self._entity_manager = entity_manager
+
+    @property
+    def entity_manager(self):
+        return self._entity_manager
+
+
+class TestAsyncFindByStatements:
+    @pytest_asyncio.fixture
+    async def repository(self, tmp_path):
+        """Fixture for an async repository bound to an aiosqlite engine holding three accounts"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'lookup.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(lambda sync_connection: LookupAccount.__table__.create(sync_connection))
+            await connection.execute(LookupAccount.__table__.insert(), ACCOUNTS)
+        registry = Mock()
+        registry.get_async_engine.return_value = engine
+        with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+            entity_manager = AsyncEntityManager()
+        yield LookupAccountAsyncRepository(entity_manager)
+        await entity_manager.close_session()
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_find_by_and_iterate(self, repository):
+        assert (await repository.find_one_by({"email": "grace@example.com"})).id == 3
+        assert [account.id for account in await repository.find_by({"team": None})] == [3]
+        assert [account.id async for account in repository.iterate(criteria={"role": "user"})] == [2, 3]
@@ -0,0 +1,194 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from unittest.mock import Mock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Field, SQLModel, create_engine
+
+from framefox.core.orm.abstract_repository import AbstractRepository
+from framefox.core.orm.async_abstract_repository import AsyncAbstractRepository
+from framefox.core.orm.async_entity_manager import AsyncEntityManager
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+from framefox.core.orm.page import Keyset
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+START = datetime(2024, 1, 1, 12, 0, 0)
+
+
+class PagedArticle(SQLModel, table=True):
+    __tablename__ = "test_paged_article"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    title: str
+    score: int
+    published_at: datetime
+
+    @classmethod
+    def get_primary_keys(cls):
+        return ["id"]
+
+
+def seed(connection):
+    # Scores repeat so the primary key has to break ties
+    for article_id in range(1, 26):
+        connection.execute(
+            PagedArticle.__table__.insert().values(
+                id=article_id,
+                title=f"Article {article_id}",
+                score=article_id % 5,
+                published_at=START + timedelta(hours=article_id),
+            )
+        )
+
+
+class PagedArticleRepository(AbstractRepository):
+    def __init__(self, entity_manager):
+        self.model = PagedArticle
+        self._entity_manager = entity_manager
+
+    @property
+    def entity_manager(self):
+        return self._entity_manager
+
+
+class AsyncPagedArticleRepository(AsyncAbstractRepository):
+    def __init__(self, entity_manager):
+        self.model = PagedArticle
+        self._entity_manager = entity_manager
+
+    @property
+    def entity_manager(self):
+        return self._entity_manager
+
+
+def walk(repository, **options):
+    pages, cursor = [], None
+    while True:
+        page = repository.paginate(cursor=cursor, **options)
+        pages.append(page)
+        if not page.has_next:
+            return pages
+        cursor = page.next_cursor
+
+
+class TestPagination:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Fixture for a SQLite engine with 25 articles"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pagination.db'}")
+        PagedArticle.__table__.create(engine)
+        with engine.begin() as connection:
+            seed(connection)
+        yield engine
+        engine.dispose()
+
+    @pytest.fixture
+    def repository(self, entity_manager):
+        """Fixture for a repository bound to the SQLite engine"""
+        return PagedArticleRepository(entity_manager)
+
+    def test_pages_cover_every_row_once_in_order(self, repository):
+        pages = walk(repository, size=10)
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert [article.id for page in pages for article in page] == list(range(1, 26))
+        assert pages[0].previous_cursor is None
+        assert pages[-1].next_cursor is None
+
+    def test_mixed_directions_break_ties_with_primary_key(self, repository):
+        pages = walk(repository, size=7, order_by={"score": "desc"})
+
+        ids = [article.id for page in pages for article in page]
+        expected = sorted(range(1, 26), key=lambda article_id: (-(article_id % 5), article_id))
+        assert ids == expected
+
+    def test_datetime_cursor_round_trip(self, repository):
+        pages = walk(repository, size=6, order_by={"published_at": "desc"})
+
+        assert [article.id for page in pages for article in page] == list(range(25, 0, -1))
+
+    def test_previous_cursor_returns_previous_page(self, repository):
+        first = repository.paginate(size=10)
+        second = repository.paginate(cursor=first.next_cursor, size=10)
+
+        back = repository.paginate(cursor=second.previous_cursor, size=10)
+
+        assert [article.id for article in back] == [article.id for article in first]
+        assert back.previous_cursor is None
+        assert back.next_cursor is not None
+
+    def test_criteria_filter_pages(self, repository):
+        pages = walk(repository, size=2, criteria={"score": 0})
+
+        assert [article.id for page in pages for article in page] == [5, 10, 15, 20, 25]
+
+    def test_next_page_seeks_past_last_row(self, repository, statements):
+        first = repository.paginate(size=10)
+        repository.paginate(cursor=first.next_cursor, size=10)
+
+        assert "WHERE test_paged_article.id > ?" in statements[-1]
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "eyJvIjpbXSwidiI6W10sImQiOiJuZXh0In0"])
+    def test_invalid_cursor_is_rejected(self, repository, cursor):
+        with pytest.raises(ValueError):
+            repository.paginate(cursor=cursor)
+
+    def test_cursor_of_another_ordering_is_rejected(self, repository):
+        page = repository.paginate(size=5, order_by={"score": "asc"})
+
+        with pytest.raises(ValueError, match="ordering"):
+            repository.paginate(cursor=page.next_cursor, size=5)
+
+    def test_unknown_order_field_is_rejected(self):
+        with pytest.raises(ValueError, match="not a field"):
+            Keyset(PagedArticle, {"missing": "asc"})
+
+    def test_iterate_streams_in_batches(self, repository):
+        ids = [article.id for article in repository.iterate(batch_size=4, order_by={"id": "asc"})]
+
+        assert ids == list(range(1, 26))
+
+    def test_iterate_with_criteria(self, repository):
+        titles = [article.title for article in repository.iterate(batch_size=2, criteria={"score": 1})]
+
+        assert titles == ["Article 1", "Article 6", "Article 11", "Article 16", "Article 21"]
+
+
+class TestAsyncPagination:
+    @pytest_asyncio.fixture
+    async def repository(self, tmp_path):
+        """Fixture for an async repository bound to an aiosqlite engine with 25 articles"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pagination.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(lambda sync_connection: PagedArticle.__table__.create(sync_connection))
+            await connection.run_sync(seed)
+        registry = Mock()
+        registry.get_async_engine.return_value = engine
+        with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+            entity_manager = AsyncEntityManager()
+        yield AsyncPagedArticleRepository(entity_manager)
+        await entity_manager.close_session()
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_paginate(self, repository):
+        first = await repository.paginate(size=10, order_by={"score": "asc"})
+        second = await repository.paginate(cursor=first.next_cursor, size=10, order_by={"score": "asc"})
+
+        assert [article.id for article in first] == [5, 10, 15, 20, 25, 1, 6, 11, 16, 21]
+        assert [article.id for article in second] == [2, 7, 12, 17, 22, 3, 8, 13, 18, 23]
+
+    @pytest.mark.asyncio
+    async def test_iterate(self, repository):
+        ids = [article.id async for article in repository.iterate(batch_size=4, order_by={"id": "desc"})]
+
+        assert ids == list(range(25, 0, -1))
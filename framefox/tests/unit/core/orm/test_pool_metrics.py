@@ -0,0 +1,159 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine
+
+from framefox.core.debug.metrics.metrics_registry import MetricsRegistry
+from framefox.core.orm.pool_metrics import PoolMetrics
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class TestPoolMetrics:
+    @pytest.fixture
+    def pool_name(self, request):
+        """Fixture for a pool name unique to the test, metrics are process-wide"""
+        return f"test:{request.node.name}"
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Fixture for a SQLite engine with a small QueuePool"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=2, max_overflow=1, pool_timeout=0.05)
+        yield engine
+        engine.dispose()
+
+    def test_events_and_sizes_are_recorded(self, engine, pool_name):
+        metrics = PoolMetrics.instrument(engine, pool_name)
+
+        for _ in range(3):
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+
+        snapshot = metrics.snapshot()
+        assert snapshot["pool_size"] == 2
+        assert snapshot["max_overflow"] == 1
+        assert snapshot["checkouts"] == 3
+        assert snapshot["checkins"] == 3
+        assert snapshot["connects"] == 1
+        assert snapshot["checked_out"] == 0
+        assert metrics.wait.summary(pool=pool_name)["count"] == 3
+
+    def test_engine_is_instrumented_once(self, engine, pool_name):
+        metrics = PoolMetrics.instrument(engine, pool_name)
+
+        assert PoolMetrics.instrument(engine, "other") is metrics
+        with engine.connect():
+            pass
+        assert metrics.snapshot()["checkouts"] == 1
+
+    def test_concurrency_and_timeouts(self, engine, pool_name):
+        metrics = PoolMetrics.instrument(engine, pool_name)
+        held = [engine.connect() for _ in range(3)]
+
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        for connection in held:
+            connection.close()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["concurrency_max"] == 3
+        assert snapshot["timeouts"] == 1
+        assert "1 checkouts timed out: the pool was exhausted" in PoolMetrics.recommend(snapshot)["findings"]
+
+    def test_invalidated_connections_are_counted(self, engine, pool_name):
+        metrics = PoolMetrics.instrument(engine, pool_name)
+
+        with engine.connect() as connection:
+            connection.invalidate()
+        with engine.connect():
+            pass
+
+        snapshot = metrics.snapshot()
+        assert snapshot["invalidates"] == 1
+        assert snapshot["connects"] == 2
+
+    def test_request_checkouts_are_kept(self, engine, pool_name):
+        PoolMetrics.instrument(engine, pool_name)
+        PoolMetrics.start_request()
+
+        with engine.connect():
+            pass
+
+        checkouts = PoolMetrics.get_request_checkouts()
+        assert len(checkouts) == 1
+        assert checkouts[0]["pool"] == pool_name
+        assert checkouts[0]["timed_out"] is False
+
+    def test_metrics_page_round_trip(self, engine, pool_name):
+        metrics = PoolMetrics.instrument(engine, pool_name)
+        held = [engine.connect() for _ in range(2)]
+        for connection in held:
+            connection.close()
+
+        parsed = {stats["pool"]: stats for stats in PoolMetrics.parse_metrics(MetricsRegistry().render_text())}[pool_name]
+
+        snapshot = metrics.snapshot()
+        for key in ("pool_size", "max_overflow", "checkouts", "connects", "timeouts", "concurrency_p95", "concurrency_max"):
+            assert parsed[key] == snapshot[key]
+
+    @pytest.mark.asyncio
+    async def test_async_engine_is_instrumented(self, tmp_path, pool_name):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+        metrics = PoolMetrics.instrument(engine, pool_name)
+
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        await engine.dispose()
+
+        assert metrics.snapshot()["checkouts"] == 1
+
+
+class TestPoolRecommendations:
+    def stats(self, **overrides):
+        stats = {
+            "pool": "default",
+            "pool_size": 20,
+            "max_overflow": 10,
+            "checkouts": 1000,
+            "connects": 20,
+            "invalidates": 0,
+            "timeouts": 0,
+            "wait_p95": 0.0005,
+            "concurrency_p95": 16,
+            "concurrency_max": 20,
+        }
+        stats.update(overrides)
+        return stats
+
+    def test_size_covers_p95_with_headroom(self):
+        recommendation = PoolMetrics.recommend(self.stats())
+
+        assert recommendation["recommended_pool_size"] == 20
+        assert recommendation["recommended_max_overflow"] == 10
+        assert recommendation["findings"] == []
+
+    def test_exhausted_pool(self):
+        findings = PoolMetrics.recommend(self.stats(concurrency_p95=30, concurrency_max=30, timeouts=4, wait_p95=0.25))["findings"]
+
+        assert any("timed out" in finding for finding in findings)
+        assert any("250.0 ms" in finding for finding in findings)
+        assert any("all 30 connections" in finding for finding in findings)
+
+    def test_oversized_pool_and_churn(self):
+        recommendation = PoolMetrics.recommend(self.stats(concurrency_p95=2, concurrency_max=4, connects=400))
+
+        assert recommendation["recommended_pool_size"] == 3
+        assert any("oversized" in finding for finding in recommendation["findings"])
+        assert any("pool_recycle" in finding for finding in recommendation["findings"])
+
+    def test_few_checkouts_are_flagged(self):
+        findings = PoolMetrics.recommend(self.stats(checkouts=10))["findings"]
+
+        assert findings == ["only 10 checkouts observed, recommendations are not reliable yet"]
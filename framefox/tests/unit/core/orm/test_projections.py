@@ -0,0 +1,163 @@
+from typing import Optional
+from unittest.mock import Mock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Field, SQLModel, create_engine
+
+from framefox.core.cache.memory_cache import MemoryCache
+from framefox.core.form.type.entity_type import EntityType
+from framefox.core.orm.abstract_repository import AbstractRepository
+from framefox.core.orm.async_abstract_repository import AsyncAbstractRepository
+from framefox.core.orm.async_entity_manager import AsyncEntityManager
+from framefox.core.orm.cache.query_cache import QueryCache
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+from framefox.core.orm.query_builder import QueryBuilder
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+CUSTOMERS = [
+    {"id": 1, "name": "Ada", "email": "ada@example.com", "notes": "x" * 1000},
+    {"id": 2, "name": "Alan", "email": "alan@example.com", "notes": "y" * 1000},
+    {"id": 3, "name": "Grace", "email": "grace@example.com", "notes": None},
+]
+
+
+class ProjectedCustomer(SQLModel, table=True):
+    __tablename__ = "test_projected_customer"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    email: str
+    notes: Optional[str] = None
+
+    @classmethod
+    def get_primary_keys(cls):
+        return ["id"]
+
+
+class ProjectedCustomerRepository(AbstractRepository):
+    def __init__(self, entity_manager):
+        self.model = ProjectedCustomer
+        self._entity_manager = entity_manager
+
+    @property
+    def entity_manager(self):
+        return self._entity_manager
+
+
+class TestProjections:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Fixture for a SQLite engine holding three customers"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'projections.db'}")
+        ProjectedCustomer.__table__.create(engine)
+        with engine.begin() as connection:
+            connection.execute(ProjectedCustomer.__table__.insert(), CUSTOMERS)
+        yield engine
+        engine.dispose()
+
+    @pytest.fixture
+    def repository(self, entity_manager):
+        """Fixture for a repository bound to the EntityManager"""
+        return ProjectedCustomerRepository(entity_manager)
+
+    def test_find_by_fields_returns_rows(self, repository, entity_manager):
+        rows = repository.find_by({}, fields=["id", "email"], order_by={"id": "asc"})
+
+        assert [tuple(row) for row in rows] == [(1, "ada@example.com"), (2, "alan@example.com"), (3, "grace@example.com")]
+        assert rows[0].email == "ada@example.com"
+        assert not isinstance(rows[0], ProjectedCustomer)
+        assert len(entity_manager.session.identity_map) == 0
+
+    def test_single_field_still_returns_rows(self, repository):
+        row = repository.find_one_by({"name": "Grace"}, fields=["id"])
+
+        assert row.id == 3
+        assert tuple(row) == (3,)
+
+    def test_unknown_field_is_rejected(self, repository):
+        with pytest.raises(ValueError, match="'password' is not a field of ProjectedCustomer"):
+            repository.find_by({}, fields=["password"])
+
+    def test_fields_cannot_be_eager_loaded(self, repository):
+        with pytest.raises(ValueError, match="eager_load"):
+            repository.find_by({}, fields=["id"], eager_load=["orders"])
+
+    def test_iterate_fields(self, repository):
+        assert [row.name for row in repository.iterate(batch_size=2, fields=["name"], order_by={"id": "asc"})] == ["Ada", "Alan", "Grace"]
+
+    def test_fields_from_the_query_cache(self, repository):
+        with patch.object(QueryCache, "_instance", QueryCache(MemoryCache(), default_ttl=60)):
+            first = repository.find_by({"name": "Ada"}, fields=["id", "email"], cache=60)
+            second = repository.find_by({"name": "Alan"}, fields=["id", "email"], cache=60)
+            cached = repository.find_by({"name": "Ada"}, fields=["id", "email"], cache=60)
+
+        assert [tuple(row) for row in first + second] == [(1, "ada@example.com"), (2, "alan@example.com")]
+        assert tuple(cached[0]) == (1, "ada@example.com")
+
+    def test_query_builder_select_columns(self, entity_manager):
+        query_builder = QueryBuilder(ProjectedCustomer, entity_manager).select_columns("name", ProjectedCustomer.email)
+
+        rows = query_builder.where(ProjectedCustomer.notes.is_not(None)).order_by(ProjectedCustomer.id).execute()
+
+        assert [tuple(row) for row in rows] == [("Ada", "ada@example.com"), ("Alan", "alan@example.com")]
+        assert QueryBuilder(ProjectedCustomer, entity_manager).select_columns("id").order_by(ProjectedCustomer.id.desc()).first().id == 3
+
+    def test_query_builder_rejects_eager_loads_on_columns(self, entity_manager):
+        query_builder = QueryBuilder(ProjectedCustomer, entity_manager).select_columns("id").options(Mock())
+
+        with pytest.raises(ValueError, match="select_columns"):
+            query_builder.get_query()
+
+    def test_entity_type_choices_select_id_and_label(self, repository):
+        entity_type = EntityType({"class": "ProjectedCustomer", "choice_label": "name", "show_id": False})
+        entity_type._repository = repository
+
+        with patch.object(repository, "find_all") as find_all:
+            choices = entity_type.get_choices()
+
+        find_all.assert_not_called()
+        assert choices == {1: "Ada", 2: "Alan", 3: "Grace"}
+
+
+class ProjectedCustomerAsyncRepository(AsyncAbstractRepository):
+    def __init__(self, entity_manager):
+        self.model = ProjectedCustomer
+        self._entity_manager = entity_manager
+
+    @property
+    def entity_manager(self):
+        return self._entity_manager
+
+
+class TestAsyncProjections:
+    @pytest_asyncio.fixture
+    async def repository(self, tmp_path):
+        """Fixture for an async repository on an aiosqlite engine holding three customers"""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'projections.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(lambda sync_connection: ProjectedCustomer.__table__.create(sync_connection))
+            await connection.execute(ProjectedCustomer.__table__.insert(), CUSTOMERS)
+        registry = Mock()
+        registry.get_async_engine.return_value = engine
+        with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+            entity_manager = AsyncEntityManager()
+        yield ProjectedCustomerAsyncRepository(entity_manager)
+        await entity_manager.close_session()
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_find_by_and_iterate_fields(self, repository):
+        rows = await repository.find_by({"notes": None}, fields=["id", "name"])
+        names = [row.name async for row in repository.iterate(fields=["name"], order_by={"id": "asc"})]
+
+        assert [tuple(row) for row in rows] == [(3, "Grace")]
+        assert names == ["Ada", "Alan", "Grace"]
@@ -0,0 +1,138 @@
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import Field, SQLModel, create_engine, func, select, update
+
+from framefox.core.cache.memory_cache import MemoryCache
+from framefox.core.orm.abstract_repository import AbstractRepository
+from framefox.core.orm.cache.query_cache import QueryCache
+from framefox.core.orm.query_builder import QueryBuilder
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class CachedProduct(SQLModel, table=True):
+    __tablename__ = "test_cached_product"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    name: str
+    price: int
+
+    @classmethod
+    def get_primary_keys(cls):
+        return ["id"]
+
+
+class CachedProductRepository(AbstractRepository):
+    def __init__(self, entity_manager):
+        self.model = CachedProduct
+        self._entity_manager = entity_manager
+
+    @property
+    def entity_manager(self):
+        return self._entity_manager
+
+
+class TestQueryCache:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Fixture for a SQLite engine holding three products"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'query_cache.db'}")
+        CachedProduct.__table__.create(engine)
+        with engine.begin() as connection:
+            connection.execute(
+                CachedProduct.__table__.insert(),
+                [{"id": 1, "name": "pen", "price": 2}, {"id": 2, "name": "book", "price": 15}, {"id": 3, "name": "bag", "price": 40}],
+            )
+        yield engine
+        engine.dispose()
+
+    @pytest.fixture(autouse=True)
+    def query_cache(self):
+        """Fixture installing a query cache backed by a fresh MemoryCache"""
+        query_cache = QueryCache(MemoryCache(), default_ttl=60)
+        with patch.object(QueryCache, "_instance", query_cache):
+            yield query_cache
+
+    def test_find_by_is_served_from_cache(self, make_entity_manager, statements):
+        CachedProductRepository(make_entity_manager()).find_by({"name": "pen"}, cache=60)
+
+        products = CachedProductRepository(make_entity_manager()).find_by({"name": "pen"}, cache=60)
+
+        assert [product.price for product in products] == [2]
+        assert len(statements) == 1
+
+    def test_parameters_are_part_of_the_key(self, make_entity_manager, statements):
+        repository = CachedProductRepository(make_entity_manager())
+
+        assert repository.find_by({"name": "pen"}, cache=60)[0].id == 1
+        assert repository.find_by({"name": "bag"}, cache=60)[0].id == 3
+        assert len(statements) == 2
+
+    def test_write_to_the_table_invalidates_entries(self, make_entity_manager, statements):
+        CachedProductRepository(make_entity_manager()).find_by({}, cache=60)
+        writer = make_entity_manager()
+        writer.session.add(CachedProduct(name="lamp", price=25))
+        writer.commit()
+
+        products = CachedProductRepository(make_entity_manager()).find_by({}, cache=60)
+
+        assert len(products) == 4
+        assert len(statements) == 2
+
+    def test_bulk_update_invalidates_entries(self, make_entity_manager):
+        CachedProductRepository(make_entity_manager()).find_by({"id": 1}, cache=60)
+        writer = make_entity_manager()
+        writer.session.exec(update(CachedProduct).values(price=3))
+        writer.commit()
+
+        assert CachedProductRepository(make_entity_manager()).find_by({"id": 1}, cache=60)[0].price == 3
+
+    def test_custom_tags_and_keys(self, make_entity_manager, query_cache, statements):
+        def expensive():
+            return (
+                QueryBuilder(CachedProduct, make_entity_manager())
+                .select()
+                .where(CachedProduct.price > 10)
+                .cache(key="expensive", tags=["catalog"])
+                .execute()
+            )
+
+        expensive()
+        assert len(expensive()) == 2
+        assert len(statements) == 1
+
+        query_cache.invalidate_tags("catalog")
+        expensive()
+        assert len(statements) == 2
+
+    def test_scalar_and_row_results(self, make_entity_manager, statements):
+        def run():
+            entity_manager = make_entity_manager()
+            total = entity_manager.exec_statement(select(func.sum(CachedProduct.price)), cache=60)
+            rows = entity_manager.exec_statement(select(CachedProduct.id, CachedProduct.name).order_by(CachedProduct.id), cache=60)
+            return total, rows
+
+        run()
+        total, rows = run()
+
+        assert total == [57]
+        assert rows[0].name == "pen"
+        assert rows[2] == (3, "bag")
+        assert len(statements) == 2
+
+    def test_first_is_cached(self, make_entity_manager, statements):
+        def cheapest():
+            return QueryBuilder(CachedProduct, make_entity_manager()).select().order_by(CachedProduct.price).cache(ttl=30).first()
+
+        cheapest()
+
+        assert cheapest().name == "pen"
+        assert len(statements) == 1
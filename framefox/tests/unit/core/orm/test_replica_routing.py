@@ -0,0 +1,195 @@
+from typing import Optional
+from unittest.mock import Mock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Field, SQLModel, create_engine, select
+
+from framefox.core.orm.async_entity_manager import AsyncEntityManager
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+from framefox.core.orm.replica_router import ReplicaRouter, RoutingSession
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+DATABASES = ("primary", "replica_a", "replica_b")
+
+
+class ReplicatedNode(SQLModel, table=True):
+    __tablename__ = "test_replicated_node"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    origin: str
+
+    @classmethod
+    def get_primary_keys(cls):
+        return ["id"]
+
+
+def create_databases(tmp_path) -> dict:
+    """One SQLite file per database, each row telling which database answered"""
+    engines = {}
+    for name in DATABASES:
+        engine = create_engine(f"sqlite:///{tmp_path / f'{name}.db'}")
+        ReplicatedNode.__table__.create(engine)
+        with engine.begin() as connection:
+            connection.execute(ReplicatedNode.__table__.insert().values(id=1, origin=name))
+        engines[name] = engine
+    return engines
+
+
+def origin(entity_manager) -> str:
+    return entity_manager.exec_statement(select(ReplicatedNode.origin).where(ReplicatedNode.id == 1))[0]
+
+
+class TestReplicaRouting:
+    @pytest.fixture
+    def engines(self, tmp_path):
+        """Fixture for a primary and two replica SQLite files"""
+        engines = create_databases(tmp_path)
+        yield engines
+        EntityManagerRegistry.unregister_replicas(engines["primary"])
+        for engine in engines.values():
+            engine.dispose()
+
+    @pytest.fixture
+    def engine(self, engines):
+        """Fixture for the primary engine, on which the EntityManager instances are built"""
+        return engines["primary"]
+
+    def replicate(self, engines, balancing="round_robin", sticky=True) -> ReplicaRouter:
+        return EntityManagerRegistry.register_replicas(
+            engines["primary"], [engines["replica_a"], engines["replica_b"]], balancing=balancing, sticky=sticky
+        )
+
+    def test_without_replicas_everything_uses_the_primary(self, engines, make_entity_manager):
+        entity_manager = make_entity_manager()
+
+        assert type(entity_manager.session) is not RoutingSession
+        assert origin(entity_manager) == "primary"
+
+    def test_reads_are_balanced_round_robin(self, engines, make_entity_manager):
+        self.replicate(engines)
+        entity_manager = make_entity_manager()
+
+        assert [origin(entity_manager) for _ in range(4)] == ["replica_a", "replica_b", "replica_a", "replica_b"]
+
+    def test_find_reads_from_a_replica(self, engines, make_entity_manager):
+        self.replicate(engines)
+
+        assert make_entity_manager().find(ReplicatedNode, 1).origin == "replica_a"
+
+    def test_writes_go_to_the_primary_and_stick(self, engines, make_entity_manager):
+        self.replicate(engines)
+        entity_manager = make_entity_manager()
+        origin(entity_manager)
+
+        entity_manager.session.add(ReplicatedNode(id=2, origin="written"))
+        entity_manager.commit()
+
+        assert origin(entity_manager) == "primary"
+        assert entity_manager.find(ReplicatedNode, 2).origin == "written"
+        with engines["replica_a"].connect() as connection:
+            assert connection.execute(select(ReplicatedNode.id)).all() == [(1,)]
+        assert origin(make_entity_manager()).startswith("replica")
+
+    def test_without_stickiness_reads_return_to_replicas(self, engines, make_entity_manager):
+        self.replicate(engines, sticky=False)
+        entity_manager = make_entity_manager()
+
+        entity_manager.session.add(ReplicatedNode(id=2, origin="written"))
+        entity_manager.commit()
+
+        assert origin(entity_manager).startswith("replica")
+
+    def test_transaction_reads_from_the_primary(self, engines, make_entity_manager):
+        self.replicate(engines)
+        entity_manager = make_entity_manager()
+
+        with entity_manager.transaction():
+            inside = origin(entity_manager)
+
+        assert inside == "primary"
+        assert origin(entity_manager).startswith("replica")
+
+    def test_use_primary_and_locking_reads(self, engines, make_entity_manager):
+        self.replicate(engines)
+        entity_manager = make_entity_manager()
+
+        with entity_manager.use_primary():
+            assert origin(entity_manager) == "primary"
+        locked = entity_manager.exec_statement(select(ReplicatedNode.origin).with_for_update())
+
+        assert locked == ["primary"]
+
+    def test_least_connections_avoids_busy_replica(self, engines):
+        router = ReplicaRouter([engines["replica_a"], engines["replica_b"]], balancing="least_connections")
+
+        with engines["replica_a"].connect():
+            chosen = {router.choose() for _ in range(4)}
+
+        assert chosen == {engines["replica_b"]}
+        assert router.connections_in_use(engines["replica_a"]) == 0
+
+    def test_unknown_balancing_is_rejected(self, engines):
+        with pytest.raises(ValueError, match="balancing"):
+            ReplicaRouter([engines["replica_a"]], balancing="random")
+
+    def test_registry_builds_replicas_from_settings(self, engines, tmp_path):
+        registry = EntityManagerRegistry.__new__(EntityManagerRegistry)
+        registry.settings = Mock(
+            config={"database": {}},
+            database_echo=False,
+            database_url=f"sqlite:///{tmp_path / 'primary.db'}",
+            database_replicas=[{"url": f"sqlite:///{tmp_path / 'replica_b.db'}", "pool_size": 5}],
+            database_replica_routing={"balancing": "least_connections"},
+        )
+
+        engine = registry.get_engine("replica_settings_test")
+        try:
+            router = EntityManagerRegistry.get_replica_router(engine)
+            assert router.balancing == "least_connections"
+            assert [str(replica.url) for replica in router.replicas] == [f"sqlite:///{tmp_path / 'replica_b.db'}"]
+            assert router.replicas[0].pool.size() == 5
+        finally:
+            EntityManagerRegistry._engines.pop("replica_settings_test")
+            EntityManagerRegistry.unregister_replicas(engine)
+            engine.dispose()
+
+
+class TestAsyncReplicaRouting:
+    @pytest_asyncio.fixture
+    async def entity_manager(self, tmp_path):
+        """Fixture for an AsyncEntityManager whose reads are routed to an aiosqlite replica"""
+        for engine in create_databases(tmp_path).values():
+            engine.dispose()
+        primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+        replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica_a.db'}")
+        EntityManagerRegistry.register_replicas(primary, [replica])
+        registry = Mock()
+        registry.get_async_engine.return_value = primary
+        with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+            entity_manager = AsyncEntityManager()
+        yield entity_manager
+        await entity_manager.close_session()
+        EntityManagerRegistry.unregister_replicas(primary)
+        await primary.dispose()
+        await replica.dispose()
+
+    @pytest.mark.asyncio
+    async def test_reads_use_replica_until_a_write(self, entity_manager):
+        statement = select(ReplicatedNode.origin).where(ReplicatedNode.id == 1)
+
+        before = await entity_manager.exec_statement(statement)
+        await entity_manager.persist(ReplicatedNode(id=2, origin="written"))
+        await entity_manager.commit()
+        after = await entity_manager.exec_statement(statement)
+
+        assert before == ["replica_a"]
+        assert after == ["primary"]
@@ -0,0 +1,62 @@
+from unittest.mock import Mock
+
+import pytest
+
+from framefox.core.request.session.lazy_session_data import LazySessionData
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class TestLazySessionData:
+    @pytest.fixture
+    def loader(self):
+        """Fixture for a loader returning stored session data"""
+        return Mock(return_value={"user_id": 42, "_flash_bag": []})
+
+    def test_loader_not_called_until_access(self, loader):
+        """Test that creating the proxy performs no storage read"""
+        data = LazySessionData(loader)
+
+        assert not data.loaded
+        loader.assert_not_called()
+
+    def test_read_access_loads_once(self, loader):
+        """Test that the first access loads the data and later ones reuse it"""
+        data = LazySessionData(loader)
+
+        assert data["user_id"] == 42
+        assert "user_id" in data
+        assert data.get("missing", "default") == "default"
+        assert len(data) == 2
+
+        assert data.loaded
+        loader.assert_called_once()
+
+    def test_write_merges_with_stored_data(self, loader):
+        """Test that writing keeps the values already stored"""
+        data = LazySessionData(loader)
+        data["theme"] = "dark"
+
+        assert dict(data) == {"user_id": 42, "_flash_bag": [], "theme": "dark"}
+
+    def test_clear_does_not_load(self, loader):
+        """Test that clearing discards stored data without reading it"""
+        data = LazySessionData(loader)
+        data.clear()
+
+        assert data.loaded
+        assert dict(data) == {}
+        loader.assert_not_called()
+
+    def test_missing_session_is_empty(self):
+        """Test that a loader returning None yields an empty session"""
+        data = LazySessionData(lambda: None)
+
+        assert not data
+        assert data.to_dict() == {}
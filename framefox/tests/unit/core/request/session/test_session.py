@@ -4,6 +4,7 @@ import pytest
 from fastapi import Request
 
 from framefox.core.request.request_stack import RequestStack
+from framefox.core.request.session.lazy_session_data import LazySessionData
 from framefox.core.request.session.session import Session
 
 """
@@ -101,3 +102,21 @@ class TestSession:
         # Subsequent uses should retain the same ID
         session.set("another_key", "another_value")
         assert mock_request.state.session_id == generated_id
+
+    def test_invalidate_deletes_a_session_that_was_never_loaded(self, session, mock_request):
+        """Test invalidate() deletes the stored session even when its data was never read"""
+
+        def load_session():
+            mock_request.state.session_id = "old-session"
+            return {"user_id": 1}
+
+        mock_request.state.session_data = LazySessionData(load_session)
+        session_manager = Mock()
+        session.container = Mock()
+        session.container.get_by_name.return_value = session_manager
+
+        session.invalidate()
+
+        session_manager.delete_session.assert_called_once_with("old-session")
+        assert mock_request.state.session_id not in (None, "old-session")
+        assert dict(mock_request.state.session_data) == {}
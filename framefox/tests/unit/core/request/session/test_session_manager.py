@@ -84,6 +84,12 @@ class TestSessionManager:
         # Verify that the session no longer exists
         assert session_manager.get_session(session_id) is None
 
+    def test_expired_session_is_not_returned_before_cleanup(self, session_manager, sample_session_data):
+        """Test an expired session cannot be read while it waits for the cleanup"""
+        session_manager.create_session("test_session", sample_session_data, -1)
+
+        assert session_manager.get_session("test_session") is None
+
     # def test_cleanup_expired_sessions(self, session_manager, tmp_path):
     #     """Test cleaning up expired sessions"""
     #     # Create sessions with different expiration dates
@@ -0,0 +1,104 @@
+import sqlite3
+from unittest.mock import Mock
+
+import pytest
+
+from framefox.core.config.settings import Settings
+from framefox.core.debug.metrics.metrics_registry import MetricsRegistry
+from framefox.core.request.session.session_manager import SessionManager
+from framefox.core.request.session.session_metrics import SessionMetrics
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class TestSessionMetrics:
+    @pytest.fixture
+    def settings(self, tmp_path):
+        """Fixture for settings using a temporary SQLite session store"""
+        settings = Mock(spec=Settings)
+        settings.session_file_path = str(tmp_path / "sessions.db")
+        settings.session_redis_enabled = False
+        settings.session_serializer = "json"
+        return settings
+
+    @pytest.fixture
+    def manager(self, settings):
+        """Fixture for a session manager with fresh metrics"""
+        MetricsRegistry().reset()
+        return SessionManager(settings)
+
+    def test_hit_miss_and_sizes_are_recorded(self, manager):
+        """Test that reads, writes and lookups feed the metrics"""
+        manager.create_session("abc", {"user": "alice"}, 3600)
+        manager.get_session("abc")
+        manager.get_session("missing")
+        manager.update_session("abc", {"user": "alice", "theme": "dark"}, 3600)
+
+        snapshot = manager.metrics.snapshot()
+
+        assert snapshot["backend"] == "sqlite"
+        assert snapshot["hits"] == 1
+        assert snapshot["misses"] == 1
+        assert snapshot["hit_ratio"] == 0.5
+        assert snapshot["writes"] == 2
+        assert snapshot["bytes_written"] > 0
+        assert snapshot["read_size"]["count"] == 1
+
+    def test_request_operations_are_tracked(self, manager):
+        """Test that operations are listed for the profiled request only"""
+        manager.get_session("missing")
+        SessionMetrics.start_request()
+        manager.create_session("abc", {"user": "alice"}, 3600)
+
+        operations = SessionMetrics.get_request_operations()
+
+        assert [op["operation"] for op in operations] == ["create"]
+        assert operations[0]["size"] > 0
+
+    def test_inspect_sessions_by_size_and_writes(self, manager):
+        """Test that the largest and most written sessions are listed first"""
+        manager.create_session("small", {"user": "alice"}, 3600)
+        manager.create_session("large", {"_flash_messages": {"info": ["x" * 500, "y"]}}, 3600)
+        for _ in range(3):
+            manager.update_session("small", {"user": "alice"}, 3600)
+
+        by_size = manager.inspect_sessions(limit=1, sort="size")
+        by_writes = manager.inspect_sessions(limit=2, sort="writes")
+
+        assert by_size[0]["session_id"] == "large"
+        assert by_size[0]["flash_messages"] == 2
+        assert by_size[0]["keys"][0][0] == "_flash_messages"
+        assert [session["session_id"] for session in by_writes] == ["small", "large"]
+        assert by_writes[0]["write_count"] == 4
+
+    def test_inspect_sessions_rejects_unknown_sort(self, manager):
+        with pytest.raises(ValueError):
+            manager.inspect_sessions(sort="age")
+
+    def test_write_count_column_is_added_to_existing_store(self, settings, tmp_path):
+        """Test that stores created before write tracking are migrated"""
+        conn = sqlite3.connect(tmp_path / "sessions.db")
+        conn.execute("CREATE TABLE sessions (session_id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)")
+        conn.commit()
+        conn.close()
+
+        manager = SessionManager(settings)
+        manager.create_session("abc", {"user": "alice"}, 3600)
+
+        assert manager.inspect_sessions(sort="writes")[0]["write_count"] == 1
+
+    def test_registry_renders_prometheus_text(self, manager):
+        """Test that the registry exposes the session metrics"""
+        manager.get_session("missing")
+
+        text = MetricsRegistry().render_text()
+
+        assert "# TYPE framefox_session_operation_seconds histogram" in text
+        assert 'framefox_session_lookups_total{backend="sqlite",result="miss"} 1' in text
+        assert 'framefox_session_operation_seconds_bucket{backend="sqlite",operation="get",le="+Inf"} 1' in text
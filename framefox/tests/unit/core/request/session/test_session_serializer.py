@@ -0,0 +1,92 @@
+from unittest.mock import Mock
+
+import pytest
+
+from framefox.core.config.settings import Settings
+from framefox.core.request.session.serializer.json_session_serializer import (
+    JsonSessionSerializer,
+)
+from framefox.core.request.session.serializer.session_payload_codec import (
+    SessionPayloadCodec,
+)
+from framefox.core.request.session.serializer.session_serializer_factory import (
+    SessionSerializerFactory,
+)
+from framefox.core.request.session.session_manager import SessionManager
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class TestSessionSerializer:
+    @pytest.fixture
+    def sample_session_data(self):
+        """Fixture for sample session data including flash messages"""
+        return {
+            "user_id": "123",
+            "csrf_token": "abc",
+            "_flash_messages": {"success": ["Saved"], "error": ["Oops", "Again"]},
+        }
+
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgpack"])
+    def test_round_trip(self, name, sample_session_data):
+        """Each serializer decodes what it encodes"""
+        if name != "json":
+            pytest.importorskip(name)
+        codec = SessionPayloadCodec(SessionSerializerFactory.create(name))
+
+        payload = codec.encode(sample_session_data)
+
+        assert payload[0] == codec.serializer.format_id
+        assert codec.decode(payload) == sample_session_data
+
+    def test_decode_legacy_json(self, sample_session_data):
+        """Payloads written before the format byte existed are still readable"""
+        import json
+
+        codec = SessionPayloadCodec(JsonSessionSerializer())
+
+        assert codec.decode(json.dumps(sample_session_data)) == sample_session_data
+
+    def test_decode_other_format(self, sample_session_data):
+        """A codec reads payloads written by another configured serializer"""
+        pytest.importorskip("msgpack")
+        msgpack_codec = SessionPayloadCodec(SessionSerializerFactory.create("msgpack"))
+        json_codec = SessionPayloadCodec(JsonSessionSerializer())
+
+        assert json_codec.decode(msgpack_codec.encode(sample_session_data)) == sample_session_data
+        assert msgpack_codec.decode(json_codec.encode(sample_session_data)) == sample_session_data
+
+    def test_decode_unknown_format(self):
+        """Unknown format bytes are rejected"""
+        codec = SessionPayloadCodec(JsonSessionSerializer())
+
+        with pytest.raises(ValueError):
+            codec.decode(b"\x7f\x00")
+
+    def test_unknown_serializer_falls_back_to_json(self):
+        """An unknown serializer name falls back to JSON"""
+        assert isinstance(SessionSerializerFactory.create("yaml"), JsonSessionSerializer)
+
+    def test_session_manager_migrates_format(self, tmp_path, sample_session_data):
+        """Sessions survive a serializer change and are rewritten in the new format"""
+        pytest.importorskip("msgpack")
+        settings = Mock(spec=Settings)
+        settings.session_file_path = str(tmp_path / "sessions.db")
+        settings.session_redis_enabled = False
+
+        settings.session_serializer = "json"
+        SessionManager(settings).create_session("migrated", sample_session_data, 3600)
+
+        settings.session_serializer = "msgpack"
+        manager = SessionManager(settings)
+        session = manager.get_session("migrated")
+        assert session["data"] == sample_session_data
+
+        manager.update_session("migrated", session["data"], 3600)
+        assert manager.get_session("migrated")["data"] == sample_session_data
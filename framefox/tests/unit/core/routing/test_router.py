@@ -74,6 +74,17 @@ class TestRouter:
         url = router.url_path_for("nonexistent_route")
         assert url == "#"
 
+    def test_file_controller_is_registered_outside_dev(self, router):
+        """Test the /_files endpoint is served in prod when a storage is configured"""
+        settings = Mock(app_env="prod", storage_download_enabled=True, metrics_enabled=False)
+        with (
+            patch.object(router, "settings", settings),
+            patch.object(router, "_import_class") as import_class,
+            patch.object(router, "_register_controller_routes"),
+        ):
+            router._register_framework_controllers()
+        assert [call.args[0] for call in import_class.call_args_list] == ["framefox.core.file.file_controller.FileController"]
+
     # def test_register_default_route(self, router, mock_app):
     #     """Test default route registration"""
     #     router.register_controller()
@@ -0,0 +1,138 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import create_engine
+
+from framefox.core.orm.entity_manager import EntityManager
+from framefox.core.orm.entity_manager_interface import EntityManagerInterface
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+from framefox.core.task.broker.broker_interface import BrokerInterface
+from framefox.core.task.broker.database_broker import DatabaseBroker
+from framefox.core.task.decorator.async_task import AsyncTask
+from framefox.core.task.entity.task import Task, TaskStatus
+from framefox.core.task.task_manager import TaskManager
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+def send_mail(user_id):
+    return user_id
+
+
+class TestTaskBatch:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Fixture for a SQLite database holding the task table"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+        Task.__table__.create(engine)
+        yield engine
+        engine.dispose()
+
+    @pytest.fixture
+    def commits(self, engine):
+        """Fixture counting the transactions committed on the database"""
+        commits = []
+        event.listen(engine, "commit", lambda connection: commits.append(connection))
+        return commits
+
+    @pytest.fixture
+    def broker(self, engine):
+        """Fixture for a DatabaseBroker on the SQLite database"""
+        registry = Mock()
+        registry.get_engine.return_value = engine
+        with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+            entity_manager = EntityManager()
+        # persist() looks the repositories of the relations up in the service container
+        with patch.object(EntityManager, "get_repository", return_value=None):
+            yield DatabaseBroker(EntityManagerInterface(entity_manager=entity_manager))
+        entity_manager.close_session()
+
+    @pytest.fixture
+    def task_manager(self, broker):
+        """Fixture for a TaskManager queuing to the DatabaseBroker"""
+        with patch("framefox.core.task.task_manager.ServiceContainer"), patch("framefox.core.task.task_manager.Settings") as settings:
+            settings.return_value.task_defaults = {}
+            return TaskManager(broker)
+
+    def test_enqueue_many_inserts_the_tasks_in_one_transaction(self, broker, commits):
+        tasks = []
+        for index in range(50):
+            task = Task(name="tests.send_mail", queue="mails" if index % 2 else "default")
+            task.set_payload({"kwargs": {"user_id": index}})
+            tasks.append(task)
+
+        with patch.object(broker.notifier, "notify") as notify:
+            broker.enqueue_many(tasks)
+
+        assert len(commits) == 1
+        assert [call.args[0] for call in notify.call_args_list] == ["default", "mails"]
+        claimed = broker.dequeue("mails", 100)
+        assert len(claimed) == 25
+        assert all(task.status == TaskStatus.RUNNING for task in claimed)
+        assert {task.get_payload()["kwargs"]["user_id"] for task in claimed} == set(range(1, 50, 2))
+
+    def test_brokers_without_bulk_insert_enqueue_the_tasks_one_by_one(self, broker):
+        tasks = []
+        for index in range(3):
+            task = Task(name="tests.send_mail", queue="mails", priority=index)
+            task.set_payload({"kwargs": {"user_id": index}})
+            tasks.append(task)
+
+        # The default of the interface, for the brokers that only implement enqueue()
+        BrokerInterface.enqueue_many(broker, tasks)
+
+        pending = broker.get_tasks_by_status(TaskStatus.PENDING, queue="mails")
+        assert sorted(task.priority for task in pending) == [0, 1, 2]
+        assert {task.get_payload()["kwargs"]["user_id"] for task in pending} == {0, 1, 2}
+        assert sorted(task.id for task in pending) == sorted(task.id for task in tasks)
+
+    def test_batch_handles_match_the_tasks_of_brokers_without_bulk_insert(self, task_manager, broker):
+        with patch.object(DatabaseBroker, "enqueue_many", BrokerInterface.enqueue_many):
+            handles = task_manager.queue_many([{"task": send_mail, "user_id": index} for index in range(3)])
+
+        assert sorted(task.id for task in broker.get_tasks_by_status(TaskStatus.PENDING)) == sorted(handles)
+
+    def test_batch_writes_the_queued_tasks_on_exit(self, task_manager, broker, commits):
+        with task_manager.batch():
+            ids = [task_manager.queue_task(send_mail, user_id=index) for index in range(20)]
+            assert broker.get_tasks_by_status(TaskStatus.PENDING) == []
+
+        assert len(commits) == 1
+        assert sorted(task.id for task in broker.get_tasks_by_status(TaskStatus.PENDING)) == sorted(ids)
+
+    def test_batch_queues_nothing_when_the_block_raises(self, task_manager, broker):
+        with pytest.raises(RuntimeError):
+            with task_manager.batch():
+                task_manager.queue_task(send_mail, user_id=1)
+                raise RuntimeError("fan-out aborted")
+
+        assert broker.get_tasks_by_status(TaskStatus.PENDING) == []
+
+    def test_queue_many(self, task_manager, broker, commits):
+        ids = task_manager.queue_many([{"task": send_mail, "queue": "mails", "priority": 2, "user_id": index} for index in range(10)])
+
+        assert len(commits) == 1
+        claimed = broker.dequeue("mails", 10)
+        assert sorted(task.id for task in claimed) == sorted(ids)
+        assert claimed[0].name == f"{__name__}.send_mail"
+        assert claimed[0].priority == 2
+
+    def test_delay_joins_the_current_batch(self, task_manager, broker):
+        delayed = AsyncTask(queue="mails")(send_mail)
+
+        with task_manager.batch():
+            task_id = delayed.delay(7)
+            with task_manager.batch():
+                task_manager.queue_task(send_mail, user_id=8)
+
+        tasks = broker.get_tasks_by_status(TaskStatus.PENDING, queue="mails")
+        assert [task.id for task in tasks] == [task_id]
+        assert tasks[0].get_payload() == {"args": [7]}
+        assert len(broker.get_tasks_by_status(TaskStatus.PENDING)) == 2
@@ -0,0 +1,124 @@
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import create_engine
+
+from framefox.core.orm.entity_manager import EntityManager
+from framefox.core.orm.entity_manager_interface import EntityManagerInterface
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+from framefox.core.task.broker.database_broker import DatabaseBroker
+from framefox.core.task.entity.task import Task, TaskStatus
+from framefox.core.task.task_claimer import TaskClaimer
+from framefox.core.task.transport.database_transport import DatabaseTransport
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class TestTaskClaimer:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Fixture for a SQLite engine holding the task table"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}", connect_args={"timeout": 30})
+        Task.__table__.create(engine)
+        yield engine
+        engine.dispose()
+
+    @pytest.fixture
+    def entity_manager_factory(self, engine):
+        """Fixture building EntityManagerInterfaces on the SQLite engine, one per worker"""
+        registry = Mock()
+        registry.get_engine.return_value = engine
+        entity_managers = []
+
+        def build():
+            with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+                entity_manager = EntityManager()
+            entity_managers.append(entity_manager)
+            return EntityManagerInterface(entity_manager=entity_manager)
+
+        yield build
+        for entity_manager in entity_managers:
+            entity_manager.close_session()
+
+    def add_tasks(self, engine, count, **values):
+        now = datetime.now()
+        rows = [
+            {
+                "id": f"task-{i}",
+                "name": "send_mail",
+                "queue": "default",
+                "status": TaskStatus.PENDING,
+                "created_at": now + timedelta(microseconds=i),
+            }
+            for i in range(count)
+        ]
+        for row in rows:
+            row.update(values)
+        with engine.begin() as connection:
+            connection.execute(Task.__table__.insert(), rows)
+
+    def test_claim_marks_due_tasks_running_in_queue_order(self, engine, entity_manager_factory):
+        self.add_tasks(engine, 3)
+        with engine.begin() as connection:
+            connection.execute(Task.__table__.update().where(Task.__table__.c.id == "task-2").values(priority=5))
+            connection.execute(
+                Task.__table__.update().where(Task.__table__.c.id == "task-1").values(scheduled_for=datetime.now() + timedelta(hours=1))
+            )
+
+        tasks = TaskClaimer(entity_manager_factory()).claim("default", 5)
+
+        assert [task.id for task in tasks] == ["task-2", "task-0"]
+        assert all(task.status == TaskStatus.RUNNING and task.started_at for task in tasks)
+        assert TaskClaimer(entity_manager_factory()).claim("default", 5) == []
+
+    def test_claim_is_one_update_and_one_select(self, engine, entity_manager_factory):
+        self.add_tasks(engine, 10)
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement.split()[0]))
+
+        tasks = TaskClaimer(entity_manager_factory()).claim("default", 10)
+        for task in tasks:
+            assert task.name == "send_mail"
+
+        assert len(tasks) == 10
+        assert statements == ["UPDATE", "SELECT"]
+
+    def test_claim_without_returning_locks_then_updates(self, engine, entity_manager_factory):
+        self.add_tasks(engine, 3)
+
+        with patch.object(engine.dialect, "update_returning", False):
+            tasks = TaskClaimer(entity_manager_factory()).claim("default", 2)
+
+        assert [task.id for task in tasks] == ["task-0", "task-1"]
+        assert all(task.status == TaskStatus.RUNNING for task in tasks)
+
+    def test_concurrent_workers_never_claim_the_same_task(self, engine, entity_manager_factory):
+        self.add_tasks(engine, 200)
+        claimed = []
+        barrier = threading.Barrier(4)
+
+        def work(claim):
+            barrier.wait()
+            while tasks := claim("default", 7):
+                claimed.extend(task.id for task in tasks)
+
+        claims = [DatabaseBroker(entity_manager_factory()).dequeue for _ in range(2)] + [
+            DatabaseTransport(entity_manager_factory()).consume for _ in range(2)
+        ]
+        workers = [threading.Thread(target=work, args=(claim,)) for claim in claims]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert len(claimed) == 200
+        assert len(set(claimed)) == 200
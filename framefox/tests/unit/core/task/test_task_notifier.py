@@ -0,0 +1,152 @@
+import asyncio
+import statistics
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlmodel import create_engine
+
+from framefox.core.orm.entity_manager import EntityManager
+from framefox.core.orm.entity_manager_interface import EntityManagerInterface
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+from framefox.core.task.broker.database_broker import DatabaseBroker
+from framefox.core.task.entity.task import Task
+from framefox.core.task.task_notifier import TaskNotifier
+from framefox.core.task.worker_manager import WorkerManager
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class TestTaskNotifier:
+    @pytest.fixture
+    def notifier(self):
+        """Fixture for a TaskNotifier of its own"""
+        notifier = TaskNotifier()
+        yield notifier
+        notifier.close()
+
+    @pytest.mark.asyncio
+    async def test_notify_wakes_the_subscribers_of_the_queue(self, notifier):
+        mails = notifier.subscribe(["mails"])
+        reports = notifier.subscribe(["reports"])
+
+        threading.Thread(target=notifier.notify, args=("mails",)).start()
+
+        assert await mails.wait(1) is True
+        assert await reports.wait(0.05) is False
+
+    @pytest.mark.asyncio
+    async def test_notification_before_the_wait_is_kept(self, notifier):
+        subscription = notifier.subscribe(["default"])
+        subscription.clear()
+
+        notifier.notify("default")
+        await asyncio.sleep(0)
+
+        assert await subscription.wait(0.05) is True
+
+    @pytest.mark.asyncio
+    async def test_closed_subscriptions_are_not_notified(self, notifier):
+        subscription = notifier.subscribe(["default"])
+        subscription.close()
+
+        notifier.notify("default")
+
+        assert await subscription.wait(0.05) is False
+
+    def test_postgres_notify_statement(self):
+        statement = TaskNotifier.notify_statement("mails").compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+
+        assert str(statement) == "SELECT pg_notify('framefox_tasks', 'mails')"
+
+    def test_only_postgres_is_listened_to(self, notifier, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+
+        assert notifier.listen(engine) is False
+
+
+pickups = []
+
+
+def record_pickup():
+    pickups.append(time.perf_counter())
+
+
+class TestWorkerWakeUp:
+    @pytest.fixture
+    def entity_manager_factory(self, tmp_path):
+        """Fixture building EntityManagerInterfaces on a SQLite database holding the task table"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}", connect_args={"check_same_thread": False})
+        Task.__table__.create(engine)
+        registry = Mock()
+        registry.get_engine.return_value = engine
+        entity_managers = []
+
+        def build():
+            with patch.object(EntityManagerRegistry, "get_instance", return_value=registry):
+                entity_manager = EntityManager()
+            entity_managers.append(entity_manager)
+            return EntityManagerInterface(entity_manager=entity_manager)
+
+        # persist() looks the repositories of the relations up in the service container
+        with patch.object(EntityManager, "get_repository", return_value=None):
+            yield build
+        for entity_manager in entity_managers:
+            entity_manager.close_session()
+        engine.dispose()
+
+    @pytest.fixture
+    def worker_manager(self, entity_manager_factory):
+        """Fixture for a WorkerManager polling every 5 seconds at most, its loop run by the test"""
+        worker_manager = WorkerManager(DatabaseBroker(entity_manager_factory()))
+        worker_manager.set_polling_interval(5)
+        worker_manager.last_cleanup_time = time.time()
+        return worker_manager
+
+    def test_idle_delay_doubles_up_to_the_polling_interval(self, worker_manager):
+        delays = [worker_manager._idle_delay(polls) for polls in range(1, 10)]
+
+        assert delays[:4] == [0.05, 0.1, 0.2, 0.4]
+        assert delays[-1] == 5
+
+    def test_enqueue_notifies_the_workers_of_the_process(self, entity_manager_factory):
+        broker = DatabaseBroker(entity_manager_factory())
+
+        with patch.object(broker.notifier, "notify") as notify:
+            broker.enqueue("tests.pickup", {}, queue="mails")
+
+        notify.assert_called_once_with("mails")
+
+    @pytest.mark.asyncio
+    async def test_tasks_are_picked_up_within_milliseconds(self, worker_manager, entity_manager_factory):
+        pickups.clear()
+        WorkerManager.register_task_handler("tests.pickup", record_pickup)
+        producer = DatabaseBroker(entity_manager_factory())
+        worker_manager.running = True
+
+        with patch("framefox.core.task.worker_manager.ServiceContainer"):
+            loop_task = asyncio.create_task(worker_manager._process_loop())
+            latencies = []
+            for _ in range(3):
+                # Long enough for the idle backoff to wait most of a second
+                await asyncio.sleep(0.8)
+                queued = time.perf_counter()
+                await asyncio.to_thread(producer.enqueue, "tests.pickup", {})
+                while len(pickups) < len(latencies) + 1:
+                    await asyncio.sleep(0.001)
+                latencies.append(pickups[-1] - queued)
+
+            stopping = time.perf_counter()
+            await worker_manager.stop()
+            await loop_task
+
+        assert statistics.median(latencies) < 0.1
+        assert time.perf_counter() - stopping < 1
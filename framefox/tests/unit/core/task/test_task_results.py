@@ -0,0 +1,217 @@
+import asyncio
+import threading
+import time
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlmodel import create_engine
+
+from framefox.core.task.entity.task import Task
+from framefox.core.task.entity.task_result import TaskResult
+from framefox.core.task.result.database_result_backend import DatabaseResultBackend
+from framefox.core.task.result.memory_result_backend import MemoryResultBackend
+from framefox.core.task.result.redis_result_backend import RedisResultBackend
+from framefox.core.task.result.task_handle import TaskFailedError, TaskHandle
+from framefox.core.task.worker_manager import WorkerManager
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class InMemoryRedisClient:
+    """Minimal stand-in for the redis client calls used by RedisResultBackend (expiry is not simulated)"""
+
+    def __init__(self):
+        self.values = {}
+        self.lists = {}
+        self.changed = threading.Condition()
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+    def get(self, name):
+        return self.values.get(name)
+
+    def set(self, name, value, ex=None):
+        self.values[name] = value
+
+    def rpush(self, name, value):
+        with self.changed:
+            self.lists.setdefault(name, []).append(value)
+            self.changed.notify_all()
+
+    def expire(self, name, seconds):
+        pass
+
+    def blmove(self, first_list, second_list, timeout, src="LEFT", dest="RIGHT"):
+        with self.changed:
+            if self.changed.wait_for(lambda: self.lists.get(first_list), timeout):
+                return self.lists[first_list][-1]
+            return None
+
+
+def double(value):
+    return value * 2
+
+
+def explode():
+    raise ValueError("boom")
+
+
+def now():
+    return datetime.now()
+
+
+class TestResultBackends:
+    @pytest.fixture
+    def engine(self, tmp_path):
+        """Fixture for a SQLite database holding the task_result table"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'results.db'}")
+        TaskResult.__table__.create(engine)
+        yield engine
+        engine.dispose()
+
+    @pytest.fixture(params=["memory", "database", "redis"])
+    def backend(self, request, engine):
+        """Fixture for each result backend"""
+        if request.param == "memory":
+            return MemoryResultBackend(ttl=60)
+        if request.param == "database":
+            return DatabaseResultBackend(engine, ttl=60)
+        return RedisResultBackend(ttl=60, client=InMemoryRedisClient())
+
+    def test_stores_the_outcomes(self, backend):
+        backend.store_result("task-1", {"total": 3, "items": [1, 2]})
+        backend.store_error("task-2", "boom")
+
+        assert backend.get("task-1") == {"status": "completed", "value": {"total": 3, "items": [1, 2]}}
+        assert backend.get("task-2") == {"status": "failed", "error": "boom"}
+        assert backend.get("task-3") is None
+
+    def test_outcomes_are_written_with_msgpack(self, backend):
+        encoded = backend.codec.encode({"status": "completed", "value": 1})
+
+        assert encoded[0] == 2
+
+    def test_a_task_run_again_overwrites_its_outcome(self, backend):
+        backend.store_error("task-1", "boom")
+        backend.store_result("task-1", 42)
+
+        assert backend.get("task-1")["value"] == 42
+
+    def test_values_that_cannot_be_serialized_are_rejected(self, backend):
+        with pytest.raises(TypeError):
+            backend.store_result("task-1", object())
+
+    @pytest.mark.asyncio
+    async def test_wait_wakes_up_when_the_outcome_is_stored(self, backend):
+        # Checks far apart: only the notification can return in time
+        backend.MIN_CHECK_INTERVAL = 10
+        threading.Timer(0.1, backend.store_result, ("task-1", "done")).start()
+
+        started = time.monotonic()
+        outcome = await backend.wait("task-1", timeout=5)
+
+        assert outcome["value"] == "done"
+        assert time.monotonic() - started < 2
+
+    @pytest.mark.asyncio
+    async def test_wait_gives_up_after_the_timeout(self, backend):
+        assert await backend.wait("task-1", timeout=0.1) is None
+
+    def test_expired_rows_are_ignored_and_purged(self, engine):
+        backend = DatabaseResultBackend(engine, ttl=60)
+        backend.store_result("task-1", 1)
+        backend.ttl = -1
+        backend.store_result("task-2", 2)
+
+        assert backend.get("task-2") is None
+        assert backend.purge_expired() == 1
+        assert backend.get("task-1")["value"] == 1
+
+
+class TestTaskHandle:
+    @pytest.fixture
+    def backend(self):
+        """Fixture for an in-memory result backend"""
+        return MemoryResultBackend(ttl=60)
+
+    @pytest.fixture
+    def worker_manager(self, backend):
+        """Fixture for a WorkerManager keeping the results in the in-memory backend"""
+        WorkerManager.register_task_handler("tests.double", double)
+        WorkerManager.register_task_handler("tests.explode", explode)
+        WorkerManager.register_task_handler("tests.now", now)
+        with patch("framefox.core.task.worker_manager.ServiceContainer"):
+            worker_manager = WorkerManager(Mock())
+            worker_manager.set_result_backend(backend)
+            yield worker_manager
+        worker_manager.shutdown_executors()
+
+    def make_task(self, name, payload=None, max_retries=0):
+        task = Task(name=name, max_retries=max_retries)
+        task.set_payload(payload or {})
+        return task
+
+    def test_handle_is_the_task_id(self):
+        handle = TaskHandle("task-1")
+
+        assert handle == "task-1"
+        assert handle.id == "task-1"
+
+    @pytest.mark.asyncio
+    async def test_result_returns_the_value_of_the_handler(self, worker_manager, backend):
+        task = self.make_task("tests.double", {"args": [21]})
+        handle = TaskHandle(task.id, backend)
+
+        waiter = asyncio.create_task(handle.result(timeout=5))
+        await worker_manager._execute_task(task)
+
+        assert await waiter == 42
+        assert handle.ready()
+        worker_manager.broker.complete_task.assert_called_once_with(task)
+
+    @pytest.mark.asyncio
+    async def test_result_raises_the_error_of_a_failed_task(self, worker_manager, backend):
+        task = self.make_task("tests.explode")
+
+        await worker_manager._execute_task(task)
+
+        with pytest.raises(TaskFailedError, match="boom"):
+            await TaskHandle(task.id, backend).result(timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_a_task_left_to_retry_has_no_outcome_yet(self, worker_manager, backend):
+        task = self.make_task("tests.explode", max_retries=3)
+
+        await worker_manager._execute_task(task)
+
+        assert not TaskHandle(task.id, backend).ready()
+        with pytest.raises(TimeoutError):
+            await TaskHandle(task.id, backend).result(timeout=0.1)
+
+    @pytest.mark.asyncio
+    async def test_a_result_that_cannot_be_stored_fails_the_handle(self, worker_manager, backend):
+        task = self.make_task("tests.now")
+
+        await worker_manager._execute_task(task)
+
+        with pytest.raises(TaskFailedError, match="could not be stored"):
+            await TaskHandle(task.id, backend).result(timeout=1)
+        worker_manager.broker.complete_task.assert_called_once_with(task)
+
+    @pytest.mark.asyncio
+    async def test_result_needs_a_result_backend(self):
+        with patch("framefox.core.task.result.task_handle.ServiceContainer") as container:
+            container.return_value.get.return_value = None
+            with pytest.raises(RuntimeError, match="tasks.results.backend"):
+                await TaskHandle("task-1").result(timeout=1)
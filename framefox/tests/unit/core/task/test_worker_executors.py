@@ -0,0 +1,103 @@
+import asyncio
+import os
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlmodel import create_engine
+
+from framefox.core.events.event_dispatcher import dispatcher
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+from framefox.core.task.decorator.async_task import AsyncTask
+from framefox.core.task.entity.task import Task
+from framefox.core.task.worker_manager import WorkerManager
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+@AsyncTask()
+def current_thread_name():
+    return threading.current_thread().name
+
+
+@AsyncTask(executor="process")
+def current_pid():
+    return os.getpid()
+
+
+@AsyncTask(executor="process")
+def inherited_engines():
+    return len(EntityManagerRegistry._engines)
+
+
+def make_task(handler, *args):
+    task = Task(name=f"{handler.__module__}.{handler.__name__}")
+    task.set_payload({"args": list(args)})
+    return task
+
+
+class TestWorkerExecutors:
+    @pytest.fixture
+    def worker_manager(self):
+        """Fixture for a WorkerManager with a mocked broker and two task slots"""
+        worker_manager = WorkerManager(Mock())
+        worker_manager.set_concurrent_tasks(2)
+        yield worker_manager
+        worker_manager.shutdown_executors()
+
+    @pytest.fixture
+    def results(self):
+        """Fixture collecting the results of the executed tasks"""
+        results = []
+        with patch.dict(dispatcher.listeners, {"worker.task.after_execution": [lambda event: results.append(event["result"])]}):
+            yield results
+
+    @pytest.mark.asyncio
+    async def test_sync_tasks_share_a_bounded_thread_pool(self, worker_manager, results):
+        threads_before = set(threading.enumerate())
+
+        await asyncio.gather(*[worker_manager._execute_task(make_task(current_thread_name)) for _ in range(20)])
+
+        assert len(results) == 20
+        assert all(name.startswith("framefox-task") for name in results)
+        assert len(set(results)) <= 2
+        started = set(threading.enumerate()) - threads_before
+        assert len([thread for thread in started if thread.name.startswith("framefox-task")]) <= 2
+        assert worker_manager.broker.complete_task.call_count == 20
+
+    @pytest.mark.asyncio
+    async def test_process_tasks_run_in_the_process_pool(self, worker_manager, results):
+        await asyncio.gather(*[worker_manager._execute_task(make_task(current_pid)) for _ in range(4)])
+
+        assert len(results) == 4
+        assert os.getpid() not in results
+        assert len(set(results)) <= 2
+        worker_manager.broker.fail_task.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_process_pool_drops_the_engines_of_the_worker(self, worker_manager, results, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'worker.db'}")
+        with patch.dict(EntityManagerRegistry._engines, {"default": engine}):
+            await worker_manager._execute_task(make_task(inherited_engines))
+        engine.dispose()
+
+        assert results == [0]
+
+    @pytest.mark.asyncio
+    async def test_stop_shuts_the_executors_down(self, worker_manager):
+        executor = worker_manager.get_executor("thread")
+
+        await worker_manager.stop()
+
+        assert executor._shutdown
+        assert worker_manager.get_executor("thread") is not executor
+
+    def test_unknown_executor_is_rejected(self):
+        with pytest.raises(ValueError, match="Unknown executor 'gpu'"):
+            WorkerManager.register_task_handler("tasks.compute", current_pid, executor="gpu")
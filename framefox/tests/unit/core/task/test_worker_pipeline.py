@@ -0,0 +1,201 @@
+import asyncio
+import time
+from collections import deque
+from unittest.mock import patch
+
+import pytest
+
+from framefox.core.task.broker.broker_interface import BrokerInterface
+from framefox.core.task.entity.task import Task, TaskStatus
+from framefox.core.task.queue_scheduler import QueueScheduler
+from framefox.core.task.worker_manager import WorkerManager
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+class MemoryBroker(BrokerInterface):
+    """Broker keeping its queues in memory"""
+
+    def __init__(self):
+        self.queues = {}
+        self.completed = []
+        self.failed = []
+        self.released = []
+
+    def enqueue(self, name, payload, queue="default", priority=0, scheduled_for=None, max_retries=3, task_id=None):
+        task = Task(name=name, queue=queue, priority=priority, max_retries=max_retries)
+        if task_id is not None:
+            task.id = task_id
+        task.set_payload(payload)
+        self.queues.setdefault(queue, deque()).append(task)
+        return task
+
+    def dequeue(self, queue="default", batch_size=1):
+        pending = self.queues.get(queue, deque())
+        tasks = [pending.popleft() for _ in range(min(batch_size, len(pending)))]
+        for task in tasks:
+            task.status = TaskStatus.RUNNING
+        return tasks
+
+    def complete_task(self, task):
+        self.completed.append(task)
+
+    def fail_task(self, task, error):
+        self.failed.append((task, error))
+
+    def release(self, task):
+        task.status = TaskStatus.PENDING
+        self.released.append(task)
+
+    def get_task(self, task_id):
+        return None
+
+    def get_tasks_by_status(self, status, queue=None, limit=100):
+        return []
+
+    def purge_failed_tasks(self, older_than_days=30):
+        return 0
+
+
+events = []
+
+
+async def sleeping_task(label, seconds):
+    events.append(("start", label))
+    await asyncio.sleep(seconds)
+    events.append(("end", label))
+
+
+def started(label=None):
+    return [name for kind, name in events if kind == "start" and (label is None or name.startswith(label))]
+
+
+def finished(label=None):
+    return [name for kind, name in events if kind == "end" and (label is None or name.startswith(label))]
+
+
+class TestQueueScheduler:
+    def test_busy_queues_are_interleaved_by_weight(self):
+        scheduler = QueueScheduler(["mails", "reports"], {"mails": 3})
+
+        order = [scheduler.next(["mails", "reports"]) for _ in range(8)]
+
+        assert order.count("mails") == 6 and order.count("reports") == 2
+        assert "reports" in order[:4]
+
+    def test_only_ready_queues_are_chosen(self):
+        scheduler = QueueScheduler(["mails", "reports"], {"mails": 3})
+
+        assert scheduler.next(["reports"]) == "reports"
+        assert scheduler.next([]) is None
+
+    def test_share_of_the_slots(self):
+        scheduler = QueueScheduler(["mails", "reports"], {"mails": 3})
+
+        assert scheduler.share("mails", 8) == 6
+        assert scheduler.share("reports", 8) == 2
+        assert scheduler.share("reports", 1) == 1
+
+    def test_weights_must_be_positive(self):
+        with pytest.raises(ValueError, match="reports"):
+            QueueScheduler(["reports"], {"reports": 0})
+
+
+class TestWorkerPipeline:
+    @pytest.fixture(autouse=True)
+    def handlers(self):
+        """Fixture registering the test handler and clearing the recorded events"""
+        events.clear()
+        WorkerManager.register_task_handler("tests.sleeping_task", sleeping_task)
+        with patch("framefox.core.task.worker_manager.ServiceContainer"):
+            yield
+
+    @pytest.fixture
+    def broker(self):
+        """Fixture for an in-memory broker"""
+        return MemoryBroker()
+
+    @pytest.fixture
+    def worker_manager(self, broker):
+        """Fixture for a WorkerManager with two slots polling the in-memory broker often"""
+        worker_manager = WorkerManager(broker)
+        worker_manager.set_concurrent_tasks(2)
+        worker_manager.set_polling_interval(0.05)
+        worker_manager.set_min_polling_interval(0.01)
+        worker_manager.last_cleanup_time = time.time()
+        worker_manager.running = True
+        yield worker_manager
+        worker_manager.shutdown_executors()
+
+    async def run_until(self, worker_manager, condition, timeout=5):
+        loop_task = asyncio.create_task(worker_manager._process_loop())
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            await asyncio.sleep(0.005)
+        worker_manager.running = False
+        if worker_manager._subscription is not None:
+            worker_manager._subscription.set()
+        await loop_task
+
+    @pytest.mark.asyncio
+    async def test_a_slow_task_does_not_hold_the_fast_ones_back(self, worker_manager, broker):
+        broker.enqueue("tests.sleeping_task", {"args": ["slow", 1]})
+        for index in range(10):
+            broker.enqueue("tests.sleeping_task", {"args": [f"fast-{index}", 0.02]})
+
+        await self.run_until(worker_manager, lambda: len(finished("fast")) == 10)
+
+        # With batch-and-wait the fast tasks would wait for the slow one every other batch
+        assert len(finished("fast")) == 10
+        assert finished() == finished("fast") + ["slow"]
+
+    @pytest.mark.asyncio
+    async def test_busy_queues_share_the_slots_by_weight(self, worker_manager, broker):
+        worker_manager.set_concurrent_tasks(1)
+        worker_manager.set_queues(["mails", "reports"])
+        worker_manager.set_queue_weights({"mails": 3})
+        for index in range(12):
+            broker.enqueue("tests.sleeping_task", {"args": [f"mail-{index}", 0]}, queue="mails")
+            broker.enqueue("tests.sleeping_task", {"args": [f"report-{index}", 0]}, queue="reports")
+
+        await self.run_until(worker_manager, lambda: len(finished()) >= 8)
+
+        first = started()[:8]
+        assert len([label for label in first if label.startswith("mail")]) == 6
+        assert len([label for label in first if label.startswith("report")]) == 2
+
+    @pytest.mark.asyncio
+    async def test_tasks_running_past_their_timeout_fail(self, worker_manager, broker):
+        worker_manager.set_task_timeout(0.05)
+        broker.enqueue("tests.sleeping_task", {"args": ["stuck", 10]})
+
+        await self.run_until(worker_manager, lambda: broker.failed)
+
+        task, error = broker.failed[0]
+        assert "timed out after 0.05s" in error
+        assert finished() == []
+
+    def test_task_timeout_overrides_the_worker_timeout(self):
+        WorkerManager.register_task_handler("tests.quick", sleeping_task, timeout=1)
+
+        assert WorkerManager._task_timeouts["tests.quick"] == 1
+        assert "tests.sleeping_task" not in WorkerManager._task_timeouts
+
+    @pytest.mark.asyncio
+    async def test_stop_finishes_running_tasks_and_releases_prefetched_ones(self, worker_manager, broker):
+        for index in range(6):
+            broker.enqueue("tests.sleeping_task", {"args": [f"task-{index}", 0.1]})
+
+        await self.run_until(worker_manager, lambda: len(started()) == 2)
+
+        assert sorted(finished()) == sorted(started())
+        assert len(broker.completed) == 2
+        # Two running, two prefetched for the free slots and released, two never claimed
+        assert len(broker.released) == 2
+        assert all(task.status == TaskStatus.PENDING for task in broker.released)
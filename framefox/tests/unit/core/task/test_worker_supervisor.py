@@ -0,0 +1,113 @@
+import os
+import signal
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import create_engine
+
+from framefox.core.orm.entity_manager_registry import EntityManagerRegistry
+from framefox.core.task.worker_supervisor import WorkerSupervisor
+
+"""
+Framefox Framework developed by SOMA
+Github: https://github.com/soma-smart/framefox
+----------------------------
+Author: BOUMAZA Rayen
+Github: https://github.com/RayenBou
+"""
+
+
+def read_lines(path):
+    return path.read_text().splitlines() if path.exists() else []
+
+
+def stop_when(supervisor, condition, timeout=10):
+    """Stops the supervisor from another thread once condition() holds, run() must stay in the main thread"""
+
+    def watch():
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        supervisor.stop()
+
+    thread = threading.Thread(target=watch, daemon=True)
+    thread.start()
+    return thread
+
+
+class TestWorkerSupervisor:
+    def test_processes_must_be_positive(self):
+        with pytest.raises(ValueError, match="processes"):
+            WorkerSupervisor(lambda index: None, 0)
+
+    def test_crashed_processes_are_restarted_and_drained(self, tmp_path):
+        def worker(index):
+            def drain(signum, frame):
+                (tmp_path / f"drained-{index}").write_text("done")
+                sys.exit(0)
+
+            signal.signal(signal.SIGTERM, drain)
+            starts = tmp_path / f"starts-{index}"
+            with starts.open("a") as file:
+                file.write(f"{os.getpid()}\n")
+            if len(read_lines(starts)) == 1:
+                sys.exit(3)
+            while True:
+                time.sleep(0.01)
+
+        supervisor = WorkerSupervisor(worker, 2, shutdown_timeout=5, restart_backoff=0.05)
+        stop_when(supervisor, lambda: all(len(read_lines(tmp_path / f"starts-{index}")) == 2 for index in range(2)))
+
+        supervisor.run()
+
+        assert supervisor.restarts == 2
+        assert supervisor.crashes == [1, 1]
+        for index in range(2):
+            pids = read_lines(tmp_path / f"starts-{index}")
+            assert len(set(pids)) == 2 and str(os.getpid()) not in pids
+            assert (tmp_path / f"drained-{index}").read_text() == "done"
+        assert all(process is None or not process.is_alive() for process in supervisor.children)
+
+    def test_restart_backoff_grows_with_crashes(self, tmp_path):
+        def worker(index):
+            with (tmp_path / "starts").open("a") as file:
+                file.write(f"{time.monotonic()}\n")
+            sys.exit(1)
+
+        supervisor = WorkerSupervisor(worker, 1, restart_backoff=0.1, max_restart_backoff=0.4)
+        stop_when(supervisor, lambda: len(read_lines(tmp_path / "starts")) >= 5)
+
+        supervisor.run()
+
+        starts = [float(line) for line in read_lines(tmp_path / "starts")][:5]
+        gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+        assert gaps[0] >= 0.1
+        assert gaps[1] >= 0.2
+        assert gaps[2] >= 0.4 and gaps[3] < 0.8
+
+    def test_processes_ignoring_sigterm_are_killed(self, tmp_path):
+        def worker(index):
+            signal.signal(signal.SIGTERM, signal.SIG_IGN)
+            (tmp_path / "started").write_text("yes")
+            while True:
+                time.sleep(0.01)
+
+        supervisor = WorkerSupervisor(worker, 1, shutdown_timeout=0.2)
+        stop_when(supervisor, lambda: (tmp_path / "started").exists())
+
+        started = time.monotonic()
+        supervisor.run()
+
+        assert time.monotonic() - started < 5
+        assert supervisor.children[0].exitcode == -signal.SIGKILL
+
+    def test_reset_engines_forgets_inherited_engines(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'worker.db'}")
+
+        with patch.dict(EntityManagerRegistry._engines, {"default": engine}, clear=True):
+            EntityManagerRegistry.reset_engines()
+
+            assert EntityManagerRegistry._engines == {}